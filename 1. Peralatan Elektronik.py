@@ -1,116 +1,183 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import numpy as np
 
-# kelas monitor listrik
-class MonitorListrik:
-    def __init__(self):
-        """Inisialisasi kelas monitoring listrik"""
-        self.peralatan = []
-        self.penggunaan_harian = []
-        self.tarif_listrik = {
-            'R-1': 1444,  # Tarif untuk golongan R-1 (per kWh)
-            'R-2': 1699,  # Tarif untuk golongan R-2 (per kWh)
-            'R-3': 1699,  # Tarif untuk golongan R-3 (per kWh)
-        }
-        self.tarif_terpilih = 'R-1'  # Golongan R-1 sebagai default
-
-    # 1.Peralatan Elektronik
-    def tambah_peralatan(self, nama, unit, watt, golongan, jam_per_hari):
-        """Menambahkan peralatan elektronik dan golongan listrik"""
-        self.peralatan.append({
-            'nama': nama,
-            'unit': unit,
-            'watt': watt,
-            'total_watt': watt * unit,
-            'golongan': golongan,
-            'jam_per_hari': jam_per_hari,
-        })
-        self.update_penggunaan_harian_dengan_peralatan_baru()
-
-    def update_penggunaan_harian_dengan_peralatan_baru(self):
-        """Mengupdate penggunaan harian dengan peralatan baru"""
-        if not self.penggunaan_harian:
-            self.generate_sample_data()
+from powerwatch import instrumentasi, kueri
+from powerwatch.katalog_peralatan import katalog_peralatan
+from powerwatch.sesi import monitor_sesi
+
+# Pilihan jumlah baris per halaman tabel; hanya halaman yang tampil dikirim ke browser
+UKURAN_HALAMAN = [25, 50, 100, 250]
+# Irisan grafik pie; peralatan di luar irisan terbesar digabung menjadi "Lainnya"
+MAKS_IRISAN_PIE = 20
+# Jumlah saran model dari katalog yang ditampilkan saat mengetik
+BATAS_SARAN_MODEL = 10
+# Label kolom tabel -> nama kolom TabelPeralatan (None = urutan input)
+KOLOM_TABEL = {
+    'Urutan Input': None,
+    'Nama Peralatan': 'nama',
+    'Golongan Listrik': 'golongan',
+    'Jumlah Unit': 'unit',
+    'Daya per Unit (Watt)': 'watt',
+    'Total Daya (Watt)': 'total_watt',
+    'Jam Penggunaan per Hari': 'jam_per_hari',
+    'Jam Mulai': 'jam_mulai',
+}
+
+
+@st.fragment
+def grafik_distribusi_daya(monitor):
+    """Grafik pie distribusi daya per nama peralatan"""
+    def buat_tampilan():
+        # Agregasi per nama dari indeks grup; hanya irisan terbesar yang diurutkan
+        nama, daya = kueri.teratas_dengan_lainnya(monitor, 'nama', 'total_watt', MAKS_IRISAN_PIE)
+        return px.pie(
+            pd.DataFrame({'Nama Peralatan': nama, 'Total Daya (Watt)': daya}),
+            values='Total Daya (Watt)',
+            names='Nama Peralatan',
+            title='Distribusi Daya per Peralatan'
+        )
+
+    # Figure hanya dibangun ulang bila data berubah
+    st.plotly_chart(monitor.memo_halaman('peralatan', buat_tampilan))
+
+
+@st.fragment
+def tabel_peralatan(monitor):
+    """Tabel peralatan dengan saringan, urutan, dan halaman di sisi server"""
+    col1, col2 = st.columns(2)
+    with col1:
+        cari = st.text_input('Cari Nama Peralatan').strip()
+        urut = st.selectbox('Urutkan Berdasarkan', list(KOLOM_TABEL))
+    with col2:
+        golongan = st.multiselect('Golongan Listrik', sorted(monitor.tarif_listrik))
+        menurun = st.toggle('Urutan Menurun')
+
+    indeks = monitor.kueri_peralatan(cari, golongan or None, KOLOM_TABEL[urut], menurun)
+    if not len(indeks):
+        st.info('Tidak ada peralatan yang cocok dengan saringan.')
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        ukuran = st.selectbox('Baris per Halaman', UKURAN_HALAMAN)
+    jumlah_halaman = -(-len(indeks) // ukuran)
+    with col2:
+        # max_value ikut identitas widget, sehingga halaman kembali ke 1 saat saringan berubah
+        nomor = st.number_input('Halaman', min_value=1, max_value=jumlah_halaman, value=1)
+
+    awal = (nomor - 1) * ukuran
+    terlihat = indeks[awal:awal + ukuran]
+    baris = monitor.peralatan.baris(terlihat)
+    peralatan_df = pd.DataFrame({
+        'Nama Peralatan': baris['nama'],
+        'Golongan Listrik': baris['golongan'],
+        'Jumlah Unit': baris['unit'],
+        'Daya per Unit (Watt)': baris['watt'],
+        'Total Daya (Watt)': baris['total_watt'],
+        'Jam Penggunaan per Hari': baris['jam_per_hari'],
+        'Jam Mulai': baris['jam_mulai']
+    }, index=terlihat)
+    st.dataframe(peralatan_df)
+    st.caption(
+        f'Menampilkan {awal + 1:,}–{awal + len(terlihat):,} dari {len(indeks):,} peralatan '
+        f'(halaman {nomor:,} dari {jumlah_halaman:,})'
+    )
+
+
+@st.fragment
+def formulir_tambah(monitor):
+    """Formulir tambah peralatan; halaman digambar ulang hanya setelah data berubah"""
+    pesan = st.session_state.pop('pesan_peralatan', None)
+    if pesan:
+        st.success(pesan)
+
+    # Autocomplete dari katalog model (indeks trie + trigram, dimuat sekali per proses)
+    model = None
+    teks_cari = st.text_input(
+        'Cari Model di Katalog', key='kueri_katalog',
+        placeholder='mis. kulkas 2 pintu, ac inverter 1 pk'
+    )
+    if teks_cari.strip():
+        hasil = katalog_peralatan().cari(teks_cari, BATAS_SARAN_MODEL)
+        if hasil:
+            pilihan = st.selectbox(
+                'Model', range(len(hasil)), index=None,
+                format_func=lambda i: (
+                    f"{hasil[i]['nama']} ({hasil[i]['watt']:,.0f} W, "
+                    f"siklus kerja {hasil[i]['siklus_kerja']:.0%})"
+                ),
+                placeholder='Pilih model untuk mengisi formulir'
+            )
+            model = None if pilihan is None else hasil[pilihan]
+        else:
+            st.caption('Tidak ada model yang cocok di katalog.')
+
+    with st.form('Tambah Peralatan', clear_on_submit=True):
+        st.subheader("Formulir Tambah Peralatan Elektronik")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            golongan = st.selectbox('Golongan Listrik', ['R-1', 'R-2', 'R-3'])
+            nama = st.text_input('Nama Peralatan', value=model['nama'] if model else '')
+            unit = st.number_input('Jumlah Unit', min_value=1, value=1)
+
+        with col2:
+            jam_per_hari = st.number_input(
+                'Waktu Penggunaan per Hari (Jam)', min_value=0.1,
+                value=model['jam_per_hari'] if model else 1.0
+            )
+            jam_mulai = st.number_input(
+                'Jam Mulai Penggunaan', min_value=0.0, max_value=23.99, value=None,
+                placeholder='Otomatis (selesai pukul 22.00)'
+            )
+            # Model katalog: daya rata-rata (watt x siklus kerja) agar energi per hari sesuai pola pakainya
+            watt = st.number_input(
+                'Daya per Unit (Watt)', min_value=1,
+                value=max(1, round(model['daya_rata'])) if model else 1
+            )
+
+        submit = st.form_submit_button('Tambah')
+
+        if submit:
+            monitor.tambah_peralatan(nama, unit, watt, golongan, jam_per_hari, jam_mulai)
+            monitor.simpan()
+            # Grafik dan tabel berada di fragmen lain; gambar ulang seluruh halaman
+            st.session_state.pesan_peralatan = f'Peralatan {nama} berhasil ditambahkan!'
+            # Kosongkan pencarian katalog untuk peralatan berikutnya
+            del st.session_state.kueri_katalog
+            st.rerun()
+
+
+@st.fragment
+def impor_peralatan(monitor):
+    """Impor banyak peralatan sekaligus dari berkas"""
+    pesan = st.session_state.pop('pesan_impor', None)
+    if pesan:
+        st.success(pesan)
+
+    st.subheader("Impor Peralatan dari Berkas")
+    berkas = st.file_uploader(
+        'Berkas CSV atau Parquet',
+        type=['csv', 'parquet'],
+        help='Kolom wajib: nama, unit, watt, golongan, jam_per_hari (opsional: jam_mulai)'
+    )
+    if berkas is not None and st.button('Impor'):
+        try:
+            jumlah = monitor.impor_peralatan(berkas)
+        except ValueError as e:
+            st.error(f'Impor gagal: {e}')
         else:
-            new_usage = np.random.uniform(1, 5)
-            self.penggunaan_harian.append({
-                'hari': len(self.penggunaan_harian) + 1,
-                'penggunaan': new_usage
-            })
-
-    def set_tarif_listrik(self, golongan):
-        """Set golongan listrik yang dipilih"""
-        self.tarif_terpilih = golongan
-
-    # 2.Penggunaan Listrik
-    def hitung_total_penggunaan(self):
-        """Menghitung total penggunaan listrik dalam kWh per bulan"""
-        total_penggunaan_per_bulan = 0
-        for peralatan in self.peralatan:
-            total_penggunaan_per_bulan += (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30
-        return total_penggunaan_per_bulan
-
-    # 3.Estimasi Biaya
-    def hitung_estimasi_biaya(self):
-        """Menghitung estimasi biaya listrik"""
-        total_penggunaan_per_bulan = self.hitung_total_penggunaan()
-        tarif = self.tarif_listrik.get(self.tarif_terpilih, 1500)
-        return total_penggunaan_per_bulan * tarif
-
-    def generate_sample_data(self, hari=30):
-        """Menghasilkan data penggunaan listrik sampel"""
-        np.random.seed(42)
-        self.penggunaan_harian = []
-        for hari in range(1, hari + 1):
-            penggunaan = np.random.uniform(5, 15)
-            self.penggunaan_harian.append({
-                'hari': hari,
-                'penggunaan': penggunaan
-            })
-
-    def konsumsi_energi_per_peralatan(self):
-        """Menghitung konsumsi energi per peralatan"""
-        return [
-            {'peralatan': peralatan['nama'], 'konsumsi': (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30}
-            for peralatan in self.peralatan
-        ]
+            monitor.simpan()
+            st.session_state.pesan_impor = f'{jumlah} peralatan berhasil diimpor!'
+            st.rerun()
+
 
 # Input data
 def main():
-    if 'monitor' not in st.session_state:
-        monitor = MonitorListrik()
-
-        # Menambahkan peralatan default
-        peralatan_default = [
-            ('TV 21 inci', 1, 68, 'R-1', 8),
-            ('Audio', 1, 50, 'R-1', 14),
-            ('AC', 1, 430, 'R-1', 8),
-            ('Komputer', 1, 140, 'R-1', 5),
-            ('Game Player', 1, 20, 'R-1', 5),
-            ('Lampu Bohlam', 3, 60, 'R-1', 8),
-            ('Lampu Hemat Listrik', 5, 12, 'R-1', 8),
-            ('Kipas Angin', 1, 103, 'R-1', 8),
-            ('Microwave', 1, 1270, 'R-1', 1),
-            ('Blender', 1, 130, 'R-1', 1.2),
-            ('Kompor Listrik', 1, 380, 'R-1', 4),
-            ('Magic jar', 1, 465, 'R-1', 9),
-            ('Kulkas 120 Liter', 1, 62, 'R-1', 24),
-            ('Setrika', 1, 300, 'R-1', 1),
-            ('Dispenser', 1, 256, 'R-1', 24),
-            ('Pemanggang Roti', 1, 380, 'R-1', 1),
-            ('Mesin Cuci', 1, 550, 'R-1', 4),
-            ('Pemanas Air', 1, 400, 'R-1', 2),
-            ('Pompa Air', 1, 650, 'R-1', 3)
-        ]
-
-        for nama, unit, watt, golongan, jam in peralatan_default:
-            monitor.tambah_peralatan(nama, unit, watt, golongan, jam)
-
-        st.session_state.monitor = monitor
-
-    monitor = st.session_state.monitor
+    monitor = monitor_sesi(st.session_state)
 
 # Pelajarin masing-masing 
 # (yang beda baris 115)  
@@ -121,50 +188,21 @@ def main():
 
         tab1, tab2 = st.tabs(["Daftar Elektronik", "Tambah Elektronik"])
 
+        # Grafik, tabel, formulir, dan impor adalah fragmen terpisah: berinteraksi
+        # dengan salah satunya hanya menjalankan ulang fragmen tersebut
         with tab1:
             if monitor.peralatan:
-                data_peralatan = [{
-                    'Nama Peralatan': peralatan['nama'],
-                    'Golongan Listrik': peralatan['golongan'],
-                    'Jumlah Unit': peralatan['unit'],
-                    'Daya per Unit (Watt)': peralatan['watt'],
-                    'Total Daya (Watt)': peralatan['total_watt'],
-                    'Jam Penggunaan per Hari': peralatan['jam_per_hari']
-                } for peralatan in monitor.peralatan]
-
-                peralatan_df = pd.DataFrame(data_peralatan)
                 st.subheader("Daftar Peralatan Elektronik")
                 # Menampilkan grafik terlebih dahulu
-                fig_pie = px.pie(
-                    peralatan_df,
-                    values='Total Daya (Watt)',
-                    names='Nama Peralatan',
-                    title='Distribusi Daya per Peralatan'
-                )
-                st.plotly_chart(fig_pie)
+                grafik_distribusi_daya(monitor)
                 # Kemudian tabel
-                st.dataframe(peralatan_df)
+                tabel_peralatan(monitor)
 
         with tab2:
-            with st.form('Tambah Peralatan', clear_on_submit=True):
-                st.subheader("Formulir Tambah Peralatan Elektronik")
-
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    golongan = st.selectbox('Golongan Listrik', ['R-1', 'R-2', 'R-3'])
-                    nama = st.text_input('Nama Peralatan')
-                    unit = st.number_input('Jumlah Unit', min_value=1, value=1)
-
-                with col2:
-                    jam_per_hari = st.number_input('Waktu Penggunaan per Hari (Jam)', min_value=0.1, value=1.0)
-                    watt = st.number_input('Daya per Unit (Watt)', min_value=1)
-
-                submit = st.form_submit_button('Tambah')
-
-                if submit:
-                    monitor.tambah_peralatan(nama, unit, watt, golongan, jam_per_hari)
-                    st.success(f'Peralatan {nama} berhasil ditambahkan!')
+            formulir_tambah(monitor)
+            # Impor banyak peralatan sekaligus dari berkas
+            impor_peralatan(monitor)
 
 if __name__ == '__main__':
-    main()
+    with instrumentasi.rerun('1. Peralatan Elektronik.py'):
+        main()
@@ -1,116 +1,16 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import numpy as np
 
-# kelas monitor listrik
-class MonitorListrik:
-    def __init__(self):
-        """Inisialisasi kelas monitoring listrik"""
-        self.peralatan = []
-        self.penggunaan_harian = []
-        self.tarif_listrik = {
-            'R-1': 1444,  # Tarif untuk golongan R-1 (per kWh)
-            'R-2': 1699,  # Tarif untuk golongan R-2 (per kWh)
-            'R-3': 1699,  # Tarif untuk golongan R-3 (per kWh)
-        }
-        self.tarif_terpilih = 'R-1'  # Golongan R-1 sebagai default
+from powerwatch import instrumentasi
+from powerwatch.sesi import monitor_sesi
 
-    # 1.Peralatan Elektronik
-    def tambah_peralatan(self, nama, unit, watt, golongan, jam_per_hari):
-        """Menambahkan peralatan elektronik dan golongan listrik"""
-        self.peralatan.append({
-            'nama': nama,
-            'unit': unit,
-            'watt': watt,
-            'total_watt': watt * unit,
-            'golongan': golongan,
-            'jam_per_hari': jam_per_hari,
-        })
-        self.update_penggunaan_harian_dengan_peralatan_baru()
-
-    def update_penggunaan_harian_dengan_peralatan_baru(self):
-        """Mengupdate penggunaan harian dengan peralatan baru"""
-        if not self.penggunaan_harian:
-            self.generate_sample_data()
-        else:
-            new_usage = np.random.uniform(1, 5)
-            self.penggunaan_harian.append({
-                'hari': len(self.penggunaan_harian) + 1,
-                'penggunaan': new_usage
-            })
-
-    def set_tarif_listrik(self, golongan):
-        """Set golongan listrik yang dipilih"""
-        self.tarif_terpilih = golongan
-
-    # 2.Penggunaan Listrik
-    def hitung_total_penggunaan(self):
-        """Menghitung total penggunaan listrik dalam kWh per bulan"""
-        total_penggunaan_per_bulan = 0
-        for peralatan in self.peralatan:
-            total_penggunaan_per_bulan += (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30
-        return total_penggunaan_per_bulan
-
-    # 3.Estimasi Biaya
-    def hitung_estimasi_biaya(self):
-        """Menghitung estimasi biaya listrik"""
-        total_penggunaan_per_bulan = self.hitung_total_penggunaan()
-        tarif = self.tarif_listrik.get(self.tarif_terpilih, 1500)
-        return total_penggunaan_per_bulan * tarif
-
-    def generate_sample_data(self, hari=30):
-        """Menghasilkan data penggunaan listrik sampel"""
-        np.random.seed(42)
-        self.penggunaan_harian = []
-        for hari in range(1, hari + 1):
-            penggunaan = np.random.uniform(5, 15)
-            self.penggunaan_harian.append({
-                'hari': hari,
-                'penggunaan': penggunaan
-            })
-
-    def konsumsi_energi_per_peralatan(self):
-        """Menghitung konsumsi energi per peralatan"""
-        return [
-            {'peralatan': peralatan['nama'], 'konsumsi': (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30}
-            for peralatan in self.peralatan
-        ]
+# Jumlah peralatan dengan biaya terbesar yang digambar di grafik batang
+BATAS_GRAFIK = 20
 
 # Input data
 def main():
-    if 'monitor' not in st.session_state:
-        monitor = MonitorListrik()
-
-        # Menambahkan peralatan default
-        peralatan_default = [
-            ('TV 21 inci', 1, 68, 'R-1', 8),
-            ('Audio', 1, 50, 'R-1', 14),
-            ('AC', 1, 430, 'R-1', 8),
-            ('Komputer', 1, 140, 'R-1', 5),
-            ('Game Player', 1, 20, 'R-1', 5),
-            ('Lampu Bohlam', 3, 60, 'R-1', 8),
-            ('Lampu Hemat Listrik', 5, 12, 'R-1', 8),
-            ('Kipas Angin', 1, 103, 'R-1', 8),
-            ('Microwave', 1, 1270, 'R-1', 1),
-            ('Blender', 1, 130, 'R-1', 1.2),
-            ('Kompor Listrik', 1, 380, 'R-1', 4),
-            ('Magic jar', 1, 465, 'R-1', 9),
-            ('Kulkas 120 Liter', 1, 62, 'R-1', 24),
-            ('Setrika', 1, 300, 'R-1', 1),
-            ('Dispenser', 1, 256, 'R-1', 24),
-            ('Pemanggang Roti', 1, 380, 'R-1', 1),
-            ('Mesin Cuci', 1, 550, 'R-1', 4),
-            ('Pemanas Air', 1, 400, 'R-1', 2),
-            ('Pompa Air', 1, 650, 'R-1', 3)
-        ]
-
-        for nama, unit, watt, golongan, jam in peralatan_default:
-            monitor.tambah_peralatan(nama, unit, watt, golongan, jam)
-
-        st.session_state.monitor = monitor
-
-    monitor = st.session_state.monitor
+    monitor = monitor_sesi(st.session_state)
 
 # Pelajarin masing-masing 
 # (yang beda baris 111)
@@ -125,33 +25,69 @@ def main():
             value=f"Rp {total_biaya:,.2f}"
         )
 
-        data_peralatan = []
-        for peralatan in monitor.peralatan:
-            konsumsi = (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30
-            biaya_per_peralatan = konsumsi * monitor.tarif_listrik[peralatan['golongan']]
-            data_peralatan.append({
-                'Nama Peralatan': peralatan['nama'],
-                'Listrik Sebulan (kWh)': konsumsi,
-                'Biaya Listrik (Rp)': biaya_per_peralatan
+        def buat_tampilan():
+            hasil = monitor.kueri(kolom=('nama', 'kwh', 'biaya'))
+            data_peralatan = {
+                'Nama Peralatan': hasil['nama'],
+                'Listrik Sebulan (kWh)': hasil['kwh'],
+                'Biaya Listrik (Rp)': hasil['biaya']
+            }
+            peralatan_df = pd.DataFrame(data_peralatan)
+
+            # Grafik distribusi biaya listrik untuk peralatan termahal
+            teratas = monitor.kueri(kolom=('nama', 'biaya'), urut='biaya', menurun=True, batas=BATAS_GRAFIK)
+            fig = px.bar(
+                pd.DataFrame({'Nama Peralatan': teratas['nama'], 'Biaya Listrik (Rp)': teratas['biaya']}),
+                x='Nama Peralatan',
+                y='Biaya Listrik (Rp)',
+                title=f'Distribusi Biaya Listrik: {BATAS_GRAFIK} Peralatan Termahal',
+                color='Biaya Listrik (Rp)',
+                color_continuous_scale='Viridis'
+            )
+
+            # kWh dan biaya per golongan dari indeks grup golongan
+            per_golongan = monitor.kueri(grup='golongan', kolom=('jumlah', 'kwh', 'biaya'))
+            golongan_df = pd.DataFrame({
+                'Golongan Listrik': per_golongan['golongan'],
+                'Jumlah Peralatan': per_golongan['jumlah'],
+                'Listrik Sebulan (kWh)': per_golongan['kwh'],
+                'Biaya Listrik (Rp)': per_golongan['biaya'],
             })
+            return peralatan_df, fig, golongan_df
 
-        peralatan_df = pd.DataFrame(data_peralatan)
-        st.subheader("Rincian Biaya Listrik per Peralatan")
+        # DataFrame dan figure hanya dibangun ulang bila data/tarif berubah
+        peralatan_df, fig, golongan_df = monitor.memo_halaman('biaya', buat_tampilan)
+        st.subheader("Rincian Biaya Listrik per Golongan")
+        st.dataframe(golongan_df, hide_index=True)
 
-        # Grafik distribusi biaya listrik
-        fig = px.bar(
-            peralatan_df,
-            x='Nama Peralatan',
-            y='Biaya Listrik (Rp)',
-            title='Distribusi Biaya Listrik per Peralatan',
-            color='Biaya Listrik (Rp)',
-            color_continuous_scale='Viridis'
-        )
+        st.subheader("Rincian Biaya Listrik per Peralatan")
         st.plotly_chart(fig)
 
         # Kemudian tabel
         st.dataframe(peralatan_df)
 
+        # Prakiraan tagihan dari variasi pemakaian bulanan (Monte Carlo)
+        st.subheader("Prakiraan Tagihan Bulanan")
+        prakiraan = monitor.prakiraan_biaya()
+        col1, col2, col3 = st.columns(3)
+        col1.metric(label="P10 (hemat)", value=f"Rp {prakiraan['p10']:,.0f}")
+        col2.metric(label="P50 (median)", value=f"Rp {prakiraan['p50']:,.0f}")
+        col3.metric(label="P90 (boros)", value=f"Rp {prakiraan['p90']:,.0f}")
+
+        def buat_histogram():
+            fig = px.histogram(
+                x=prakiraan['tagihan'],
+                nbins=60,
+                title=f"Sebaran Tagihan dari {len(prakiraan['tagihan']):,} Bulan Simulasi",
+                labels={'x': 'Tagihan (Rp)'}
+            )
+            for p in ('p10', 'p50', 'p90'):
+                fig.add_vline(x=prakiraan[p], line_dash='dash', annotation_text=p.upper())
+            return fig
+
+        st.plotly_chart(monitor.memo_halaman('biaya_prakiraan', buat_histogram))
+
 # Menjalankan aplikasi
 if __name__ == "__main__":
-    main()
+    with instrumentasi.rerun('3. Estimasi Biaya Listrik.py'):
+        main()
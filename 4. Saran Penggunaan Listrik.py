@@ -1,116 +1,121 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
+import plotly.express as px
 
-# kelas monitor listrik
-class MonitorListrik:
-    def __init__(self):
-        """Inisialisasi kelas monitoring listrik"""
-        self.peralatan = []
-        self.penggunaan_harian = []
-        self.tarif_listrik = {
-            'R-1': 1444,  # Tarif untuk golongan R-1 (per kWh)
-            'R-2': 1699,  # Tarif untuk golongan R-2 (per kWh)
-            'R-3': 1699,  # Tarif untuk golongan R-3 (per kWh)
-        }
-        self.tarif_terpilih = 'R-1'  # Golongan R-1 sebagai default
-
-    # 1.Peralatan Elektronik
-    def tambah_peralatan(self, nama, unit, watt, golongan, jam_per_hari):
-        """Menambahkan peralatan elektronik dan golongan listrik"""
-        self.peralatan.append({
-            'nama': nama,
-            'unit': unit,
-            'watt': watt,
-            'total_watt': watt * unit,
-            'golongan': golongan,
-            'jam_per_hari': jam_per_hari,
-        })
-        self.update_penggunaan_harian_dengan_peralatan_baru()
-
-    def update_penggunaan_harian_dengan_peralatan_baru(self):
-        """Mengupdate penggunaan harian dengan peralatan baru"""
-        if not self.penggunaan_harian:
-            self.generate_sample_data()
-        else:
-            new_usage = np.random.uniform(1, 5)
-            self.penggunaan_harian.append({
-                'hari': len(self.penggunaan_harian) + 1,
-                'penggunaan': new_usage
-            })
-
-    def set_tarif_listrik(self, golongan):
-        """Set golongan listrik yang dipilih"""
-        self.tarif_terpilih = golongan
-
-    # 2.Penggunaan Listrik
-    def hitung_total_penggunaan(self):
-        """Menghitung total penggunaan listrik dalam kWh per bulan"""
-        total_penggunaan_per_bulan = 0
-        for peralatan in self.peralatan:
-            total_penggunaan_per_bulan += (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30
-        return total_penggunaan_per_bulan
-
-    # 3.Estimasi Biaya
-    def hitung_estimasi_biaya(self):
-        """Menghitung estimasi biaya listrik"""
-        total_penggunaan_per_bulan = self.hitung_total_penggunaan()
-        tarif = self.tarif_listrik.get(self.tarif_terpilih, 1500)
-        return total_penggunaan_per_bulan * tarif
-
-    def generate_sample_data(self, hari=30):
-        """Menghasilkan data penggunaan listrik sampel"""
-        np.random.seed(42)
-        self.penggunaan_harian = []
-        for hari in range(1, hari + 1):
-            penggunaan = np.random.uniform(5, 15)
-            self.penggunaan_harian.append({
-                'hari': hari,
-                'penggunaan': penggunaan
-            })
-
-    def konsumsi_energi_per_peralatan(self):
-        """Menghitung konsumsi energi per peralatan"""
-        return [
-            {'peralatan': peralatan['nama'], 'konsumsi': (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30}
-            for peralatan in self.peralatan
+from powerwatch import instrumentasi, saran, skenario
+from powerwatch.sesi import monitor_sesi
+
+# Skenario dengan penghematan terbesar yang ditampilkan di grafik perbandingan
+BATAS_GRAFIK_SKENARIO = 20
+# Label kolom editor skenario -> kolom perubahan (lihat skenario.KOLOM_PERUBAHAN)
+KOLOM_SKENARIO = {
+    'Daya Baru (Watt)': 'watt',
+    'Jam per Hari Baru': 'jam_per_hari',
+    'Jam Mulai Baru': 'jam_mulai',
+}
+# Baris awal editor; hanya yang peralatannya terdaftar yang ditampilkan
+SKENARIO_CONTOH = [
+    {'Skenario': 'Ganti Lampu Bohlam ke LED', 'Peralatan': 'Lampu Bohlam', 'Daya Baru (Watt)': 9},
+    {'Skenario': 'AC 6 jam', 'Peralatan': 'AC', 'Jam per Hari Baru': 6},
+    {'Skenario': 'Mesin Cuci di luar jam puncak', 'Peralatan': 'Mesin Cuci', 'Jam Mulai Baru': 23},
+    {'Skenario': 'Pemanas Air 1 jam', 'Peralatan': 'Pemanas Air', 'Jam per Hari Baru': 1},
+    {'Skenario': 'Hemat dapur', 'Peralatan': 'Kompor Listrik', 'Jam per Hari Baru': 1},
+    {'Skenario': 'Hemat dapur', 'Peralatan': 'Magic jar', 'Jam per Hari Baru': 4},
+]
+
+
+def skenario_dari_tabel(skenario_df):
+    """Baris editor (satu perubahan per baris) -> daftar skenario; baris bernama sama digabung"""
+    daftar = {}
+    for i, baris in enumerate(skenario_df.to_dict('records')):
+        perubahan = {kolom: float(baris[label]) for label, kolom in KOLOM_SKENARIO.items()
+                     if pd.notna(baris.get(label))}
+        if pd.isna(baris.get('Peralatan')) or not perubahan:
+            continue
+        perubahan['peralatan'] = baris['Peralatan']
+        nama = baris.get('Skenario')
+        nama = str(nama).strip() if pd.notna(nama) and str(nama).strip() else f'Skenario {i + 1}'
+        daftar.setdefault(nama, []).append(perubahan)
+    return [{'nama': nama, 'perubahan': perubahan} for nama, perubahan in daftar.items()]
+
+
+@st.fragment
+def simulasi_skenario(monitor, peralatan):
+    """Editor skenario what-if dan perbandingan penghematannya"""
+    st.subheader('Simulasi Skenario')
+    st.caption('Satu baris untuk satu perubahan; baris dengan nama skenario yang sama digabung. '
+               'Kolom yang dikosongkan tidak diubah.')
+    nama_peralatan = sorted(set(peralatan['nama'].tolist()))
+    skenario_df = st.data_editor(
+        pd.DataFrame([b for b in SKENARIO_CONTOH if b['Peralatan'] in nama_peralatan],
+                     columns=['Skenario', 'Peralatan', *KOLOM_SKENARIO]),
+        column_config={
+            'Peralatan': st.column_config.SelectboxColumn(options=nama_peralatan),
+            'Daya Baru (Watt)': st.column_config.NumberColumn(min_value=0.1),
+            'Jam per Hari Baru': st.column_config.NumberColumn(min_value=0.0, max_value=24.0),
+            'Jam Mulai Baru': st.column_config.NumberColumn(min_value=0.0, max_value=23.9),
+        },
+        num_rows='dynamic',
+        hide_index=True,
+        key=f'skenario_{monitor.versi}'
+    )
+    daftar_skenario = skenario_dari_tabel(skenario_df)
+    if st.checkbox('Tambahkan skenario otomatis: setiap peralatan dipakai 1 jam lebih singkat'):
+        daftar_skenario += [
+            {'nama': f'{nama} #{i + 1} 1 jam lebih singkat',
+             'perubahan': [{'indeks': i, 'jam_per_hari': max(jam - 1, 0.0)}]}
+            for i, (nama, jam) in enumerate(zip(peralatan['nama'].tolist(),
+                                                peralatan['jam_per_hari'].tolist()))
         ]
+    if not daftar_skenario:
+        st.info('Belum ada skenario; tambahkan baris perubahan di tabel.')
+        return
+
+    try:
+        hasil = monitor.evaluasi_skenario(daftar_skenario)
+    except ValueError as e:
+        st.error(f'Skenario tidak valid: {e}')
+        return
+
+    def buat_tampilan():
+        # Semua skenario terurut menurut penghematan biaya; grafik hanya yang teratas
+        urutan = skenario.peringkat(hasil)
+        hasil_df = pd.DataFrame({
+            'Skenario': hasil['nama'][urutan],
+            'Listrik (kWh/bulan)': hasil['kwh'][urutan],
+            'Tagihan (Rp/bulan)': hasil['biaya'][urutan],
+            'Penghematan (kWh)': hasil['penghematan_kwh'][urutan],
+            'Penghematan (Rp)': hasil['penghematan_biaya'][urutan],
+        })
+        fig = px.bar(
+            hasil_df.head(BATAS_GRAFIK_SKENARIO),
+            x='Penghematan (Rp)',
+            y='Skenario',
+            orientation='h',
+            title=f'Perbandingan Skenario: {BATAS_GRAFIK_SKENARIO} Penghematan Terbesar per Bulan',
+            color='Penghematan (kWh)',
+            color_continuous_scale='Viridis',
+            hover_data=['Tagihan (Rp/bulan)', 'Listrik (kWh/bulan)']
+        )
+        fig.update_yaxes(autorange='reversed')
+        return hasil_df, fig
+
+    hasil_df, fig = monitor.memo_halaman(
+        'skenario_tampilan', buat_tampilan, skenario.kunci_parameter(daftar_skenario)
+    )
+    terbaik = hasil_df.iloc[0]
+    st.metric(
+        label=f'Skenario Terbaik ({len(hasil_df):,} dievaluasi)',
+        value=terbaik['Skenario'],
+        delta=f"hemat {terbaik['Penghematan (kWh)']:.2f} kWh (Rp {terbaik['Penghematan (Rp)']:,.2f})"
+    )
+    st.plotly_chart(fig)
+    st.dataframe(hasil_df, hide_index=True)
 
 # Input data
 def main():
-    if 'monitor' not in st.session_state:
-        monitor = MonitorListrik()
-
-        # Menambahkan peralatan default
-        peralatan_default = [
-            ('TV 21 inci', 1, 68, 'R-1', 8),
-            ('Audio', 1, 50, 'R-1', 14),
-            ('AC', 1, 430, 'R-1', 8),
-            ('Komputer', 1, 140, 'R-1', 5),
-            ('Game Player', 1, 20, 'R-1', 5),
-            ('Lampu Bohlam', 3, 60, 'R-1', 8),
-            ('Lampu Hemat Listrik', 5, 12, 'R-1', 8),
-            ('Kipas Angin', 1, 103, 'R-1', 8),
-            ('Microwave', 1, 1270, 'R-1', 1),
-            ('Blender', 1, 130, 'R-1', 1.2),
-            ('Kompor Listrik', 1, 380, 'R-1', 4),
-            ('Magic jar', 1, 465, 'R-1', 9),
-            ('Kulkas 120 Liter', 1, 62, 'R-1', 24),
-            ('Setrika', 1, 300, 'R-1', 1),
-            ('Dispenser', 1, 256, 'R-1', 24),
-            ('Pemanggang Roti', 1, 380, 'R-1', 1),
-            ('Mesin Cuci', 1, 550, 'R-1', 4),
-            ('Pemanas Air', 1, 400, 'R-1', 2),
-            ('Pompa Air', 1, 650, 'R-1', 3)
-        ]
-
-        for nama, unit, watt, golongan, jam in peralatan_default:
-            monitor.tambah_peralatan(nama, unit, watt, golongan, jam)
-
-        st.session_state.monitor = monitor
-
-    monitor = st.session_state.monitor
+    monitor = monitor_sesi(st.session_state)
 
 # Pelajarin masing-masing 
 # (yang beda baris 111)
@@ -119,27 +124,92 @@ def main():
     if 'Saran Penggunaan':
         st.title('Saran Penggunaan Listrik')
 
-        col1, col2 = st.columns(2)
+        # Target penghematan dan batas jam per peralatan
+        pilihan_target = st.radio(
+            'Target',
+            ['Penghematan maksimal', 'Tagihan (Rp/bulan)', 'Energi (kWh/bulan)'],
+            horizontal=True
+        )
+        target_kwh = target_biaya = None
+        if pilihan_target == 'Tagihan (Rp/bulan)':
+            target_biaya = st.number_input(
+                'Target tagihan (Rp/bulan)', min_value=0.0, step=10000.0,
+                value=round(monitor.hitung_estimasi_biaya() * 0.8, -3)
+            )
+        elif pilihan_target == 'Energi (kWh/bulan)':
+            target_kwh = st.number_input(
+                'Target penggunaan (kWh/bulan)', min_value=0.0, step=10.0,
+                value=round(monitor.hitung_total_penggunaan() * 0.8, 1)
+            )
 
-        saran_penggunaan = []
-        total_penggunaan_saat_ini = 0
-        total_penggunaan_saran = 0
+        # Nama dan jam pakai per peralatan (urutan input)
+        peralatan = monitor.kueri(kolom=('nama', 'jam_per_hari'))
+        with st.expander('Jam minimum dan peralatan esensial'):
+            jam_saat_ini = peralatan['jam_per_hari']
+            batas_df = st.data_editor(
+                pd.DataFrame({
+                    'Nama Peralatan': peralatan['nama'],
+                    'Jam Saat Ini': jam_saat_ini,
+                    'Jam Minimum': np.minimum(jam_saat_ini, saran.JAM_MINIMUM_DEFAULT),
+                    'Esensial': saran.mask_esensial(monitor.peralatan),
+                }),
+                disabled=['Nama Peralatan', 'Jam Saat Ini'],
+                hide_index=True,
+                key=f'batas_saran_{monitor.versi}'
+            )
+        # Peralatan esensial tidak dikurangi: jam minimumnya sama dengan jam saat ini
+        jam_minimum = np.where(
+            batas_df['Esensial'].to_numpy(dtype=bool),
+            jam_saat_ini,
+            batas_df['Jam Minimum'].to_numpy(dtype=np.float64)
+        )
 
-        for peralatan in monitor.peralatan:
-            penggunaan_saat_ini = (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30
-            saran_jam = min(peralatan['jam_per_hari'], 4) if peralatan['nama'] not in ['Kulkas', 'Kamera Pengawas'] else peralatan['jam_per_hari']
-            penggunaan_saran_peralatan = (peralatan['total_watt'] / 1000) * saran_jam * 30
+        col1, col2 = st.columns(2)
 
-            saran_penggunaan.append({
+        def hitung_saran():
+            hasil = monitor.hitung_saran(
+                target_kwh=target_kwh, target_biaya=target_biaya,
+                jam_minimum=jam_minimum, esensial=()
+            )
+            penggunaan_saat_ini = hasil['kwh_saat_ini']
+            penggunaan_saran_peralatan = hasil['kwh_saran']
+
+            saran_penggunaan = {
                 'Nama Peralatan': peralatan['nama'],
-                'Penggunaan Saat Ini (Jam)': peralatan['jam_per_hari'],
-                'Saran Penggunaan (Jam)': saran_jam,
+                'Penggunaan Saat Ini (Jam)': hasil['jam_saat_ini'],
+                'Saran Penggunaan (Jam)': hasil['jam_saran'],
                 'Listrik Saat Ini (kWh)': penggunaan_saat_ini,
                 'Listrik Setelah Saran (kWh)': penggunaan_saran_peralatan
-            })
+            }
+
+            total_penggunaan_saat_ini = float(penggunaan_saat_ini.sum())
+            total_penggunaan_saran = float(penggunaan_saran_peralatan.sum())
 
-            total_penggunaan_saat_ini += penggunaan_saat_ini
-            total_penggunaan_saran += penggunaan_saran_peralatan
+            saran_df = pd.DataFrame(saran_penggunaan)
+
+            # Grafik perbandingan penggunaan listrik saat ini vs saran
+            fig = px.bar(
+                saran_df,
+                x='Nama Peralatan',
+                y=['Listrik Saat Ini (kWh)', 'Listrik Setelah Saran (kWh)'],
+                title='Perbandingan Penggunaan Listrik: Saat Ini vs Saran',
+                barmode='group'
+            )
+            # Selisih biaya dihitung lewat mesin tarif (blok, minimum, pajak ikut berlaku)
+            penghematan_biaya = hasil['biaya_saat_ini'] - hasil['biaya_saran']
+            return (total_penggunaan_saat_ini, total_penggunaan_saran, penghematan_biaya,
+                    hasil['tercapai'], saran_df, fig)
+
+        # Saran, DataFrame, dan figure hanya dihitung ulang bila data, tarif, atau target berubah
+        (total_penggunaan_saat_ini, total_penggunaan_saran, potensi_penghematan_biaya,
+         tercapai, saran_df, fig) = monitor.memo_halaman(
+            'saran', hitung_saran,
+            saran.kunci_parameter((target_kwh, target_biaya, jam_minimum))
+        )
+
+        if not tercapai:
+            st.warning('Target tidak tercapai dengan jam minimum saat ini; '
+                       'ditampilkan penghematan terbesar yang mungkin.')
 
         with col1:
             st.metric(
@@ -154,28 +224,21 @@ def main():
             )
 
         potensi_penghematan = total_penggunaan_saat_ini - total_penggunaan_saran
-        potensi_penghematan_biaya = potensi_penghematan * monitor.tarif_listrik[monitor.tarif_terpilih]
         
         st.metric(
             label="Potensi Penghematan per Bulan",
             value=f"{potensi_penghematan:.2f} kWh (Rp {potensi_penghematan_biaya:,.2f})"
         )
 
-        saran_df = pd.DataFrame(saran_penggunaan)
         st.subheader("Rincian Saran Penggunaan Listrik")
         
-        # Grafik perbandingan penggunaan listrik saat ini vs saran
-        fig = px.bar(
-            saran_df,
-            x='Nama Peralatan',
-            y=['Listrik Saat Ini (kWh)', 'Listrik Setelah Saran (kWh)'],
-            title='Perbandingan Penggunaan Listrik: Saat Ini vs Saran',
-            barmode='group'
-        )
         st.plotly_chart(fig)
         
         # Kemudian tabel
         st.dataframe(saran_df)
 
+        simulasi_skenario(monitor, peralatan)
+
 if __name__ == '__main__':
-    main()
+    with instrumentasi.rerun('4. Saran Penggunaan Listrik.py'):
+        main()
@@ -0,0 +1,85 @@
+import json
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from powerwatch import instrumentasi
+
+# Halaman diagnostik, dijalankan sendiri (`streamlit run _Diagnostik.py`); tidak ada
+# halaman lain yang menautkannya: rentang waktu, histogram latensi rerun, memori
+# per sesi, dan ekspor
+def main():
+    st.title('Diagnostik')
+
+    # Instrumentasi berlaku untuk seluruh proses (semua sesi), bukan per sesi.
+    # Toggle disamakan dengan status proses di setiap rerun dan hanya mengubahnya
+    # saat benar-benar diklik, sehingga toggle sesi lain yang basi tidak membaliknya.
+    st.session_state.instrumentasi_aktif = instrumentasi.aktif()
+    st.toggle(
+        'Instrumentasi aktif (global: seluruh proses, semua sesi)',
+        key='instrumentasi_aktif',
+        on_change=lambda: instrumentasi.aktifkan(st.session_state.instrumentasi_aktif),
+        help='Mengubah instrumentasi untuk semua pengguna proses ini. '
+             f'Set ${instrumentasi.VARIABEL_LINGKUNGAN}=1 agar aktif sejak proses dimulai'
+    )
+    if st.button('Reset statistik (global)', help='Menghapus statistik semua sesi di proses ini'):
+        instrumentasi.reset()
+
+    data = instrumentasi.ekspor_json()
+    if not data['rentang']:
+        st.info('Belum ada data. Aktifkan instrumentasi lalu buka halaman lain.')
+        return
+
+    # Rentang: total dan waktu sendiri (tanpa rentang anak) per jalur
+    rentang_df = pd.DataFrame([
+        {
+            'Rentang': jalur,
+            'Jumlah': s['jumlah'],
+            'Total (ms)': s['total'] * 1e3,
+            'Rata-rata (ms)': s['total'] / s['jumlah'] * 1e3,
+            'Sendiri (ms)': s['sendiri'] * 1e3,
+            'Maks (ms)': s['maks'] * 1e3,
+        }
+        for jalur, s in data['rentang'].items()
+    ]).sort_values('Total (ms)', ascending=False)
+    st.subheader('Rentang Waktu')
+    st.dataframe(rentang_df, hide_index=True)
+
+    # Histogram latensi rerun per halaman
+    label_ember = [f'<= {b * 1e3:g} ms' for b in data['batas_histogram']] + ['> 10 s']
+    rerun_df = pd.DataFrame([
+        {'Halaman': jalur.removeprefix('rerun:'), 'Latensi': label, 'Jumlah': jumlah}
+        for jalur, s in data['rentang'].items() if jalur.startswith('rerun:') and instrumentasi.PEMISAH not in jalur
+        for label, jumlah in zip(label_ember, s['ember'])
+    ])
+    if not rerun_df.empty:
+        st.subheader('Latensi Rerun')
+        st.plotly_chart(px.bar(
+            rerun_df, x='Latensi', y='Jumlah', color='Halaman', barmode='group',
+            title='Histogram Latensi Rerun per Halaman'
+        ))
+
+    # Gauge memori dan cache per sesi
+    gauge_df = pd.DataFrame([
+        {'Sesi': g['label'].get('sesi', ''), 'Gauge': g['nama'], 'Nilai': g['nilai']}
+        for g in data['gauge']
+    ])
+    if not gauge_df.empty:
+        st.subheader('Memori per Sesi')
+        st.dataframe(gauge_df.pivot(index='Sesi', columns='Gauge', values='Nilai'))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            'Unduh JSON', json.dumps(data, indent=2),
+            file_name='powerwatch_instrumentasi.json', mime='application/json'
+        )
+    with col2:
+        st.download_button(
+            'Unduh Prometheus', instrumentasi.ekspor_prometheus(),
+            file_name='powerwatch_instrumentasi.prom', mime='text/plain'
+        )
+
+if __name__ == '__main__':
+    main()
@@ -1,116 +1,134 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import numpy as np
+
+from powerwatch import instrumentasi, kueri
+from powerwatch.ingesti import PipaIngesti, SumberSimulator
+from powerwatch.sesi import monitor_sesi
 
 # Set halaman konfigurasi Streamlit
 st.set_page_config(page_title="Multipage App")
 
-# Kelas untuk monitoring listrik
-class MonitorListrik:
-    def __init__(self):
-        """Inisialisasi kelas monitoring listrik"""
-        self.peralatan = []
-        self.penggunaan_harian = []
-        self.tarif_listrik = {
-            'R-1': 1444,  # Tarif untuk golongan R-1 (per kWh)
-            'R-2': 1699,  # Tarif untuk golongan R-2 (per kWh)
-            'R-3': 1699,  # Tarif untuk golongan R-3 (per kWh)
-        }
-        self.tarif_terpilih = 'R-1'  # Golongan R-1 sebagai default
-
-    def tambah_peralatan(self, nama, unit, watt, golongan, jam_per_hari):
-        """Menambahkan peralatan elektronik dan golongan listrik"""
-        self.peralatan.append({
-            'nama': nama,
-            'unit': unit,
-            'watt': watt,
-            'total_watt': watt * unit,
-            'golongan': golongan,
-            'jam_per_hari': jam_per_hari,
+# Lebar area konten Streamlit (layout centered) dalam piksel; grafik
+# deret waktu di-downsample ke jumlah titik sebanyak ini
+LEBAR_GRAFIK_PX = 700
+# Interval (detik) pembaruan grafik selama ingesti meter aktif
+INTERVAL_PEMBARUAN = 2
+# Irisan grafik konsumsi; peralatan di luar irisan terbesar digabung menjadi "Lainnya"
+MAKS_IRISAN_PIE = 20
+# Label legenda untuk setiap jenis tanda anomali
+LABEL_ANOMALI = {
+    'lonjakan': 'Lonjakan',
+    'drift': 'Drift',
+    'beban_dasar': 'Beban dasar selalu menyala',
+}
+
+
+def kelola_ingesti(monitor, aktif):
+    """Menyalakan atau mematikan ingesti simulator di latar belakang"""
+    ingesti = st.session_state.get('ingesti')
+    if aktif and (ingesti is None or not ingesti.aktif()):
+        sumber = SumberSimulator(
+            laju=1_000, ukuran_batch=500, rata_kwh=0.01,
+            mulai=monitor.penggunaan_harian.waktu_terakhir()
+        )
+        st.session_state.ingesti = PipaIngesti(monitor.penggunaan_harian, sumber).jalankan_di_latar()
+    elif not aktif and ingesti is not None:
+        ingesti.hentikan()
+        del st.session_state.ingesti
+
+
+@instrumentasi.diukur('dashboard:grafik_penggunaan_harian')
+def grafik_penggunaan_harian(monitor):
+    """Grafik penggunaan harian (di-downsample sesuai lebar grafik)"""
+    deret = monitor.penggunaan_harian
+    awal = akhir = None
+    if len(deret) > 1 and deret.waktu()[0] < deret.waktu()[-1]:
+        # Mempersempit rentang mengambil ulang detail dari data asli
+        waktu_min = deret.waktu()[0].item()
+        waktu_maks = deret.waktu()[-1].item()
+        awal, akhir = st.slider(
+            'Rentang waktu',
+            min_value=waktu_min,
+            max_value=waktu_maks,
+            value=(waktu_min, waktu_maks)
+        )
+    metode = st.radio('Metode downsampling', ['lttb', 'minmax'], horizontal=True)
+    waktu, penggunaan = deret.sampel(awal, akhir, LEBAR_GRAFIK_PX, metode)
+    penggunaan_df = pd.DataFrame({'waktu': waktu, 'penggunaan': penggunaan})
+    fig_line = px.line(
+        penggunaan_df,
+        x='waktu',
+        y='penggunaan',
+        title='Penggunaan Listrik Harian'
+    )
+    # Titik yang ditandai detektor anomali daring (nilai asli, bukan hasil downsampling)
+    tanda = monitor.detektor_anomali().tanda(awal, akhir)
+    for jenis, label in LABEL_ANOMALI.items():
+        pilih = tanda['jenis'] == jenis
+        if pilih.any():
+            fig_line.add_scatter(
+                x=tanda['waktu'][pilih], y=tanda['kwh'][pilih],
+                mode='markers', name=label, marker={'size': 9}
+            )
+    st.plotly_chart(fig_line)
+
+
+@instrumentasi.diukur('dashboard:grafik_beban_puncak')
+def grafik_beban_puncak(monitor):
+    """Profil beban harian per golongan beserta batas kapasitas VA"""
+    def buat_tampilan():
+        profil = monitor.simulasi_beban()
+        menit = profil.menit()
+        beban_df = pd.DataFrame({
+            'jam': np.tile(menit / 60, len(profil.golongan)),
+            'beban (VA)': profil.beban_va.ravel(),
+            'golongan': np.repeat(profil.golongan, len(menit)),
         })
-        self.update_penggunaan_harian_dengan_peralatan_baru()
-
-    def update_penggunaan_harian_dengan_peralatan_baru(self):
-        """Mengupdate penggunaan harian dengan peralatan baru"""
-        if not self.penggunaan_harian:
-            self.generate_sample_data()
-        else:
-            new_usage = np.random.uniform(1, 5)
-            self.penggunaan_harian.append({
-                'hari': len(self.penggunaan_harian) + 1,
-                'penggunaan': new_usage
-            })
-
-    def set_tarif_listrik(self, golongan):
-        """Set golongan listrik yang dipilih"""
-        self.tarif_terpilih = golongan
-
-    def hitung_total_penggunaan(self):
-        """Menghitung total penggunaan listrik dalam kWh per bulan"""
-        total_penggunaan_per_bulan = 0
-        for peralatan in self.peralatan:
-            total_penggunaan_per_bulan += (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30
-        return total_penggunaan_per_bulan
-
-    def hitung_estimasi_biaya(self):
-        """Menghitung estimasi biaya listrik"""
-        total_penggunaan_per_bulan = self.hitung_total_penggunaan()
-        tarif = self.tarif_listrik.get(self.tarif_terpilih, 1500)
-        return total_penggunaan_per_bulan * tarif
-
-    def generate_sample_data(self, hari=30):
-        """Menghasilkan data penggunaan listrik sampel"""
-        np.random.seed(42)
-        self.penggunaan_harian = []
-        for hari in range(1, hari + 1):
-            penggunaan = np.random.uniform(5, 15)
-            self.penggunaan_harian.append({
-                'hari': hari,
-                'penggunaan': penggunaan
-            })
-
-    def konsumsi_energi_per_peralatan(self):
-        """Menghitung konsumsi energi per peralatan"""
-        return [
-            {'peralatan': peralatan['nama'], 'konsumsi': (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * 30}
-            for peralatan in self.peralatan
-        ]
+        fig = px.line(
+            beban_df,
+            x='jam',
+            y='beban (VA)',
+            color='golongan',
+            title='Profil Beban Harian'
+        )
+        for g, kapasitas in zip(profil.golongan, profil.kapasitas_va):
+            if np.isfinite(kapasitas):
+                fig.add_hline(
+                    y=kapasitas, line_dash='dash',
+                    annotation_text=f'Kapasitas {g} ({kapasitas:,.0f} VA)'
+                )
+        return profil, fig
+
+    # Simulasi dan figure hanya dihitung ulang bila data peralatan berubah
+    profil, fig = monitor.memo_halaman('beban', buat_tampilan)
+    if not profil.golongan:
+        return
+    i = int(np.argmax(profil.puncak_va))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        menit_puncak = profil.menit_puncak[i]
+        st.metric(
+            label=f"Beban Puncak {profil.golongan[i]} (VA)",
+            value=f"{profil.puncak_va[i]:,.0f}",
+            help=f"Pukul {menit_puncak // 60:02d}.{menit_puncak % 60:02d}"
+        )
+    with col2:
+        st.metric(
+            label="Faktor Kebersamaan",
+            value=f"{profil.faktor_kebersamaan[i]:.2f}"
+        )
+    with col3:
+        st.metric(
+            label="Di Atas Kapasitas (menit/hari)",
+            value=int(profil.menit_lebih.sum())
+        )
+    st.plotly_chart(fig)
 
 
 def main():
-    if 'monitor' not in st.session_state:
-        monitor = MonitorListrik()
-        
-        # Menambahkan peralatan default
-        peralatan_default = [
-            ('TV 21 inci', 1, 68, 'R-1', 8),
-            ('Audio', 1, 50, 'R-1', 14),
-            ('AC', 1, 430, 'R-1', 8),
-            ('Komputer', 1, 140, 'R-1', 5),
-            ('Game Player', 1, 20, 'R-1', 5),
-            ('Lampu Bohlam', 3, 60, 'R-1', 8),
-            ('Lampu Hemat Listrik', 5, 12, 'R-1', 8),
-            ('Kipas Angin', 1, 103, 'R-1', 8),
-            ('Microwave', 1, 1270, 'R-1', 1),
-            ('Blender', 1, 130, 'R-1', 1.2),
-            ('Kompor Listrik', 1, 380, 'R-1', 4),
-            ('Magic jar', 1, 465, 'R-1', 9),
-            ('Kulkas 120 Liter', 1, 62, 'R-1', 24),
-            ('Setrika', 1, 300, 'R-1', 1),
-            ('Dispenser', 1, 256, 'R-1', 24),
-            ('Pemanggang Roti', 1, 380, 'R-1', 1),
-            ('Mesin Cuci', 1, 550, 'R-1', 4),
-            ('Pemanas Air', 1, 400, 'R-1', 2),
-            ('Pompa Air', 1, 650, 'R-1', 3)
-        ]
-        
-        for nama, unit, watt, golongan, jam in peralatan_default:
-            monitor.tambah_peralatan(nama, unit, watt, golongan, jam)
-            
-        st.session_state.monitor = monitor
-    else:
-        monitor = st.session_state.monitor
+    monitor = monitor_sesi(st.session_state)
 
     if 'Dashboard':
         st.title('Dashboard Penggunaan Listrik')
@@ -126,7 +144,7 @@ def main():
         with col2:
             st.metric(
                 label="Jumlah Peralatan",
-                value=len(monitor.peralatan)
+                value=monitor.jumlah_peralatan()
             )
             
         with col3:
@@ -135,26 +153,33 @@ def main():
                 value=f"{monitor.hitung_estimasi_biaya():,.2f}"
             )
         
-        # Grafik penggunaan harian
-        penggunaan_df = pd.DataFrame(monitor.penggunaan_harian)
-        fig_line = px.line(
-            penggunaan_df,
-            x='hari',
-            y='penggunaan',
-            title='Penggunaan Listrik Harian'
-        )
-        st.plotly_chart(fig_line)
+        # Ingesti meter langsung: grafik diperbarui tanpa memuat ulang halaman
+        with st.sidebar:
+            ingesti_aktif = st.toggle('Ingesti meter langsung (simulator)')
+        kelola_ingesti(monitor, ingesti_aktif)
+        st.fragment(run_every=INTERVAL_PEMBARUAN if ingesti_aktif else None)(
+            grafik_penggunaan_harian
+        )(monitor)
         
         # Grafik konsumsi per peralatan
-        konsumsi_peralatan = monitor.konsumsi_energi_per_peralatan()
-        peralatan_df = pd.DataFrame(konsumsi_peralatan)
-        fig_pie = px.pie(
-            peralatan_df,
-            values='konsumsi',
-            names='peralatan',
-            title='Distribusi Konsumsi Energi per Peralatan'
-        )
+        def buat_grafik_konsumsi():
+            # kWh per nama peralatan dari indeks grup
+            nama, konsumsi = kueri.teratas_dengan_lainnya(monitor, 'nama', 'kwh', MAKS_IRISAN_PIE)
+            peralatan_df = pd.DataFrame({'peralatan': nama, 'konsumsi': konsumsi})
+            return px.pie(
+                peralatan_df,
+                values='konsumsi',
+                names='peralatan',
+                title='Distribusi Konsumsi Energi per Peralatan'
+            )
+
+        # Figure hanya dibangun ulang bila data peralatan berubah
+        fig_pie = monitor.memo_halaman('dashboard', buat_grafik_konsumsi)
         st.plotly_chart(fig_pie)
 
+        # Beban puncak dan kapasitas daya tersambung
+        grafik_beban_puncak(monitor)
+
 if __name__ == '__main__':
-    main()
+    with instrumentasi.rerun('app.py'):
+        main()
@@ -0,0 +1,49 @@
+"""Biaya per bacaan detektor anomali saat riwayat bertambah
+
+Mengalirkan data menit selama dua tahun (sekitar 1 juta bacaan) ke
+DeretWaktu yang dipasangi DetektorAnomali dalam batch 500 bacaan, lalu
+membandingkan biaya per bacaan di awal dan di akhir. Keduanya harus setara
+(O(1) per bacaan, tidak bergantung panjang riwayat).
+
+    python benchmarks/anomali.py [tahun]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch.anomali import DetektorAnomali  # noqa: E402
+from powerwatch.deret_waktu import DeretWaktu  # noqa: E402
+
+UKURAN_BATCH = 500
+BLOK_UKUR = 100_000
+
+
+def main():
+    tahun = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    n = int(tahun * 365 * 1440)
+    rng = np.random.default_rng(0)
+    waktu = np.datetime64('2024-01-01T00:00:00') + np.arange(n) * np.timedelta64(60, 's')
+    jam = (np.arange(n) % 1440) / 60
+    kwh = 0.005 + 0.02 * ((jam >= 17) & (jam < 22)) + rng.gamma(4, 0.001, n)
+
+    deret = DeretWaktu()
+    detektor = DetektorAnomali().pasang(deret)
+    per_blok = []
+    for awal_blok in range(0, n, BLOK_UKUR):
+        mulai = time.perf_counter()
+        for i in range(awal_blok, min(awal_blok + BLOK_UKUR, n), UKURAN_BATCH):
+            deret.tambah_batch(waktu[i:i + UKURAN_BATCH], kwh[i:i + UKURAN_BATCH])
+        per_blok.append((time.perf_counter() - mulai) / (min(awal_blok + BLOK_UKUR, n) - awal_blok))
+
+    print(f'{n:,} bacaan menit ({tahun:g} tahun)')
+    print(f'blok pertama : {per_blok[0] * 1e6:6.2f} us/bacaan')
+    print(f'blok terakhir: {per_blok[-1] * 1e6:6.2f} us/bacaan')
+    print('tanda        :', detektor.ringkasan())
+
+
+if __name__ == '__main__':
+    main()
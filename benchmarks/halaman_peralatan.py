@@ -0,0 +1,56 @@
+"""Benchmark halaman Peralatan Elektronik dengan inventaris besar
+
+Menggambar halaman dengan 50.000 peralatan, lalu mengukur interaksi yang
+umum: berpindah halaman tabel, mengurutkan, menyaring, dan menambah satu
+peralatan lewat formulir. Tabel hanya mengirim satu halaman ke browser,
+sehingga setiap interaksi diharapkan < 1 detik.
+
+    python benchmarks/halaman_peralatan.py [jumlah_peralatan]
+"""
+import os
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.saran import buat_monitor  # noqa: E402
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HALAMAN = os.path.join(AKAR, '1. Peralatan Elektronik.py')
+
+
+def ukur(nama, fungsi):
+    mulai = time.perf_counter()
+    at = fungsi()
+    durasi = time.perf_counter() - mulai
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    print(f'{nama:<28} {durasi * 1000:9.1f} ms')
+    return at
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    at = AppTest.from_file(HALAMAN, default_timeout=120)
+    at.session_state.monitor = buat_monitor(n)
+    print(f'{n:,} peralatan')
+
+    ukur('gambar pertama', at.run)
+    ukur('gambar ulang', at.run)
+    halaman = [w for w in at.number_input if w.label == 'Halaman'][0]
+    ukur('pindah halaman', halaman.set_value(3).run)
+    ukur('urutkan total daya', lambda: at.selectbox[0].set_value('Total Daya (Watt)').run())
+    ukur('saring nama', lambda: at.text_input[0].set_value('Peralatan 12').run())
+    at.text_input[0].set_value('').run()
+
+    formulir = {w.label: w for w in at.number_input}
+    [w for w in at.text_input if w.label == 'Nama Peralatan'][0].set_value('Radio')
+    formulir['Daya per Unit (Watt)'].set_value(25)
+    at = ukur('tambah peralatan', at.button[0].click().run)
+    print('jumlah setelah tambah:', len(at.session_state.monitor.peralatan))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Mengukur waktu impor CLI dengan `python -X importtime`
+
+Membandingkan biaya impor `python -m powerwatch` dengan `import streamlit`
+(biaya awal setiap halaman), dan memastikan CLI tidak memuat pandas,
+Plotly, atau Streamlit. Keluar dengan kode 1 bila salah satu syarat gagal.
+
+    python benchmarks/importtime.py
+"""
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RASIO_MAKS = 0.5  # CLI harus jauh di bawah biaya impor Streamlit
+MODUL_TERLARANG = ('pandas', 'plotly', 'streamlit', 'pyarrow')
+PENGULANGAN = 5
+
+
+def ukur_impor(argumen):
+    """Total waktu impor (mikrodetik) dan nama modul yang dimuat"""
+    hasil = subprocess.run(
+        [sys.executable, '-X', 'importtime', *argumen],
+        cwd=AKAR, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    modul = set()
+    for baris in hasil.stderr.splitlines():
+        if not baris.startswith('import time:') or 'cumulative' in baris:
+            continue
+        _, kumulatif, nama = baris[len('import time:'):].split('|')
+        modul.add(nama.strip())
+        # Hanya modul tingkat atas; anak-anaknya sudah termasuk dalam kumulatif
+        if not nama[1:].startswith(' '):
+            total += int(kumulatif)
+    return total, modul
+
+
+def terbaik(argumen):
+    """Hasil tercepat dari beberapa pengulangan (mengurangi derau)"""
+    hasil = [ukur_impor(argumen) for _ in range(PENGULANGAN)]
+    return min(hasil, key=lambda h: h[0])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as direktori:
+        berkas = os.path.join(direktori, 'inventaris.csv')
+        with open(berkas, 'w', newline='') as f:
+            penulis = csv.writer(f)
+            penulis.writerow(['nama', 'unit', 'watt', 'golongan', 'jam_per_hari'])
+            penulis.writerow(['Kulkas', 1, 150, 'R-1', 24])
+
+        waktu_cli, modul_cli = terbaik(['-m', 'powerwatch', berkas])
+    waktu_st, _ = terbaik(['-c', 'import streamlit'])
+
+    print(f'python -m powerwatch : {waktu_cli / 1000:8.1f} ms')
+    print(f'import streamlit     : {waktu_st / 1000:8.1f} ms')
+    print(f'rasio                : {waktu_cli / waktu_st:8.2f} (maks {RASIO_MAKS})')
+
+    gagal = False
+    terlarang = sorted(
+        m for m in modul_cli if m.split('.')[0] in MODUL_TERLARANG
+    )
+    if terlarang:
+        print(f"GAGAL: CLI memuat {', '.join(terlarang[:5])}")
+        gagal = True
+    if waktu_cli > RASIO_MAKS * waktu_st:
+        print('GAGAL: waktu impor CLI melebihi batas')
+        gagal = True
+    return 1 if gagal else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
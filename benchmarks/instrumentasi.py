@@ -0,0 +1,44 @@
+"""Biaya instrumentasi saat nonaktif dan aktif
+
+Membandingkan panggilan MonitorListrik yang didekorasi dengan fungsi aslinya
+(__wrapped__) untuk operasi O(1) (hitung_total_penggunaan), di mana biaya
+tambahan paling terlihat, dan operasi O(n) (hitung_biaya_per_peralatan).
+
+    python benchmarks/instrumentasi.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch import MonitorListrik, instrumentasi  # noqa: E402
+from powerwatch.katalog_default import katalog_default  # noqa: E402
+
+PANGGILAN = 200_000
+
+
+def ukur(fungsi, jumlah):
+    """Waktu per panggilan (mikrodetik), terbaik dari lima"""
+    return min(timeit.repeat(fungsi, number=jumlah, repeat=5)) / jumlah * 1e6
+
+
+def main():
+    monitor = MonitorListrik.dari_katalog(katalog_default())
+    for nama, jumlah in (('hitung_total_penggunaan', PANGGILAN), ('hitung_biaya_per_peralatan', 5_000)):
+        terdekorasi = getattr(monitor, nama)
+        asli = getattr(MonitorListrik, nama).__wrapped__.__get__(monitor)
+        instrumentasi.aktifkan(False)
+        tanpa = ukur(asli, jumlah)
+        nonaktif = ukur(terdekorasi, jumlah)
+        instrumentasi.aktifkan(True)
+        aktif = ukur(terdekorasi, jumlah)
+        instrumentasi.aktifkan(False)
+        print(f'{nama}')
+        print(f'  tanpa dekorator : {tanpa:8.3f} us')
+        print(f'  nonaktif        : {nonaktif:8.3f} us (+{nonaktif - tanpa:.3f} us)')
+        print(f'  aktif           : {aktif:8.3f} us (+{aktif - tanpa:.3f} us)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark API kueri MonitorListrik untuk inventaris besar
+
+Untuk 1.000.000 peralatan mengukur: membangun indeks grup, agregasi kWh dan
+biaya per golongan (jumlah berjalan indeks) dibanding bincount penuh, top-20
+konsumen dengan argpartition dibanding argsort penuh, saringan golongan lewat
+indeks dibanding mask penuh, saringan jam > 8, serta pemeliharaan indeks saat
+menambah, mengubah, dan menghapus satu peralatan dibanding membangun ulang.
+
+    python benchmarks/kueri.py [jumlah_peralatan]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.saran import buat_monitor  # noqa: E402
+from powerwatch import HARI_PER_BULAN  # noqa: E402
+from powerwatch.kueri import IndeksGrup  # noqa: E402
+
+PENGULANGAN = 5
+
+
+def ukur(nama, fungsi):
+    """Waktu terbaik dari beberapa pengulangan"""
+    terbaik = float('inf')
+    for _ in range(PENGULANGAN):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    print(f'  {nama:<40} {terbaik * 1000:9.2f} ms')
+    return hasil
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    monitor = buat_monitor(n)
+    tabel = monitor.peralatan
+    print(f'{n:,} peralatan')
+
+    ukur('bangun indeks golongan', lambda: IndeksGrup(tabel, 'golongan', HARI_PER_BULAN))
+    ukur('bangun indeks nama', lambda: IndeksGrup(tabel, 'nama', HARI_PER_BULAN))
+    monitor.indeks_grup('golongan')
+    monitor.indeks_grup('nama')
+
+    print('agregasi kWh per golongan')
+    hasil = ukur('kueri (jumlah berjalan indeks)',
+                 lambda: monitor.kueri(grup='golongan', kolom=('jumlah', 'kwh')))
+    acuan = ukur('bincount penuh', lambda: np.bincount(
+        tabel.kolom('golongan'), weights=tabel.kwh_per_bulan(HARI_PER_BULAN)))
+    assert np.allclose(hasil['kwh'], acuan[acuan > 0])
+    monitor.kueri(grup='golongan', kolom=('kwh', 'biaya'))
+    ukur('kueri kWh dan biaya (biaya di-cache)',
+         lambda: monitor.kueri(grup='golongan', kolom=('kwh', 'biaya')))
+
+    print('top-20 konsumen kWh')
+    hasil = ukur('kueri (argpartition)',
+                 lambda: monitor.kueri(kolom=('nama', 'kwh'), urut='kwh', menurun=True, batas=20))
+    acuan = ukur('argsort penuh', lambda: np.argsort(
+        -tabel.kwh_per_bulan(HARI_PER_BULAN), kind='stable')[:20])
+    assert np.array_equal(hasil['indeks'], acuan)
+
+    print('saringan')
+    hasil = ukur('golongan R-2 (indeks grup)',
+                 lambda: monitor.kueri({'golongan': 'R-2'}, kolom=()))
+    acuan = ukur('golongan R-2 (mask penuh)',
+                 lambda: np.flatnonzero(tabel.golongan_dalam(['R-2'])))
+    assert np.array_equal(hasil['indeks'], acuan)
+    ukur('jam_per_hari > 8', lambda: monitor.kueri({'jam_per_hari': ('>', 8)}, kolom=()))
+    ukur('R-2 dan jam > 8, 20 teratas kWh', lambda: monitor.kueri(
+        {'golongan': 'R-2', 'jam_per_hari': ('>', 8)}, kolom=('nama', 'kwh'),
+        urut='kwh', menurun=True, batas=20))
+
+    print('pemeliharaan indeks (kedua indeks)')
+    mulai = time.perf_counter()
+    monitor.tambah_peralatan('Radio', 1, 25, 'R-2', 3)
+    monitor.ubah_peralatan(n // 2, golongan='R-3', jam_per_hari=9)
+    monitor.hapus_peralatan(0)
+    print(f'  {"tambah + ubah + hapus satu peralatan":<40} '
+          f'{(time.perf_counter() - mulai) * 1000:9.2f} ms')
+    for indeks in monitor._indeks_grup.values():
+        indeks.verifikasi(monitor.peralatan)
+
+
+if __name__ == '__main__':
+    main()
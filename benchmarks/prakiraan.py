@@ -0,0 +1,40 @@
+"""Benchmark prakiraan tagihan Monte Carlo
+
+Mensimulasikan 10.000 bulan untuk inventaris 5.000 peralatan (50 juta
+peralatan-bulan) dengan tarif blok, waktu pemakaian, minimum, dan pajak,
+sekali berurutan dan sekali dibagi ke beberapa proses. Hasil keduanya harus
+identik karena benih chunk diturunkan dari generator yang sama.
+
+    python benchmarks/prakiraan.py [jumlah_proses]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saran import buat_monitor  # noqa: E402
+
+JUMLAH_PERALATAN = 5_000
+JUMLAH_SIMULASI = 10_000
+
+
+def main():
+    jumlah_proses = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    hasil = []
+    for proses in (1, jumlah_proses):
+        monitor = buat_monitor(JUMLAH_PERALATAN)
+        monitor.rng = np.random.default_rng(0)
+        mulai = time.perf_counter()
+        prakiraan = monitor.prakiraan_biaya(JUMLAH_SIMULASI, jumlah_proses=proses)
+        detik = time.perf_counter() - mulai
+        hasil.append(prakiraan['tagihan'])
+        print(f'{proses} proses: {detik:8.3f} s  '
+              f"P10 {prakiraan['p10']:,.0f}  P50 {prakiraan['p50']:,.0f}  P90 {prakiraan['p90']:,.0f}")
+    print('hasil identik:', np.array_equal(hasil[0], hasil[-1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark mesin saran untuk inventaris besar
+
+Menyelesaikan saran dengan target kWh (greedy langsung) dan target tagihan
+(greedy + regula falsi atas tagihan sebenarnya) untuk 5.000 dan 100.000
+peralatan, dengan tarif blok, waktu pemakaian, biaya minimum, dan pajak.
+Batas yang diharapkan < 1 detik per solusi untuk 5.000 peralatan.
+
+    python benchmarks/saran.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch import MonitorListrik  # noqa: E402
+
+TARIF = {
+    'R-1': {'harga': 1444, 'blok': [(900, 1600)], 'minimum': 40000, 'pajak': 0.03},
+    'R-2': {'harga': 1699, 'waktu': [(17, 22, 2200)], 'pajak': 0.03},
+    'R-3': 1699,
+}
+
+
+def buat_monitor(n, seed=0):
+    rng = np.random.default_rng(seed)
+    monitor = MonitorListrik()
+    monitor.tarif_listrik = TARIF
+    monitor.tambah_peralatan_batch({
+        'nama': np.char.add('Peralatan ', (np.arange(n) % 500).astype(str)),
+        'unit': rng.integers(1, 4, n),
+        'watt': rng.uniform(5, 1500, n).round(),
+        'golongan': rng.choice(['R-1', 'R-2', 'R-3'], n),
+        'jam_per_hari': rng.uniform(0.5, 24, n).round(1),
+        'jam_mulai': rng.integers(0, 24, n).astype(float),
+    })
+    return monitor
+
+
+def ukur(fungsi):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    return time.perf_counter() - mulai, hasil
+
+
+def main():
+    for n in (5_000, 100_000):
+        monitor = buat_monitor(n)
+        biaya = monitor.hitung_estimasi_biaya()
+        kwh = monitor.hitung_total_penggunaan()
+        print(f'{n:,} peralatan')
+        detik, hasil = ukur(lambda: monitor.hitung_saran(target_kwh=kwh * 0.8))
+        print(f'  target kWh     : {detik:8.3f} s  tercapai={hasil["tercapai"]}')
+        detik, hasil = ukur(lambda: monitor.hitung_saran(target_biaya=biaya * 0.8))
+        print(f'  target tagihan : {detik:8.3f} s  tercapai={hasil["tercapai"]}')
+        detik, _ = ukur(lambda: monitor.hitung_saran(target_biaya=biaya * 0.8))
+        print(f'  dari cache     : {detik:8.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Uji beban server HTTP/JSON PowerWatch di localhost
+
+Menjalankan `python -m powerwatch.server` sebagai proses terpisah (satu
+core), lalu beberapa proses klien asyncio membuka koneksi keep-alive dan
+mengirim permintaan secara pipelining. Campuran permintaan: ringkasan,
+konsumsi teratas, biaya, halaman daftar peralatan, dan sebagian kecil
+perubahan (PATCH) yang menaikkan versi inventaris dan membuang cache.
+Mencetak permintaan per detik dan latensi per putaran pipelining.
+
+    python benchmarks/server.py [--peralatan N] [--durasi 5] [--koneksi 32]
+                                [--kedalaman 8] [--proses 2] [--rasio-ubah 0.01]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import sintetis  # noqa: E402
+
+GET = (
+    '/ringkasan',
+    '/konsumsi?batas=20',
+    '/konsumsi?grup=golongan',
+    '/biaya?batas=20',
+    '/peralatan?batas=25&urut=kwh&menurun=1',
+    '/saran',
+)
+
+
+def _permintaan(metode, path, body=None):
+    data = b'' if body is None else json.dumps(body).encode()
+    kepala = f'{metode} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n'
+    return kepala.encode() + data
+
+
+async def _baca_respons(reader):
+    kepala = await reader.readuntil(b'\r\n\r\n')
+    status = int(kepala[9:12])
+    awal = kepala.lower().find(b'content-length:') + len(b'content-length:')
+    panjang = int(kepala[awal:kepala.find(b'\r\n', awal)])
+    await reader.readexactly(panjang)
+    return status
+
+
+async def _klien(host, port, akhir, kedalaman, rasio_ubah, jumlah_peralatan, rng, hasil):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < akhir:
+            paket = []
+            for _ in range(kedalaman):
+                if rng.random() < rasio_ubah:
+                    indeks = int(rng.integers(jumlah_peralatan))
+                    jam = round(float(rng.uniform(1, 12)), 1)
+                    paket.append(_permintaan('PATCH', f'/peralatan/{indeks}', {'jam_per_hari': jam}))
+                else:
+                    paket.append(_permintaan('GET', GET[int(rng.integers(len(GET)))]))
+            mulai = time.perf_counter()
+            writer.write(b''.join(paket))
+            for _ in paket:
+                status = await _baca_respons(reader)
+                if status >= 400:
+                    hasil['galat'] += 1
+            hasil['latensi'].append(time.perf_counter() - mulai)
+            hasil['jumlah'] += len(paket)
+    finally:
+        writer.close()
+
+
+def _proses_klien(argumen):
+    host, port, durasi, koneksi, kedalaman, rasio_ubah, jumlah_peralatan, seed = argumen
+
+    async def jalankan():
+        hasil = {'jumlah': 0, 'galat': 0, 'latensi': []}
+        akhir = time.perf_counter() + durasi
+        rng = np.random.default_rng(seed)
+        await asyncio.gather(*(
+            _klien(host, port, akhir, kedalaman, rasio_ubah, jumlah_peralatan, rng, hasil)
+            for _ in range(koneksi)
+        ))
+        return hasil
+
+    return asyncio.run(jalankan())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--peralatan', type=int, default=1_000)
+    parser.add_argument('--durasi', type=float, default=5.0)
+    parser.add_argument('--koneksi', type=int, default=32, help='Koneksi per proses klien')
+    parser.add_argument('--kedalaman', type=int, default=8, help='Permintaan per putaran pipelining')
+    parser.add_argument('--proses', type=int, default=2, help='Jumlah proses klien')
+    parser.add_argument('--rasio-ubah', type=float, default=0.01,
+                        help='Porsi permintaan PATCH (menaikkan versi inventaris)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as direktori:
+        inventaris = os.path.join(direktori, 'inventaris.csv')
+        with open(inventaris, 'w', encoding='utf-8') as f:
+            sintetis.tulis_csv_inventaris(f, sintetis.buat_inventaris(args.peralatan, 0))
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'powerwatch.server', inventaris, '--port', '0'],
+            cwd=AKAR, stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            alamat = server.stdout.readline().rsplit('//', 1)[1].strip()
+            host, port = alamat.rsplit(':', 1)
+            print(f'server {alamat}, {args.peralatan:,} peralatan, '
+                  f'{args.proses} x {args.koneksi} koneksi, kedalaman {args.kedalaman}')
+
+            daftar_argumen = [
+                (host, int(port), args.durasi, args.koneksi, args.kedalaman,
+                 args.rasio_ubah, args.peralatan, seed)
+                for seed in range(args.proses)
+            ]
+            mulai = time.perf_counter()
+            with multiprocessing.Pool(args.proses) as pool:
+                semua = pool.map(_proses_klien, daftar_argumen)
+            durasi = time.perf_counter() - mulai
+        finally:
+            server.terminate()
+            server.wait()
+
+    jumlah = sum(h['jumlah'] for h in semua)
+    galat = sum(h['galat'] for h in semua)
+    latensi = np.concatenate([h['latensi'] for h in semua]) * 1000
+    print(f'permintaan        : {jumlah:,} ({galat} galat)')
+    print(f'throughput        : {jumlah / durasi:,.0f} permintaan/detik')
+    print(f'latensi putaran   : p50 {np.percentile(latensi, 50):.2f} ms, '
+          f'p99 {np.percentile(latensi, 99):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
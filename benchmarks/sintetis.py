@@ -0,0 +1,58 @@
+"""Benchmark generator data sintetis
+
+Mengukur laju pembangkitan inventaris dan bacaan (tanpa disk), lalu menulis
+dataset ke penyimpanan sementara per chunk sambil mencatat puncak memori
+proses. Memori puncak harus tetap sebanding dengan satu chunk, bukan dengan
+jumlah bacaan.
+
+    python benchmarks/sintetis.py [jumlah_bacaan]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch import sintetis  # noqa: E402
+from powerwatch.penyimpanan import PenyimpananListrik  # noqa: E402
+
+
+def ukur(nama, fungsi, jumlah):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    durasi = time.perf_counter() - mulai
+    print(f'{nama:<36} {durasi:7.2f} s   {jumlah / durasi / 1e6:7.1f} juta/s')
+    return hasil
+
+
+def puncak_memori_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    jumlah_bacaan = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    jumlah_peralatan = 1_000_000
+
+    ukur(f'inventaris {jumlah_peralatan:,}',
+         lambda: sintetis.buat_inventaris(jumlah_peralatan, seed=0), jumlah_peralatan)
+    ukur(f'bacaan {jumlah_bacaan:,} (memori)',
+         lambda: sum(len(k) for _, k in sintetis.chunk_penggunaan(jumlah_bacaan, seed=0)),
+         jumlah_bacaan)
+    memori_awal = puncak_memori_mib()
+
+    with tempfile.TemporaryDirectory() as direktori:
+        penyimpanan = PenyimpananListrik(direktori)
+        ukur(f'tulis ke penyimpanan {jumlah_bacaan:,}',
+             lambda: sintetis.tulis_penyimpanan(penyimpanan, 10_000, jumlah_bacaan, seed=0),
+             jumlah_bacaan)
+        assert penyimpanan.jumlah_pembacaan() == jumlah_bacaan
+        penyimpanan.tutup()
+
+    print(f'puncak memori: {puncak_memori_mib():.0f} MiB '
+          f'(sebelum menulis: {memori_awal:.0f} MiB, data: {jumlah_bacaan * 16 / 2**20:.0f} MiB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark evaluasi skenario what-if sebagai matriks skenario x peralatan
+
+Membuat 10.000 skenario acak (ganti daya, ubah jam per hari, geser jam mulai,
+satu sampai tiga perubahan per skenario) atas 1.000 peralatan dengan tarif
+waktu pemakaian, lalu mengukur kompilasi perubahan, evaluasi matriks,
+peringkat 20 skenario teratas, dan panggilan ulang yang di-cache. Sebagai
+acuan, beberapa skenario dievaluasi satu per satu dengan mengubah peralatan
+lalu memanggil hitung_estimasi_biaya; hasilnya harus sama.
+
+    python benchmarks/skenario.py [jumlah_skenario] [jumlah_peralatan]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.saran import buat_monitor  # noqa: E402
+from powerwatch import skenario  # noqa: E402
+
+JUMLAH_ACUAN = 20
+
+
+def buat_skenario(jumlah, jumlah_nama, rng):
+    """Skenario acak atas nama 'Peralatan k'"""
+    daftar = []
+    for s in range(jumlah):
+        perubahan = []
+        for _ in range(int(rng.integers(1, 4))):
+            p = {'peralatan': f'Peralatan {int(rng.integers(jumlah_nama))}'}
+            jenis = int(rng.integers(3))
+            if jenis == 0:
+                p['watt'] = round(float(rng.uniform(5, 200)))
+            elif jenis == 1:
+                p['jam_per_hari'] = round(float(rng.uniform(0.5, 12)), 1)
+            else:
+                p['jam_mulai'] = float(rng.integers(0, 24))
+            perubahan.append(p)
+        daftar.append({'nama': f'Skenario {s + 1}', 'perubahan': perubahan})
+    return daftar
+
+
+def ukur(nama, fungsi):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    print(f'  {nama:<40} {(time.perf_counter() - mulai) * 1000:9.2f} ms')
+    return hasil
+
+
+def acuan(n, perubahan):
+    """Tagihan satu skenario lewat ubah_peralatan + hitung_estimasi_biaya"""
+    monitor = buat_monitor(n)
+    for p in perubahan:
+        nilai = {k: v for k, v in p.items() if k != 'peralatan'}
+        for i in monitor.kueri({'nama': p['peralatan']}, kolom=())['indeks'].tolist():
+            monitor.ubah_peralatan(i, **nilai)
+    return monitor.hitung_estimasi_biaya()
+
+
+def main():
+    jumlah = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    monitor = buat_monitor(n)
+    daftar = buat_skenario(jumlah, min(n, 500), np.random.default_rng(1))
+    print(f'{jumlah:,} skenario x {n:,} peralatan '
+          f'(tarif waktu pemakaian: {not monitor.tabel_tarif().seragam})')
+
+    ukur('kompilasi perubahan', lambda: skenario.kompilasi(monitor, daftar))
+    hasil = ukur('evaluasi (kompilasi + matriks + tagihan)',
+                 lambda: skenario.evaluasi(monitor, daftar))
+    teratas = ukur('peringkat 20 teratas', lambda: skenario.peringkat(hasil, 20))
+    monitor.evaluasi_skenario(daftar)
+    ukur('evaluasi_skenario di-cache', lambda: monitor.evaluasi_skenario(daftar))
+
+    mulai = time.perf_counter()
+    galat = max(abs(acuan(n, daftar[s]['perubahan']) - hasil['biaya'][s]) / hasil['biaya'][s]
+                for s in teratas[:JUMLAH_ACUAN].tolist())
+    per_skenario = (time.perf_counter() - mulai) / JUMLAH_ACUAN
+    print(f'  {"acuan satu per satu (per skenario)":<40} {per_skenario * 1000:9.2f} ms'
+          f'  (x{jumlah:,} = {per_skenario * jumlah:.1f} s), galat relatif {galat:.1e}')
+    assert galat < 1e-9
+
+    print(f'tagihan saat ini Rp {hasil["biaya_saat_ini"]:,.0f}; skenario terbaik:')
+    for s in teratas[:5].tolist():
+        print(f'  {hasil["nama"][s]:<16} hemat Rp {hasil["penghematan_biaya"][s]:>12,.0f} '
+              f'({hasil["penghematan_kwh"][s]:,.1f} kWh)')
+
+
+if __name__ == '__main__':
+    main()
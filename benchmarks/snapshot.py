@@ -0,0 +1,77 @@
+"""Benchmark snapshot biner: tulis dan pulihkan monitor besar
+
+Monitor dengan 1.000.000 peralatan (semua nama unik, kasus terburuk untuk
+kamus) dan 10.000.000 bacaan per menit ditulis ke snapshot, lalu dipulihkan
+dengan mmap. Pembanding: membangun ulang monitor yang sama lewat
+tambah_peralatan_batch. Pemulihan diharapkan jauh di bawah 1 detik.
+
+    python benchmarks/snapshot.py [jumlah_peralatan] [jumlah_bacaan]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch import DeretWaktu, MonitorListrik  # noqa: E402
+
+
+def ukur(nama, fungsi):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    print(f'{nama:<34} {time.perf_counter() - mulai:8.3f} s')
+    return hasil
+
+
+def buat_data(n, jumlah_bacaan, seed=0):
+    rng = np.random.default_rng(seed)
+    peralatan = {
+        'nama': np.char.add('Peralatan ', np.arange(n).astype(str)),
+        'unit': rng.integers(1, 4, n),
+        'watt': rng.uniform(5, 1500, n).round(),
+        'golongan': rng.choice(['R-1', 'R-2', 'R-3'], n),
+        'jam_per_hari': rng.uniform(0.5, 24, n).round(1),
+        'jam_mulai': rng.integers(0, 24, n).astype(float),
+    }
+    akhir = np.datetime64('now', 'm')
+    waktu = (akhir - np.arange(jumlah_bacaan)[::-1].astype('timedelta64[m]')).astype('datetime64[ns]')
+    kwh = rng.gamma(2.0, 0.01, jumlah_bacaan)
+    return peralatan, waktu, kwh
+
+
+def bangun_ulang(peralatan, waktu, kwh):
+    monitor = MonitorListrik()
+    monitor.penggunaan_harian = DeretWaktu.dari_array(waktu, kwh)
+    monitor.tambah_peralatan_batch(peralatan)
+    return monitor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    jumlah_bacaan = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000
+    print(f'{n:,} peralatan, {jumlah_bacaan:,} bacaan')
+    peralatan, waktu, kwh = buat_data(n, jumlah_bacaan)
+    monitor = ukur('bangun ulang (tambah_peralatan_batch)', lambda: bangun_ulang(peralatan, waktu, kwh))
+
+    with tempfile.TemporaryDirectory() as direktori:
+        path = os.path.join(direktori, 'monitor.pwsnap')
+        ukur('tulis snapshot', lambda: monitor.simpan_snapshot(path))
+        print(f'{"ukuran berkas":<34} {os.path.getsize(path) / 2**20:8.1f} MiB')
+        pulih = ukur('pulihkan snapshot', lambda: MonitorListrik.dari_snapshot(path))
+        ukur('pulihkan + total & biaya', lambda: (
+            MonitorListrik.dari_snapshot(path).hitung_estimasi_biaya()
+        ))
+
+        assert np.isclose(pulih.hitung_total_penggunaan(), monitor.hitung_total_penggunaan())
+        assert np.isclose(pulih.hitung_estimasi_biaya(), monitor.hitung_estimasi_biaya())
+        assert len(pulih.penggunaan_harian) == jumlah_bacaan
+        assert pulih.peralatan[n - 1] == monitor.peralatan[n - 1]
+        print('hasil pulihan sama dengan monitor asli')
+        del pulih
+
+
+if __name__ == '__main__':
+    main()
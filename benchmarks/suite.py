@@ -0,0 +1,242 @@
+"""Rangkaian benchmark MonitorListrik dan latensi render halaman
+
+Menyapu jumlah peralatan (10^2..10^6) dan panjang riwayat penggunaan
+(30..10^7 bacaan), mengukur operasi inti MonitorListrik, lalu merender
+app.py dan keempat halaman lewat AppTest Streamlit (headless): sekali dingin
+(cache tampilan kosong) dan sekali hangat (rerun). Hasil ditulis ke JSON;
+dengan --bandingkan, keluar dengan kode 1 bila ada pengukuran yang lebih
+lambat dari hasil dasar melebihi ambang (setelah dinormalkan dengan beban
+kerja kalibrasi yang diukur pada kedua run).
+
+    python benchmarks/suite.py --keluaran hasil.json
+    python benchmarks/suite.py --cepat --keluaran baru.json --bandingkan hasil.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik  # noqa: E402
+
+JUMLAH_PERALATAN = (100, 1_000, 10_000, 100_000, 1_000_000)
+PANJANG_RIWAYAT = (30, 1_000, 100_000, 1_000_000, 10_000_000)
+# Halaman menampilkan setiap peralatan dalam tabel; di atas ini render diukur terpisah
+PERALATAN_HALAMAN_MAKS = 10_000
+# Halaman yang menggambar riwayat penggunaan, diukur untuk setiap panjang riwayat
+HALAMAN_RIWAYAT = ('app.py', '2. Penggunaan Listrik.py')
+PENGULANGAN_HALAMAN = 3
+TAMBAH_SATUAN = 200  # tambah_peralatan berturut-turut yang diukur per ukuran tabel
+AMBANG_DEFAULT = 0.25  # regresi maksimum yang diizinkan (25%)
+NAMA_KALIBRASI = 'kalibrasi'
+SELISIH_MINIMUM = 0.002  # detik; selisih lebih kecil dianggap derau
+
+
+def data_peralatan(n, seed=0):
+    """Kolom inventaris acak dengan n baris"""
+    rng = np.random.default_rng(seed)
+    return {
+        'nama': np.char.add('Peralatan ', (np.arange(n) % 1000).astype(str)),
+        'unit': rng.integers(1, 4, n),
+        'watt': rng.uniform(5, 1500, n).round(),
+        'golongan': rng.choice(['R-1', 'R-2', 'R-3'], n),
+        'jam_per_hari': rng.uniform(0.5, 24, n).round(1),
+    }
+
+
+def buat_monitor(n, riwayat=30):
+    """Monitor dengan n peralatan dan riwayat bacaan per menit yang berakhir sekarang"""
+    monitor = MonitorListrik(seed=0)
+    monitor.tambah_peralatan_batch(data_peralatan(n))
+    # Bacaan harian sebanyak 10^7 akan melewati batas tahun datetime; pakai data menit
+    akhir = np.datetime64('now', 's')
+    waktu = akhir - np.timedelta64(60, 's') * np.arange(riwayat - 1, -1, -1)
+    monitor.penggunaan_harian.kosongkan()
+    monitor.penggunaan_harian.tambah_batch(waktu, monitor.rng.uniform(0.005, 0.02, riwayat))
+    return monitor
+
+
+def ukur(fungsi, pengulangan=3):
+    """Waktu tercepat (detik) dari beberapa pengulangan"""
+    terbaik = float('inf')
+    for _ in range(pengulangan):
+        mulai = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik
+
+
+def ukur_operasi(jumlah_peralatan, panjang_riwayat, hasil):
+    for n in jumlah_peralatan:
+        data = data_peralatan(n)
+        hasil[f'tambah_peralatan_batch/n={n}'] = ukur(
+            lambda: MonitorListrik().tambah_peralatan_batch(data), pengulangan=1 if n >= 100_000 else 3
+        )
+        monitor = buat_monitor(n)
+
+        def tambah_satuan():
+            for i in range(TAMBAH_SATUAN):
+                monitor.tambah_peralatan('Baru', 1, 100, 'R-1', 2)
+        hasil[f'tambah_peralatan/n={n}'] = ukur(tambah_satuan, pengulangan=1) / TAMBAH_SATUAN
+        hasil[f'hitung_total_penggunaan/n={n}'] = ukur(monitor.hitung_total_penggunaan)
+        hasil[f'hitung_estimasi_biaya/n={n}'] = ukur(monitor.hitung_estimasi_biaya)
+        hasil[f'hitung_biaya_per_peralatan/n={n}'] = ukur(monitor.hitung_biaya_per_peralatan)
+        hasil[f'konsumsi_energi_per_peralatan/n={n}'] = ukur(monitor.konsumsi_energi_per_peralatan)
+        hasil[f'hitung_saran/n={n}'] = ukur(
+            lambda: (monitor.memo.kosongkan(), monitor.hitung_saran())
+        )
+        cetak_baris(hasil)
+
+    for h in panjang_riwayat:
+        monitor = MonitorListrik(seed=0)
+        hasil[f'generate_sample_data/h={h}'] = ukur(
+            lambda: monitor.generate_sample_data(h), pengulangan=1 if h >= 1_000_000 else 3
+        )
+        deret = monitor.penggunaan_harian
+        hasil[f'sampel_lttb/h={h}'] = ukur(
+            lambda: (deret._cache_sampel.clear(), deret.sampel(jumlah_titik=700))
+        )
+        cetak_baris(hasil)
+
+
+def ukur_halaman(berkas, monitor, pengulangan=PENGULANGAN_HALAMAN):
+    """(dingin, hangat): render pertama dengan cache kosong, lalu rerun (tercepat)"""
+    from streamlit.testing.v1 import AppTest
+
+    dingin = hangat = float('inf')
+    for _ in range(pengulangan):
+        monitor.memo.kosongkan()
+        monitor.penggunaan_harian._cache_sampel.clear()
+        app = AppTest.from_file(os.path.join(AKAR, berkas), default_timeout=600)
+        app.session_state.monitor = monitor
+        mulai = time.perf_counter()
+        app.run()
+        dingin = min(dingin, time.perf_counter() - mulai)
+        mulai = time.perf_counter()
+        app.run()
+        hangat = min(hangat, time.perf_counter() - mulai)
+        if app.exception:
+            raise RuntimeError(f'{berkas}: {app.exception[0].value}')
+    return dingin, hangat
+
+
+def ukur_semua_halaman(jumlah_peralatan, panjang_riwayat, hasil):
+    halaman = ['app.py'] + sorted(
+        os.path.basename(p) for p in glob.glob(os.path.join(AKAR, '[1-9]. *.py'))
+    )
+    # Render pertama Streamlit memuat banyak modul; jangan dihitung sebagai milik halaman
+    ukur_halaman('app.py', buat_monitor(10), pengulangan=1)
+
+    for n in jumlah_peralatan:
+        if n > PERALATAN_HALAMAN_MAKS:
+            continue
+        monitor = buat_monitor(n)
+        for berkas in halaman:
+            dingin, hangat = ukur_halaman(berkas, monitor)
+            hasil[f'halaman/{berkas}/dingin/n={n}'] = dingin
+            hasil[f'halaman/{berkas}/hangat/n={n}'] = hangat
+        cetak_baris(hasil)
+
+    for h in panjang_riwayat:
+        monitor = buat_monitor(19, h)
+        for berkas in HALAMAN_RIWAYAT:
+            dingin, hangat = ukur_halaman(berkas, monitor)
+            hasil[f'halaman/{berkas}/dingin/h={h}'] = dingin
+            hasil[f'halaman/{berkas}/hangat/h={h}'] = hangat
+        cetak_baris(hasil)
+
+
+def cetak_baris(hasil):
+    """Mencetak pengukuran yang belum dicetak"""
+    for nama, detik in hasil.items():
+        if nama not in cetak_baris.sudah:
+            print(f'{nama:<60} {detik * 1e3:12.3f} ms', flush=True)
+            cetak_baris.sudah.add(nama)
+
+
+cetak_baris.sudah = set()
+
+
+def kalibrasi():
+    """Beban kerja tetap (Python murni + NumPy) untuk menormalkan kecepatan mesin"""
+    def kerja():
+        sum(i * i for i in range(200_000))
+        np.sort(np.random.default_rng(0).random(500_000))
+    return ukur(kerja, pengulangan=5)
+
+
+def bandingkan(dasar, baru, ambang):
+    """Daftar (nama, lama, baru) yang melambat melebihi ambang
+
+    Hasil dasar diskalakan dengan rasio kalibrasi kedua run, sehingga mesin
+    yang sedang lebih lambat secara merata tidak dianggap regresi.
+    """
+    skala = 1.0
+    if dasar.get(NAMA_KALIBRASI) and baru.get(NAMA_KALIBRASI):
+        skala = baru[NAMA_KALIBRASI] / dasar[NAMA_KALIBRASI]
+    regresi = []
+    for nama, detik in baru.items():
+        if nama == NAMA_KALIBRASI or nama not in dasar:
+            continue
+        lama = dasar[nama] * skala
+        if detik > lama * (1 + ambang) and detik - lama > SELISIH_MINIMUM:
+            regresi.append((nama, lama, detik))
+    return regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keluaran', default='hasil_benchmark.json', help='Berkas JSON hasil')
+    parser.add_argument('--bandingkan', metavar='JSON', help='Hasil dasar untuk dibandingkan')
+    parser.add_argument('--ambang', type=float, default=AMBANG_DEFAULT,
+                        help='Regresi relatif maksimum (default: 0.25)')
+    parser.add_argument('--cepat', action='store_true',
+                        help='Sapuan kecil (n <= 10^4, riwayat <= 10^5) untuk pemeriksaan rutin')
+    parser.add_argument('--tanpa-halaman', action='store_true', help='Lewati render halaman')
+    args = parser.parse_args(argv)
+
+    jumlah_peralatan = [n for n in JUMLAH_PERALATAN if not args.cepat or n <= 10_000]
+    panjang_riwayat = [h for h in PANJANG_RIWAYAT if not args.cepat or h <= 100_000]
+
+    hasil = {NAMA_KALIBRASI: kalibrasi()}
+    ukur_operasi(jumlah_peralatan, panjang_riwayat, hasil)
+    if not args.tanpa_halaman:
+        ukur_semua_halaman(jumlah_peralatan, panjang_riwayat, hasil)
+
+    # Kalibrasi diulang di akhir; yang tercepat mewakili kecepatan mesin selama run
+    hasil[NAMA_KALIBRASI] = min(hasil[NAMA_KALIBRASI], kalibrasi())
+    with open(args.keluaran, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'cpu': os.cpu_count(),
+                'waktu': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'hasil': hasil,
+        }, f, indent=2)
+    print(f'hasil ditulis ke {args.keluaran}')
+
+    if args.bandingkan:
+        with open(args.bandingkan, encoding='utf-8') as f:
+            dasar = json.load(f)['hasil']
+        regresi = bandingkan(dasar, hasil, args.ambang)
+        for nama, lama, baru in regresi:
+            print(f'REGRESI {nama}: {lama * 1e3:.3f} ms -> {baru * 1e3:.3f} ms '
+                  f'({baru / lama - 1:+.0%})')
+        if regresi:
+            return 1
+        print(f'tidak ada regresi di atas {args.ambang:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
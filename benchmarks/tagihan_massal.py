@@ -0,0 +1,60 @@
+"""Skalabilitas tagihan massal terhadap jumlah proses
+
+Membuat tabel CSV sintetis (default 20.000 rumah tangga x 20 peralatan),
+lalu menjalankan hitung_tagihan dengan 1, 2, 4, ... proses hingga jumlah CPU.
+
+    python benchmarks/tagihan_massal.py [jumlah_rumah_tangga]
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch.katalog_default import PERALATAN_DEFAULT  # noqa: E402
+from powerwatch.tagihan_massal import hitung_tagihan  # noqa: E402
+
+PERALATAN_PER_RUMAH = 20
+
+
+def buat_tabel(path, jumlah_rumah, seed=0):
+    rng = np.random.default_rng(seed)
+    n = jumlah_rumah * PERALATAN_PER_RUMAH
+    pilihan = rng.integers(len(PERALATAN_DEFAULT), size=n)
+    nama = np.array([p[0] for p in PERALATAN_DEFAULT])[pilihan]
+    watt = np.array([p[2] for p in PERALATAN_DEFAULT])[pilihan]
+    unit = rng.integers(1, 4, size=n)
+    jam = rng.integers(1, 25, size=n)
+    id_rumah = np.repeat(np.arange(jumlah_rumah), PERALATAN_PER_RUMAH)
+    with open(path, 'w') as f:
+        f.write('id_rumah,nama,unit,watt,golongan,jam_per_hari\n')
+        f.writelines(
+            f'rt{i:07d},{a},{u},{w},R-1,{j}\n'
+            for i, a, u, w, j in zip(id_rumah, nama, unit, watt, jam)
+        )
+
+
+def main():
+    jumlah_rumah = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cpu = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as direktori:
+        sumber = os.path.join(direktori, 'inventaris.csv')
+        keluaran = os.path.join(direktori, 'tagihan.csv')
+        buat_tabel(sumber, jumlah_rumah)
+        print(f'{jumlah_rumah} rumah tangga, {os.path.getsize(sumber) / 2**20:.1f} MB, {cpu} CPU')
+
+        proses, dasar = 1, None
+        while proses <= cpu:
+            ringkasan = hitung_tagihan(sumber, keluaran, jumlah_proses=proses,
+                                       ukuran_shard=4 * 2**20)
+            detik = ringkasan['detik']
+            dasar = dasar or detik
+            print(f'{proses:3d} proses: {detik:7.2f} s  '
+                  f"({ringkasan['rumah_tangga'] / detik:,.0f} rumah/s, percepatan {dasar / detik:.2f}x)")
+            proses *= 2
+
+
+if __name__ == '__main__':
+    main()
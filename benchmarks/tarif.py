@@ -0,0 +1,72 @@
+"""Kecepatan mesin tarif untuk 1 juta peralatan-bulan
+
+Mengukur dua jalur TabelTarif: tanpa profil per jam (pemakaian merata), dan
+dengan matriks kWh per jam (peralatan x 24) berikut waktu pemakaian, blok,
+biaya minimum, dan pajak, dengan 50.000 akun. Batas yang diharapkan < 1 detik.
+
+    python benchmarks/tarif.py [jumlah_peralatan]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerwatch import tarif  # noqa: E402
+from powerwatch.monitor import TARIF_DEFAULT  # noqa: E402
+
+TARIF_UJI = {
+    'R-1': {'harga': 1444, 'blok': [(200, 1600), (900, 1800)], 'minimum': 50_000, 'pajak': 0.03},
+    'R-2': {'harga': 1699, 'waktu': [(17, 22, 2100)], 'pajak': 0.05},
+    'R-3': {'harga': 1699, 'waktu': [(22, 6, 1200)], 'blok': [(1500, 1900)]},
+}
+JUMLAH_AKUN = 50_000
+
+
+def ukur(fungsi, pengulangan=3):
+    hasil = []
+    for _ in range(pengulangan):
+        mulai = time.perf_counter()
+        fungsi()
+        hasil.append(time.perf_counter() - mulai)
+    return min(hasil)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    kw = rng.uniform(0.01, 2.0, n)
+    jam_mulai = rng.integers(0, 24, n)
+    durasi = rng.integers(1, 12, n)
+    kwh = kw * durasi * 30
+    akun = np.sort(rng.integers(0, JUMLAH_AKUN, n))
+    kode = rng.integers(0, 3, n)
+
+    tabel = tarif.kompilasi(TARIF_UJI, TARIF_DEFAULT)
+    jam = np.arange(24)
+
+    def matriks(mulai, selesai):
+        # kWh bulanan per jam: aktif pada [jam_mulai, jam_mulai + durasi) modulo 24
+        offset = (jam[None, :] - jam_mulai[mulai:selesai, None]) % 24
+        return np.where(offset < durasi[mulai:selesai, None], kw[mulai:selesai, None] * 30, 0.0)
+
+    def merata():
+        energi = tabel.energi(kode, kwh)
+        tabel.tagihan(kode, kwh, energi, akun)
+
+    def per_jam():
+        energi = tabel.energi(kode, kwh, matriks)
+        tagihan = tabel.tagihan(kode, kwh, energi, akun)
+        tabel.alokasi(tagihan, kwh)
+
+    waktu_kompilasi = ukur(lambda: tarif.kompilasi(TARIF_UJI, TARIF_DEFAULT))
+    print(f'{n:,} peralatan-bulan, {JUMLAH_AKUN:,} akun')
+    print(f'kompilasi (cache)   : {waktu_kompilasi * 1e6:8.1f} us')
+    print(f'tanpa profil per jam: {ukur(merata):8.3f} s')
+    print(f'matriks per jam     : {ukur(per_jam):8.3f} s (termasuk membangun matriks)')
+
+
+if __name__ == '__main__':
+    main()
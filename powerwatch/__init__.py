@@ -0,0 +1,16 @@
+"""Mesin perhitungan PowerWatch yang dipakai bersama oleh semua halaman"""
+from .deret_waktu import DeretWaktu
+from .monitor import HARI_PER_BULAN, TARIF_DEFAULT, TARIF_LISTRIK, MonitorListrik
+from .tabel_peralatan import KamusString, TabelPeralatan
+from .tarif import TabelTarif
+
+__all__ = [
+    'DeretWaktu',
+    'HARI_PER_BULAN',
+    'TARIF_DEFAULT',
+    'TARIF_LISTRIK',
+    'KamusString',
+    'MonitorListrik',
+    'TabelPeralatan',
+    'TabelTarif',
+]
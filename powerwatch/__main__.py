@@ -0,0 +1,6 @@
+"""Menjalankan CLI dengan `python -m powerwatch`"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
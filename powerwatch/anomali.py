@@ -0,0 +1,204 @@
+"""Deteksi anomali daring pada deret penggunaan listrik
+
+Setiap bacaan diproses sekali dengan biaya O(1), tanpa membaca ulang riwayat:
+
+- lonjakan: residual terhadap baseline (musiman per slot jam bila sudah
+  cukup data, selain itu rata-rata jendela bergulir Welford) melebihi
+  AMBANG_LONJAKAN simpangan baku;
+- drift: grafik kendali EWMA atas residual terstandar keluar dari batas
+  L * sqrt(lambda / (2 - lambda)), paling banyak sekali per periode;
+- beban_dasar: selama satu periode penuh, bacaan terkecil tetap di atas
+  FRAKSI_BEBAN_DASAR dari rata-ratanya (ada beban yang selalu menyala),
+  paling banyak sekali per periode.
+
+Baseline diperbarui dengan nilai yang sudah dipangkas agar lonjakan tidak
+ikut menggeser baseline.
+"""
+import bisect
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+JENDELA = 60  # bacaan untuk rata-rata/varian bergulir (Welford)
+MIN_JENDELA = 30  # bacaan minimum sebelum jendela bergulir dipakai sebagai baseline
+PERIODE_DETIK = 86_400  # siklus musiman (harian)
+JUMLAH_SLOT = 24  # slot musiman per periode (per jam)
+ALFA_MUSIMAN = 0.02  # bobot EWMA rata-rata/varian setiap slot musiman
+MIN_MUSIMAN = 30  # bacaan minimum per slot sebelum baseline musiman dipakai
+AMBANG_LONJAKAN = 6.0  # simpangan baku
+LAMBDA_EWMA = 0.05  # bobot grafik kendali EWMA untuk drift
+L_EWMA = 4.0  # lebar batas kendali EWMA
+FRAKSI_BEBAN_DASAR = 0.6  # minimum / rata-rata satu periode
+MIN_BACAAN_BEBAN_DASAR = 24  # bacaan minimum dalam satu periode untuk cek beban dasar
+PEMANASAN = 10_000  # bacaan terakhir yang diproses saat detektor dipasang pada riwayat
+JENIS_TANDA = ('lonjakan', 'drift', 'beban_dasar')
+
+
+class DetektorAnomali:
+    def __init__(self, periode_detik=PERIODE_DETIK, jumlah_slot=JUMLAH_SLOT, jendela=JENDELA):
+        """Detektor daring; pasang ke DeretWaktu dengan pasang()"""
+        self.periode = periode_detik
+        self.jumlah_slot = jumlah_slot
+        self.jendela = jendela
+        self._kunci = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Menghapus seluruh keadaan dan tanda"""
+        self.jumlah_bacaan = 0
+        self._t_terakhir = None
+        # Welford bergulir atas jendela bacaan terakhir
+        self._cincin = deque()
+        self._n = 0
+        self._rata = 0.0
+        self._m2 = 0.0
+        # Baseline musiman: rata-rata dan varian EWMA per slot
+        self._rata_slot = [0.0] * self.jumlah_slot
+        self._var_slot = [0.0] * self.jumlah_slot
+        self._n_slot = [0] * self.jumlah_slot
+        # Grafik kendali EWMA atas residual terstandar
+        self.ewma = 0.0
+        self._batas_ewma = L_EWMA * math.sqrt(LAMBDA_EWMA / (2 - LAMBDA_EWMA))
+        self._tanda_drift = None
+        # Jendela waktu satu periode: antrean (t, x), minimum monoton, dan jumlah
+        self._periode_t = deque()
+        self._periode_x = deque()
+        self._minimum = deque()
+        self._jumlah_periode = 0.0
+        self._tanda_beban_dasar = None
+        # Tanda, terurut menurut waktu
+        self._tanda_waktu = []
+        self._tanda_kwh = []
+        self._tanda_jenis = []
+        self._tanda_skor = []
+        self._jumlah_tanda = dict.fromkeys(JENIS_TANDA, 0)
+
+    def pasang(self, deret, pemanasan=PEMANASAN):
+        """Memproses bacaan terakhir deret lalu mendengarkan bacaan barunya"""
+        waktu, kwh = deret.waktu(), deret.kwh()
+        self.proses(waktu[-pemanasan:], kwh[-pemanasan:])
+        deret.daftarkan_pendengar(self.proses)
+        return self
+
+    # Pembaruan
+    def proses(self, waktu, kwh):
+        """Memproses batch bacaan (dipanggil DeretWaktu setiap ada penambahan)"""
+        detik = np.asarray(waktu).astype('datetime64[s]').astype(np.int64).tolist()
+        with self._kunci:
+            for t, x in zip(detik, np.asarray(kwh, dtype=np.float64).tolist()):
+                if self._t_terakhir is not None and t < self._t_terakhir:
+                    # Deret dikosongkan lalu diisi ulang dari awal
+                    self.reset()
+                self._satu(t, x)
+
+    def _tandai(self, t, x, jenis, skor):
+        self._tanda_waktu.append(t)
+        self._tanda_kwh.append(x)
+        self._tanda_jenis.append(jenis)
+        self._tanda_skor.append(skor)
+        self._jumlah_tanda[jenis] += 1
+
+    def _satu(self, t, x):
+        """Pembaruan O(1) untuk satu bacaan"""
+        self.jumlah_bacaan += 1
+        self._t_terakhir = t
+        slot = (t % self.periode) * self.jumlah_slot // self.periode
+
+        # Baseline yang diharapkan sebelum bacaan ini ikut diperhitungkan
+        if self._n_slot[slot] >= MIN_MUSIMAN:
+            harapan, sebaran = self._rata_slot[slot], math.sqrt(self._var_slot[slot])
+        elif self._n >= MIN_JENDELA:
+            harapan, sebaran = self._rata, math.sqrt(max(self._m2, 0.0) / (self._n - 1))
+        else:
+            harapan = sebaran = None
+
+        nilai_baseline = x
+        if harapan is not None:
+            sebaran = max(sebaran, 1e-6 * max(abs(harapan), 1.0))
+            z = (x - harapan) / sebaran
+            if z > AMBANG_LONJAKAN:
+                self._tandai(t, x, 'lonjakan', z)
+            z = max(-AMBANG_LONJAKAN, min(z, AMBANG_LONJAKAN))
+            nilai_baseline = harapan + z * sebaran
+            self.ewma = LAMBDA_EWMA * z + (1 - LAMBDA_EWMA) * self.ewma
+            if abs(self.ewma) > self._batas_ewma:
+                # Selama baseline menyesuaikan diri, drift yang sama cukup ditandai sekali per periode
+                if self._tanda_drift is None or t - self._tanda_drift >= self.periode:
+                    self._tandai(t, x, 'drift', self.ewma)
+                    self._tanda_drift = t
+                self.ewma = 0.0
+
+        self._perbarui_jendela(nilai_baseline)
+        self._perbarui_slot(slot, nilai_baseline)
+        self._perbarui_periode(t, x)
+
+    def _perbarui_jendela(self, x):
+        """Welford dengan penambahan dan pengurangan untuk jendela bergulir"""
+        self._cincin.append(x)
+        self._n += 1
+        delta = x - self._rata
+        self._rata += delta / self._n
+        self._m2 += delta * (x - self._rata)
+        if self._n > self.jendela:
+            lama = self._cincin.popleft()
+            self._n -= 1
+            delta = lama - self._rata
+            self._rata -= delta / self._n
+            self._m2 -= delta * (lama - self._rata)
+
+    def _perbarui_slot(self, slot, x):
+        """Rata-rata dan varian EWMA untuk satu slot musiman"""
+        if self._n_slot[slot] == 0:
+            self._rata_slot[slot] = x
+        else:
+            delta = x - self._rata_slot[slot]
+            self._rata_slot[slot] += ALFA_MUSIMAN * delta
+            self._var_slot[slot] = (1 - ALFA_MUSIMAN) * (self._var_slot[slot] + ALFA_MUSIMAN * delta * delta)
+        self._n_slot[slot] += 1
+
+    def _perbarui_periode(self, t, x):
+        """Minimum dan rata-rata satu periode terakhir (antrean monoton, O(1) teramortisasi)"""
+        self._periode_t.append(t)
+        self._periode_x.append(x)
+        self._jumlah_periode += x
+        while self._minimum and self._minimum[-1][1] > x:
+            self._minimum.pop()
+        self._minimum.append((t, x))
+        while self._periode_t[0] <= t - self.periode:
+            self._periode_t.popleft()
+            self._jumlah_periode -= self._periode_x.popleft()
+        while self._minimum[0][0] <= t - self.periode:
+            self._minimum.popleft()
+
+        n = len(self._periode_t)
+        if n < MIN_BACAAN_BEBAN_DASAR or t - self._periode_t[0] < 0.9 * self.periode:
+            return
+        if self._tanda_beban_dasar is not None and t - self._tanda_beban_dasar < self.periode:
+            return
+        rata = self._jumlah_periode / n
+        minimum = self._minimum[0][1]
+        if rata > 0 and minimum >= FRAKSI_BEBAN_DASAR * rata:
+            self._tandai(t, x, 'beban_dasar', minimum / rata)
+            self._tanda_beban_dasar = t
+
+    # Pembacaan
+    def tanda(self, awal=None, akhir=None):
+        """Tanda dalam rentang waktu: dict array waktu, kwh, jenis, skor"""
+        with self._kunci:
+            mulai = 0 if awal is None else bisect.bisect_left(
+                self._tanda_waktu, int(np.datetime64(awal, 's').astype(np.int64)))
+            selesai = len(self._tanda_waktu) if akhir is None else bisect.bisect_right(
+                self._tanda_waktu, int(np.datetime64(akhir, 's').astype(np.int64)))
+            return {
+                'waktu': np.array(self._tanda_waktu[mulai:selesai], dtype=np.int64).astype('datetime64[s]'),
+                'kwh': np.array(self._tanda_kwh[mulai:selesai], dtype=np.float64),
+                'jenis': np.array(self._tanda_jenis[mulai:selesai], dtype=object),
+                'skor': np.array(self._tanda_skor[mulai:selesai], dtype=np.float64),
+            }
+
+    def ringkasan(self):
+        """Jumlah tanda per jenis"""
+        with self._kunci:
+            return dict(self._jumlah_tanda)
@@ -0,0 +1,137 @@
+"""CLI headless: penggunaan, biaya, dan saran dari berkas inventaris
+
+Hanya memuat NumPy; pandas dan Plotly tidak pernah diimpor di jalur ini.
+"""
+import argparse
+import json
+import sys
+
+from . import snapshot
+from .monitor import HARI_PER_BULAN, MonitorListrik
+
+
+def hitung_ringkasan(monitor, target_kwh=None, target_biaya=None, jumlah_simulasi=0,
+                     jumlah_proses=1):
+    """Ringkasan penggunaan, biaya, saran, dan (opsional) prakiraan sebagai dict biasa"""
+    total_kwh = monitor.hitung_total_penggunaan()
+    saran = monitor.hitung_saran(target_kwh=target_kwh, target_biaya=target_biaya)
+    total_saran = float(saran['kwh_saran'].sum())
+    biaya = monitor.hitung_estimasi_biaya()
+    biaya_golongan = monitor.hitung_biaya_per_golongan()
+
+    ringkasan = {
+        'jumlah_peralatan': monitor.jumlah_peralatan(),
+        'total_kwh': total_kwh,
+        'rata_kwh_per_hari': total_kwh / HARI_PER_BULAN,
+        'estimasi_biaya': biaya,
+        'per_golongan': {
+            golongan: {'kwh': kwh, 'biaya': biaya_golongan[golongan]}
+            for golongan, kwh in sorted(monitor.hitung_kwh_per_golongan().items())
+        },
+        'kwh_setelah_saran': total_saran,
+        'penghematan_kwh': total_kwh - total_saran,
+        'penghematan_biaya': saran['biaya_saat_ini'] - saran['biaya_saran'],
+        'target_tercapai': saran['tercapai'],
+    }
+    if jumlah_simulasi:
+        prakiraan = monitor.prakiraan_biaya(jumlah_simulasi, jumlah_proses)
+        ringkasan['prakiraan_biaya'] = {
+            k: v for k, v in prakiraan.items() if k != 'tagihan'
+        }
+    return ringkasan
+
+
+def _cetak_teks(ringkasan, keluaran):
+    """Menulis ringkasan dalam bentuk teks yang mudah dibaca"""
+    r = ringkasan
+    baris = [
+        f"Jumlah peralatan        : {r['jumlah_peralatan']}",
+        f"Total penggunaan        : {r['total_kwh']:,.2f} kWh/bulan",
+        f"Rata-rata per hari      : {r['rata_kwh_per_hari']:,.2f} kWh",
+        f"Estimasi biaya          : Rp {r['estimasi_biaya']:,.2f}/bulan",
+        '',
+        'Per golongan:',
+    ]
+    for golongan, nilai in r['per_golongan'].items():
+        baris.append(f"  {golongan:<6} {nilai['kwh']:>14,.2f} kWh   Rp {nilai['biaya']:>16,.2f}")
+    baris += [
+        '',
+        f"Setelah saran           : {r['kwh_setelah_saran']:,.2f} kWh/bulan",
+        f"Potensi penghematan     : {r['penghematan_kwh']:,.2f} kWh "
+        f"(Rp {r['penghematan_biaya']:,.2f})",
+    ]
+    if not r['target_tercapai']:
+        baris.append('Target tidak tercapai; ditampilkan penghematan terbesar yang mungkin.')
+    if 'prakiraan_biaya' in r:
+        p = r['prakiraan_biaya']
+        baris += [
+            '',
+            f"Prakiraan biaya P10     : Rp {p['p10']:,.2f}",
+            f"Prakiraan biaya P50     : Rp {p['p50']:,.2f}",
+            f"Prakiraan biaya P90     : Rp {p['p90']:,.2f}",
+        ]
+    keluaran.write('\n'.join(baris) + '\n')
+
+
+def buat_parser():
+    parser = argparse.ArgumentParser(
+        prog='powerwatch',
+        description='Hitung penggunaan, biaya, dan saran listrik dari berkas inventaris.',
+    )
+    parser.add_argument('berkas', help='Berkas inventaris CSV atau Parquet '
+                        '(kolom: nama, unit, watt, golongan, jam_per_hari), '
+                        f'atau snapshot {snapshot.EKSTENSI}')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'snapshot'],
+                        help='Format berkas (default: ditebak dari ekstensi)')
+    parser.add_argument('--tarif', metavar='JSON',
+                        help='Berkas JSON spesifikasi tarif per golongan (lihat powerwatch.tarif)')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--target-biaya', type=float, metavar='RP',
+                        help='Target tagihan per bulan untuk saran (default: penghematan maksimal)')
+    target.add_argument('--target-kwh', type=float, metavar='KWH',
+                        help='Target penggunaan kWh per bulan untuk saran')
+    parser.add_argument('--simulasi', type=int, default=0, metavar='N',
+                        help='Jumlah bulan simulasi Monte Carlo untuk prakiraan P10/P50/P90')
+    parser.add_argument('--proses', type=int, default=1,
+                        help='Jumlah proses untuk simulasi prakiraan (default: 1)')
+    parser.add_argument('--snapshot', metavar='BERKAS',
+                        help='Tulis snapshot biner monitor untuk mulai hangat berikutnya')
+    parser.add_argument('--json', action='store_true', help='Keluaran dalam format JSON')
+    return parser
+
+
+def main(argv=None, keluaran=None):
+    """Titik masuk CLI; mengembalikan kode keluar"""
+    keluaran = keluaran or sys.stdout
+    parser = buat_parser()
+    args = parser.parse_args(argv)
+
+    dari_snapshot = args.format == 'snapshot' or (
+        args.format is None and args.berkas.endswith(snapshot.EKSTENSI)
+    )
+    try:
+        monitor = MonitorListrik.dari_snapshot(args.berkas) if dari_snapshot else MonitorListrik()
+        if args.tarif:
+            with open(args.tarif, encoding='utf-8') as f:
+                monitor.tarif_listrik = json.load(f)
+            monitor.tabel_tarif()  # validasi spesifikasi sebelum impor
+        if not dari_snapshot:
+            monitor.impor_peralatan(args.berkas, format=args.format, pakai_pandas=False)
+        if args.snapshot:
+            monitor.simpan_snapshot(args.snapshot)
+    except (OSError, ValueError) as e:
+        print(f'powerwatch: {e}', file=sys.stderr)
+        return 1
+
+    try:
+        ringkasan = hitung_ringkasan(monitor, args.target_kwh, args.target_biaya,
+                                     args.simulasi, args.proses)
+    except ValueError as e:
+        print(f'powerwatch: {e}', file=sys.stderr)
+        return 1
+    if args.json:
+        json.dump(ringkasan, keluaran, indent=2)
+        keluaran.write('\n')
+    else:
+        _cetak_teks(ringkasan, keluaran)
+    return 0
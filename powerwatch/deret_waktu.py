@@ -0,0 +1,230 @@
+"""Deret waktu penggunaan listrik berbasis array NumPy yang dapat bertambah"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import instrumentasi
+from .downsampling import sampel_indeks
+
+KAPASITAS_AWAL = 1024
+UKURAN_CACHE_SAMPEL = 32
+TIPE_WAKTU = 'datetime64[s]'
+LANGKAH_DEFAULT = np.timedelta64(1, 'D')  # Jarak bacaan jika waktu tidak diberikan
+
+
+def _ke_waktu(nilai):
+    """Konversi nilai (datetime, string, angka detik epoch) ke datetime64[s]"""
+    array = np.asarray(nilai)
+    if np.issubdtype(array.dtype, np.number):
+        return array.astype('int64', copy=False).astype(TIPE_WAKTU, copy=False)
+    return array.astype(TIPE_WAKTU, copy=False)
+
+
+class DeretWaktu:
+    def __init__(self, kapasitas=KAPASITAS_AWAL):
+        """Inisialisasi buffer deret waktu (waktu, kWh)"""
+        self._waktu = np.empty(kapasitas, dtype=TIPE_WAKTU)
+        self._kwh = np.empty(kapasitas, dtype=np.float64)
+        self._n = 0
+        # Naik setiap kali isi deret berubah; dipakai sebagai kunci cache
+        self.versi = 0
+        self._cache_sampel = OrderedDict()
+        # Melindungi penambahan dari beberapa thread (mis. ingesti latar belakang)
+        self._kunci = threading.Lock()
+        # Fungsi (waktu, kwh) yang dipanggil setelah setiap penambahan batch
+        self._pendengar = []
+        # Banyaknya pipa ingesti meter yang sedang menulis ke deret ini
+        self.ingesti_aktif = 0
+
+    @classmethod
+    def dari_array(cls, waktu, kwh):
+        """Membuat deret yang langsung memakai array (mis. memory-map) tanpa menyalin
+
+        Array hanya dibaca; buffer baru baru dialokasikan saat ada penambahan.
+        """
+        deret = cls(kapasitas=0)
+        deret._waktu = _ke_waktu(waktu).view()
+        deret._kwh = np.asarray(kwh, dtype=np.float64).view()
+        if deret._waktu.shape != deret._kwh.shape:
+            raise ValueError('waktu dan kwh harus memiliki panjang sama')
+        # Tandai baca-saja agar penambahan selalu menyalin ke buffer baru
+        deret._waktu.flags.writeable = False
+        deret._kwh.flags.writeable = False
+        deret._n = len(deret._kwh)
+        return deret
+
+    def ukuran_memori(self):
+        """Byte buffer milik deret ini (0 jika masih memakai array bersama/memory-map)"""
+        if not self._kwh.flags.writeable:
+            return 0
+        return self._waktu.nbytes + self._kwh.nbytes
+
+    def daftarkan_pendengar(self, fungsi):
+        """Mendaftarkan fungsi(waktu, kwh) yang dipanggil setiap ada bacaan baru"""
+        self._pendengar.append(fungsi)
+
+    def mulai_ingesti(self):
+        """Menandai ada pipa ingesti yang mulai menulis bacaan meter sungguhan"""
+        with self._kunci:
+            self.ingesti_aktif += 1
+
+    def selesai_ingesti(self):
+        """Pasangan mulai_ingesti, dipanggil saat pipa berhenti"""
+        with self._kunci:
+            self.ingesti_aktif -= 1
+
+    def __len__(self):
+        return self._n
+
+    # Shim kompatibilitas: perilaku seperti list of {'hari', 'penggunaan'}
+    def __getitem__(self, indeks):
+        """Mengembalikan satu bacaan sebagai dict"""
+        waktu, kwh, n = self._potret()
+        if indeks < 0:
+            indeks += n
+        if not 0 <= indeks < n:
+            raise IndexError('indeks bacaan di luar jangkauan')
+        return {
+            'hari': indeks + 1,
+            'waktu': waktu[indeks],
+            'penggunaan': float(kwh[indeks]),
+        }
+
+    def __iter__(self):
+        for indeks in range(self._n):
+            yield self[indeks]
+
+    def append(self, bacaan):
+        """Menambahkan bacaan dalam bentuk dict lama {'hari', 'penggunaan'}"""
+        self.tambah(bacaan['penggunaan'], bacaan.get('waktu'))
+
+    def sebagai_list(self):
+        """Seluruh bacaan sebagai list of dict (format lama)"""
+        return list(self)
+
+    # Penambahan data
+    def _pastikan_kapasitas(self, jumlah_tambahan):
+        """Memperbesar buffer (dua kali lipat) bila kapasitas tidak cukup"""
+        dibutuhkan = self._n + jumlah_tambahan
+        kapasitas = len(self._kwh)
+        if dibutuhkan <= kapasitas and self._kwh.flags.writeable:
+            return
+        kapasitas_baru = max(dibutuhkan, kapasitas * 2, KAPASITAS_AWAL)
+        for nama in ('_waktu', '_kwh'):
+            lama = getattr(self, nama)
+            baru = np.empty(kapasitas_baru, dtype=lama.dtype)
+            baru[:self._n] = lama[:self._n]
+            setattr(self, nama, baru)
+
+    def _potret(self):
+        """(buffer waktu, buffer kwh, panjang) yang konsisten satu sama lain"""
+        with self._kunci:
+            return self._waktu, self._kwh, self._n
+
+    def waktu_terakhir(self):
+        """Waktu bacaan terakhir, atau None jika deret kosong"""
+        waktu, _, n = self._potret()
+        return waktu[n - 1] if n else None
+
+    def tambah(self, kwh, waktu=None):
+        """Menambahkan satu bacaan; tanpa waktu, bacaan diletakkan satu langkah setelah yang terakhir"""
+        if waktu is None:
+            terakhir = self.waktu_terakhir()
+            if terakhir is None:
+                waktu = np.datetime64('today').astype(TIPE_WAKTU)
+            else:
+                waktu = terakhir + LANGKAH_DEFAULT
+        self.tambah_batch([waktu], [kwh])
+
+    def tambah_batch(self, waktu, kwh):
+        """Menambahkan banyak bacaan sekaligus; waktu harus tidak menurun"""
+        waktu = _ke_waktu(waktu)
+        kwh = np.asarray(kwh, dtype=np.float64)
+        if waktu.shape != kwh.shape or waktu.ndim != 1:
+            raise ValueError('waktu dan kwh harus array 1 dimensi dengan panjang sama')
+        if not len(waktu):
+            return
+        if np.any(waktu[1:] < waktu[:-1]):
+            raise ValueError('waktu bacaan harus terurut tidak menurun')
+
+        with self._kunci:
+            if self._n and waktu[0] < self._waktu[self._n - 1]:
+                raise ValueError('waktu bacaan lebih awal dari bacaan terakhir')
+            self._pastikan_kapasitas(len(waktu))
+            awal, akhir = self._n, self._n + len(waktu)
+            self._waktu[awal:akhir] = waktu
+            self._kwh[awal:akhir] = kwh
+            self._n = akhir
+            self.versi += 1
+        for fungsi in self._pendengar:
+            fungsi(waktu, kwh)
+
+    def kosongkan(self):
+        """Menghapus seluruh bacaan (buffer tetap dipakai ulang)"""
+        with self._kunci:
+            self._n = 0
+            self.versi += 1
+
+    # Pembacaan (tanpa salinan)
+    def waktu(self):
+        """View baca-saja seluruh waktu bacaan"""
+        waktu, _, n = self._potret()
+        return self._view(waktu, 0, n)
+
+    def kwh(self):
+        """View baca-saja seluruh nilai kWh"""
+        _, kwh, n = self._potret()
+        return self._view(kwh, 0, n)
+
+    @staticmethod
+    def _view(array, awal, akhir):
+        view = array[awal:akhir]
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def _cari_rentang(waktu, n, awal, akhir):
+        waktu = waktu[:n]
+        mulai = 0 if awal is None else int(np.searchsorted(waktu, _ke_waktu(awal), 'left'))
+        selesai = n if akhir is None else int(np.searchsorted(waktu, _ke_waktu(akhir), 'right'))
+        return mulai, max(mulai, selesai)
+
+    def indeks_rentang(self, awal=None, akhir=None):
+        """Indeks [mulai, selesai) untuk bacaan dengan awal <= waktu <= akhir"""
+        waktu, _, n = self._potret()
+        return self._cari_rentang(waktu, n, awal, akhir)
+
+    def rentang(self, awal=None, akhir=None):
+        """View (waktu, kwh) untuk rentang waktu tertentu tanpa menyalin data"""
+        waktu, kwh, n = self._potret()
+        mulai, selesai = self._cari_rentang(waktu, n, awal, akhir)
+        return self._view(waktu, mulai, selesai), self._view(kwh, mulai, selesai)
+
+    def ke_dataframe(self, awal=None, akhir=None):
+        """DataFrame pandas (kolom waktu, penggunaan) yang berbagi memori dengan buffer"""
+        import pandas as pd
+
+        waktu, kwh = self.rentang(awal, akhir)
+        return pd.DataFrame({'waktu': waktu, 'penggunaan': kwh}, copy=False)
+
+    @instrumentasi.diukur()
+    def sampel(self, awal=None, akhir=None, jumlah_titik=800, metode='lttb'):
+        """(waktu, kwh) hasil downsampling untuk grafik, di-cache per (versi, rentang, resolusi)"""
+        versi = self.versi
+        semua_waktu, semua_kwh, n = self._potret()
+        mulai, selesai = self._cari_rentang(semua_waktu, n, awal, akhir)
+        kunci = (versi, mulai, selesai, jumlah_titik, metode)
+        hasil = self._cache_sampel.get(kunci)
+        if hasil is not None:
+            self._cache_sampel.move_to_end(kunci)
+            return hasil
+
+        waktu = semua_waktu[mulai:selesai]
+        kwh = semua_kwh[mulai:selesai]
+        indeks = sampel_indeks(waktu, kwh, jumlah_titik, metode)
+        hasil = (waktu[indeks], kwh[indeks])
+        self._cache_sampel[kunci] = hasil
+        if len(self._cache_sampel) > UKURAN_CACHE_SAMPEL:
+            self._cache_sampel.popitem(last=False)
+        return hasil
@@ -0,0 +1,72 @@
+"""Downsampling deret waktu untuk grafik (LTTB dan min-max per bucket)"""
+import numpy as np
+
+METODE = ('lttb', 'minmax')
+
+
+def _ke_float(x):
+    """Sumbu x sebagai float64 (datetime64 dikonversi ke bilangan bulat)"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('int64')
+    return x.astype(np.float64)
+
+
+def minmax(y, jumlah_titik):
+    """Indeks titik minimum dan maksimum setiap bucket (sekitar jumlah_titik titik)"""
+    n = len(y)
+    jumlah_bucket = max(1, jumlah_titik // 2)
+    if n <= jumlah_titik:
+        return np.arange(n)
+    batas = np.linspace(0, n, jumlah_bucket + 1).astype(np.int64)[:-1]
+    y = np.asarray(y)
+    # reduceat memberi nilai min/maks; argmin/argmax per bucket dicari lewat pencocokan
+    nilai_min = np.minimum.reduceat(y, batas)
+    nilai_maks = np.maximum.reduceat(y, batas)
+    bucket = np.repeat(np.arange(jumlah_bucket), np.diff(np.append(batas, n)))
+    cocok_min = np.flatnonzero(y == nilai_min[bucket])
+    cocok_maks = np.flatnonzero(y == nilai_maks[bucket])
+    # Ambil kecocokan pertama di setiap bucket
+    indeks_min = cocok_min[np.unique(bucket[cocok_min], return_index=True)[1]]
+    indeks_maks = cocok_maks[np.unique(bucket[cocok_maks], return_index=True)[1]]
+    return np.unique(np.concatenate([indeks_min, indeks_maks, [0, n - 1]]))
+
+
+def lttb(x, y, jumlah_titik):
+    """Indeks titik terpilih menurut Largest-Triangle-Three-Buckets"""
+    n = len(y)
+    if n <= jumlah_titik or jumlah_titik < 3:
+        return np.arange(n)
+    x = _ke_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket untuk titik 1..n-2; titik pertama dan terakhir selalu dipilih
+    batas = np.linspace(1, n - 1, jumlah_titik - 1).astype(np.int64)
+    terpilih = np.empty(jumlah_titik, dtype=np.int64)
+    terpilih[0] = 0
+    terpilih[-1] = n - 1
+    a = 0
+    for i in range(jumlah_titik - 2):
+        mulai, selesai = batas[i], batas[i + 1]
+        # Titik acuan: rata-rata bucket berikutnya (atau titik terakhir)
+        if i + 2 < len(batas):
+            berikut_mulai, berikut_selesai = batas[i + 1], batas[i + 2]
+            cx = x[berikut_mulai:berikut_selesai].mean()
+            cy = y[berikut_mulai:berikut_selesai].mean()
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+        luas = np.abs(
+            (ax - cx) * (y[mulai:selesai] - ay) - (ax - x[mulai:selesai]) * (cy - ay)
+        )
+        a = mulai + int(np.argmax(luas))
+        terpilih[i + 1] = a
+    return terpilih
+
+
+def sampel_indeks(x, y, jumlah_titik, metode='lttb'):
+    """Indeks titik hasil downsampling dengan metode 'lttb' atau 'minmax'"""
+    if metode == 'lttb':
+        return lttb(x, y, jumlah_titik)
+    if metode == 'minmax':
+        return minmax(y, jumlah_titik)
+    raise ValueError(f"Metode downsampling tidak dikenal: {metode}")
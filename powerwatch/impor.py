@@ -0,0 +1,191 @@
+"""Impor peralatan massal dari kolom, CSV, atau Parquet"""
+import csv
+import io
+import os
+
+import numpy as np
+
+KOLOM_WAJIB = ('nama', 'unit', 'watt', 'golongan', 'jam_per_hari')
+KOLOM_OPSIONAL = ('jam_mulai',)
+UKURAN_CHUNK = 100_000
+
+
+def _contoh_baris(mask, awal_baris, maks=5):
+    """Nomor baris (dimulai dari 1) pertama yang ditandai mask"""
+    baris = (np.flatnonzero(mask)[:maks] + awal_baris + 1).tolist()
+    return ', '.join(map(str, baris))
+
+
+def _ke_angka(nilai, nama_kolom, awal_baris):
+    """Konversi kolom ke float64; menunjukkan baris yang bukan angka"""
+    try:
+        return np.asarray(nilai, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    hasil = np.empty(len(nilai), dtype=np.float64)
+    salah = np.zeros(len(nilai), dtype=bool)
+    for i, x in enumerate(nilai):
+        try:
+            hasil[i] = float(x)
+        except (TypeError, ValueError):
+            salah[i] = True
+    raise ValueError(
+        f"Kolom '{nama_kolom}' berisi nilai bukan angka pada baris {_contoh_baris(salah, awal_baris)}"
+    )
+
+
+def ambil_kolom(data):
+    """Mengambil kolom wajib (dan opsional bila ada) dari dict kolom, DataFrame, atau list tuple"""
+    if isinstance(data, (list, tuple)):
+        baris = list(data)
+        if not baris:
+            return {nama: [] for nama in KOLOM_WAJIB}
+        if isinstance(baris[0], dict):
+            kolom = {nama: [b.get(nama) for b in baris] for nama in KOLOM_WAJIB}
+            for nama in KOLOM_OPSIONAL:
+                if nama in baris[0]:
+                    kolom[nama] = [b.get(nama) for b in baris]
+            return kolom
+        return dict(zip(KOLOM_WAJIB + KOLOM_OPSIONAL, (list(k) for k in zip(*baris))))
+    hilang = [nama for nama in KOLOM_WAJIB if nama not in data]
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+    return {nama: data[nama] for nama in KOLOM_WAJIB + KOLOM_OPSIONAL if nama in data}
+
+
+def pemeriksaan(nama_asli, nama, golongan, unit, watt, jam, golongan_valid):
+    """Daftar (mask baris salah, pesan) untuk setiap aturan validasi"""
+    return [
+        (np.equal(nama_asli, None) | (nama_asli != nama_asli)
+         | (np.char.str_len(np.char.strip(nama)) == 0), 'nama kosong'),
+        (~np.isin(golongan, list(golongan_valid)),
+         f"golongan bukan salah satu dari {', '.join(golongan_valid)}"),
+        (~np.isfinite(unit) | (unit < 1) | (unit != np.round(unit)),
+         'unit harus bilangan bulat >= 1'),
+        (~np.isfinite(watt) | (watt <= 0), 'watt harus > 0'),
+        (~np.isfinite(jam) | (jam <= 0) | (jam > 24), 'jam_per_hari harus di antara 0 dan 24'),
+    ]
+
+
+def validasi_kolom(data, golongan_valid, awal_baris=0):
+    """Validasi vektor kolom peralatan dan mengembalikan array yang siap disimpan"""
+    kolom = ambil_kolom(data)
+    nama_asli = np.asarray(kolom['nama'], dtype=object)
+    nama = nama_asli.astype(str)
+    golongan = np.asarray(kolom['golongan'], dtype=object).astype(str)
+    unit = _ke_angka(kolom['unit'], 'unit', awal_baris)
+    watt = _ke_angka(kolom['watt'], 'watt', awal_baris)
+    jam = _ke_angka(kolom['jam_per_hari'], 'jam_per_hari', awal_baris)
+
+    if 'jam_mulai' in kolom:
+        jam_mulai = np.array(
+            [np.nan if x is None or x == '' else x for x in kolom['jam_mulai']], dtype=object
+        )
+        jam_mulai = _ke_angka(jam_mulai, 'jam_mulai', awal_baris)
+    else:
+        jam_mulai = np.full(len(nama), np.nan)
+
+    panjang = {len(nama), len(golongan), len(unit), len(watt), len(jam), len(jam_mulai)}
+    if len(panjang) != 1:
+        raise ValueError('Panjang kolom peralatan tidak sama')
+
+    pemeriksaan_baris = pemeriksaan(nama_asli, nama, golongan, unit, watt, jam, golongan_valid)
+    pemeriksaan_baris.append(
+        ((jam_mulai < 0) | (jam_mulai >= 24), 'jam_mulai harus di antara 0 dan 24 (atau kosong)')
+    )
+    for salah, pesan in pemeriksaan_baris:
+        if salah.any():
+            raise ValueError(
+                f'{int(salah.sum())} baris tidak valid ({pesan}), '
+                f'misalnya baris {_contoh_baris(salah, awal_baris)}'
+            )
+
+    return {
+        'nama': nama,
+        'unit': unit.astype(np.int64),
+        'watt': watt,
+        'golongan': golongan,
+        'jam_per_hari': jam,
+        'jam_mulai': jam_mulai,
+    }
+
+
+def _tebak_format(berkas):
+    """Menentukan format berkas ('csv' atau 'parquet') dari ekstensinya"""
+    nama = berkas if isinstance(berkas, (str, os.PathLike)) else getattr(berkas, 'name', '')
+    ekstensi = os.path.splitext(str(nama))[1].lower()
+    if ekstensi in ('.parquet', '.pq'):
+        return 'parquet'
+    if ekstensi in ('.csv', '.txt', ''):
+        return 'csv'
+    raise ValueError(f'Format berkas tidak didukung: {ekstensi}')
+
+
+def _baca_csv_stdlib(berkas, ukuran_chunk):
+    """Membaca CSV per chunk dengan modul csv bawaan (tanpa memuat pandas)"""
+    dari_path = isinstance(berkas, (str, os.PathLike))
+    if dari_path:
+        teks = open(berkas, newline='', encoding='utf-8')
+    else:
+        teks = io.TextIOWrapper(berkas, encoding='utf-8', newline='')
+    try:
+        pembaca = csv.reader(teks)
+        header = [h.strip() for h in next(pembaca, [])]
+        hilang = [n for n in KOLOM_WAJIB if n not in header]
+        if hilang:
+            raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+        nama_kolom = KOLOM_WAJIB + tuple(n for n in KOLOM_OPSIONAL if n in header)
+        posisi = [header.index(n) for n in nama_kolom]
+
+        baris = []
+        for b in pembaca:
+            if not b:
+                continue
+            baris.append([b[i] if i < len(b) else None for i in posisi])
+            if len(baris) == ukuran_chunk:
+                yield dict(zip(nama_kolom, (list(k) for k in zip(*baris))))
+                baris = []
+        if baris:
+            yield dict(zip(nama_kolom, (list(k) for k in zip(*baris))))
+    finally:
+        if dari_path:
+            teks.close()
+        else:
+            # Berkas milik pemanggil tidak ikut ditutup
+            teks.detach()
+
+
+def baca_chunk(berkas, format=None, ukuran_chunk=UKURAN_CHUNK, pakai_pandas=True):
+    """Membaca berkas inventaris per chunk sebagai dict kolom"""
+    format = format or _tebak_format(berkas)
+    if format == 'csv' and not pakai_pandas:
+        yield from _baca_csv_stdlib(berkas, ukuran_chunk)
+    elif format == 'csv':
+        import pandas as pd
+
+        pembaca = pd.read_csv(
+            berkas, usecols=lambda nama: nama in KOLOM_WAJIB + KOLOM_OPSIONAL,
+            chunksize=ukuran_chunk, dtype={'nama': str, 'golongan': str},
+        )
+        for chunk in pembaca:
+            hilang = [n for n in KOLOM_WAJIB if n not in chunk.columns]
+            if hilang:
+                raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+            yield {nama: chunk[nama].to_numpy() for nama in chunk.columns}
+    elif format == 'parquet':
+        import pyarrow.parquet as pq
+
+        berkas_parquet = pq.ParquetFile(berkas)
+        hilang = [n for n in KOLOM_WAJIB if n not in berkas_parquet.schema_arrow.names]
+        if hilang:
+            raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+        nama_kolom = KOLOM_WAJIB + tuple(
+            n for n in KOLOM_OPSIONAL if n in berkas_parquet.schema_arrow.names
+        )
+        for batch in berkas_parquet.iter_batches(batch_size=ukuran_chunk, columns=list(nama_kolom)):
+            yield {
+                nama: batch.column(nama).to_numpy(zero_copy_only=False)
+                for nama in nama_kolom
+            }
+    else:
+        raise ValueError(f'Format berkas tidak didukung: {format}')
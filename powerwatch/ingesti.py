@@ -0,0 +1,351 @@
+"""Ingesti bacaan meter secara streaming (asyncio) ke deret penggunaan MonitorListrik
+
+Setiap sumber adalah async iterator yang menghasilkan batch (waktu, kwh)
+berupa array NumPy. Format teks yang dipakai sumber berkas dan socket adalah
+satu bacaan per baris: ``detik_epoch,kwh``.
+"""
+import asyncio
+import io
+import os
+import threading
+import time
+
+import numpy as np
+
+from .deret_waktu import TIPE_WAKTU
+
+UKURAN_BATCH = 50_000
+MAKS_ANTREAN = 8
+
+
+def _urai_per_baris(teks):
+    """Jalur lambat urai_baris: baris demi baris; baris yang salah menjadi NaN"""
+    pasangan = []
+    for baris in teks.splitlines():
+        if not baris.strip():
+            continue
+        bagian = baris.split(',')
+        try:
+            pasangan.append((float(bagian[0]), float(bagian[1])) if len(bagian) == 2 else (np.nan, np.nan))
+        except ValueError:
+            pasangan.append((np.nan, np.nan))
+    return np.array(pasangan, dtype=np.float64).reshape(-1, 2)
+
+
+def urai_baris(data):
+    """Mengurai teks ``detik_epoch,kwh`` per baris menjadi (waktu, kwh, jumlah baris salah)
+
+    Baris yang bukan dua angka berhingga (header, baris rusak) dilewati dan
+    dihitung, sehingga satu baris buruk tidak menghentikan ingesti.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('ascii', errors='ignore')
+    pasangan = None
+    if data.strip():
+        try:
+            pasangan = np.loadtxt(io.StringIO(data), dtype=np.float64, delimiter=',',
+                                  comments=None, ndmin=2)
+        except ValueError:
+            pass
+    if pasangan is None or pasangan.shape[1] != 2:
+        pasangan = _urai_per_baris(data)
+    valid = np.isfinite(pasangan).all(axis=1)
+    salah = len(valid) - int(np.count_nonzero(valid))
+    if salah:
+        pasangan = pasangan[valid]
+    return pasangan[:, 0].astype(np.int64).astype(TIPE_WAKTU), pasangan[:, 1], salah
+
+
+def buang_header(data):
+    """Membuang baris pertama jika bukan bacaan (mis. header ``waktu,kwh``)"""
+    akhir = data.find(b'\n')
+    pertama = data if akhir < 0 else data[:akhir]
+    try:
+        float(pertama.split(b',')[0])
+        return data
+    except ValueError:
+        return b'' if akhir < 0 else data[akhir + 1:]
+
+
+def _pisah_baris_lengkap(sisa, potongan):
+    """Memisahkan baris lengkap dari potongan data; mengembalikan (lengkap, sisa baru)"""
+    data = sisa + potongan
+    akhir = data.rfind(b'\n')
+    if akhir < 0:
+        return b'', data
+    return data[:akhir], data[akhir + 1:]
+
+
+class SumberSimulator:
+    def __init__(self, laju=100_000, ukuran_batch=10_000, interval_detik=60,
+                 rata_kwh=0.01, mulai=None, jumlah=None, seed=None):
+        """Simulator meter lokal: laju bacaan per detik (None = secepatnya)"""
+        self.laju = laju
+        self.ukuran_batch = ukuran_batch
+        self.interval = np.timedelta64(interval_detik, 's')
+        self.rata_kwh = rata_kwh
+        self.mulai = mulai
+        self.jumlah = jumlah
+        self.rng = np.random.default_rng(seed)
+
+    async def __aiter__(self):
+        waktu = np.datetime64('now', 's') if self.mulai is None else np.datetime64(self.mulai, 's')
+        terkirim = 0
+        awal_jam_dinding = time.perf_counter()
+        while self.jumlah is None or terkirim < self.jumlah:
+            ukuran = self.ukuran_batch
+            if self.jumlah is not None:
+                ukuran = min(ukuran, self.jumlah - terkirim)
+            batch_waktu = waktu + self.interval * np.arange(ukuran)
+            batch_kwh = self.rng.gamma(4.0, self.rata_kwh / 4.0, size=ukuran)
+            waktu = batch_waktu[-1] + self.interval
+            terkirim += ukuran
+            yield batch_waktu, batch_kwh
+            if self.laju:
+                # Jaga laju rata-rata sesuai target
+                tunda = terkirim / self.laju - (time.perf_counter() - awal_jam_dinding)
+                await asyncio.sleep(max(0.0, tunda))
+            else:
+                await asyncio.sleep(0)
+
+
+class SumberReplayCSV:
+    def __init__(self, path, kecepatan=1.0, ukuran_chunk=UKURAN_BATCH):
+        """Memutar ulang rekaman CSV detik_epoch,kwh dengan kecepatan N kali waktu asli"""
+        self.path = path
+        self.kecepatan = kecepatan
+        self.ukuran_chunk = ukuran_chunk
+        self.baris_salah = 0
+
+    async def __aiter__(self):
+        awal_rekaman = None
+        awal_jam_dinding = time.perf_counter()
+        with open(self.path, 'rb') as berkas:
+            sisa = b''
+            pertama = True
+            while True:
+                potongan = await asyncio.to_thread(berkas.read, self.ukuran_chunk * 32)
+                if not potongan:
+                    lengkap, sisa = sisa, b''
+                else:
+                    lengkap, sisa = _pisah_baris_lengkap(sisa, potongan)
+                if pertama and (lengkap or not potongan):
+                    # Rekaman CSV boleh diawali header kolom
+                    lengkap = buang_header(lengkap)
+                    pertama = False
+                if lengkap.strip():
+                    waktu, kwh, salah = urai_baris(lengkap)
+                    self.baris_salah += salah
+                    if not len(waktu):
+                        continue
+                    if awal_rekaman is None:
+                        awal_rekaman = waktu[0]
+                    if self.kecepatan:
+                        detik_rekaman = (waktu[-1] - awal_rekaman) / np.timedelta64(1, 's')
+                        tunda = detik_rekaman / self.kecepatan - (time.perf_counter() - awal_jam_dinding)
+                        await asyncio.sleep(max(0.0, tunda))
+                    yield waktu, kwh
+                if not potongan:
+                    return
+
+
+class SumberTailBerkas:
+    def __init__(self, path, interval_poll=0.2, dari_awal=False):
+        """Mengikuti (tail) berkas yang terus ditambahi baris detik_epoch,kwh"""
+        self.path = path
+        self.interval_poll = interval_poll
+        self.dari_awal = dari_awal
+        self.baris_salah = 0
+
+    async def __aiter__(self):
+        with open(self.path, 'rb') as berkas:
+            if not self.dari_awal:
+                berkas.seek(0, os.SEEK_END)
+            sisa = b''
+            pertama = self.dari_awal
+            while True:
+                potongan = berkas.read(1 << 20)
+                if not potongan:
+                    await asyncio.sleep(self.interval_poll)
+                    continue
+                lengkap, sisa = _pisah_baris_lengkap(sisa, potongan)
+                if pertama and lengkap:
+                    lengkap = buang_header(lengkap)
+                    pertama = False
+                if lengkap.strip():
+                    waktu, kwh, salah = urai_baris(lengkap)
+                    self.baris_salah += salah
+                    if len(waktu):
+                        yield waktu, kwh
+
+
+class SumberSocket:
+    def __init__(self, host='127.0.0.1', port=9870, protokol='udp', maks_antrean=MAKS_ANTREAN):
+        """Menerima baris detik_epoch,kwh lewat socket UDP (datagram) atau TCP lokal"""
+        if protokol not in ('udp', 'tcp'):
+            raise ValueError("protokol harus 'udp' atau 'tcp'")
+        self.host = host
+        self.port = port
+        self.protokol = protokol
+        self.maks_antrean = maks_antrean
+        self.siap = None  # asyncio.Event, diset saat socket sudah mendengarkan
+        self.baris_salah = 0
+
+    async def __aiter__(self):
+        antrean = asyncio.Queue(self.maks_antrean)
+        self.siap = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        if self.protokol == 'udp':
+            class _Protokol(asyncio.DatagramProtocol):
+                def datagram_received(self, data, alamat):
+                    # UDP tidak punya backpressure; datagram dibuang jika antrean penuh
+                    if not antrean.full():
+                        antrean.put_nowait(data)
+
+            transport, _ = await loop.create_datagram_endpoint(
+                _Protokol, local_addr=(self.host, self.port)
+            )
+            penutup = transport.close
+        else:
+            async def tangani(reader, writer):
+                sisa = b''
+                while potongan := await reader.read(1 << 20):
+                    lengkap, sisa = _pisah_baris_lengkap(sisa, potongan)
+                    if lengkap:
+                        # Menunggu di sini memberi backpressure ke pengirim TCP
+                        await antrean.put(lengkap)
+                if sisa.strip():
+                    await antrean.put(sisa)
+                writer.close()
+
+            server = await asyncio.start_server(tangani, self.host, self.port)
+            penutup = server.close
+
+        self.siap.set()
+        try:
+            while True:
+                data = await antrean.get()
+                if data.strip():
+                    waktu, kwh, salah = urai_baris(data)
+                    self.baris_salah += salah
+                    if len(waktu):
+                        yield waktu, kwh
+        finally:
+            penutup()
+
+
+class PipaIngesti:
+    def __init__(self, deret, sumber, ukuran_batch=UKURAN_BATCH, maks_antrean=MAKS_ANTREAN):
+        """Pipa sumber -> antrean terbatas -> penulisan batch ke DeretWaktu"""
+        self.deret = deret
+        self.sumber = sumber
+        self.ukuran_batch = ukuran_batch
+        self.maks_antrean = maks_antrean
+        self.diterima = 0
+        self.ditulis = 0
+        self.dibuang = 0  # Bacaan yang lebih lama dari bacaan terakhir di deret
+
+    @property
+    def baris_salah(self):
+        """Baris teks yang dilewati sumber karena bukan bacaan (header, baris rusak)"""
+        return getattr(self.sumber, 'baris_salah', 0)
+
+    def _tulis(self, daftar_waktu, daftar_kwh):
+        """Menulis satu batch gabungan; bacaan yang terlambat dibuang"""
+        waktu = np.concatenate(daftar_waktu)
+        kwh = np.concatenate(daftar_kwh)
+        if np.any(waktu[1:] < waktu[:-1]):
+            urutan = np.argsort(waktu, kind='stable')
+            waktu, kwh = waktu[urutan], kwh[urutan]
+        terakhir = self.deret.waktu_terakhir()
+        if terakhir is not None:
+            mulai = int(np.searchsorted(waktu, terakhir, 'left'))
+            self.dibuang += mulai
+            waktu, kwh = waktu[mulai:], kwh[mulai:]
+        self.deret.tambah_batch(waktu, kwh)
+        self.ditulis += len(waktu)
+
+    async def _produsen(self, antrean):
+        try:
+            async for waktu, kwh in self.sumber:
+                self.diterima += len(waktu)
+                # put() menunggu saat antrean penuh: backpressure ke sumber
+                await antrean.put((waktu, kwh))
+        finally:
+            await antrean.put(None)
+
+    async def _konsumen(self, antrean):
+        selesai = False
+        while not selesai:
+            item = await antrean.get()
+            if item is None:
+                break
+            daftar_waktu, daftar_kwh = [item[0]], [item[1]]
+            jumlah = len(item[0])
+            # Gabungkan yang sudah menunggu agar penulisan tetap berupa batch besar
+            while jumlah < self.ukuran_batch and not antrean.empty():
+                item = antrean.get_nowait()
+                if item is None:
+                    selesai = True
+                    break
+                daftar_waktu.append(item[0])
+                daftar_kwh.append(item[1])
+                jumlah += len(item[0])
+            self._tulis(daftar_waktu, daftar_kwh)
+
+    async def jalankan(self):
+        """Menjalankan pipa sampai sumber habis (atau dibatalkan)"""
+        antrean = asyncio.Queue(self.maks_antrean)
+        konsumen = asyncio.create_task(self._konsumen(antrean))
+        self.deret.mulai_ingesti()
+        try:
+            await self._produsen(antrean)
+            await konsumen
+        finally:
+            konsumen.cancel()
+            self.deret.selesai_ingesti()
+
+    def jalankan_di_latar(self):
+        """Menjalankan pipa di thread latar belakang dengan event loop sendiri"""
+        return IngestiLatar(self)
+
+
+class IngestiLatar:
+    def __init__(self, pipa):
+        """Thread latar belakang yang menjalankan sebuah PipaIngesti"""
+        self.pipa = pipa
+        self.galat = None
+        self._loop = asyncio.new_event_loop()
+        self._tugas = None
+        # Diset setelah _tugas dibuat, agar hentikan() selalu punya tugas untuk dibatalkan
+        self._siap = threading.Event()
+        self._thread = threading.Thread(target=self._jalankan, name='ingesti-meter', daemon=True)
+        self._thread.start()
+
+    def _jalankan(self):
+        asyncio.set_event_loop(self._loop)
+        self._tugas = self._loop.create_task(self.pipa.jalankan())
+        self._siap.set()
+        try:
+            self._loop.run_until_complete(self._tugas)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.galat = e
+        finally:
+            self._loop.close()
+
+    def aktif(self):
+        return self._thread.is_alive()
+
+    def hentikan(self, batas_waktu=5.0):
+        """Menghentikan pipa dan menunggu thread selesai"""
+        batas = time.monotonic() + batas_waktu
+        if self._siap.wait(batas_waktu) and self._thread.is_alive():
+            try:
+                self._loop.call_soon_threadsafe(self._tugas.cancel)
+            except RuntimeError:
+                # Loop sudah ditutup: pipa telah selesai sendiri
+                pass
+        self._thread.join(max(batas - time.monotonic(), 0))
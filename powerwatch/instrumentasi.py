@@ -0,0 +1,293 @@
+"""Instrumentasi opsional: rentang waktu, histogram latensi rerun, dan gauge memori
+
+Nonaktif secara default; aktif bila $POWERWATCH_INSTRUMENTASI diset (atau
+lewat aktifkan()). Saat nonaktif, rentang() mengembalikan satu konteks kosong
+bersama dan fungsi yang didekorasi diukur() hanya menambah satu pemeriksaan
+bendera per panggilan.
+
+Rentang bersarang dicatat dengan nama jalurnya, misalnya
+'rerun:app.py > tampilan:dashboard > px.pie', sehingga waktu satu rerun
+terurai menjadi perhitungan MonitorListrik, pembangunan DataFrame (waktu
+sendiri rentang tampilan), figure Plotly, dan serialisasi Streamlit.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+VARIABEL_LINGKUNGAN = 'POWERWATCH_INSTRUMENTASI'
+VARIABEL_EKSPOR = 'POWERWATCH_INSTRUMENTASI_EKSPOR'  # berkas .json atau teks Prometheus
+BATAS_HISTOGRAM = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INTERVAL_EKSPOR = 5.0  # detik minimum antar penulisan berkas ekspor
+MAKS_GAUGE = 1000  # gauge tertua (mis. sesi yang sudah berakhir) dibuang setelah ini
+PEMISAH = ' > '
+# Fungsi Streamlit/Plotly yang diberi rentang saat instrumentasi dipasang ke halaman
+FUNGSI_STREAMLIT = ('plotly_chart', 'dataframe', 'data_editor')
+FUNGSI_PLOTLY = ('line', 'bar', 'pie', 'histogram', 'scatter')
+
+_aktif = bool(os.environ.get(VARIABEL_LINGKUNGAN))
+_konteks_kosong = contextlib.nullcontext()
+
+
+class StatistikRentang:
+    __slots__ = ('jumlah', 'total', 'sendiri', 'maks', 'ember')
+
+    def __init__(self):
+        """Jumlah, total waktu, waktu sendiri (tanpa anak), maksimum, dan histogram"""
+        self.jumlah = 0
+        self.total = 0.0
+        self.sendiri = 0.0
+        self.maks = 0.0
+        self.ember = [0] * (len(BATAS_HISTOGRAM) + 1)
+
+    def catat(self, durasi, sendiri):
+        self.jumlah += 1
+        self.total += durasi
+        self.sendiri += sendiri
+        self.maks = max(self.maks, durasi)
+        i = 0
+        while i < len(BATAS_HISTOGRAM) and durasi > BATAS_HISTOGRAM[i]:
+            i += 1
+        self.ember[i] += 1
+
+
+class Pencatat:
+    def __init__(self):
+        """Penampung statistik rentang dan gauge, aman dipakai banyak thread (sesi)"""
+        self._kunci = threading.Lock()
+        self._lokal = threading.local()
+        self.rentang = {}
+        self.gauge = {}
+        self._ekspor_terakhir = 0.0
+
+    def _tumpukan(self):
+        tumpukan = getattr(self._lokal, 'tumpukan', None)
+        if tumpukan is None:
+            tumpukan = self._lokal.tumpukan = []
+        return tumpukan
+
+    def mulai(self, nama):
+        tumpukan = self._tumpukan()
+        jalur = tumpukan[-1][0] + PEMISAH + nama if tumpukan else nama
+        # [jalur, waktu mulai, total waktu anak]
+        tumpukan.append([jalur, time.perf_counter(), 0.0])
+
+    def selesai(self):
+        tumpukan = self._tumpukan()
+        jalur, mulai, anak = tumpukan.pop()
+        durasi = time.perf_counter() - mulai
+        if tumpukan:
+            tumpukan[-1][2] += durasi
+        with self._kunci:
+            statistik = self.rentang.get(jalur)
+            if statistik is None:
+                statistik = self.rentang[jalur] = StatistikRentang()
+            statistik.catat(durasi, durasi - anak)
+
+    def set_gauge(self, nama, nilai, **label):
+        kunci = (nama, tuple(sorted(label.items())))
+        with self._kunci:
+            self.gauge.pop(kunci, None)
+            self.gauge[kunci] = float(nilai)
+            while len(self.gauge) > MAKS_GAUGE:
+                del self.gauge[next(iter(self.gauge))]
+
+    def reset(self):
+        with self._kunci:
+            self.rentang.clear()
+            self.gauge.clear()
+
+
+PENCATAT = Pencatat()
+
+
+class _Rentang:
+    __slots__ = ('nama',)
+
+    def __init__(self, nama):
+        self.nama = nama
+
+    def __enter__(self):
+        PENCATAT.mulai(self.nama)
+        return self
+
+    def __exit__(self, *exc):
+        PENCATAT.selesai()
+        return False
+
+
+def aktif():
+    """True jika instrumentasi sedang aktif"""
+    return _aktif
+
+
+def aktifkan(nilai=True):
+    """Menyalakan atau mematikan instrumentasi pada saat berjalan"""
+    global _aktif
+    _aktif = bool(nilai)
+
+
+def reset():
+    """Menghapus semua statistik dan gauge"""
+    PENCATAT.reset()
+
+
+def rentang(nama):
+    """Konteks yang mengukur bloknya sebagai rentang `nama` (tanpa biaya bila nonaktif)"""
+    if not _aktif:
+        return _konteks_kosong
+    return _Rentang(nama)
+
+
+def jalankan(nama, fungsi):
+    """fungsi() di dalam rentang `nama`"""
+    with rentang(nama):
+        return fungsi()
+
+
+def diukur(nama=None):
+    """Dekorator: setiap panggilan diukur sebagai rentang (default: nama kualifikasi fungsi)"""
+    def dekorator(fungsi):
+        label = nama or fungsi.__qualname__
+
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            if not _aktif:
+                return fungsi(*args, **kwargs)
+            with _Rentang(label):
+                return fungsi(*args, **kwargs)
+        return pembungkus
+    return dekorator
+
+
+def catat_memori(sesi, monitor):
+    """Gauge memori dan cache tampilan untuk satu sesi"""
+    PENCATAT.set_gauge('powerwatch_memori_sesi_byte', monitor.ukuran_memori(), sesi=sesi)
+    statistik = monitor.memo.statistik()
+    PENCATAT.set_gauge('powerwatch_memo_entri', statistik['ukuran'], sesi=sesi)
+    PENCATAT.set_gauge('powerwatch_memo_hit_total', statistik['hit'], sesi=sesi)
+    PENCATAT.set_gauge('powerwatch_memo_miss_total', statistik['miss'], sesi=sesi)
+
+
+# Integrasi halaman Streamlit
+_terpasang = False
+
+
+def _bungkus(objek, atribut, nama):
+    asli = getattr(objek, atribut)
+
+    @functools.wraps(asli)
+    def pembungkus(*args, **kwargs):
+        with rentang(nama):
+            return asli(*args, **kwargs)
+    setattr(objek, atribut, pembungkus)
+
+
+def pasang_streamlit():
+    """Memberi rentang pada fungsi figure Plotly Express dan elemen Streamlit (sekali per proses)"""
+    global _terpasang
+    if _terpasang:
+        return
+    import plotly.express as px
+    import streamlit as st
+
+    for atribut in FUNGSI_STREAMLIT:
+        _bungkus(st, atribut, f'st.{atribut}')
+    for atribut in FUNGSI_PLOTLY:
+        _bungkus(px, atribut, f'px.{atribut}')
+    _terpasang = True
+
+
+@contextlib.contextmanager
+def _rerun_terukur(halaman):
+    pasang_streamlit()
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    with _Rentang(f'rerun:{halaman}'):
+        yield
+    konteks = get_script_run_ctx()
+    monitor = st.session_state.get('monitor')
+    if monitor is not None:
+        catat_memori(konteks.session_id if konteks is not None else 'lokal', monitor)
+    berkas = os.environ.get(VARIABEL_EKSPOR)
+    if berkas and time.monotonic() - PENCATAT._ekspor_terakhir >= INTERVAL_EKSPOR:
+        PENCATAT._ekspor_terakhir = time.monotonic()
+        tulis_ekspor(berkas)
+
+
+def rerun(halaman):
+    """Konteks untuk seluruh rerun sebuah halaman: latensi, memori sesi, dan ekspor berkala"""
+    if not _aktif:
+        return _konteks_kosong
+    return _rerun_terukur(halaman)
+
+
+# Ekspor
+def ekspor_json():
+    """Seluruh statistik sebagai dict yang dapat di-serialisasi JSON"""
+    with PENCATAT._kunci:
+        return {
+            'batas_histogram': list(BATAS_HISTOGRAM),
+            'rentang': {
+                jalur: {
+                    'jumlah': s.jumlah, 'total': s.total, 'sendiri': s.sendiri,
+                    'maks': s.maks, 'ember': list(s.ember),
+                }
+                for jalur, s in PENCATAT.rentang.items()
+            },
+            'gauge': [
+                {'nama': nama, 'label': dict(label), 'nilai': nilai}
+                for (nama, label), nilai in PENCATAT.gauge.items()
+            ],
+        }
+
+
+def _label(pasangan):
+    teks = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pasangan
+    )
+    return '{' + teks + '}' if teks else ''
+
+
+def ekspor_prometheus():
+    """Seluruh statistik dalam format teks eksposisi Prometheus"""
+    data = ekspor_json()
+    baris = [
+        '# HELP powerwatch_rentang_detik Durasi rentang instrumentasi (detik)',
+        '# TYPE powerwatch_rentang_detik histogram',
+    ]
+    sendiri = ['# HELP powerwatch_rentang_sendiri_detik_total Waktu rentang tanpa anaknya (detik)',
+               '# TYPE powerwatch_rentang_sendiri_detik_total counter']
+    for jalur, s in data['rentang'].items():
+        kumulatif = 0
+        for batas, jumlah in zip(list(BATAS_HISTOGRAM) + ['+Inf'], s['ember']):
+            kumulatif += jumlah
+            baris.append(f"powerwatch_rentang_detik_bucket{_label([('rentang', jalur), ('le', batas)])} {kumulatif}")
+        baris.append(f"powerwatch_rentang_detik_sum{_label([('rentang', jalur)])} {s['total']}")
+        baris.append(f"powerwatch_rentang_detik_count{_label([('rentang', jalur)])} {s['jumlah']}")
+        sendiri.append(f"powerwatch_rentang_sendiri_detik_total{_label([('rentang', jalur)])} {s['sendiri']}")
+    baris += sendiri
+
+    nama_terakhir = None
+    for gauge in sorted(data['gauge'], key=lambda g: g['nama']):
+        if gauge['nama'] != nama_terakhir:
+            baris.append(f"# TYPE {gauge['nama']} gauge")
+            nama_terakhir = gauge['nama']
+        baris.append(f"{gauge['nama']}{_label(sorted(gauge['label'].items()))} {gauge['nilai']}")
+    return '\n'.join(baris) + '\n'
+
+
+def tulis_ekspor(berkas):
+    """Menulis ekspor (JSON jika berakhiran .json, selain itu teks Prometheus) secara atomik"""
+    if berkas.endswith('.json'):
+        isi = json.dumps(ekspor_json(), indent=2)
+    else:
+        isi = ekspor_prometheus()
+    sementara = f'{berkas}.{os.getpid()}.tmp'
+    with open(sementara, 'w', encoding='utf-8') as f:
+        f.write(isi)
+    os.replace(sementara, berkas)
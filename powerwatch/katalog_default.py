@@ -0,0 +1,59 @@
+"""Katalog peralatan default yang dibangun sekali per proses dan dibagi ke semua sesi"""
+import functools
+
+import numpy as np
+
+from .monitor import MonitorListrik
+
+SEED_KATALOG = 42
+
+# Peralatan default: (nama, unit, watt, golongan, jam_per_hari, jam_mulai)
+PERALATAN_DEFAULT = [
+    ('TV 21 inci', 1, 68, 'R-1', 8, 17),
+    ('Audio', 1, 50, 'R-1', 14, 7),
+    ('AC', 1, 430, 'R-1', 8, 22),
+    ('Komputer', 1, 140, 'R-1', 5, 19),
+    ('Game Player', 1, 20, 'R-1', 5, 14),
+    ('Lampu Bohlam', 3, 60, 'R-1', 8, 18),
+    ('Lampu Hemat Listrik', 5, 12, 'R-1', 8, 18),
+    ('Kipas Angin', 1, 103, 'R-1', 8, 10),
+    ('Microwave', 1, 1270, 'R-1', 1, 12),
+    ('Blender', 1, 130, 'R-1', 1.2, 6.5),
+    ('Kompor Listrik', 1, 380, 'R-1', 4, 15),
+    ('Magic jar', 1, 465, 'R-1', 9, 5),
+    ('Kulkas 120 Liter', 1, 62, 'R-1', 24, 0),
+    ('Setrika', 1, 300, 'R-1', 1, 20),
+    ('Dispenser', 1, 256, 'R-1', 24, 0),
+    ('Pemanggang Roti', 1, 380, 'R-1', 1, 6),
+    ('Mesin Cuci', 1, 550, 'R-1', 4, 8),
+    ('Pemanas Air', 1, 400, 'R-1', 2, 4.5),
+    ('Pompa Air', 1, 650, 'R-1', 3, 13)
+]
+
+
+class KatalogBersama:
+    def __init__(self, monitor):
+        """Potret baca-saja dari sebuah monitor untuk dipakai bersama banyak sesi"""
+        self.tabel = monitor.peralatan.bekukan()
+        self.total_kwh = monitor._total_kwh
+        self.kwh_per_golongan = dict(monitor._kwh_per_golongan)
+        self.tarif_listrik = dict(monitor.tarif_listrik)
+        self.tarif_terpilih = monitor.tarif_terpilih
+        self.waktu = np.array(monitor.penggunaan_harian.waktu())
+        self.kwh = np.array(monitor.penggunaan_harian.kwh())
+        self.waktu.flags.writeable = False
+        self.kwh.flags.writeable = False
+
+
+def buat_katalog(peralatan):
+    """Membangun katalog bersama dari daftar peralatan"""
+    # Benih tetap: data sampel katalog sama di setiap proses
+    monitor = MonitorListrik(seed=SEED_KATALOG)
+    monitor.tambah_peralatan_batch(peralatan)
+    return KatalogBersama(monitor)
+
+
+@functools.lru_cache(maxsize=None)
+def katalog_default():
+    """Katalog peralatan default, dibangun sekali per proses"""
+    return buat_katalog(PERALATAN_DEFAULT)
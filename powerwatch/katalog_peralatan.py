@@ -0,0 +1,308 @@
+"""Katalog model peralatan dengan pencarian awalan (trie) dan fuzzy (trigram)
+
+Sumber katalog adalah CSV di powerwatch/data (nama, jenis, watt, jam_per_hari,
+siklus_kerja); nilainya adalah daya dan pola pakai tipikal per kelas model,
+bukan lembar data pabrikan. CSV dikompilasi sekali menjadi berkas biner
+(format snapshot.tulis_array) berisi kolom entri dan dua indeks:
+
+- trie token: setiap kata nama (huruf kecil) disusun dalam trie yang
+  dipadatkan ke array (anak per simpul terurut menurut huruf). Token
+  terurut sehingga setiap simpul mewakili rentang token [lo, hi) dan daftar
+  entrinya bersebelahan di array posting.
+- trigram: trigram setiap kata (diberi spasi pembatas seperti pg_trgm)
+  sebagai kode int64 terurut beserta posting entrinya.
+
+Berkas dibuka dengan mmap saat pertama kali dipakai dan dibagi ke semua
+sesi dalam satu proses; tidak ada penguraian CSV saat aplikasi mulai.
+
+    python -m powerwatch.katalog_peralatan            # kompilasi ulang
+    python -m powerwatch.katalog_peralatan --cari "kulkas 2 pintu"
+"""
+import argparse
+import csv
+import functools
+import os
+import re
+import sys
+
+import numpy as np
+
+from .snapshot import baca_array, kodekan_teks, tulis_array, urai_teks
+
+DIREKTORI_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SUMBER_KATALOG = os.path.join(DIREKTORI_DATA, 'katalog_peralatan.csv')
+BERKAS_KATALOG = os.path.join(DIREKTORI_DATA, 'katalog_peralatan.pwkat')
+MAGIC = b'PWKAT\x00\x00\x00'
+VERSI_FORMAT = 1
+KOLOM_SUMBER = ('nama', 'jenis', 'watt', 'jam_per_hari', 'siklus_kerja')
+BATAS_HASIL = 10
+AMBANG_MIRIP = 0.5  # Minimal proporsi trigram kueri yang ditemukan pada nama
+
+_POLA_TOKEN = re.compile(r'\w+')
+
+
+def tokenisasi(teks):
+    """Kata-kata huruf kecil dalam teks"""
+    return _POLA_TOKEN.findall(teks.casefold())
+
+
+def _kode_trigram(teks):
+    """Kode int64 unik trigram setiap kata (tiap huruf 21 bit, seperti code point)"""
+    kode = set()
+    for token in tokenisasi(teks):
+        huruf = [ord(h) for h in f'  {token} ']
+        for a, b, c in zip(huruf, huruf[1:], huruf[2:]):
+            kode.add((a << 42) | (b << 21) | c)
+    return np.array(sorted(kode), dtype=np.int64)
+
+
+def _tipe_indeks(jumlah):
+    """Tipe bilangan bulat terkecil untuk indeks entri (menghemat posting)"""
+    return np.uint16 if jumlah <= np.iinfo(np.uint16).max else np.int32
+
+
+def _posting(pasangan, jumlah_kunci, jumlah_entri):
+    """(kunci, entri) -> (ptr, entri) gaya CSR; pasangan sudah unik"""
+    pasangan = np.array(sorted(pasangan), dtype=np.int64).reshape(-1, 2)
+    ptr = np.zeros(jumlah_kunci + 1, dtype=np.int32)
+    np.cumsum(np.bincount(pasangan[:, 0], minlength=jumlah_kunci), out=ptr[1:])
+    return ptr, pasangan[:, 1].astype(_tipe_indeks(jumlah_entri))
+
+
+def _bangun_trie(token):
+    """Trie token terurut sebagai array: anak_ptr, anak_huruf, anak_node, lo, hi"""
+    anak = [{}]
+    lo, hi = [0], [len(token)]
+    for indeks, kata in enumerate(token):
+        simpul = 0
+        for huruf in kata:
+            berikut = anak[simpul].get(huruf)
+            if berikut is None:
+                berikut = len(anak)
+                anak[simpul][huruf] = berikut
+                anak.append({})
+                lo.append(indeks)
+                hi.append(indeks)
+            hi[berikut] = indeks + 1
+            simpul = berikut
+    anak_ptr = np.zeros(len(anak) + 1, dtype=np.int32)
+    np.cumsum([len(a) for a in anak], out=anak_ptr[1:])
+    urut = [sorted(a.items()) for a in anak]
+    return {
+        'trie/anak_ptr': anak_ptr,
+        'trie/anak_huruf': np.array([ord(h) for a in urut for h, _ in a], dtype=np.int32),
+        'trie/anak_node': np.array([n for a in urut for _, n in a], dtype=np.int32),
+        'trie/lo': np.array(lo, dtype=np.int32),
+        'trie/hi': np.array(hi, dtype=np.int32),
+    }
+
+
+def baca_sumber(path=SUMBER_KATALOG):
+    """Kolom katalog dari CSV sumber (tanpa pandas)"""
+    with open(path, newline='', encoding='utf-8') as berkas:
+        pembaca = csv.DictReader(berkas)
+        kurang = set(KOLOM_SUMBER) - set(pembaca.fieldnames or ())
+        if kurang:
+            raise ValueError(f"Kolom katalog tidak ada: {', '.join(sorted(kurang))}")
+        kolom = {nama: [] for nama in KOLOM_SUMBER}
+        for nomor, baris in enumerate(pembaca, start=2):
+            try:
+                watt = float(baris['watt'])
+                jam = float(baris['jam_per_hari'])
+                siklus = float(baris['siklus_kerja'])
+            except ValueError as e:
+                raise ValueError(f'Baris {nomor}: {e}') from None
+            if not (baris['nama'].strip() and watt > 0 and 0 < jam <= 24 and 0 < siklus <= 1):
+                raise ValueError(f'Baris {nomor}: nama kosong atau watt/jam/siklus di luar rentang')
+            kolom['nama'].append(baris['nama'].strip())
+            kolom['jenis'].append(baris['jenis'].strip())
+            kolom['watt'].append(watt)
+            kolom['jam_per_hari'].append(jam)
+            kolom['siklus_kerja'].append(siklus)
+    return kolom
+
+
+def kompilasi(sumber=SUMBER_KATALOG, tujuan=BERKAS_KATALOG):
+    """Mengompilasi CSV sumber menjadi berkas katalog biner berindeks"""
+    kolom = baca_sumber(sumber)
+    nama = kolom['nama']
+    if len(set(nama)) != len(nama):
+        raise ValueError('Nama model dalam katalog harus unik')
+    jenis = sorted(set(kolom['jenis']))
+    kode_jenis = {j: k for k, j in enumerate(jenis)}
+
+    array = {
+        'jenis': np.array([kode_jenis[j] for j in kolom['jenis']], dtype=np.int16),
+        'watt': np.array(kolom['watt'], dtype=np.float32),
+        'jam_per_hari': np.array(kolom['jam_per_hari'], dtype=np.float32),
+        'siklus_kerja': np.array(kolom['siklus_kerja'], dtype=np.float32),
+    }
+    # Peringkat alfabetis untuk mengurutkan hasil pencarian
+    peringkat = np.empty(len(nama), dtype=_tipe_indeks(len(nama)))
+    peringkat[sorted(range(len(nama)), key=lambda i: nama[i].casefold())] = np.arange(len(nama))
+    array['peringkat'] = peringkat
+    kodekan_teks(array, 'nama', nama)
+    kodekan_teks(array, 'jenis', jenis)
+
+    token_entri = [set(tokenisasi(n)) for n in nama]
+    token = sorted(set().union(*token_entri))
+    indeks_token = {t: i for i, t in enumerate(token)}
+    kodekan_teks(array, 'token', token)
+    array['token/ptr'], array['token/entri'] = _posting(
+        {(indeks_token[t], i) for i, daftar in enumerate(token_entri) for t in daftar},
+        len(token), len(nama),
+    )
+    array.update(_bangun_trie(token))
+
+    trigram_entri = [_kode_trigram(n) for n in nama]
+    trigram = np.unique(np.concatenate(trigram_entri)) if nama else np.zeros(0, dtype=np.int64)
+    array['trigram/kode'] = trigram
+    array['trigram/jumlah'] = np.array([len(t) for t in trigram_entri], dtype=np.uint16)
+    array['trigram/ptr'], array['trigram/entri'] = _posting(
+        {(int(k), i) for i, kode in enumerate(trigram_entri)
+         for k in np.searchsorted(trigram, kode).tolist()},
+        len(trigram), len(nama),
+    )
+
+    meta = {'jumlah': len(nama), 'jumlah_teks': {'nama': len(nama), 'jenis': len(jenis),
+                                                 'token': len(token)}}
+    tulis_array(tujuan, MAGIC, VERSI_FORMAT, meta, array)
+    return len(nama)
+
+
+class KatalogPeralatan:
+    def __init__(self, meta, array):
+        """Katalog berindeks yang dibaca dari berkas kompilasi (array berupa view mmap)"""
+        self._array = array
+        jumlah_teks = meta['jumlah_teks']
+        self.nama = urai_teks(array, 'nama', jumlah_teks['nama'])
+        self.daftar_jenis = urai_teks(array, 'jenis', jumlah_teks['jenis'])
+        self.jenis = array['jenis']
+        self.watt = array['watt']
+        self.jam_per_hari = array['jam_per_hari']
+        self.siklus_kerja = array['siklus_kerja']
+        self._peringkat = array['peringkat']
+        # Simpul trie sering diakses per huruf; list Python lebih cepat dari indeks NumPy
+        self._anak_ptr = array['trie/anak_ptr'].tolist()
+        self._anak_huruf = array['trie/anak_huruf'].tolist()
+        self._anak_node = array['trie/anak_node'].tolist()
+
+    def __len__(self):
+        return len(self.nama)
+
+    def entri(self, indeks):
+        """Satu model sebagai dict; daya_rata = watt x siklus kerja"""
+        # Kolom disimpan float32; dibulatkan agar nilai seperti 0.3 tidak menjadi 0.30000001
+        watt = round(float(self.watt[indeks]), 3)
+        siklus = round(float(self.siklus_kerja[indeks]), 3)
+        return {
+            'nama': self.nama[indeks],
+            'jenis': self.daftar_jenis[self.jenis[indeks]],
+            'watt': watt,
+            'jam_per_hari': round(float(self.jam_per_hari[indeks]), 3),
+            'siklus_kerja': siklus,
+            'daya_rata': watt * siklus,
+        }
+
+    def _rentang_awalan(self, awalan):
+        """Rentang token [lo, hi) yang diawali awalan, lewat trie"""
+        simpul = 0
+        for huruf in map(ord, awalan):
+            a, b = self._anak_ptr[simpul], self._anak_ptr[simpul + 1]
+            # Pencarian biner di antara anak simpul (terurut menurut huruf)
+            while a < b:
+                tengah = (a + b) // 2
+                if self._anak_huruf[tengah] < huruf:
+                    a = tengah + 1
+                else:
+                    b = tengah
+            if a == self._anak_ptr[simpul + 1] or self._anak_huruf[a] != huruf:
+                return 0, 0
+            simpul = self._anak_node[a]
+        return int(self._array['trie/lo'][simpul]), int(self._array['trie/hi'][simpul])
+
+    def _urutkan(self, indeks, batas):
+        return indeks[np.argsort(self._peringkat[indeks], kind='stable')][:batas]
+
+    def cari_awalan(self, kueri, batas=BATAS_HASIL):
+        """Indeks model yang setiap kata kuerinya menjadi awalan salah satu kata nama"""
+        hasil = None
+        ptr, posting = self._array['token/ptr'], self._array['token/entri']
+        for token in tokenisasi(kueri):
+            lo, hi = self._rentang_awalan(token)
+            cocok = np.unique(posting[ptr[lo]:ptr[hi]])
+            hasil = cocok if hasil is None else np.intersect1d(hasil, cocok, assume_unique=True)
+            if not len(hasil):
+                break
+        if hasil is None:
+            return np.zeros(0, dtype=np.int64)
+        return self._urutkan(hasil, batas)
+
+    def cari_mirip(self, kueri, batas=BATAS_HASIL, ambang=AMBANG_MIRIP):
+        """Indeks model yang mirip kueri (toleran salah ketik), skor tertinggi dahulu
+
+        Skor utama adalah proporsi trigram kueri yang ada pada nama; nama
+        yang lebih pendek (Dice lebih tinggi) didahulukan bila seri.
+        """
+        kode = _kode_trigram(kueri)
+        if not len(kode) or not len(self):
+            return np.zeros(0, dtype=np.int64)
+        semua = self._array['trigram/kode']
+        posisi = np.searchsorted(semua, kode)
+        ada = posisi < len(semua)
+        ada[ada] = semua[posisi[ada]] == kode[ada]
+        ptr, posting = self._array['trigram/ptr'], self._array['trigram/entri']
+        entri = np.concatenate([posting[ptr[p]:ptr[p + 1]] for p in posisi[ada]] or [posting[:0]])
+        sama = np.bincount(entri, minlength=len(self))
+        skor = sama / len(kode)
+        kandidat = np.flatnonzero(skor >= ambang)
+        dice = 2 * sama[kandidat] / (len(kode) + self._array['trigram/jumlah'][kandidat])
+        urut = np.lexsort((self._peringkat[kandidat], -dice, -skor[kandidat]))
+        return kandidat[urut][:batas]
+
+    def cari(self, kueri, batas=BATAS_HASIL):
+        """Autocomplete: cocok awalan lebih dahulu, lalu dilengkapi hasil fuzzy"""
+        hasil = self.cari_awalan(kueri, batas).tolist()
+        if len(hasil) < batas:
+            sudah = set(hasil)
+            hasil += [i for i in self.cari_mirip(kueri, batas).tolist() if i not in sudah]
+        return [self.entri(i) for i in hasil[:batas]]
+
+
+def baca(path=BERKAS_KATALOG):
+    """Membuka berkas katalog biner dengan mmap"""
+    return KatalogPeralatan(*baca_array(path, MAGIC, VERSI_FORMAT, 'katalog PowerWatch'))
+
+
+@functools.lru_cache(maxsize=None)
+def katalog_peralatan(path=BERKAS_KATALOG):
+    """Katalog model bawaan, dibuka sekali per proses saat pertama dipakai"""
+    return baca(path)
+
+
+def main(argv=None):
+    """Titik masuk `python -m powerwatch.katalog_peralatan`"""
+    parser = argparse.ArgumentParser(
+        prog='powerwatch.katalog_peralatan',
+        description='Kompilasi katalog model peralatan atau cari di dalamnya.',
+    )
+    parser.add_argument('--sumber', default=SUMBER_KATALOG, help='CSV sumber katalog')
+    parser.add_argument('--keluaran', default=BERKAS_KATALOG, help='Berkas katalog biner')
+    parser.add_argument('--cari', metavar='KUERI', help='Cari model alih-alih mengompilasi')
+    args = parser.parse_args(argv)
+    try:
+        if args.cari is not None:
+            for entri in baca(args.keluaran).cari(args.cari):
+                print(f"{entri['nama']:<50} {entri['watt']:>7.0f} W  "
+                      f"{entri['jam_per_hari']:>4g} jam/hari  siklus {entri['siklus_kerja']:.0%}")
+            return 0
+        jumlah = kompilasi(args.sumber, args.keluaran)
+    except (OSError, ValueError) as e:
+        print(f'powerwatch.katalog_peralatan: {e}', file=sys.stderr)
+        return 1
+    print(f'{jumlah:,} model dikompilasi ke {args.keluaran}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
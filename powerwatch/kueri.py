@@ -0,0 +1,383 @@
+"""Kueri inventaris peralatan: saring, kelompokkan, urutkan, dan ambil k teratas
+
+Saringan sama-dengan / salah-satu pada kolom grup (nama, golongan) memakai
+IndeksGrup sehingga hanya baris grup terpilih yang diperiksa. Agregasi per
+grup tanpa saringan dibaca dari jumlah berjalan indeks dalam O(jumlah grup),
+dan k teratas dipilih dengan argpartition sehingga hanya k baris yang
+diurutkan.
+"""
+import numpy as np
+
+KOLOM_GRUP = ('nama', 'golongan')
+# Kolom yang dijumlah berjalan per grup di IndeksGrup
+KOLOM_JUMLAH = ('unit', 'total_watt', 'kwh')
+# Kolom hasil kueri baris ('biaya' ikut bila diminta karena memakai mesin tarif)
+KOLOM_BARIS = ('nama', 'golongan', 'unit', 'watt', 'total_watt', 'jam_per_hari', 'jam_mulai', 'kwh')
+KOLOM_NILAI = KOLOM_BARIS + ('biaya',)
+# Kolom hasil kueri per grup ('jumlah' = banyaknya peralatan)
+KOLOM_AGREGAT = ('jumlah', 'unit', 'total_watt', 'kwh')
+KOLOM_AGREGAT_SEMUA = KOLOM_AGREGAT + ('biaya',)
+
+OPERATOR = {
+    '==': np.equal,
+    '!=': np.not_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+OPERATOR_TEKS = ('==', '!=', 'dalam', 'mengandung')
+
+
+class IndeksGrup:
+    def __init__(self, tabel, kolom, hari):
+        """Indeks baris per kode grup (nama/golongan) dengan jumlah berjalan per grup
+
+        Baris grup k tersimpan menaik di baris[ptr[k]:ptr[k + 1]] (format CSR).
+        Indeks diperbarui di tempat saat peralatan ditambah, dihapus, atau
+        diubah; jika tabel berubah di luar itu, indeks dibangun ulang.
+        """
+        if kolom not in KOLOM_GRUP:
+            raise KeyError(f'kolom grup tidak dikenal: {kolom}')
+        self.kolom = kolom
+        self.hari = hari
+        self.bangun(tabel)
+
+    def _kamus(self, tabel):
+        return tabel.kamus_nama if self.kolom == 'nama' else tabel.kamus_golongan
+
+    def _nilai(self, tabel, awal=0):
+        """Nilai kolom jumlah untuk baris awal.. sampai akhir tabel"""
+        total_watt = tabel.kolom('total_watt')[awal:]
+        return {
+            'unit': tabel.kolom('unit')[awal:],
+            'total_watt': total_watt,
+            'kwh': (total_watt / 1000) * tabel.kolom('jam_per_hari')[awal:] * self.hari,
+        }
+
+    def _nilai_satu(self, peralatan):
+        """Nilai kolom jumlah untuk satu peralatan (dict)"""
+        return {
+            'unit': peralatan['unit'],
+            'total_watt': peralatan['total_watt'],
+            'kwh': (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * self.hari,
+        }
+
+    def bangun(self, tabel):
+        """Membangun indeks dari seluruh tabel"""
+        kode = tabel.kolom(self.kolom).astype(np.intp)
+        jumlah_grup = len(self._kamus(tabel))
+        self.baris = np.argsort(kode, kind='stable')
+        self.ptr = np.zeros(jumlah_grup + 1, dtype=np.intp)
+        np.cumsum(np.bincount(kode, minlength=jumlah_grup), out=self.ptr[1:])
+        self.jumlah = {
+            nama: np.bincount(kode, weights=nilai, minlength=jumlah_grup)
+            for nama, nilai in self._nilai(tabel).items()
+        }
+        self.tabel = tabel
+        self.n = len(tabel)
+
+    def sinkron(self, tabel):
+        """True jika indeks mencerminkan tabel ini"""
+        return self.tabel is tabel and self.n == len(tabel)
+
+    def _perbesar(self, tabel):
+        """Menambah slot untuk kode grup baru di kamus"""
+        tambahan = len(self._kamus(tabel)) + 1 - len(self.ptr)
+        if tambahan > 0:
+            self.ptr = np.append(self.ptr, np.full(tambahan, self.ptr[-1]))
+            for nama, jumlah in self.jumlah.items():
+                self.jumlah[nama] = np.append(jumlah, np.zeros(tambahan))
+
+    def _cari_posisi(self, kode, indeks):
+        """Posisi baris indeks di dalam grup kode"""
+        awal, akhir = self.ptr[kode], self.ptr[kode + 1]
+        return awal + np.searchsorted(self.baris[awal:akhir], indeks)
+
+    def _catat(self, kode, nilai, tanda):
+        for nama, jumlah in self.jumlah.items():
+            jumlah[kode] += tanda * nilai[nama]
+
+    def tambah(self, tabel, awal):
+        """Memasukkan baris awal.. sampai akhir tabel (baru ditambahkan) ke grupnya"""
+        if self.tabel is not tabel or self.n != awal:
+            return self.bangun(tabel)
+        self._perbesar(tabel)
+        kode = tabel.kolom(self.kolom)[awal:].astype(np.intp)
+        urut = np.argsort(kode, kind='stable')
+        # Indeks baris baru lebih besar dari semua baris lama: cukup disisipkan di akhir grupnya
+        self.baris = np.insert(self.baris, self.ptr[kode[urut] + 1], awal + urut)
+        jumlah_grup = len(self.ptr) - 1
+        self.ptr[1:] += np.cumsum(np.bincount(kode, minlength=jumlah_grup))
+        for nama, nilai in self._nilai(tabel, awal).items():
+            self.jumlah[nama] += np.bincount(kode, weights=nilai, minlength=jumlah_grup)
+        self.n = len(tabel)
+
+    def hapus(self, tabel, indeks, lama):
+        """Mengeluarkan baris indeks (sudah dihapus dari tabel, datanya lama)"""
+        if self.tabel is not tabel or self.n != len(tabel) + 1:
+            return self.bangun(tabel)
+        kode = self._kamus(tabel).cari(lama[self.kolom])
+        self.baris = np.delete(self.baris, self._cari_posisi(kode, indeks))
+        # Baris setelah indeks bergeser satu ke atas
+        self.baris[self.baris > indeks] -= 1
+        self.ptr[kode + 1:] -= 1
+        self._catat(kode, self._nilai_satu(lama), -1)
+        self.n = len(tabel)
+
+    def ubah(self, tabel, indeks, lama):
+        """Memperbarui baris indeks setelah diubah (datanya sebelum diubah: lama)"""
+        if not self.sinkron(tabel):
+            return self.bangun(tabel)
+        self._perbesar(tabel)
+        kamus = self._kamus(tabel)
+        baru = tabel[indeks]
+        kode_lama = kamus.cari(lama[self.kolom])
+        kode_baru = kamus.cari(baru[self.kolom])
+        if kode_baru != kode_lama:
+            self.baris = np.delete(self.baris, self._cari_posisi(kode_lama, indeks))
+            self.ptr[kode_lama + 1:] -= 1
+            self.baris = np.insert(self.baris, self._cari_posisi(kode_baru, indeks), indeks)
+            self.ptr[kode_baru + 1:] += 1
+        self._catat(kode_lama, self._nilai_satu(lama), -1)
+        self._catat(kode_baru, self._nilai_satu(baru), 1)
+
+    def baris_grup(self, daftar_kode):
+        """Indeks baris (menaik) milik grup-grup dalam daftar_kode"""
+        potongan = [
+            self.baris[self.ptr[k]:self.ptr[k + 1]] for k in sorted(set(daftar_kode))
+            if k < len(self.ptr) - 1
+        ]
+        if not potongan:
+            return np.zeros(0, dtype=np.intp)
+        if len(potongan) == 1:
+            return potongan[0].copy()
+        return np.sort(np.concatenate(potongan))
+
+    def jumlah_per_grup(self):
+        """Banyaknya peralatan setiap kode grup"""
+        return np.diff(self.ptr)
+
+    def verifikasi(self, tabel, toleransi=1e-6):
+        """Memastikan indeks sama dengan hasil bangun ulang penuh"""
+        acuan = IndeksGrup(tabel, self.kolom, self.hari)
+        jumlah_grup = len(acuan.ptr)
+        cocok = (
+            self.sinkron(tabel)
+            and np.array_equal(self.baris, acuan.baris)
+            and np.array_equal(self.ptr[:jumlah_grup], acuan.ptr)
+            and all(
+                np.allclose(self.jumlah[nama][:jumlah_grup - 1], acuan.jumlah[nama],
+                            rtol=toleransi, atol=toleransi)
+                for nama in KOLOM_JUMLAH
+            )
+        )
+        if not cocok:
+            raise RuntimeError(f'Indeks grup {self.kolom} tidak konsisten dengan tabel peralatan')
+
+
+def urutan_teratas(kunci, menurun=False, batas=None):
+    """Posisi kunci terurut stabil; dengan batas hanya batas posisi pertama
+
+    Untuk batas < len(kunci) k terkecil dipilih dengan argpartition (O(n)),
+    lalu hanya k kunci itu yang diurutkan. Hasilnya sama dengan argsort
+    stabil yang dipotong, termasuk untuk kunci kembar di batas potongan.
+    """
+    kunci = np.asarray(kunci)
+    if menurun:
+        kunci = -kunci
+    n = len(kunci)
+    if batas is None or batas >= n:
+        return np.argsort(kunci, kind='stable')
+    if batas <= 0:
+        return np.zeros(0, dtype=np.intp)
+    ambang = kunci[np.argpartition(kunci, batas - 1)[batas - 1]]
+    kurang = np.flatnonzero(kunci < ambang)
+    sama = np.flatnonzero(kunci == ambang)[:batas - len(kurang)]
+    terpilih = np.concatenate([kurang, sama])
+    return terpilih[np.argsort(kunci[terpilih], kind='stable')]
+
+
+def _normalisasi(kondisi):
+    """(operator, nilai) dari kondisi saringan"""
+    if isinstance(kondisi, tuple):
+        if len(kondisi) != 2 or kondisi[0] not in OPERATOR and kondisi[0] not in OPERATOR_TEKS:
+            raise ValueError(f'kondisi saringan tidak dikenal: {kondisi!r}')
+        return kondisi
+    if isinstance(kondisi, (list, set, frozenset)):
+        return 'dalam', kondisi
+    return '==', kondisi
+
+
+def _mask_kode(kamus, operator, nilai):
+    """Mask per kode kamus yang memenuhi kondisi teks"""
+    if operator == 'mengandung':
+        kata = [k.casefold() for k in ([nilai] if isinstance(nilai, str) else nilai)]
+        return np.array(
+            [any(k in teks.casefold() for k in kata) for teks in kamus.daftar()], dtype=bool
+        )
+    if operator not in OPERATOR_TEKS:
+        raise ValueError(f'operator {operator} tidak berlaku untuk kolom teks')
+    cocok = np.zeros(len(kamus), dtype=bool)
+    for teks in ([nilai] if operator in ('==', '!=') else nilai):
+        kode = kamus.cari(teks)
+        if kode is not None:
+            cocok[kode] = True
+    return ~cocok if operator == '!=' else cocok
+
+
+def _kamus(tabel, kolom):
+    return tabel.kamus_nama if kolom == 'nama' else tabel.kamus_golongan
+
+
+def _saring(monitor, saring):
+    """Indeks baris (menaik) yang lolos semua kondisi; None = semua baris"""
+    tabel = monitor.peralatan
+    kondisi = []
+    for kolom, nilai in (saring or {}).items():
+        if kolom not in KOLOM_NILAI:
+            raise KeyError(f'kolom tidak dikenal: {kolom}')
+        kondisi.append((kolom, *_normalisasi(nilai)))
+
+    # Kondisi sama-dengan / salah-satu pada kolom grup langsung memilih baris dari indeks
+    baris = None
+    sisa = []
+    for kolom, operator, nilai in kondisi:
+        if kolom in KOLOM_GRUP and operator in ('==', 'dalam'):
+            kamus = _kamus(tabel, kolom)
+            daftar_kode = [kamus.cari(t) for t in ([nilai] if operator == '==' else nilai)]
+            hasil = monitor.indeks_grup(kolom).baris_grup(k for k in daftar_kode if k is not None)
+            baris = hasil if baris is None else np.intersect1d(baris, hasil, assume_unique=True)
+        else:
+            sisa.append((kolom, operator, nilai))
+
+    # Kondisi lain hanya diperiksa pada baris yang tersisa
+    for kolom, operator, nilai in sisa:
+        if kolom in KOLOM_GRUP:
+            kode = tabel.kolom(kolom)
+            mask_kode = _mask_kode(_kamus(tabel, kolom), operator, nilai)
+            lolos = mask_kode[kode if baris is None else kode[baris]]
+        else:
+            data = monitor.nilai_kolom(kolom)
+            if baris is not None:
+                data = data[baris]
+            if operator == 'dalam':
+                lolos = np.isin(data, list(nilai))
+            elif operator in OPERATOR:
+                lolos = OPERATOR[operator](data, nilai)
+            else:
+                raise ValueError(f'operator {operator} tidak berlaku untuk kolom {kolom}')
+        baris = np.flatnonzero(lolos) if baris is None else baris[lolos]
+    return baris
+
+
+def _kunci_urut(monitor, kolom, baris):
+    """Kunci pengurutan untuk baris (teks diurutkan menurut peringkat alfabetis)"""
+    tabel = monitor.peralatan
+    if kolom in KOLOM_GRUP:
+        data = tabel.peringkat_teks(kolom)[tabel.kolom(kolom)]
+    elif kolom in KOLOM_NILAI:
+        data = monitor.nilai_kolom(kolom)
+    else:
+        raise KeyError(f'kolom tidak dikenal: {kolom}')
+    return data if baris is None else data[baris]
+
+
+def _kueri_baris(monitor, baris, kolom, urut, menurun, batas):
+    tabel = monitor.peralatan
+    if urut is None:
+        if baris is None:
+            baris = np.arange(len(tabel))
+        if menurun:
+            baris = baris[::-1]
+        baris = baris[:batas]
+    else:
+        posisi = urutan_teratas(_kunci_urut(monitor, urut, baris), menurun, batas)
+        baris = posisi if baris is None else baris[posisi]
+
+    hasil = {'indeks': baris}
+    for nama in kolom:
+        if nama in KOLOM_GRUP:
+            hasil[nama] = _kamus(tabel, nama).sebagai_array()[tabel.kolom(nama)[baris]]
+        elif nama in KOLOM_NILAI:
+            hasil[nama] = monitor.nilai_kolom(nama)[baris]
+        else:
+            raise KeyError(f'kolom tidak dikenal: {nama}')
+    return hasil
+
+
+def _kueri_grup(monitor, baris, grup, kolom, urut, menurun, batas):
+    tabel = monitor.peralatan
+    indeks = monitor.indeks_grup(grup)
+    jumlah_grup = len(indeks.ptr) - 1
+    kode = tabel.kolom(grup)
+    nilai = {}
+    for nama in dict.fromkeys(kolom + (() if urut is None or urut == grup else (urut,))):
+        if nama not in KOLOM_AGREGAT_SEMUA:
+            raise KeyError(f'kolom agregat tidak dikenal: {nama}')
+        if baris is None and nama == 'jumlah':
+            nilai[nama] = indeks.jumlah_per_grup()
+        elif baris is None and nama in KOLOM_JUMLAH:
+            # Tanpa saringan: jumlah berjalan indeks, O(jumlah grup)
+            nilai[nama] = indeks.jumlah[nama][:jumlah_grup]
+        elif baris is None and nama == 'biaya' and grup == 'golongan' and monitor.tabel_tarif().seragam:
+            # Tanpa tarif waktu pemakaian, tagihan per golongan cukup dari agregat berjalan
+            biaya = np.zeros(jumlah_grup)
+            for teks, total in monitor.hitung_biaya_per_golongan().items():
+                biaya[tabel.kamus_golongan.cari(teks)] = total
+            nilai[nama] = biaya
+        else:
+            kode_baris = kode if baris is None else kode[baris]
+            bobot = None
+            if nama != 'jumlah':
+                bobot = monitor.nilai_kolom(nama)
+                bobot = bobot if baris is None else bobot[baris]
+            nilai[nama] = np.bincount(kode_baris, weights=bobot, minlength=jumlah_grup)
+
+    if baris is None:
+        terisi = np.flatnonzero(indeks.jumlah_per_grup())
+    else:
+        terisi = np.flatnonzero(np.bincount(kode[baris], minlength=jumlah_grup))
+    if urut is not None:
+        if urut == grup:
+            kunci = tabel.peringkat_teks(grup)[terisi]
+        else:
+            kunci = nilai[urut][terisi]
+        terisi = terisi[urutan_teratas(kunci, menurun, batas)]
+    else:
+        terisi = (terisi[::-1] if menurun else terisi)[:batas]
+
+    hasil = {grup: _kamus(tabel, grup).sebagai_array()[terisi]}
+    for nama in kolom:
+        hasil[nama] = nilai[nama][terisi]
+        if nama in ('jumlah', 'unit'):
+            hasil[nama] = np.rint(hasil[nama]).astype(np.int64)
+    return hasil
+
+
+def jalankan(monitor, saring=None, grup=None, kolom=None, urut=None, menurun=False, batas=None):
+    """Menjalankan kueri atas inventaris monitor (lihat MonitorListrik.kueri)"""
+    baris = _saring(monitor, saring)
+    if grup is None:
+        kolom = KOLOM_BARIS if kolom is None else tuple(kolom)
+        return _kueri_baris(monitor, baris, kolom, urut, menurun, batas)
+    if grup not in KOLOM_GRUP:
+        raise KeyError(f'kolom grup tidak dikenal: {grup}')
+    kolom = KOLOM_AGREGAT if kolom is None else tuple(kolom)
+    return _kueri_grup(monitor, baris, grup, kolom, urut, menurun, batas)
+
+
+def teratas_dengan_lainnya(monitor, grup, kolom, batas, label_lainnya='Lainnya'):
+    """(label, nilai) batas grup terbesar menurut kolom (mis. irisan grafik pie)
+
+    Bila grup lebih dari batas, grup di luar batas - 1 teratas digabung
+    menjadi satu label_lainnya.
+    """
+    teratas = jalankan(monitor, grup=grup, kolom=('jumlah', kolom), urut=kolom, menurun=True, batas=batas)
+    label, nilai = teratas[grup], teratas[kolom]
+    if teratas['jumlah'].sum() < len(monitor.peralatan):
+        # Total seluruh inventaris dari jumlah berjalan indeks golongan, O(jumlah golongan)
+        total = jalankan(monitor, grup='golongan', kolom=(kolom,))[kolom].sum()
+        label = np.append(label[:batas - 1], label_lainnya)
+        nilai = np.append(nilai[:batas - 1], total - nilai[:batas - 1].sum())
+    return label, nilai
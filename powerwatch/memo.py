@@ -0,0 +1,49 @@
+"""Cache LRU sederhana dengan penghitung hit/miss"""
+import threading
+from collections import OrderedDict
+
+KAPASITAS_DEFAULT = 16
+
+
+class MemoLRU:
+    def __init__(self, kapasitas=KAPASITAS_DEFAULT):
+        """Inisialisasi cache LRU dengan kapasitas maksimum entri"""
+        self.kapasitas = kapasitas
+        self._data = OrderedDict()
+        self._kunci = threading.Lock()
+        self.hit = 0
+        self.miss = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def ambil(self, kunci, fungsi):
+        """Nilai untuk kunci; jika belum ada, dihitung dengan fungsi() lalu disimpan"""
+        with self._kunci:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                self.hit += 1
+                return self._data[kunci]
+            self.miss += 1
+
+        nilai = fungsi()
+        with self._kunci:
+            self._data[kunci] = nilai
+            self._data.move_to_end(kunci)
+            while len(self._data) > self.kapasitas:
+                self._data.popitem(last=False)
+        return nilai
+
+    def buang_jika(self, predikat):
+        """Membuang semua entri yang kuncinya memenuhi predikat(kunci)"""
+        with self._kunci:
+            for kunci in [k for k in self._data if predikat(k)]:
+                del self._data[kunci]
+
+    def kosongkan(self):
+        with self._kunci:
+            self._data.clear()
+
+    def statistik(self):
+        """Jumlah hit, miss, dan entri dalam cache"""
+        return {'hit': self.hit, 'miss': self.miss, 'ukuran': len(self._data)}
@@ -0,0 +1,620 @@
+import functools
+import threading
+
+import numpy as np
+
+from . import anomali, impor, instrumentasi, kueri, prakiraan, profil_beban, saran, skenario, snapshot, tarif
+from .deret_waktu import LANGKAH_DEFAULT, DeretWaktu
+from .memo import MemoLRU
+from .tabel_peralatan import TabelPeralatan
+
+HARI_PER_BULAN = 30
+TARIF_LISTRIK = {
+    'R-1': 1444,  # Tarif untuk golongan R-1 (per kWh)
+    'R-2': 1699,  # Tarif untuk golongan R-2 (per kWh)
+    'R-3': 1699,  # Tarif untuk golongan R-3 (per kWh)
+}
+TARIF_DEFAULT = 1500  # Tarif cadangan (Rp/kWh) untuk golongan yang tidak dikenal
+
+
+def _terkunci(metode):
+    """Menjalankan metode yang mengubah state di bawah kunci monitor (lihat snapshot.tulis)"""
+    @functools.wraps(metode)
+    def pembungkus(self, *args, **kwargs):
+        with self.kunci:
+            return metode(self, *args, **kwargs)
+    return pembungkus
+
+
+# Kelas untuk monitoring listrik
+class MonitorListrik:
+    def __init__(self, cek_konsistensi=False, seed=None):
+        """Inisialisasi kelas monitoring listrik"""
+        self.peralatan = TabelPeralatan()
+        self.penggunaan_harian = DeretWaktu()
+        self.tarif_listrik = dict(TARIF_LISTRIK)
+        self.tarif_terpilih = 'R-1'  # Golongan R-1 sebagai default
+
+        # Agregat berjalan agar metrik dashboard dapat dibaca dalam O(1)
+        self._total_kwh = 0.0
+        self._kwh_per_golongan = {}
+        # Indeks grup per kolom (lihat kueri.IndeksGrup), dibangun saat pertama dikueri
+        self._indeks_grup = {}
+        # Jika aktif, setiap perubahan diverifikasi terhadap hitung ulang penuh
+        self.cek_konsistensi = cek_konsistensi
+        # Generator acak milik instance (data sampel dan prakiraan), bukan RNG global
+        self.rng = np.random.default_rng(seed)
+
+        # Versi naik pada setiap perubahan peralatan/tarif; kunci cache tampilan
+        self.versi = 0
+        self.memo = MemoLRU()
+        # Dipegang selama perubahan peralatan/tarif; thread lain (snapshot berkala)
+        # memegangnya saat menyalin state agar tidak membaca tabel setengah berubah
+        self.kunci = threading.RLock()
+
+        # Detektor anomali pada penggunaan_harian, dipasang saat pertama diminta
+        self._detektor = None
+
+        # Penyimpanan persisten opsional (lihat sambungkan_penyimpanan)
+        self.penyimpanan = None
+        self._perlu_disimpan = False
+        # Kunci baris (urutan) tiap peralatan di penyimpanan saat simpan terakhir
+        # (None = simpan penuh) dan perubahan tabel sejak itu
+        self._urutan_tersimpan = None
+        self._perubahan_tertunda = []
+
+    # Penyimpanan persisten
+    @classmethod
+    def dari_penyimpanan(cls, penyimpanan, awal=None, akhir=None):
+        """Memuat monitor dari penyimpanan; riwayat bacaan dimemory-map sesuai rentang"""
+        monitor = cls()
+        waktu, kwh = penyimpanan.muat_pembacaan(awal, akhir)
+        monitor.penggunaan_harian = DeretWaktu.dari_array(waktu, kwh)
+        data = penyimpanan.muat_peralatan()
+        monitor.tambah_peralatan_batch(data)
+        monitor.tarif_terpilih = penyimpanan.muat_pengaturan('tarif_terpilih', monitor.tarif_terpilih)
+        monitor.sambungkan_penyimpanan(penyimpanan)
+        monitor._perlu_disimpan = False
+        monitor._urutan_tersimpan = np.asarray(data['urutan'], dtype=np.int64)
+        monitor._perubahan_tertunda = []
+        return monitor
+
+    @classmethod
+    def dari_env(cls):
+        """Monitor awal sebuah sesi menurut lingkungan proses
+
+        Urutannya: snapshot biner $POWERWATCH_SNAPSHOT (mulai hangat tanpa
+        replay), data tersimpan di $POWERWATCH_DATA, lalu katalog default.
+        Penyimpanan $POWERWATCH_DATA (bila diset) selalu disambungkan.
+        """
+        # Diimpor di sini agar CLI tidak memuat sqlite3 dan katalog default
+        from .katalog_default import katalog_default
+        from .penyimpanan import buka_penyimpanan_dari_env
+        penyimpanan = buka_penyimpanan_dari_env()
+        tersimpan = snapshot.baca_dari_env()
+        if tersimpan is not None:
+            monitor = cls.dari_snapshot(tersimpan)
+        elif penyimpanan is not None and penyimpanan.ada_peralatan():
+            return cls.dari_penyimpanan(penyimpanan)
+        else:
+            # Katalog default dibangun sekali per proses; sesi hanya menyimpan
+            # tambahan dan ubahannya sendiri (overlay copy-on-write)
+            monitor = cls.dari_katalog(katalog_default())
+        if penyimpanan is not None:
+            monitor.sambungkan_penyimpanan(penyimpanan)
+            if tersimpan is None:
+                monitor.simpan()
+        return monitor
+
+    # Katalog bersama
+    @classmethod
+    def dari_katalog(cls, katalog):
+        """Monitor sesi berupa overlay copy-on-write di atas katalog bersama"""
+        monitor = cls()
+        monitor.peralatan = katalog.tabel.turunan()
+        monitor.penggunaan_harian = DeretWaktu.dari_array(katalog.waktu, katalog.kwh)
+        # Agregat sesi dimulai dari agregat basis lalu diperbarui oleh overlay
+        monitor._total_kwh = katalog.total_kwh
+        monitor._kwh_per_golongan = dict(katalog.kwh_per_golongan)
+        monitor.tarif_listrik = dict(katalog.tarif_listrik)
+        monitor.tarif_terpilih = katalog.tarif_terpilih
+        return monitor
+
+    # Snapshot biner
+    @classmethod
+    def dari_snapshot(cls, snap):
+        """Monitor dari snapshot (objek Snapshot atau path berkas) tanpa replay peralatan"""
+        if not isinstance(snap, snapshot.Snapshot):
+            snap = snapshot.baca(snap)
+        monitor = cls.dari_katalog(snap)
+        monitor.rng.bit_generator.state = snap.status_rng
+        return monitor
+
+    @instrumentasi.diukur()
+    def simpan_snapshot(self, path):
+        """Menulis snapshot biner peralatan, riwayat bacaan, dan tarif (lihat snapshot)"""
+        snapshot.tulis(self, path)
+
+    # Cache tampilan per versi
+    def kunci_tarif(self):
+        """Kunci hashable untuk pengaturan tarif saat ini"""
+        return (self.tarif_terpilih, tarif.kunci_spesifikasi(self.tarif_listrik))
+
+    def memo_halaman(self, halaman, fungsi, parameter=None):
+        """Hasil fungsi() (DataFrame, figure, ...) di-cache per (halaman, versi, tarif, parameter)"""
+        kunci = (halaman, self.versi, self.kunci_tarif(), parameter)
+        # Entri versi/tarif lama untuk halaman yang sama tidak akan pernah dipakai lagi
+        self.memo.buang_jika(lambda k: k[0] == halaman and k[1:3] != kunci[1:3])
+        return self.memo.ambil(kunci, lambda: instrumentasi.jalankan(f'tampilan:{halaman}', fungsi))
+
+    def ukuran_memori(self):
+        """Perkiraan byte memori milik sesi ini (tanpa data yang dibagi bersama)"""
+        return self.peralatan.ukuran_memori() + self.penggunaan_harian.ukuran_memori()
+
+    def sambungkan_penyimpanan(self, penyimpanan):
+        """Menyambungkan penyimpanan; bacaan baru ikut ditulis ke segmen"""
+        self.penyimpanan = penyimpanan
+        self.penggunaan_harian.daftarkan_pendengar(penyimpanan.tambah_pembacaan)
+        self._perlu_disimpan = True
+        self._urutan_tersimpan = None
+
+    @instrumentasi.diukur()
+    def simpan(self):
+        """Menulis perubahan peralatan, pengaturan, dan bacaan yang tertunda
+
+        Setelah simpan penuh pertama, hanya baris peralatan yang ditambah,
+        diubah, atau dihapus sejak simpan terakhir yang ditulis.
+        """
+        if self.penyimpanan is None:
+            return
+        if self._urutan_tersimpan is None:
+            self._urutan_tersimpan = self.penyimpanan.simpan_peralatan(self.peralatan)
+        elif self._perubahan_tertunda:
+            self._urutan_tersimpan = self.penyimpanan.simpan_perubahan_peralatan(
+                self.peralatan, self._urutan_tersimpan, self._perubahan_tertunda
+            )
+        self._perubahan_tertunda = []
+        if self._perlu_disimpan:
+            self.penyimpanan.simpan_pengaturan('tarif_terpilih', self.tarif_terpilih)
+            self._perlu_disimpan = False
+        self.penyimpanan.flush()
+
+    # Agregat berjalan
+    def _catat_agregat(self, golongan, kwh):
+        """Menambahkan (atau mengurangi, jika kwh negatif) kWh ke agregat berjalan"""
+        self._total_kwh += kwh
+        self._kwh_per_golongan[golongan] = self._kwh_per_golongan.get(golongan, 0.0) + kwh
+
+    def _buang_golongan_kosong(self, golongan):
+        """Membuang golongan yang tidak lagi punya peralatan dari agregat per golongan
+
+        Tanpa ini golongan kosong tetap ditagih sebagai akun (termasuk biaya
+        minimum) oleh hitung_estimasi_biaya.
+        """
+        kode = self.peralatan.kamus_golongan.cari(golongan)
+        if kode is None or not np.any(self.peralatan.kolom('golongan') == kode):
+            # Sisa pembulatan golongan itu ikut dibuang dari total
+            self._total_kwh -= self._kwh_per_golongan.pop(golongan, 0.0)
+
+    def _setelah_perubahan(self, perubahan):
+        """Dipanggil setelah setiap perubahan tabel peralatan ('tambah', jumlah) / ('ubah' | 'hapus', indeks)"""
+        self.versi += 1
+        if self._urutan_tersimpan is not None:
+            self._perubahan_tertunda.append(perubahan)
+        if not self.peralatan:
+            # Buang sisa pembulatan saat tabel kosong
+            self._total_kwh = 0.0
+            self._kwh_per_golongan.clear()
+        if self.cek_konsistensi:
+            self.verifikasi_agregat()
+
+    @staticmethod
+    def _kwh_peralatan(peralatan):
+        """kWh per bulan untuk satu peralatan (dict)"""
+        return (peralatan['total_watt'] / 1000) * peralatan['jam_per_hari'] * HARI_PER_BULAN
+
+    def _hitung_agregat_penuh(self):
+        """Menghitung ulang total kWh dan kWh per golongan dari seluruh tabel"""
+        kode = self.peralatan.kolom('golongan')
+        kwh = self.peralatan.kwh_per_bulan(HARI_PER_BULAN)
+        jumlah_golongan = len(self.peralatan.kamus_golongan)
+        kwh_per_kode = np.bincount(kode, weights=kwh, minlength=jumlah_golongan)
+        terisi = np.bincount(kode, minlength=jumlah_golongan) > 0
+        kwh_per_golongan = {
+            self.peralatan.kamus_golongan.teks(k): float(kwh_per_kode[k])
+            for k in np.flatnonzero(terisi)
+        }
+        return float(kwh.sum()), kwh_per_golongan
+
+    def hitung_ulang_agregat(self):
+        """Menyetel ulang agregat berjalan dari hitung ulang penuh"""
+        self._total_kwh, self._kwh_per_golongan = self._hitung_agregat_penuh()
+
+    def verifikasi_agregat(self, toleransi=1e-6):
+        """Memastikan agregat berjalan sama dengan hitung ulang penuh"""
+        total, kwh_per_golongan = self._hitung_agregat_penuh()
+        semua_golongan = set(kwh_per_golongan) | set(self._kwh_per_golongan)
+        cocok = np.isclose(self._total_kwh, total, rtol=toleransi, atol=toleransi) and all(
+            np.isclose(
+                self._kwh_per_golongan.get(g, 0.0), kwh_per_golongan.get(g, 0.0),
+                rtol=toleransi, atol=toleransi,
+            )
+            for g in semua_golongan
+        )
+        if not cocok:
+            raise RuntimeError(
+                f'Agregat berjalan tidak konsisten: total {self._total_kwh} != {total}, '
+                f'per golongan {self._kwh_per_golongan} != {kwh_per_golongan}'
+            )
+        for indeks in self._indeks_grup.values():
+            indeks.verifikasi(self.peralatan, toleransi)
+
+    # 1.Peralatan Elektronik
+    @instrumentasi.diukur()
+    @_terkunci
+    def tambah_peralatan(self, nama, unit, watt, golongan, jam_per_hari, jam_mulai=None):
+        """Menambahkan peralatan elektronik dan golongan listrik"""
+        indeks = self.peralatan.tambah(
+            nama, unit, watt, golongan, jam_per_hari, np.nan if jam_mulai is None else jam_mulai
+        )
+        self._catat_agregat(golongan, self._kwh_peralatan(self.peralatan[indeks]))
+        for indeks_grup in self._indeks_grup.values():
+            indeks_grup.tambah(self.peralatan, indeks)
+        self._setelah_perubahan(('tambah', 1))
+        self.update_penggunaan_harian_dengan_peralatan_baru()
+
+    @instrumentasi.diukur()
+    @_terkunci
+    def hapus_peralatan(self, indeks):
+        """Menghapus peralatan berdasarkan indeks dan mengembalikannya"""
+        indeks = self.peralatan._indeks_valid(indeks)
+        lama = self.peralatan.hapus(indeks)
+        self._catat_agregat(lama['golongan'], -self._kwh_peralatan(lama))
+        self._buang_golongan_kosong(lama['golongan'])
+        for indeks_grup in self._indeks_grup.values():
+            indeks_grup.hapus(self.peralatan, indeks, lama)
+        self._setelah_perubahan(('hapus', indeks))
+        return lama
+
+    @instrumentasi.diukur()
+    @_terkunci
+    def ubah_peralatan(self, indeks, **perubahan):
+        """Mengubah data peralatan (nama, unit, watt, golongan, jam_per_hari, jam_mulai)"""
+        indeks = self.peralatan._indeks_valid(indeks)
+        lama = self.peralatan[indeks]
+        self.peralatan.ubah(indeks, **perubahan)
+        baru = self.peralatan[indeks]
+        self._catat_agregat(lama['golongan'], -self._kwh_peralatan(lama))
+        self._catat_agregat(baru['golongan'], self._kwh_peralatan(baru))
+        if baru['golongan'] != lama['golongan']:
+            self._buang_golongan_kosong(lama['golongan'])
+        for indeks_grup in self._indeks_grup.values():
+            indeks_grup.ubah(self.peralatan, indeks, lama)
+        self._setelah_perubahan(('ubah', indeks))
+        return baru
+
+    def _tambah_kolom_tanpa_agregat(self, data, awal_baris=0):
+        """Validasi dan simpan satu batch kolom; mengembalikan kWh per kode golongan"""
+        kolom = impor.validasi_kolom(data, self.tarif_listrik, awal_baris)
+        awal = self.peralatan.tambah_batch(**kolom)
+        kode = self.peralatan.kolom('golongan')[awal:]
+        kwh = self.peralatan.kwh_per_bulan(HARI_PER_BULAN)[awal:]
+        return np.bincount(kode, weights=kwh, minlength=len(self.peralatan.kamus_golongan))
+
+    @_terkunci
+    def _tambah_batch_atomik(self, daftar_batch):
+        """Menambahkan beberapa batch; dibatalkan seluruhnya jika ada yang tidak valid"""
+        jumlah_awal = len(self.peralatan)
+        kwh_per_kode = np.zeros(0)
+        try:
+            for data in daftar_batch:
+                kwh_batch = self._tambah_kolom_tanpa_agregat(
+                    data, len(self.peralatan) - jumlah_awal
+                )
+                kwh_per_kode = np.pad(kwh_per_kode, (0, len(kwh_batch) - len(kwh_per_kode)))
+                kwh_per_kode += kwh_batch
+        except Exception:
+            self.peralatan._potong(jumlah_awal)
+            raise
+
+        # Satu kali pembaruan agregat untuk seluruh batch
+        for kode in np.flatnonzero(kwh_per_kode):
+            self._catat_agregat(self.peralatan.kamus_golongan.teks(kode), float(kwh_per_kode[kode]))
+        for indeks_grup in self._indeks_grup.values():
+            indeks_grup.tambah(self.peralatan, jumlah_awal)
+        self._setelah_perubahan(('tambah', len(self.peralatan) - jumlah_awal))
+        if not self.penggunaan_harian and len(self.peralatan) > jumlah_awal:
+            self.generate_sample_data()
+        return len(self.peralatan) - jumlah_awal
+
+    @instrumentasi.diukur()
+    def tambah_peralatan_batch(self, data):
+        """Menambahkan banyak peralatan sekaligus tanpa efek samping per baris
+
+        data dapat berupa dict kolom / DataFrame dengan kolom nama, unit, watt,
+        golongan, jam_per_hari, atau list tuple dengan urutan yang sama.
+        """
+        return self._tambah_batch_atomik([data])
+
+    @instrumentasi.diukur()
+    def impor_peralatan(self, berkas, format=None, ukuran_chunk=impor.UKURAN_CHUNK,
+                        pakai_pandas=True):
+        """Mengimpor inventaris peralatan dari berkas CSV atau Parquet per chunk"""
+        return self._tambah_batch_atomik(
+            impor.baca_chunk(berkas, format, ukuran_chunk, pakai_pandas)
+        )
+
+    def jumlah_peralatan(self):
+        """Jumlah peralatan yang terdaftar"""
+        return len(self.peralatan)
+
+    # Kueri inventaris
+    def indeks_grup(self, kolom):
+        """Indeks grup untuk kolom 'nama' atau 'golongan' (dibangun saat pertama diminta)"""
+        indeks = self._indeks_grup.get(kolom)
+        if indeks is None or not indeks.sinkron(self.peralatan):
+            indeks = self._indeks_grup[kolom] = kueri.IndeksGrup(self.peralatan, kolom, HARI_PER_BULAN)
+        return indeks
+
+    def nilai_kolom(self, nama):
+        """Array nilai per peralatan untuk kolom kueri numerik (termasuk kwh dan biaya)"""
+        if nama == 'kwh':
+            return self.peralatan.kwh_per_bulan(HARI_PER_BULAN)
+        if nama == 'biaya':
+            # Alokasi tagihan lewat mesin tarif; dihitung sekali per versi dan tarif
+            return self.memo_halaman('kolom_biaya', self.hitung_biaya_per_peralatan)
+        if nama == 'jam_mulai':
+            return self.peralatan.jam_mulai_efektif()
+        if nama not in kueri.KOLOM_NILAI or nama in kueri.KOLOM_GRUP:
+            raise KeyError(f'kolom numerik tidak dikenal: {nama}')
+        return self.peralatan.kolom(nama)
+
+    @instrumentasi.diukur()
+    def kueri(self, saring=None, grup=None, kolom=None, urut=None, menurun=False, batas=None):
+        """Kueri inventaris: saring, kelompokkan, urutkan, lalu ambil batas teratas
+
+        saring: dict kolom -> kondisi; kondisi berupa nilai (sama dengan), list
+        atau set nilai (salah satu), atau tuple (operator, nilai) dengan
+        operator ==, !=, <, <=, >, >=, dalam, atau mengandung (teks).
+        grup: 'nama' atau 'golongan' untuk agregasi per grup (kolom dari
+        kueri.KOLOM_AGREGAT_SEMUA); tanpa grup hasilnya per peralatan (kolom
+        dari kueri.KOLOM_NILAI) ditambah 'indeks' baris. Hasil berupa dict
+        kolom -> array. Contoh: kueri(grup='golongan', kolom=('kwh', 'biaya')),
+        kueri(urut='kwh', menurun=True, batas=20),
+        kueri(saring={'jam_per_hari': ('>', 8)}).
+        """
+        return kueri.jalankan(self, saring, grup, kolom, urut, menurun, batas)
+
+    def kueri_peralatan(self, cari='', golongan=None, urut=None, menurun=False):
+        """Indeks peralatan yang lolos saringan nama/golongan, terurut menurut kolom urut
+
+        Hasil di-cache per versi inventaris, sehingga berpindah halaman tabel
+        hanya memotong array indeks.
+        """
+        def jalankan():
+            saring = {}
+            if cari:
+                saring['nama'] = ('mengandung', cari)
+            if golongan is not None:
+                saring['golongan'] = list(golongan)
+            indeks = self.kueri(saring, kolom=(), urut=urut, menurun=menurun)['indeks']
+            indeks.flags.writeable = False
+            return indeks
+
+        parameter = (cari, None if golongan is None else tuple(golongan), urut, menurun)
+        return self.memo_halaman('kueri_peralatan', jalankan, parameter)
+
+    def update_penggunaan_harian_dengan_peralatan_baru(self):
+        """Mengupdate penggunaan harian dengan peralatan baru"""
+        if self.penggunaan_harian.ingesti_aktif:
+            # Bacaan meter sungguhan sedang masuk: bacaan contoh akan membuat
+            # pipa membuang bacaan asli yang lebih lama darinya
+            return
+        if not self.penggunaan_harian:
+            self.generate_sample_data()
+        else:
+            new_usage = self.rng.uniform(1, 5)
+            self.penggunaan_harian.tambah(new_usage)
+
+    @_terkunci
+    def set_tarif_listrik(self, golongan):
+        """Set golongan listrik yang dipilih"""
+        self.tarif_terpilih = golongan
+        self.versi += 1
+        self._perlu_disimpan = True
+
+    # 2.Penggunaan Listrik
+    @instrumentasi.diukur()
+    def hitung_total_penggunaan(self):
+        """Menghitung total penggunaan listrik dalam kWh per bulan"""
+        return self._total_kwh
+
+    @instrumentasi.diukur()
+    def hitung_kwh_per_golongan(self):
+        """Total penggunaan listrik (kWh per bulan) untuk setiap golongan"""
+        return dict(self._kwh_per_golongan)
+
+    # 3.Estimasi Biaya
+    def tabel_tarif(self):
+        """Tarif terkompilasi untuk tarif_listrik saat ini (di-cache menurut isinya)"""
+        return tarif.kompilasi(self.tarif_listrik, TARIF_DEFAULT)
+
+    def _tagihan_golongan(self, kwh_per_golongan):
+        """Tagihan (Rp per bulan) untuk setiap golongan, satu akun per golongan"""
+        tabel_tarif = self.tabel_tarif()
+        golongan = list(kwh_per_golongan)
+        kode = tabel_tarif.kode(golongan)
+        kwh = np.array([kwh_per_golongan[g] for g in golongan], dtype=np.float64)
+        tagihan = tabel_tarif.tagihan(
+            kode, kwh, tabel_tarif.energi(kode, kwh), akun=np.arange(len(golongan))
+        )
+        return dict(zip(golongan, tagihan['total'].tolist()))
+
+    def _tagihan_peralatan(self, jam_per_hari=None):
+        """Tagihan per golongan dari data per peralatan, memakai profil per jam bila perlu
+
+        Mengembalikan (energi per peralatan, tagihan per akun golongan).
+        """
+        tabel_tarif = self.tabel_tarif()
+        tabel = self.peralatan
+        if jam_per_hari is None:
+            jam_per_hari = tabel.kolom('jam_per_hari')
+        golongan = tabel.kolom('golongan').astype(np.intp)
+        kode = tabel_tarif.kode(tabel.kamus_golongan.daftar())[golongan]
+        kw = tabel.kolom('total_watt') / 1000
+        kwh = kw * jam_per_hari * HARI_PER_BULAN
+
+        kwh_jam = None
+        if not tabel_tarif.seragam:
+            # Tarif waktu pemakaian: kWh per jam dari jadwal setiap peralatan
+            jam_mulai = tabel.jam_mulai_efektif(jam_per_hari)
+
+            def kwh_jam(mulai, selesai):
+                return profil_beban.kwh_per_jam(
+                    kw[mulai:selesai], jam_mulai[mulai:selesai],
+                    jam_per_hari[mulai:selesai], HARI_PER_BULAN,
+                )
+
+        energi = tabel_tarif.energi(kode, kwh, kwh_jam)
+        return energi, tabel_tarif.tagihan(kode, kwh, energi, akun=golongan)
+
+    @instrumentasi.diukur()
+    def hitung_estimasi_biaya(self, jam_per_hari=None):
+        """Menghitung estimasi biaya listrik (Rp per bulan) lewat mesin tarif
+
+        jam_per_hari opsional (array per peralatan) untuk menghitung skenario
+        pemakaian lain, misalnya setelah saran.
+        """
+        if jam_per_hari is None:
+            return sum(self.hitung_biaya_per_golongan().values())
+        return float(self._tagihan_peralatan(jam_per_hari)[1]['total'].sum())
+
+    @instrumentasi.diukur()
+    def hitung_biaya_per_golongan(self):
+        """Estimasi biaya listrik (Rp per bulan) untuk setiap golongan"""
+        if self.tabel_tarif().seragam:
+            # Tanpa tarif waktu pemakaian, agregat berjalan sudah cukup
+            return self._tagihan_golongan(self._kwh_per_golongan)
+        tagihan = self._tagihan_peralatan()[1]
+        daftar = self.peralatan.kamus_golongan.daftar()
+        # Hanya akun golongan yang masih punya peralatan; kode golongan yang
+        # sudah kosong bisa berada di luar panjang tagihan
+        return {
+            daftar[k]: float(tagihan['total'][k]) for k in np.unique(tagihan['akun']).tolist()
+        }
+
+    @instrumentasi.diukur()
+    def hitung_biaya_per_peralatan(self):
+        """Menghitung biaya listrik per peralatan sesuai golongannya (Rp/bulan)
+
+        Tagihan tiap golongan (termasuk blok, minimum, dan pajak) dibagi ke
+        peralatannya menurut porsi biaya energinya, sehingga jumlahnya sama
+        dengan hitung_estimasi_biaya.
+        """
+        energi, tagihan = self._tagihan_peralatan()
+        return tarif.TabelTarif.alokasi(tagihan, energi)
+
+    @instrumentasi.diukur()
+    def prakiraan_biaya(self, jumlah_simulasi=prakiraan.JUMLAH_SIMULASI, jumlah_proses=1):
+        """Prakiraan tagihan bulanan Monte Carlo: sampel, rata-rata, P10/P50/P90
+
+        Di-cache menurut versi inventaris dan tarif; jumlah_proses > 1 membagi
+        chunk simulasi ke beberapa proses.
+        """
+        def hitung():
+            tabel_tarif = self.tabel_tarif()
+            tabel = self.peralatan
+            golongan, kode_golongan = np.unique(tabel.kolom('golongan').astype(np.intp),
+                                                return_inverse=True)
+            kw = tabel.kolom('total_watt') / 1000
+            jam = tabel.kolom('jam_per_hari')
+            # Harga per kWh setiap peralatan dari jadwal dasarnya (tarif waktu pemakaian)
+            energi, _ = self._tagihan_peralatan()
+            kwh = kw * jam * HARI_PER_BULAN
+            harga_kwh = np.divide(energi, kwh, out=np.zeros_like(kwh), where=kwh > 0)
+            kode_tarif = tabel_tarif.kode([tabel.kamus_golongan.teks(g) for g in golongan.tolist()])
+            hasil = prakiraan.simulasi(
+                kw, jam, harga_kwh, kode_golongan, kode_tarif, tabel_tarif, self.rng,
+                jumlah_simulasi=jumlah_simulasi, hari=HARI_PER_BULAN, jumlah_proses=jumlah_proses,
+            )
+            hasil['tagihan'].flags.writeable = False
+            return hasil
+
+        return self.memo_halaman('prakiraan', hitung, jumlah_simulasi)
+
+    @instrumentasi.diukur()
+    def simulasi_beban(self, resolusi_menit=1):
+        """Profil beban harian per golongan: puncak VA, faktor kebersamaan, menit di atas kapasitas"""
+        return profil_beban.simulasi(self.peralatan, resolusi_menit=resolusi_menit)
+
+    # 4.Saran Penggunaan
+    @instrumentasi.diukur()
+    def hitung_saran(self, target_kwh=None, target_biaya=None,
+                     jam_minimum=saran.JAM_MINIMUM_DEFAULT,
+                     esensial=None, bobot=None):
+        """Saran jam pemakaian termurah untuk target kWh/tagihan (lihat saran.optimasi)
+
+        Solusi di-cache menurut versi inventaris, tarif, dan parameternya,
+        sehingga halaman yang digambar ulang tidak menyelesaikannya lagi.
+        """
+        parameter = saran.kunci_parameter((target_kwh, target_biaya, jam_minimum, esensial, bobot))
+
+        def selesaikan():
+            tabel_tarif = self.tabel_tarif()
+            kode = tabel_tarif.kode(self.peralatan.kamus_golongan.daftar())
+            kode = kode[self.peralatan.kolom('golongan').astype(np.intp)]
+            hasil = saran.optimasi(
+                self.peralatan,
+                tabel_tarif.harga_rata[kode] * (1 + tabel_tarif.pajak[kode]),
+                self.hitung_estimasi_biaya,
+                target_kwh=target_kwh, target_biaya=target_biaya,
+                jam_minimum=jam_minimum, esensial=esensial, bobot=bobot, hari=HARI_PER_BULAN,
+            )
+            for nilai in hasil.values():
+                if isinstance(nilai, np.ndarray):
+                    nilai.flags.writeable = False
+            return hasil
+
+        return self.memo_halaman('solusi_saran', selesaikan, parameter)
+
+    @instrumentasi.diukur()
+    def evaluasi_skenario(self, daftar_skenario):
+        """kWh dan tagihan bulanan banyak skenario what-if sekaligus (lihat skenario.evaluasi)
+
+        Di-cache menurut versi inventaris, tarif, dan daftar skenarionya.
+        """
+        def hitung():
+            hasil = skenario.evaluasi(self, daftar_skenario, hari=HARI_PER_BULAN)
+            for nilai in hasil.values():
+                if isinstance(nilai, np.ndarray):
+                    nilai.flags.writeable = False
+            return hasil
+
+        return self.memo_halaman('skenario', hitung, skenario.kunci_parameter(daftar_skenario))
+
+    def detektor_anomali(self):
+        """Detektor anomali daring yang mendengarkan penggunaan_harian"""
+        if self._detektor is None:
+            self._detektor = anomali.DetektorAnomali().pasang(self.penggunaan_harian)
+        return self._detektor
+
+    @instrumentasi.diukur()
+    def generate_sample_data(self, hari=30):
+        """Menghasilkan data penggunaan listrik sampel"""
+        penggunaan = self.rng.uniform(5, 15, size=hari)
+        # Satu bacaan per hari, berakhir hari ini
+        hari_ini = np.datetime64('today', 's')
+        waktu = hari_ini - LANGKAH_DEFAULT * np.arange(hari - 1, -1, -1)
+        self.penggunaan_harian.kosongkan()
+        self.penggunaan_harian.tambah_batch(waktu, penggunaan)
+
+    @instrumentasi.diukur()
+    def konsumsi_energi_per_peralatan(self):
+        """Menghitung konsumsi energi per peralatan"""
+        return [
+            {'peralatan': nama, 'konsumsi': konsumsi}
+            for nama, konsumsi in zip(
+                self.peralatan.nama().tolist(),
+                self.peralatan.kwh_per_bulan(HARI_PER_BULAN).tolist(),
+            )
+        ]
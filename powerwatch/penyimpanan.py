@@ -0,0 +1,268 @@
+"""Penyimpanan persisten: SQLite untuk data peralatan, segmen .npy untuk riwayat bacaan
+
+Riwayat bacaan ditulis sebagai segmen append-only (sepasang berkas .npy untuk
+waktu dan kWh) yang dicatat dalam tabel ``segmen``. Saat dimuat, segmen dibuka
+dengan memory-map sehingga tidak ada penguraian teks, dan hanya segmen yang
+bersinggungan dengan rentang waktu yang diminta yang disentuh.
+"""
+import functools
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from .deret_waktu import TIPE_WAKTU, _ke_waktu
+
+NAMA_DB = 'powerwatch.db'
+DIREKTORI_SEGMEN = 'segmen'
+UKURAN_FLUSH = 100_000  # Jumlah bacaan yang ditampung sebelum ditulis sebagai segmen
+VARIABEL_LINGKUNGAN = 'POWERWATCH_DATA'
+
+SKEMA = '''
+CREATE TABLE IF NOT EXISTS peralatan (
+    urutan INTEGER PRIMARY KEY,
+    nama TEXT NOT NULL,
+    unit INTEGER NOT NULL,
+    watt REAL NOT NULL,
+    golongan TEXT NOT NULL,
+    jam_per_hari REAL NOT NULL,
+    jam_mulai REAL
+);
+CREATE TABLE IF NOT EXISTS pengaturan (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT
+);
+CREATE TABLE IF NOT EXISTS segmen (
+    id INTEGER PRIMARY KEY,
+    waktu_awal INTEGER NOT NULL,
+    waktu_akhir INTEGER NOT NULL,
+    jumlah INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segmen_waktu ON segmen (waktu_awal, waktu_akhir);
+'''
+
+
+class PenyimpananListrik:
+    def __init__(self, direktori, ukuran_flush=UKURAN_FLUSH):
+        """Membuka (atau membuat) penyimpanan di sebuah direktori"""
+        self.direktori = direktori
+        self.ukuran_flush = ukuran_flush
+        os.makedirs(os.path.join(direktori, DIREKTORI_SEGMEN), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(direktori, NAMA_DB), check_same_thread=False)
+        self._db.executescript(SKEMA)
+        self._migrasi()
+        self._kunci = threading.Lock()
+        self._buffer_waktu = []
+        self._buffer_kwh = []
+        self._jumlah_buffer = 0
+        # Segmen bersifat append-only: bacaan yang lebih lama dari yang terakhir dibuang
+        baris = self._db.execute('SELECT MAX(waktu_akhir) FROM segmen').fetchone()
+        self._waktu_terakhir = None if baris[0] is None else np.int64(baris[0]).astype(TIPE_WAKTU)
+        self.dibuang = 0
+
+    def _migrasi(self):
+        """Menambahkan kolom yang belum ada pada basis data versi lama"""
+        kolom = {baris[1] for baris in self._db.execute('PRAGMA table_info(peralatan)')}
+        if 'jam_mulai' not in kolom:
+            with self._db:
+                self._db.execute('ALTER TABLE peralatan ADD COLUMN jam_mulai REAL')
+
+    # Data peralatan
+    def ada_peralatan(self):
+        """True jika penyimpanan sudah berisi data peralatan"""
+        with self._kunci:
+            return self._db.execute('SELECT 1 FROM peralatan LIMIT 1').fetchone() is not None
+
+    @staticmethod
+    def _baris_peralatan(tabel, posisi, urutan):
+        """Baris tabel SQL (urutan, nama, ...) untuk peralatan pada posisi"""
+        return zip(
+            urutan[posisi].tolist(),
+            tabel.kamus_nama.sebagai_array()[tabel.kolom('nama')[posisi]].tolist(),
+            tabel.kolom('unit')[posisi].tolist(),
+            tabel.kolom('watt')[posisi].tolist(),
+            tabel.kamus_golongan.sebagai_array()[tabel.kolom('golongan')[posisi]].tolist(),
+            tabel.kolom('jam_per_hari')[posisi].tolist(),
+            # NaN (jam mulai otomatis) disimpan sebagai NULL
+            [None if x != x else x for x in tabel.kolom('jam_mulai')[posisi].tolist()],
+        )
+
+    def simpan_peralatan(self, tabel):
+        """Mengganti seluruh data peralatan dalam satu transaksi; mengembalikan urutan per baris"""
+        urutan = np.arange(len(tabel), dtype=np.int64)
+        with self._kunci, self._db:
+            self._db.execute('DELETE FROM peralatan')
+            self._db.executemany(
+                'INSERT INTO peralatan (urutan, nama, unit, watt, golongan, jam_per_hari, jam_mulai) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._baris_peralatan(tabel, urutan, urutan),
+            )
+        return urutan
+
+    def simpan_perubahan_peralatan(self, tabel, urutan, perubahan):
+        """Menulis hanya baris yang berubah sejak simpan terakhir dalam satu transaksi
+
+        urutan adalah kunci baris (kolom urutan) setiap peralatan saat simpan
+        terakhir; perubahan berupa daftar ('tambah', jumlah), ('ubah', indeks),
+        atau ('hapus', indeks) sesuai urutan kejadian. Baris baru mendapat
+        urutan setelah yang terbesar sehingga ORDER BY urutan tetap sama dengan
+        urutan tabel. Mengembalikan urutan setiap peralatan saat ini.
+        """
+        urutan = np.asarray(urutan, dtype=np.int64)
+        with self._kunci, self._db:
+            berikut = self._db.execute('SELECT COALESCE(MAX(urutan), -1) + 1 FROM peralatan').fetchone()[0]
+            berikut = max(berikut, int(urutan.max()) + 1 if len(urutan) else 0)
+            kotor, dihapus = set(), []
+            for jenis, nilai in perubahan:
+                if jenis == 'tambah':
+                    baru = np.arange(berikut, berikut + nilai, dtype=np.int64)
+                    berikut += nilai
+                    urutan = np.concatenate([urutan, baru])
+                    kotor.update(baru.tolist())
+                elif jenis == 'ubah':
+                    kotor.add(int(urutan[nilai]))
+                else:
+                    kunci = int(urutan[nilai])
+                    kotor.discard(kunci)
+                    dihapus.append(kunci)
+                    urutan = np.delete(urutan, nilai)
+            if len(urutan) != len(tabel):
+                raise RuntimeError('Catatan perubahan peralatan tidak cocok dengan tabel')
+
+            self._db.executemany('DELETE FROM peralatan WHERE urutan = ?', ((k,) for k in dihapus))
+            posisi = np.flatnonzero(np.isin(urutan, np.fromiter(kotor, dtype=np.int64, count=len(kotor))))
+            self._db.executemany(
+                'INSERT OR REPLACE INTO peralatan '
+                '(urutan, nama, unit, watt, golongan, jam_per_hari, jam_mulai) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._baris_peralatan(tabel, posisi, urutan),
+            )
+        return urutan
+
+    def muat_peralatan(self):
+        """Data peralatan sebagai dict kolom (urutan sesuai saat disimpan) beserta kolom urutan"""
+        with self._kunci:
+            baris = self._db.execute(
+                'SELECT nama, unit, watt, golongan, jam_per_hari, jam_mulai, urutan '
+                'FROM peralatan ORDER BY urutan'
+            ).fetchall()
+        nama_kolom = ('nama', 'unit', 'watt', 'golongan', 'jam_per_hari', 'jam_mulai', 'urutan')
+        if not baris:
+            return {nama: [] for nama in nama_kolom}
+        return dict(zip(nama_kolom, (list(k) for k in zip(*baris))))
+
+    def simpan_pengaturan(self, kunci, nilai):
+        with self._kunci, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO pengaturan (kunci, nilai) VALUES (?, ?)', (kunci, nilai)
+            )
+
+    def muat_pengaturan(self, kunci, default=None):
+        with self._kunci:
+            baris = self._db.execute(
+                'SELECT nilai FROM pengaturan WHERE kunci = ?', (kunci,)
+            ).fetchone()
+        return default if baris is None else baris[0]
+
+    # Riwayat bacaan
+    def _berkas_segmen(self, id_segmen):
+        dasar = os.path.join(self.direktori, DIREKTORI_SEGMEN, f'{id_segmen:08d}')
+        return dasar + '_waktu.npy', dasar + '_kwh.npy'
+
+    def tambah_pembacaan(self, waktu, kwh):
+        """Menampung bacaan baru; ditulis sebagai segmen saat buffer penuh"""
+        waktu = _ke_waktu(waktu)
+        kwh = np.asarray(kwh, dtype=np.float64)
+        with self._kunci:
+            if self._waktu_terakhir is not None:
+                mulai = int(np.searchsorted(waktu, self._waktu_terakhir, 'left'))
+                self.dibuang += mulai
+                waktu, kwh = waktu[mulai:], kwh[mulai:]
+            if not len(waktu):
+                return
+            self._buffer_waktu.append(np.array(waktu))
+            self._buffer_kwh.append(np.array(kwh))
+            self._jumlah_buffer += len(waktu)
+            self._waktu_terakhir = waktu[-1]
+            penuh = self._jumlah_buffer >= self.ukuran_flush
+        if penuh:
+            self.flush()
+
+    def flush(self):
+        """Menulis bacaan yang masih ditampung sebagai satu segmen baru"""
+        with self._kunci:
+            if not self._jumlah_buffer:
+                return
+            waktu = np.concatenate(self._buffer_waktu)
+            kwh = np.concatenate(self._buffer_kwh)
+            self._buffer_waktu, self._buffer_kwh, self._jumlah_buffer = [], [], 0
+
+            baris = self._db.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM segmen').fetchone()
+            id_segmen = baris[0]
+            for path, array in zip(self._berkas_segmen(id_segmen), (waktu, kwh)):
+                sementara = path + '.tmp'
+                with open(sementara, 'wb') as berkas:
+                    np.save(berkas, array)
+                os.replace(sementara, path)
+            # Segmen baru terlihat hanya setelah kedua berkasnya lengkap
+            with self._db:
+                self._db.execute(
+                    'INSERT INTO segmen (id, waktu_awal, waktu_akhir, jumlah) VALUES (?, ?, ?, ?)',
+                    (id_segmen, int(waktu[0].astype('int64')),
+                     int(waktu[-1].astype('int64')), len(waktu)),
+                )
+
+    def jumlah_pembacaan(self):
+        """Jumlah bacaan yang sudah ditulis ke segmen"""
+        with self._kunci:
+            return self._db.execute('SELECT COALESCE(SUM(jumlah), 0) FROM segmen').fetchone()[0]
+
+    def muat_pembacaan(self, awal=None, akhir=None):
+        """(waktu, kwh) dalam rentang [awal, akhir] dari segmen yang dimemory-map
+
+        Jika rentang hanya mengenai satu segmen, array yang dikembalikan adalah
+        view memory-map tanpa salinan.
+        """
+        batas_awal = np.iinfo(np.int64).min if awal is None else int(_ke_waktu(awal).astype('int64'))
+        batas_akhir = np.iinfo(np.int64).max if akhir is None else int(_ke_waktu(akhir).astype('int64'))
+        with self._kunci:
+            daftar_id = [baris[0] for baris in self._db.execute(
+                'SELECT id FROM segmen WHERE waktu_akhir >= ? AND waktu_awal <= ? ORDER BY id',
+                (batas_awal, batas_akhir),
+            )]
+
+        potongan_waktu, potongan_kwh = [], []
+        for id_segmen in daftar_id:
+            path_waktu, path_kwh = self._berkas_segmen(id_segmen)
+            waktu = np.load(path_waktu, mmap_mode='r')
+            kwh = np.load(path_kwh, mmap_mode='r')
+            mulai = 0 if awal is None else int(np.searchsorted(waktu, _ke_waktu(awal), 'left'))
+            selesai = len(waktu) if akhir is None else int(np.searchsorted(waktu, _ke_waktu(akhir), 'right'))
+            potongan_waktu.append(waktu[mulai:selesai])
+            potongan_kwh.append(kwh[mulai:selesai])
+
+        if not potongan_waktu:
+            return np.zeros(0, dtype=TIPE_WAKTU), np.zeros(0, dtype=np.float64)
+        if len(potongan_waktu) == 1:
+            return potongan_waktu[0], potongan_kwh[0]
+        return np.concatenate(potongan_waktu), np.concatenate(potongan_kwh)
+
+    def tutup(self):
+        """Menulis sisa buffer dan menutup koneksi database"""
+        self.flush()
+        with self._kunci:
+            self._db.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _buka_penyimpanan(direktori):
+    return PenyimpananListrik(direktori)
+
+
+def buka_penyimpanan_dari_env():
+    """Penyimpanan bersama per proses di direktori $POWERWATCH_DATA, atau None jika tidak diset"""
+    direktori = os.environ.get(VARIABEL_LINGKUNGAN)
+    if not direktori:
+        return None
+    return _buka_penyimpanan(os.path.abspath(direktori))
@@ -0,0 +1,127 @@
+"""Profil beban harian: jadwal per peralatan, beban puncak, dan cek kapasitas VA
+
+Setiap peralatan menyala sekali sehari pada [jam_mulai, jam_mulai + jam_per_hari),
+melewati tengah malam bila perlu.
+"""
+import numpy as np
+
+MENIT_PER_HARI = 1440
+FAKTOR_DAYA = 0.85  # cos phi rata-rata peralatan rumah tangga (W -> VA)
+KAPASITAS_VA = {
+    'R-1': 2200,  # batas atas daya tersambung golongan R-1 (VA)
+    'R-2': 5500,  # batas atas daya tersambung golongan R-2 (VA)
+    'R-3': 6600,  # batas bawah golongan R-3; dipakai sebagai kapasitas acuan
+}
+
+
+def kwh_per_jam(kw, jam_mulai, durasi, hari=30):
+    """Matriks kWh (peralatan x 24 jam) dari irisan jadwal dengan setiap jam"""
+    jam = np.arange(24)
+    mulai = np.asarray(jam_mulai, dtype=np.float64)[:, None]
+    selesai = mulai + np.asarray(durasi, dtype=np.float64)[:, None]
+    # Jadwal yang melewati tengah malam juga diiris dengan jam hari berikutnya
+    iris = (np.clip(np.minimum(selesai, jam + 1) - np.maximum(mulai, jam), 0, 1)
+            + np.clip(np.minimum(selesai, jam + 25) - np.maximum(mulai, jam + 24), 0, 1))
+    return iris * (np.asarray(kw, dtype=np.float64)[:, None] * hari)
+
+
+def _slot_jadwal(jam_mulai, durasi, resolusi_menit):
+    """Slot mulai dan panjang jadwal (dibulatkan ke resolusi)"""
+    jumlah_slot = MENIT_PER_HARI // resolusi_menit
+    mulai = np.round(np.asarray(jam_mulai) * 60 / resolusi_menit).astype(np.int64) % jumlah_slot
+    panjang = np.minimum(
+        np.round(np.asarray(durasi) * 60 / resolusi_menit).astype(np.int64), jumlah_slot
+    )
+    return jumlah_slot, mulai, panjang
+
+
+def matriks_nyala(jam_mulai, durasi, resolusi_menit=1):
+    """Matriks boolean (peralatan x slot menit) status nyala setiap peralatan"""
+    jumlah_slot, mulai, panjang = _slot_jadwal(jam_mulai, durasi, resolusi_menit)
+    offset = (np.arange(jumlah_slot)[None, :] - mulai[:, None]) % jumlah_slot
+    return offset < panjang[:, None]
+
+
+def beban_per_slot(watt, jam_mulai, durasi, kelompok, jumlah_kelompok, resolusi_menit=1):
+    """Beban (W) per kelompok per slot; sama dengan watt @ matriks_nyala per kelompok
+
+    Dihitung dengan larik selisih (+watt saat mulai, -watt saat selesai, lalu
+    cumsum), sehingga biayanya O(peralatan + slot) tanpa membangun matriks.
+    """
+    jumlah_slot, mulai, panjang = _slot_jadwal(jam_mulai, durasi, resolusi_menit)
+    watt = np.asarray(watt, dtype=np.float64)
+    kelompok = np.asarray(kelompok, dtype=np.int64)
+    selesai = mulai + panjang
+    lebar = jumlah_slot + 1
+    lewat = selesai > jumlah_slot  # jadwal melewati tengah malam
+
+    posisi = np.concatenate([
+        kelompok * lebar + mulai,
+        kelompok * lebar + np.minimum(selesai, jumlah_slot),
+        kelompok[lewat] * lebar,
+        kelompok[lewat] * lebar + (selesai[lewat] - jumlah_slot),
+    ])
+    bobot = np.concatenate([watt, -watt, watt[lewat], -watt[lewat]])
+    selisih = np.bincount(posisi, weights=bobot, minlength=jumlah_kelompok * lebar)
+    return np.cumsum(selisih.reshape(jumlah_kelompok, lebar)[:, :jumlah_slot], axis=1)
+
+
+class ProfilBeban:
+    """Hasil simulasi beban harian untuk setiap golongan"""
+
+    def __init__(self, golongan, beban_w, daya_terpasang_w, kapasitas_va, faktor_daya,
+                 resolusi_menit):
+        self.golongan = list(golongan)
+        self.resolusi_menit = resolusi_menit
+        self.beban_w = beban_w
+        self.beban_va = beban_w / faktor_daya
+        self.kapasitas_va = np.array(
+            [kapasitas_va.get(g, np.nan) for g in self.golongan], dtype=np.float64
+        )
+        self.puncak_va = self.beban_va.max(axis=1, initial=0)
+        self.menit_puncak = self.beban_va.argmax(axis=1) * resolusi_menit if beban_w.size else \
+            np.zeros(len(self.golongan), dtype=np.int64)
+        # Faktor kebersamaan: beban puncak dibanding jumlah daya semua peralatan
+        self.faktor_kebersamaan = np.divide(
+            beban_w.max(axis=1, initial=0), daya_terpasang_w,
+            out=np.full(len(self.golongan), np.nan), where=daya_terpasang_w > 0,
+        )
+        self.menit_lebih = (self.beban_va > self.kapasitas_va[:, None]).sum(axis=1) * resolusi_menit
+
+    def menit(self):
+        """Menit sejak tengah malam untuk setiap slot"""
+        return np.arange(self.beban_w.shape[1]) * self.resolusi_menit
+
+    def ringkasan(self):
+        """Daftar dict ringkasan per golongan"""
+        return [
+            {
+                'golongan': g,
+                'puncak_va': float(self.puncak_va[i]),
+                'menit_puncak': int(self.menit_puncak[i]),
+                'kapasitas_va': float(self.kapasitas_va[i]),
+                'menit_lebih': int(self.menit_lebih[i]),
+                'faktor_kebersamaan': float(self.faktor_kebersamaan[i]),
+            }
+            for i, g in enumerate(self.golongan)
+        ]
+
+
+def simulasi(tabel, kapasitas_va=KAPASITAS_VA, faktor_daya=FAKTOR_DAYA, resolusi_menit=1):
+    """Simulasi beban harian per golongan dari TabelPeralatan"""
+    if MENIT_PER_HARI % resolusi_menit:
+        raise ValueError('resolusi_menit harus membagi habis 1440')
+    watt = tabel.kolom('total_watt')
+    jam = tabel.kolom('jam_per_hari')
+    kode = tabel.kolom('golongan').astype(np.int64)
+
+    # Hanya golongan yang memiliki peralatan
+    kode_dipakai, kelompok = np.unique(kode, return_inverse=True)
+    kelompok = kelompok.ravel()
+    golongan = [tabel.kamus_golongan.teks(int(k)) for k in kode_dipakai]
+
+    beban = beban_per_slot(
+        watt, tabel.jam_mulai_efektif(), jam, kelompok, len(kode_dipakai), resolusi_menit
+    )
+    daya_terpasang = np.bincount(kelompok, weights=watt * (jam > 0), minlength=len(kode_dipakai))
+    return ProfilBeban(golongan, beban, daya_terpasang, kapasitas_va, faktor_daya, resolusi_menit)
@@ -0,0 +1,146 @@
+"""Mesin saran: pengurangan jam pemakaian termurah untuk mencapai target
+
+Setiap peralatan boleh dikurangi dari jam saat ini sampai jam minimumnya
+(peralatan esensial tidak dikurangi). "Termurah" berarti total jam yang
+dikorbankan (dikali bobot per peralatan) sekecil mungkin. Karena penghematan
+per jam setiap peralatan linear, masalah ini adalah knapsack pecahan: jam
+dipotong dari peralatan dengan penghematan per bobot terbesar lebih dulu, dan
+hasil greedy ini optimal untuk target kWh. Untuk target tagihan, urutan yang
+sama dipakai dengan harga rata-rata golongan, lalu titik potongnya dicari
+dengan regula falsi memakai tagihan sebenarnya (blok, minimum, pajak, waktu).
+"""
+import numpy as np
+
+JAM_MINIMUM_DEFAULT = 4
+PERALATAN_ESENSIAL = ('Kulkas', 'Kamera Pengawas')
+ITERASI_MAKSIMUM = 60
+TOLERANSI_BIAYA = 1.0  # Rp (atau 1e-6 target); tagihan saran boleh di bawah target sebesar ini
+
+
+def mask_esensial(tabel, esensial=None):
+    """Peralatan esensial: namanya memuat salah satu kata di esensial
+
+    Tanpa esensial (None) dipakai aturan default: nama memuat salah satu
+    PERALATAN_ESENSIAL atau peralatan menyala 24 jam. Daftar yang diberikan
+    pemanggil (termasuk kosong) sepenuhnya menentukan hasilnya.
+    """
+    if esensial is None:
+        return tabel.nama_mengandung(PERALATAN_ESENSIAL) | (tabel.kolom('jam_per_hari') >= 24)
+    return tabel.nama_mengandung(esensial)
+
+
+def jam_bawah(tabel, jam_minimum=JAM_MINIMUM_DEFAULT, esensial=None):
+    """Batas bawah jam pemakaian setiap peralatan (tidak pernah melebihi jam saat ini)"""
+    jam = tabel.kolom('jam_per_hari')
+    jam_minimum = np.broadcast_to(np.asarray(jam_minimum, dtype=np.float64), jam.shape)
+    if (jam_minimum < 0).any():
+        raise ValueError('Jam minimum tidak boleh negatif')
+    return np.where(mask_esensial(tabel, esensial), jam, np.minimum(jam, jam_minimum))
+
+
+class Lintasan:
+    def __init__(self, laju, kapasitas, bobot):
+        """Urutan potong greedy: penghematan s -> jam yang dipotong per peralatan
+
+        laju adalah penghematan per jam potong, kapasitas jam yang boleh
+        dipotong, bobot biaya setiap jam potong.
+        """
+        self.n = len(laju)
+        aktif = np.flatnonzero((laju > 0) & (kapasitas > 0))
+        rasio = laju[aktif] / bobot[aktif]
+        self.urutan = aktif[np.argsort(-rasio, kind='stable')]
+        self.laju = laju[self.urutan]
+        self.kapasitas = kapasitas[self.urutan]
+        akhir = np.cumsum(self.laju * self.kapasitas)
+        self.awal = akhir - self.laju * self.kapasitas
+        self.maksimum = float(akhir[-1]) if len(akhir) else 0.0
+
+    def potong(self, s):
+        """Jam yang dipotong per peralatan untuk total penghematan s (dibatasi maksimum)"""
+        hasil = np.zeros(self.n)
+        hasil[self.urutan] = np.clip((s - self.awal) / self.laju, 0, self.kapasitas)
+        return hasil
+
+
+def optimasi(tabel, harga_per_kwh, fungsi_biaya, target_kwh=None, target_biaya=None,
+             jam_minimum=JAM_MINIMUM_DEFAULT, esensial=None, bobot=None, hari=30):
+    """Jam saran termurah yang mencapai target kWh atau target tagihan per bulan
+
+    harga_per_kwh (per peralatan) hanya dipakai untuk mengurutkan potongan
+    pada target tagihan; fungsi_biaya(jam_per_hari) menghitung tagihan
+    sebenarnya. Tanpa target, semua peralatan dipotong sampai jam minimumnya.
+    """
+    if target_kwh is not None and target_biaya is not None:
+        raise ValueError('Pilih salah satu: target kWh atau target tagihan')
+    if (target_kwh is not None and target_kwh < 0) or (target_biaya is not None and target_biaya < 0):
+        raise ValueError('Target tidak boleh negatif')
+
+    jam = tabel.kolom('jam_per_hari')
+    kwh_per_jam = tabel.kolom('total_watt') / 1000 * hari
+    bawah = jam_bawah(tabel, jam_minimum, esensial)
+    if bobot is None:
+        bobot = np.ones(len(jam))
+    bobot = np.broadcast_to(np.asarray(bobot, dtype=np.float64), jam.shape)
+    if (bobot <= 0).any():
+        raise ValueError('Bobot harus positif')
+
+    biaya_saat_ini = fungsi_biaya(jam)
+    if target_biaya is None:
+        lintasan = Lintasan(kwh_per_jam, jam - bawah, bobot)
+        if target_kwh is None:
+            s = lintasan.maksimum
+        else:
+            s = min(max(float(jam @ kwh_per_jam) - target_kwh, 0.0), lintasan.maksimum)
+        jam_saran = jam - lintasan.potong(s)
+        biaya_saran = fungsi_biaya(jam_saran)
+        tercapai = target_kwh is None or float(jam_saran @ kwh_per_jam) <= target_kwh * (1 + 1e-12)
+    elif biaya_saat_ini <= target_biaya:
+        jam_saran, biaya_saran, tercapai = jam, biaya_saat_ini, True
+    else:
+        lintasan = Lintasan(kwh_per_jam * harga_per_kwh, jam - bawah, bobot)
+        jam_saran = jam - lintasan.potong(lintasan.maksimum)
+        biaya_saran = fungsi_biaya(jam_saran)
+        tercapai = biaya_saran <= target_biaya
+        # Tagihan tidak naik saat potongan bertambah: cari potongan terkecil yang
+        # cukup dengan regula falsi (Illinois) di dalam braket [bawah_s, atas_s]
+        bawah_s, atas_s = 0.0, lintasan.maksimum
+        g_bawah, g_atas = biaya_saat_ini - target_biaya, biaya_saran - target_biaya
+        for _ in range(ITERASI_MAKSIMUM if tercapai else 0):
+            if biaya_saran > target_biaya - max(TOLERANSI_BIAYA, 1e-6 * target_biaya) or atas_s - bawah_s <= 1e-12 * lintasan.maksimum:
+                break
+            tengah = atas_s - g_atas * (atas_s - bawah_s) / (g_atas - g_bawah)
+            if not bawah_s < tengah < atas_s:
+                tengah = (bawah_s + atas_s) / 2
+            jam_tengah = jam - lintasan.potong(tengah)
+            biaya_tengah = fungsi_biaya(jam_tengah)
+            if biaya_tengah <= target_biaya:
+                atas_s, g_atas = tengah, biaya_tengah - target_biaya
+                jam_saran, biaya_saran = jam_tengah, biaya_tengah
+                g_bawah /= 2
+            else:
+                bawah_s, g_bawah = tengah, biaya_tengah - target_biaya
+                g_atas /= 2
+
+    return {
+        'jam_saat_ini': jam,
+        'jam_saran': jam_saran,
+        'jam_minimum': bawah,
+        'esensial': mask_esensial(tabel, esensial),
+        'kwh_saat_ini': jam * kwh_per_jam,
+        'kwh_saran': jam_saran * kwh_per_jam,
+        'biaya_saat_ini': biaya_saat_ini,
+        'biaya_saran': biaya_saran,
+        'jam_dikorbankan': float((jam - jam_saran) @ bobot),
+        'tercapai': bool(tercapai),
+    }
+
+
+def kunci_parameter(nilai):
+    """Bentuk hashable dari parameter (array disalin sebagai bytes) untuk kunci cache"""
+    if isinstance(nilai, np.generic):
+        return nilai.item()
+    if nilai is None or isinstance(nilai, (int, float, str)):
+        return nilai
+    if isinstance(nilai, np.ndarray):
+        return (nilai.dtype.str, nilai.shape, nilai.tobytes())
+    return tuple(kunci_parameter(v) for v in nilai)
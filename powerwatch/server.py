@@ -0,0 +1,565 @@
+"""Server HTTP/JSON asyncio lokal di atas mesin MonitorListrik
+
+    python -m powerwatch.server [BERKAS] [--host 127.0.0.1] [--port 8765]
+
+Endpoint (semua JSON):
+
+    GET    /ringkasan             total kWh, biaya, dan rincian per golongan
+    GET    /peralatan             daftar peralatan (cari, golongan, jam_min, urut, menurun, mulai, batas)
+    POST   /peralatan             tambah satu (objek) atau banyak (list objek) peralatan
+    GET    /peralatan/<indeks>    satu peralatan
+    PATCH  /peralatan/<indeks>    ubah kolom peralatan
+    DELETE /peralatan/<indeks>    hapus peralatan
+    GET    /konsumsi              kWh per peralatan atau per grup (grup, urut, menurun, batas, saringan)
+    GET    /biaya                 biaya total, per golongan, dan peralatan termahal (batas, saringan)
+    GET    /saran                 saran jam pemakaian (target_kwh atau target_biaya, batas)
+    POST   /batch                 beberapa permintaan sekaligus: [{"metode", "path", "body"}, ...]
+
+Koneksi HTTP/1.1 dipertahankan (keep-alive). Semua permintaan lengkap yang
+tiba dalam satu potongan data (pipelining) dilayani berurutan lalu
+responsnya dikirim dengan satu kali tulis. Respons GET di-cache sebagai byte
+JSON menurut (versi inventaris, tarif, target); setiap perubahan peralatan
+menaikkan versi sehingga entri lama tidak terpakai lagi. Respons GET membawa
+ETag versi, dan If-None-Match yang cocok dijawab 304 tanpa isi.
+"""
+import argparse
+import asyncio
+import http
+import json
+import os
+import re
+import sys
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from . import impor, instrumentasi, kueri, snapshot
+from .memo import MemoLRU
+from .monitor import HARI_PER_BULAN, MonitorListrik
+
+HOST_DEFAULT = '127.0.0.1'
+PORT_DEFAULT = 8765
+KAPASITAS_CACHE = 1024  # Respons GET yang di-cache per versi inventaris
+BATAS_DEFAULT = 20  # Baris default untuk daftar peringkat (konsumsi, biaya, saran)
+BATAS_HALAMAN = 100  # Baris default untuk /peralatan
+BATAS_MAKS = 10_000
+BATAS_BATCH = 1_000  # Permintaan maksimum dalam satu /batch
+BATAS_KEPALA = 64 * 1024  # Byte maksimum baris permintaan + header
+BATAS_BODY = 16 * 1024 * 1024
+BATAS_BUFFER = 4 * 1024 * 1024  # Data masuk yang ditampung sebelum membaca dijeda
+BATAS_IDLE = 60.0  # Detik sebelum koneksi keep-alive yang diam ditutup
+
+NILAI_BENAR = ('1', 'true', 'ya', 'yes')
+
+# (metode, pola path, nama handler)
+RUTE = (
+    ('GET', r'/ringkasan', 'ringkasan'),
+    ('GET', r'/peralatan', 'daftar_peralatan'),
+    ('POST', r'/peralatan', 'tambah_peralatan'),
+    ('GET', r'/peralatan/(-?\d+)', 'ambil_peralatan'),
+    ('PATCH', r'/peralatan/(-?\d+)', 'ubah_peralatan'),
+    ('DELETE', r'/peralatan/(-?\d+)', 'hapus_peralatan'),
+    ('GET', r'/konsumsi', 'konsumsi'),
+    ('GET', r'/biaya', 'biaya'),
+    ('GET', r'/saran', 'saran'),
+    ('POST', r'/batch', 'batch'),
+)
+
+
+class GalatHTTP(Exception):
+    def __init__(self, status, pesan):
+        """Galat yang dijawab sebagai respons JSON {"galat": pesan} berstatus status"""
+        super().__init__(pesan)
+        self.status = status
+
+
+def _bawaan_json(nilai):
+    if isinstance(nilai, np.ndarray):
+        return nilai.tolist()
+    if isinstance(nilai, np.generic):
+        return nilai.item()
+    raise TypeError(f'{type(nilai).__name__} tidak dapat dijadikan JSON')
+
+
+def ke_json(data):
+    """Byte JSON ringkas; array dan skalar NumPy diubah ke tipe Python"""
+    return json.dumps(data, separators=(',', ':'), default=_bawaan_json).encode('utf-8')
+
+
+def _daftar_baris(kolom):
+    """Dict kolom -> array menjadi list objek per baris"""
+    nama = list(kolom)
+    return [dict(zip(nama, baris)) for baris in zip(*(kolom[k].tolist() for k in nama))]
+
+
+def _angka(query, nama, default=None, tipe=int, minimum=None, maksimum=None):
+    """Parameter query numerik dengan validasi rentang"""
+    if nama not in query or query[nama] == '':
+        return default
+    try:
+        nilai = tipe(query[nama])
+    except ValueError:
+        raise GalatHTTP(400, f'parameter {nama} harus berupa angka') from None
+    if minimum is not None and nilai < minimum or maksimum is not None and nilai > maksimum:
+        raise GalatHTTP(400, f'parameter {nama} di luar rentang')
+    return nilai
+
+
+def _pilihan(query, nama, pilihan, default=None):
+    nilai = query.get(nama) or default
+    if nilai is not None and nilai not in pilihan:
+        raise GalatHTTP(400, f"parameter {nama} harus salah satu dari: {', '.join(pilihan)}")
+    return nilai
+
+
+def _menurun(query, default):
+    if 'menurun' not in query:
+        return default
+    return query['menurun'].lower() in NILAI_BENAR
+
+
+def _saringan(query):
+    """Saringan kueri dari parameter cari, golongan (dipisah koma), dan jam_min"""
+    saring = {}
+    if query.get('cari'):
+        saring['nama'] = ('mengandung', query['cari'])
+    if query.get('golongan'):
+        saring['golongan'] = query['golongan'].split(',')
+    jam_min = _angka(query, 'jam_min', tipe=float)
+    if jam_min is not None:
+        saring['jam_per_hari'] = ('>=', jam_min)
+    return saring
+
+
+class ServerMonitor:
+    def __init__(self, monitor, kapasitas_cache=KAPASITAS_CACHE):
+        """Lapisan HTTP/JSON di atas satu MonitorListrik (dipakai bersama semua koneksi)"""
+        self.monitor = monitor
+        self.cache = MemoLRU(kapasitas_cache)
+        self.jumlah_permintaan = 0
+        # Pembeda ETag antar-proses: versi monitor dimulai dari 0 setiap server dijalankan
+        self._token = os.urandom(4).hex()
+        self._rute = [(metode, re.compile(pola + r'/?'), nama) for metode, pola, nama in RUTE]
+
+    def _kunci_versi(self):
+        return (self.monitor.versi, self.monitor.kunci_tarif())
+
+    def _etag(self, kunci_versi):
+        return f'"{self._token}-{kunci_versi[0]}-{hash(kunci_versi[1]) & 0xffffffff:08x}"'
+
+    def _cari_rute(self, metode, path):
+        cocok_path = False
+        for metode_rute, pola, nama in self._rute:
+            cocok = pola.fullmatch(path)
+            if cocok is None:
+                continue
+            cocok_path = True
+            if metode_rute == metode:
+                return getattr(self, '_' + nama), cocok.groups()
+        if cocok_path:
+            raise GalatHTTP(405, f'metode {metode} tidak didukung untuk {path}')
+        raise GalatHTTP(404, f'path tidak dikenal: {path}')
+
+    def _jalankan(self, metode, path, query, body):
+        """(status, byte JSON) dari handler; galat diubah menjadi respons JSON"""
+        try:
+            handler, argumen = self._cari_rute(metode, path)
+            with instrumentasi.rentang(f'http:{metode} {handler.__name__[1:]}'):
+                status, data = handler(query, body, *argumen)
+        except GalatHTTP as e:
+            return e.status, ke_json({'galat': str(e)})
+        except IndexError as e:
+            return 404, ke_json({'galat': str(e)})
+        except (ValueError, KeyError) as e:
+            return 400, ke_json({'galat': str(e).strip("'")})
+        except Exception as e:
+            return 500, ke_json({'galat': f'{type(e).__name__}: {e}'})
+        return status, data if isinstance(data, bytes) else ke_json(data)
+
+    def tangani(self, metode, target, body=None, etag_klien=None):
+        """Melayani satu permintaan; mengembalikan (status, byte JSON, ETag atau None)
+
+        body adalah JSON yang sudah diurai (atau None).
+        """
+        self.jumlah_permintaan += 1
+        bagian = urlsplit(target)
+        query = dict(parse_qsl(bagian.query, keep_blank_values=True))
+        if metode in ('GET', 'HEAD'):
+            kunci_versi = self._kunci_versi()
+            etag = self._etag(kunci_versi)
+            if etag_klien is not None and etag in etag_klien:
+                return 304, b'', etag
+            status, payload = self.cache.ambil(
+                (kunci_versi, target),
+                lambda: self._jalankan('GET', bagian.path, query, None)
+            )
+            return status, payload, etag
+
+        versi_lama = self._kunci_versi()
+        status, payload = self._jalankan(metode, bagian.path, query, body)
+        kunci_versi = self._kunci_versi()
+        if kunci_versi != versi_lama:
+            # Respons versi lama tidak akan pernah diminta lagi
+            self.cache.buang_jika(lambda k: k[0] != kunci_versi)
+        return status, payload, None
+
+    # Handler: (query, body, *grup path) -> (status, data JSON atau byte)
+    def _ringkasan(self, query, body):
+        m = self.monitor
+        total_kwh = m.hitung_total_penggunaan()
+        per_golongan = m.kueri(grup='golongan', kolom=('jumlah', 'kwh', 'biaya'))
+        return 200, {
+            'versi': m.versi,
+            'jumlah_peralatan': m.jumlah_peralatan(),
+            'total_kwh': total_kwh,
+            'rata_kwh_per_hari': total_kwh / HARI_PER_BULAN,
+            'estimasi_biaya': m.hitung_estimasi_biaya(),
+            'per_golongan': {
+                baris.pop('golongan'): baris for baris in _daftar_baris(per_golongan)
+            },
+        }
+
+    def _baris_peralatan(self, indeks):
+        """List objek peralatan untuk array indeks (jam_mulai efektif dan kWh ikut)"""
+        kolom = {'indeks': indeks, **self.monitor.peralatan.baris(indeks)}
+        kolom['kwh'] = self.monitor.nilai_kolom('kwh')[indeks]
+        return _daftar_baris(kolom)
+
+    def _objek_peralatan(self, indeks):
+        jumlah = len(self.monitor.peralatan)
+        if not -jumlah <= indeks < jumlah:
+            raise IndexError('indeks peralatan di luar jangkauan')
+        return self._baris_peralatan(np.array([indeks % jumlah]))[0]
+
+    def _daftar_peralatan(self, query, body):
+        urut = _pilihan(query, 'urut', kueri.KOLOM_NILAI)
+        mulai = _angka(query, 'mulai', 0, minimum=0)
+        batas = _angka(query, 'batas', BATAS_HALAMAN, minimum=0, maksimum=BATAS_MAKS)
+        indeks = self.monitor.kueri(
+            _saringan(query), kolom=(), urut=urut, menurun=_menurun(query, False)
+        )['indeks']
+        return 200, {
+            'jumlah': len(indeks),
+            'mulai': mulai,
+            'peralatan': self._baris_peralatan(indeks[mulai:mulai + batas]),
+        }
+
+    def _tambah_peralatan(self, query, body):
+        if isinstance(body, dict):
+            body = [body]
+        if not isinstance(body, list) or not body:
+            raise GalatHTTP(400, 'body harus berupa objek peralatan atau list objek peralatan')
+        if not all(isinstance(b, dict) for b in body):
+            raise GalatHTTP(400, 'setiap peralatan harus berupa objek')
+        awal = len(self.monitor.peralatan)
+        jumlah = self.monitor.tambah_peralatan_batch(body)
+        self.monitor.simpan()
+        return 201, {'versi': self.monitor.versi, 'indeks': list(range(awal, awal + jumlah))}
+
+    def _ambil_peralatan(self, query, body, indeks):
+        return 200, self._objek_peralatan(int(indeks))
+
+    def _ubah_peralatan(self, query, body, indeks):
+        if not isinstance(body, dict) or not body:
+            raise GalatHTTP(400, 'body harus berupa objek kolom yang diubah')
+        tidak_dikenal = set(body) - set(impor.KOLOM_WAJIB + impor.KOLOM_OPSIONAL)
+        if tidak_dikenal:
+            raise GalatHTTP(400, f"kolom tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+        indeks = int(indeks)
+        # Validasi baris gabungan dengan aturan yang sama seperti impor
+        gabungan = {**self.monitor.peralatan[indeks], **body}
+        kolom = impor.validasi_kolom(
+            {nama: [nilai] for nama, nilai in gabungan.items()}, self.monitor.tarif_listrik
+        )
+        self.monitor.ubah_peralatan(indeks, **{nama: kolom[nama][0].item() for nama in body})
+        self.monitor.simpan()
+        return 200, self._objek_peralatan(indeks)
+
+    def _hapus_peralatan(self, query, body, indeks):
+        lama = self._objek_peralatan(int(indeks))
+        self.monitor.hapus_peralatan(int(indeks))
+        self.monitor.simpan()
+        return 200, {'versi': self.monitor.versi, 'dihapus': lama}
+
+    def _konsumsi(self, query, body):
+        grup = _pilihan(query, 'grup', kueri.KOLOM_GRUP)
+        batas = _angka(query, 'batas', BATAS_DEFAULT, minimum=0, maksimum=BATAS_MAKS)
+        menurun = _menurun(query, True)
+        if grup is None:
+            urut = _pilihan(query, 'urut', kueri.KOLOM_NILAI, 'kwh')
+            hasil = self.monitor.kueri(
+                _saringan(query), kolom=('nama', 'golongan', 'jam_per_hari', 'kwh'),
+                urut=urut, menurun=menurun, batas=batas,
+            )
+        else:
+            urut = _pilihan(query, 'urut', (grup,) + kueri.KOLOM_AGREGAT, 'kwh')
+            hasil = self.monitor.kueri(
+                _saringan(query), grup=grup, kolom=('jumlah', 'kwh'),
+                urut=urut, menurun=menurun, batas=batas,
+            )
+        return 200, {
+            'total_kwh': self.monitor.hitung_total_penggunaan(),
+            'peralatan' if grup is None else grup: _daftar_baris(hasil),
+        }
+
+    def _biaya(self, query, body):
+        batas = _angka(query, 'batas', BATAS_DEFAULT, minimum=0, maksimum=BATAS_MAKS)
+        per_golongan = self.monitor.kueri(grup='golongan', kolom=('jumlah', 'kwh', 'biaya'))
+        termahal = self.monitor.kueri(
+            _saringan(query), kolom=('nama', 'golongan', 'kwh', 'biaya'),
+            urut='biaya', menurun=True, batas=batas,
+        )
+        return 200, {
+            'estimasi_biaya': self.monitor.hitung_estimasi_biaya(),
+            'per_golongan': {
+                baris.pop('golongan'): baris for baris in _daftar_baris(per_golongan)
+            },
+            'peralatan': _daftar_baris(termahal),
+        }
+
+    def _saran(self, query, body):
+        target_kwh = _angka(query, 'target_kwh', tipe=float, minimum=0)
+        target_biaya = _angka(query, 'target_biaya', tipe=float, minimum=0)
+        if target_kwh is not None and target_biaya is not None:
+            raise GalatHTTP(400, 'pilih salah satu: target_kwh atau target_biaya')
+        batas = _angka(query, 'batas', BATAS_DEFAULT, minimum=0, maksimum=BATAS_MAKS)
+        hasil = self.monitor.hitung_saran(target_kwh=target_kwh, target_biaya=target_biaya)
+        kwh_saat_ini = float(hasil['kwh_saat_ini'].sum())
+        kwh_saran = float(hasil['kwh_saran'].sum())
+        # Peralatan dengan penghematan kWh terbesar lebih dulu
+        indeks = kueri.urutan_teratas(hasil['kwh_saat_ini'] - hasil['kwh_saran'], True, batas)
+        return 200, {
+            'kwh_saat_ini': kwh_saat_ini,
+            'kwh_saran': kwh_saran,
+            'penghematan_kwh': kwh_saat_ini - kwh_saran,
+            'biaya_saat_ini': hasil['biaya_saat_ini'],
+            'biaya_saran': hasil['biaya_saran'],
+            'penghematan_biaya': hasil['biaya_saat_ini'] - hasil['biaya_saran'],
+            'tercapai': hasil['tercapai'],
+            'peralatan': _daftar_baris({
+                'indeks': indeks,
+                'nama': self.monitor.peralatan.nama()[indeks],
+                **{k: hasil[k][indeks] for k in ('jam_saat_ini', 'jam_saran', 'kwh_saat_ini', 'kwh_saran')},
+            }),
+        }
+
+    def _batch(self, query, body):
+        if not isinstance(body, list):
+            raise GalatHTTP(400, 'body /batch harus berupa list permintaan')
+        if len(body) > BATAS_BATCH:
+            raise GalatHTTP(400, f'maksimum {BATAS_BATCH} permintaan per batch')
+        bagian = []
+        for permintaan in body:
+            if not isinstance(permintaan, dict) or not isinstance(permintaan.get('path'), str):
+                status, payload = 400, ke_json({'galat': 'permintaan batch harus memuat path'})
+            elif urlsplit(permintaan['path']).path.rstrip('/') == '/batch':
+                status, payload = 400, ke_json({'galat': '/batch tidak dapat bersarang'})
+            else:
+                status, payload, _ = self.tangani(
+                    str(permintaan.get('metode', 'GET')).upper(), permintaan['path'],
+                    permintaan.get('body'),
+                )
+            # Respons yang sudah berupa byte (termasuk dari cache) disambung tanpa diurai ulang
+            bagian.append(b'{"status":%d,"body":%s}' % (status, payload or b'null'))
+        return 200, b'[' + b','.join(bagian) + b']'
+
+
+def _respons(status, payload, etag=None, tetap=True, metode='GET'):
+    """Byte respons HTTP/1.1 lengkap"""
+    kepala = [
+        f'HTTP/1.1 {status} {http.HTTPStatus(status).phrase}',
+        'Content-Type: application/json',
+        f'Content-Length: {len(payload)}',
+    ]
+    if etag is not None:
+        kepala.append(f'ETag: {etag}')
+    if not tetap:
+        kepala.append('Connection: close')
+    kepala = ('\r\n'.join(kepala) + '\r\n\r\n').encode('latin-1')
+    return kepala if metode == 'HEAD' else kepala + payload
+
+
+class ProtokolHTTP(asyncio.Protocol):
+    def __init__(self, server):
+        """Satu koneksi HTTP/1.1 keep-alive; permintaan pipelining dilayani per potongan data"""
+        self.server = server
+        self.transport = None
+        self._buffer = bytearray()
+        self._tulis_dijeda = False
+        self._penutup = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self._atur_batas_idle()
+
+    def connection_lost(self, exc):
+        if self._penutup is not None:
+            self._penutup.cancel()
+        self.transport = None
+
+    def _atur_batas_idle(self):
+        if self._penutup is not None:
+            self._penutup.cancel()
+        self._penutup = asyncio.get_running_loop().call_later(BATAS_IDLE, self._tutup_idle)
+
+    def _tutup_idle(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    def pause_writing(self):
+        self._tulis_dijeda = True
+
+    def resume_writing(self):
+        self._tulis_dijeda = False
+        if self.transport is not None:
+            self.transport.resume_reading()
+            self._layani()
+
+    def data_received(self, data):
+        self._buffer += data
+        self._atur_batas_idle()
+        self._layani()
+
+    def _ambil_permintaan(self):
+        """(metode, target, header, body) permintaan lengkap berikutnya, atau None"""
+        akhir_kepala = self._buffer.find(b'\r\n\r\n')
+        if akhir_kepala < 0:
+            if len(self._buffer) > BATAS_KEPALA:
+                raise GalatHTTP(431, 'header permintaan terlalu besar')
+            return None
+        baris = bytes(self._buffer[:akhir_kepala]).decode('latin-1').split('\r\n')
+        try:
+            metode, target, versi = baris[0].split(' ')
+        except ValueError:
+            raise GalatHTTP(400, 'baris permintaan tidak valid') from None
+        header = {}
+        for teks in baris[1:]:
+            nama, _, nilai = teks.partition(':')
+            header[nama.strip().lower()] = nilai.strip()
+        header[':versi'] = versi
+        if 'transfer-encoding' in header:
+            raise GalatHTTP(501, 'transfer-encoding tidak didukung; gunakan Content-Length')
+        teks_panjang = header.get('content-length', '0')
+        # Hanya digit ASCII: int() juga menerima tanda, spasi, dan garis bawah
+        if not (teks_panjang.isascii() and teks_panjang.isdigit()):
+            raise GalatHTTP(400, 'Content-Length tidak valid')
+        panjang = int(teks_panjang)
+        if panjang > BATAS_BODY:
+            raise GalatHTTP(413, 'body permintaan terlalu besar')
+        awal_body = akhir_kepala + 4
+        if len(self._buffer) < awal_body + panjang:
+            return None
+        body = bytes(self._buffer[awal_body:awal_body + panjang])
+        del self._buffer[:awal_body + panjang]
+        return metode.upper(), target, header, body
+
+    def _layani(self):
+        """Melayani semua permintaan lengkap di buffer lalu mengirim responsnya sekaligus"""
+        keluaran = []
+        tutup = False
+        while not self._tulis_dijeda:
+            try:
+                permintaan = self._ambil_permintaan()
+            except GalatHTTP as e:
+                # Aliran tidak dapat disinkronkan lagi setelah permintaan rusak
+                keluaran.append(_respons(e.status, ke_json({'galat': str(e)}), tetap=False))
+                tutup = True
+                break
+            if permintaan is None:
+                break
+            metode, target, header, body = permintaan
+            koneksi = header.get('connection', '').lower()
+            tetap = koneksi == 'keep-alive' if header[':versi'] == 'HTTP/1.0' else koneksi != 'close'
+            try:
+                data = json.loads(body) if body else None
+            except ValueError:
+                status, payload, etag = 400, ke_json({'galat': 'body bukan JSON yang valid'}), None
+            else:
+                status, payload, etag = self.server.tangani(
+                    metode, target, data, header.get('if-none-match')
+                )
+            keluaran.append(_respons(status, payload, etag, tetap, metode))
+            if not tetap:
+                tutup = True
+                break
+        if keluaran:
+            self.transport.write(b''.join(keluaran))
+        if tutup:
+            self.transport.close()
+        elif self._tulis_dijeda and len(self._buffer) > BATAS_BUFFER:
+            # Klien mengirim lebih cepat dari respons yang dibacanya; lanjut di resume_writing
+            self.transport.pause_reading()
+
+
+async def mulai_server(monitor, host=HOST_DEFAULT, port=PORT_DEFAULT):
+    """Menjalankan server untuk monitor; mengembalikan (asyncio.Server, ServerMonitor)"""
+    server = ServerMonitor(monitor)
+    loop = asyncio.get_running_loop()
+    srv = await loop.create_server(lambda: ProtokolHTTP(server), host, port)
+    return srv, server
+
+
+def buat_monitor(berkas=None, format=None, tarif=None):
+    """Monitor dari berkas inventaris/snapshot, atau seperti halaman Streamlit bila tanpa berkas"""
+    if berkas is not None:
+        dari_snapshot = format == 'snapshot' or (format is None and berkas.endswith(snapshot.EKSTENSI))
+        monitor = MonitorListrik.dari_snapshot(berkas) if dari_snapshot else MonitorListrik()
+        if tarif:
+            with open(tarif, encoding='utf-8') as f:
+                monitor.tarif_listrik = json.load(f)
+            monitor.tabel_tarif()  # validasi spesifikasi sebelum impor
+        if not dari_snapshot:
+            monitor.impor_peralatan(berkas, format=format, pakai_pandas=False)
+        return monitor
+
+    monitor = MonitorListrik.dari_env()
+    if tarif:
+        with open(tarif, encoding='utf-8') as f:
+            monitor.tarif_listrik = json.load(f)
+        monitor.tabel_tarif()
+    return monitor
+
+
+async def _layani_selamanya(monitor, host, port):
+    srv, _ = await mulai_server(monitor, host, port)
+    alamat = srv.sockets[0].getsockname()
+    print(f'PowerWatch mendengarkan di http://{alamat[0]}:{alamat[1]}', flush=True)
+    async with srv:
+        await srv.serve_forever()
+
+
+def main(argv=None):
+    """Titik masuk `python -m powerwatch.server`"""
+    parser = argparse.ArgumentParser(
+        prog='powerwatch.server',
+        description='Server HTTP/JSON lokal untuk penggunaan, biaya, dan saran listrik.',
+    )
+    parser.add_argument('berkas', nargs='?',
+                        help='Berkas inventaris CSV/Parquet atau snapshot '
+                        f'{snapshot.EKSTENSI} (default: $POWERWATCH_SNAPSHOT, '
+                        '$POWERWATCH_DATA, atau katalog default)')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'snapshot'],
+                        help='Format berkas (default: ditebak dari ekstensi)')
+    parser.add_argument('--tarif', metavar='JSON',
+                        help='Berkas JSON spesifikasi tarif per golongan (lihat powerwatch.tarif)')
+    parser.add_argument('--host', default=HOST_DEFAULT, help=f'Alamat (default: {HOST_DEFAULT})')
+    parser.add_argument('--port', type=int, default=PORT_DEFAULT,
+                        help=f'Port (default: {PORT_DEFAULT}; 0 = pilih bebas)')
+    args = parser.parse_args(argv)
+
+    try:
+        monitor = buat_monitor(args.berkas, args.format, args.tarif)
+    except (OSError, ValueError) as e:
+        print(f'powerwatch.server: {e}', file=sys.stderr)
+        return 1
+    try:
+        asyncio.run(_layani_selamanya(monitor, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.simpan()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
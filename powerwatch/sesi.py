@@ -0,0 +1,16 @@
+"""Monitor per sesi Streamlit, dibuat dari lingkungan saat pertama kali dipakai"""
+from . import snapshot
+from .monitor import MonitorListrik
+
+
+def monitor_sesi(state):
+    """Monitor di state sesi (mis. st.session_state); dibuat lewat MonitorListrik.dari_env bila belum ada
+
+    Monitor baru didaftarkan ke penulis snapshot berkala bersama untuk $POWERWATCH_SNAPSHOT.
+    """
+    if 'monitor' not in state:
+        monitor = MonitorListrik.dari_env()
+        state['monitor'] = monitor
+        # Didaftarkan ke penulis snapshot bersama proses; hanya monitor utama yang ditulis
+        state['snapshot_berkala'] = snapshot.berkala_dari_env(monitor)
+    return state['monitor']
@@ -0,0 +1,230 @@
+"""Generator data sintetis untuk uji beban dan skala
+
+Inventaris ditarik dari distribusi jenis peralatan (daya lognormal, jumlah
+unit, jam pemakaian, golongan) dan riwayat bacaan dibangkitkan per chunk
+dengan musiman harian/mingguan pada resolusi berapa pun. Setiap aliran
+(inventaris dan setiap chunk bacaan) memakai Generator sendiri dari
+SeedSequence.spawn, sehingga hasilnya deterministik untuk benih yang sama
+dan chunk dapat dibangkitkan secara independen. Keluaran ditulis per chunk
+ke penyimpanan (segmen .npy, lihat penyimpanan) atau teks ``detik_epoch,kwh``
+(format sumber ingesti), jadi 100 juta bacaan tidak pernah berada di RAM
+sekaligus.
+
+    python -m powerwatch.sintetis DIREKTORI --peralatan 100000 --bacaan 100000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from .deret_waktu import TIPE_WAKTU
+from .tabel_peralatan import TabelPeralatan
+
+UKURAN_CHUNK = 1_000_000  # Bacaan per chunk (dan per Generator)
+RESOLUSI_DEFAULT = 60  # Detik antar bacaan
+
+# Jenis peralatan: (nama, bobot, watt_median, sebaran_watt, rata_unit, jam_per_hari, jam_mulai)
+# Daya ditarik lognormal di sekitar watt_median dengan sigma sebaran_watt;
+# jumlah unit 1 + Poisson(rata_unit - 1); jam_per_hari 24 berarti selalu menyala.
+JENIS_PERALATAN = [
+    ('TV', 0.9, 80, 0.4, 1.3, 6, 17),
+    ('Lampu LED', 1.0, 10, 0.3, 6.0, 7, 18),
+    ('Lampu Bohlam', 0.4, 60, 0.2, 3.0, 6, 18),
+    ('AC', 0.5, 750, 0.35, 1.2, 8, 21),
+    ('Kulkas', 0.95, 100, 0.3, 1.05, 24, 0),
+    ('Kipas Angin', 0.7, 50, 0.3, 1.5, 8, 11),
+    ('Magic Jar', 0.8, 400, 0.2, 1.0, 8, 5),
+    ('Mesin Cuci', 0.6, 400, 0.3, 1.0, 1.5, 8),
+    ('Setrika', 0.6, 350, 0.2, 1.0, 1, 19),
+    ('Pompa Air', 0.5, 250, 0.3, 1.0, 2, 5),
+    ('Dispenser', 0.5, 350, 0.2, 1.0, 12, 6),
+    ('Komputer', 0.5, 150, 0.4, 1.2, 5, 19),
+    ('Microwave', 0.3, 1000, 0.2, 1.0, 0.5, 12),
+    ('Pemanas Air', 0.3, 1500, 0.3, 1.0, 1, 5),
+    ('Router WiFi', 0.6, 10, 0.3, 1.0, 24, 0),
+    ('Pengisi Daya Ponsel', 0.9, 10, 0.3, 3.0, 3, 21),
+    ('Kamera Pengawas', 0.2, 6, 0.3, 3.0, 24, 0),
+]
+# Proporsi peralatan per golongan listrik
+GOLONGAN_DEFAULT = {'R-1': 0.5, 'R-2': 0.35, 'R-3': 0.15}
+SEBARAN_JAM = 0.3  # sigma lognormal jam_per_hari di sekitar nilai jenisnya
+SEBARAN_JAM_MULAI = 1.5  # simpangan baku (jam) jam mulai di sekitar nilai jenisnya
+
+# Profil penggunaan: rata-rata harian dikalikan musiman harian (kosinus dengan
+# puncak di JAM_PUNCAK), musiman mingguan (akhir pekan lebih tinggi, rata-rata
+# seminggu tetap), dan noise Gamma dengan rata-rata 1
+RATA_KWH_PER_HARI = 28.0
+AMPLITUDO_HARIAN = 0.5
+JAM_PUNCAK = 19
+AMPLITUDO_MINGGUAN = 0.15
+CV_NOISE = 0.3
+
+_DETIK_PER_HARI = 86_400
+
+
+def benih(seed=None):
+    """SeedSequence dari int/None/SeedSequence (akar semua aliran acak)"""
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def buat_inventaris(jumlah, seed=None, jenis=JENIS_PERALATAN, golongan=GOLONGAN_DEFAULT):
+    """Inventaris sintetis sebagai dict kolom (siap untuk tambah_peralatan_batch)"""
+    if jumlah < 0:
+        raise ValueError('Jumlah peralatan tidak boleh negatif')
+    if not jenis or not golongan:
+        raise ValueError('Distribusi jenis dan golongan tidak boleh kosong')
+    rng = np.random.default_rng(benih(seed))
+    nama, bobot, watt, sebaran, rata_unit, jam, jam_mulai = (np.array(k) for k in zip(*jenis))
+    bobot = bobot.astype(np.float64)
+    proporsi = np.array(list(golongan.values()), dtype=np.float64)
+    if (bobot < 0).any() or not bobot.sum() > 0 or (proporsi < 0).any() or not proporsi.sum() > 0:
+        raise ValueError('Bobot jenis dan proporsi golongan harus >= 0 dan tidak semuanya nol')
+
+    j = rng.choice(len(nama), size=jumlah, p=bobot / bobot.sum())
+    selalu_menyala = jam[j] >= 24
+    jam_per_hari = np.where(
+        selalu_menyala, 24.0,
+        np.clip(jam[j] * rng.lognormal(0.0, SEBARAN_JAM, jumlah), 0.1, 23.9).round(1),
+    )
+    mulai = (jam_mulai[j] + rng.normal(0.0, SEBARAN_JAM_MULAI, jumlah)) % 24
+    return {
+        'nama': nama[j],
+        'unit': 1 + rng.poisson(np.maximum(rata_unit[j] - 1, 0.0)),
+        'watt': np.maximum(watt[j] * rng.lognormal(0.0, sebaran[j]), 1.0).round(),
+        'golongan': np.array(list(golongan))[
+            rng.choice(len(proporsi), size=jumlah, p=proporsi / proporsi.sum())
+        ],
+        'jam_per_hari': jam_per_hari,
+        'jam_mulai': np.where(selalu_menyala, 0.0, np.floor(mulai * 4) / 4),
+    }
+
+
+def profil_musiman(waktu, amplitudo_harian=AMPLITUDO_HARIAN, jam_puncak=JAM_PUNCAK,
+                   amplitudo_mingguan=AMPLITUDO_MINGGUAN):
+    """Faktor pengali (rata-rata 1) untuk setiap waktu: musiman harian x mingguan"""
+    detik = waktu.astype(TIPE_WAKTU).astype(np.int64)
+    jam = (detik % _DETIK_PER_HARI) / 3600
+    harian = 1 + amplitudo_harian * np.cos(2 * np.pi * (jam - jam_puncak) / 24)
+    # 1970-01-01 adalah hari Kamis: (hari + 3) % 7 memberi Senin = 0
+    akhir_pekan = (detik // _DETIK_PER_HARI + 3) % 7 >= 5
+    mingguan = np.where(akhir_pekan, 1 + amplitudo_mingguan, 1 - amplitudo_mingguan * 2 / 5)
+    return harian * mingguan
+
+
+def chunk_penggunaan(jumlah, seed=None, mulai=None, resolusi_detik=RESOLUSI_DEFAULT,
+                     ukuran_chunk=UKURAN_CHUNK, rata_kwh_per_hari=RATA_KWH_PER_HARI,
+                     amplitudo_harian=AMPLITUDO_HARIAN, jam_puncak=JAM_PUNCAK,
+                     amplitudo_mingguan=AMPLITUDO_MINGGUAN, cv_noise=CV_NOISE):
+    """Membangkitkan (waktu, kwh) per chunk; tanpa mulai, bacaan terakhir jatuh hari ini
+
+    Setiap chunk memakai Generator sendiri (SeedSequence.spawn), jadi chunk
+    ke-i hanya bergantung pada benih, ukuran_chunk, dan i.
+    """
+    if jumlah < 0 or resolusi_detik < 1 or ukuran_chunk <= 0:
+        raise ValueError('jumlah dan ukuran chunk harus positif, resolusi minimal 1 detik')
+    if cv_noise < 0:
+        raise ValueError('cv_noise tidak boleh negatif')
+    # Deret waktu menyimpan waktu dalam detik (TIPE_WAKTU)
+    langkah = np.timedelta64(int(resolusi_detik), 's')
+    if mulai is None:
+        mulai = np.datetime64('today', 's') - langkah * max(jumlah - 1, 0)
+    mulai = np.datetime64(mulai, 's')
+    kwh_per_bacaan = rata_kwh_per_hari * resolusi_detik / _DETIK_PER_HARI
+
+    jumlah_chunk = -(-jumlah // ukuran_chunk)
+    for i, anak in enumerate(benih(seed).spawn(jumlah_chunk)):
+        rng = np.random.default_rng(anak)
+        awal = i * ukuran_chunk
+        ukuran = min(ukuran_chunk, jumlah - awal)
+        waktu = mulai + langkah * np.arange(awal, awal + ukuran)
+        kwh = kwh_per_bacaan * profil_musiman(waktu, amplitudo_harian, jam_puncak, amplitudo_mingguan)
+        if cv_noise > 0:
+            bentuk = 1 / cv_noise ** 2
+            kwh *= rng.gamma(bentuk, 1 / bentuk, ukuran)
+        yield waktu, kwh
+
+
+def tulis_penyimpanan(penyimpanan, jumlah_peralatan, jumlah_bacaan, seed=None, **opsi_penggunaan):
+    """Mengisi PenyimpananListrik dengan inventaris dan riwayat bacaan sintetis
+
+    Bacaan ditulis per chunk sebagai segmen; mengembalikan jumlah bacaan tertulis.
+    """
+    aliran_inventaris, aliran_penggunaan = benih(seed).spawn(2)
+    tabel = TabelPeralatan()
+    tabel.tambah_batch(**buat_inventaris(jumlah_peralatan, aliran_inventaris))
+    penyimpanan.simpan_peralatan(tabel)
+    tertulis = 0
+    for waktu, kwh in chunk_penggunaan(jumlah_bacaan, aliran_penggunaan, **opsi_penggunaan):
+        penyimpanan.tambah_pembacaan(waktu, kwh)
+        tertulis += len(kwh)
+    penyimpanan.flush()
+    return tertulis
+
+
+def tulis_teks(berkas, chunk):
+    """Menulis chunk (waktu, kwh) sebagai baris ``detik_epoch,kwh`` (format sumber ingesti)"""
+    tertulis = 0
+    for waktu, kwh in chunk:
+        detik = waktu.astype(TIPE_WAKTU).astype(np.int64)
+        np.savetxt(berkas, np.column_stack([detik, kwh]), fmt=['%d', '%.6f'], delimiter=',')
+        tertulis += len(kwh)
+    return tertulis
+
+
+def tulis_csv_inventaris(berkas, inventaris):
+    """Menulis inventaris sebagai CSV dengan kolom yang diterima impor"""
+    kolom = ('nama', 'unit', 'watt', 'golongan', 'jam_per_hari', 'jam_mulai')
+    berkas.write(','.join(kolom) + '\n')
+    for baris in zip(*(inventaris[k].tolist() for k in kolom)):
+        berkas.write(','.join(map(str, baris)) + '\n')
+
+
+def main(argv=None):
+    """Titik masuk `python -m powerwatch.sintetis`"""
+    parser = argparse.ArgumentParser(
+        prog='powerwatch.sintetis',
+        description='Bangkitkan inventaris dan riwayat bacaan sintetis untuk uji beban.',
+    )
+    parser.add_argument('direktori', help='Direktori keluaran (penyimpanan $POWERWATCH_DATA)')
+    parser.add_argument('--peralatan', type=int, default=10_000, help='Jumlah peralatan')
+    parser.add_argument('--bacaan', type=int, default=1_000_000, help='Jumlah bacaan')
+    parser.add_argument('--resolusi', type=int, default=RESOLUSI_DEFAULT,
+                        help='Detik antar bacaan (default: 60)')
+    parser.add_argument('--seed', type=int, help='Benih acak (default: acak)')
+    parser.add_argument('--format', choices=['penyimpanan', 'teks'], default='penyimpanan',
+                        help='penyimpanan: SQLite + segmen .npy; '
+                        'teks: inventaris.csv + bacaan.txt (detik_epoch,kwh)')
+    args = parser.parse_args(argv)
+
+    mulai = time.perf_counter()
+    try:
+        if args.format == 'penyimpanan':
+            from .penyimpanan import PenyimpananListrik
+            penyimpanan = PenyimpananListrik(args.direktori)
+            try:
+                tertulis = tulis_penyimpanan(penyimpanan, args.peralatan, args.bacaan, args.seed,
+                                             resolusi_detik=args.resolusi)
+            finally:
+                penyimpanan.tutup()
+        else:
+            os.makedirs(args.direktori, exist_ok=True)
+            aliran_inventaris, aliran_penggunaan = benih(args.seed).spawn(2)
+            with open(os.path.join(args.direktori, 'inventaris.csv'), 'w', encoding='utf-8') as f:
+                tulis_csv_inventaris(f, buat_inventaris(args.peralatan, aliran_inventaris))
+            with open(os.path.join(args.direktori, 'bacaan.txt'), 'w', encoding='ascii') as f:
+                tertulis = tulis_teks(f, chunk_penggunaan(
+                    args.bacaan, aliran_penggunaan, resolusi_detik=args.resolusi
+                ))
+    except (OSError, ValueError) as e:
+        print(f'powerwatch.sintetis: {e}', file=sys.stderr)
+        return 1
+    durasi = time.perf_counter() - mulai
+    print(f'{args.peralatan:,} peralatan dan {tertulis:,} bacaan ditulis ke '
+          f'{args.direktori} dalam {durasi:.1f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
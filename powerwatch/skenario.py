@@ -0,0 +1,220 @@
+"""Evaluasi banyak skenario what-if sekaligus sebagai matriks skenario x peralatan
+
+Skenario adalah dict {'nama': ..., 'perubahan': [...]}; setiap perubahan
+memilih peralatan lewat 'peralatan' (nama atau list nama), 'saring' (dict
+saringan MonitorListrik.kueri), atau 'indeks', lalu memberi nilai baru untuk
+satu atau beberapa kolom KOLOM_PERUBAHAN. Contoh:
+
+    {'nama': 'Lampu LED', 'perubahan': [{'peralatan': 'Lampu Bohlam', 'watt': 9}]}
+    {'nama': 'AC 6 jam', 'perubahan': [{'peralatan': 'AC', 'jam_per_hari': 6}]}
+    {'nama': 'Cuci malam', 'perubahan': [{'peralatan': 'Mesin Cuci', 'jam_mulai': 23}]}
+
+Matriks daya, unit, jam per hari, dan jam mulai (skenario x peralatan) sama
+dengan kondisi saat ini kecuali pada sel yang diubah, sehingga disimpan
+jarang: baris dasar ditambah daftar sel (skenario, peralatan) yang berubah.
+kWh dan biaya energi sel-sel itu dihitung sekaligus secara vektor (tarif
+waktu pemakaian lewat TabelTarif.energi_jadwal), selisihnya terhadap kondisi
+saat ini dijumlah per (skenario, golongan) dengan bincount, lalu semua akun
+ditagih oleh mesin tarif dalam satu panggilan seperti prakiraan.
+"""
+import json
+
+import numpy as np
+
+from .kueri import urutan_teratas
+from .tabel_peralatan import jam_mulai_efektif
+
+KOLOM_PERUBAHAN = ('watt', 'unit', 'jam_per_hari', 'jam_mulai')
+PEMILIH = ('peralatan', 'saring', 'indeks')
+ELEMEN_PER_CHUNK = 2_000_000  # batas sel yang berubah per potongan, mengatur memori
+
+
+def _ke_nilai(kolom, nilai):
+    """Nilai perubahan sebagai array float; ValueError jika di luar rentang kolomnya"""
+    if kolom == 'jam_mulai':
+        # None berarti kembali ke jam mulai otomatis (selesai pukul 22.00)
+        nilai = [np.nan if x is None else x for x in nilai]
+    try:
+        nilai = np.asarray(nilai, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"Nilai '{kolom}' harus berupa angka") from None
+    salah, pesan = {
+        'watt': (~(nilai > 0), 'watt harus > 0'),
+        'unit': (~(nilai >= 1) | (nilai != np.round(nilai)), 'unit harus bilangan bulat >= 1'),
+        'jam_per_hari': (~((nilai >= 0) & (nilai <= 24)), 'jam_per_hari harus di antara 0 dan 24'),
+        'jam_mulai': ((nilai < 0) | (nilai >= 24), 'jam_mulai harus di antara 0 dan 24 (atau kosong)'),
+    }[kolom]
+    if salah.any():
+        raise ValueError(f'{int(salah.sum())} perubahan tidak valid ({pesan})')
+    return nilai
+
+
+def _pilih(monitor, jenis, nilai):
+    """Indeks peralatan (terurut, unik) yang dipilih satu pemilih perubahan"""
+    if jenis == 'indeks':
+        indeks = np.atleast_1d(np.asarray(nilai, dtype=np.intp))
+        n = len(monitor.peralatan)
+        if ((indeks < -n) | (indeks >= n)).any():
+            raise ValueError(f'Indeks peralatan di luar rentang 0..{n - 1}')
+        return np.unique(indeks % max(n, 1))
+    saring = {'nama': nilai} if jenis == 'peralatan' else nilai
+    indeks = monitor.kueri(saring, kolom=())['indeks']
+    if jenis == 'peralatan' and not len(indeks):
+        raise ValueError(f'Peralatan tidak ditemukan: {nilai}')
+    return np.sort(indeks)
+
+
+def kompilasi(monitor, daftar_skenario):
+    """Nama skenario dan sel perubahan per kolom: (baris skenario, indeks peralatan, nilai)
+
+    Jika satu sel diubah beberapa kali dalam skenario yang sama, perubahan
+    terakhir yang berlaku. Sel setiap kolom terurut menurut (skenario, peralatan).
+    """
+    nama = []
+    pilihan = {}  # pemilih -> nomor pilihan, agar setiap pemilih dikueri sekali
+    daftar_pilihan = []
+    catatan = {kolom: ([], [], []) for kolom in KOLOM_PERUBAHAN}
+    for s, skenario in enumerate(daftar_skenario):
+        nama.append(str(skenario.get('nama') or f'Skenario {s + 1}'))
+        for perubahan in skenario.get('perubahan', ()):
+            tidak_dikenal = set(perubahan) - set(PEMILIH) - set(KOLOM_PERUBAHAN)
+            if tidak_dikenal:
+                raise ValueError(f"Kolom perubahan tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+            pemilih = [k for k in PEMILIH if k in perubahan]
+            if len(pemilih) != 1:
+                raise ValueError(f"Perubahan harus punya tepat satu pemilih: {', '.join(PEMILIH)}")
+            kunci = (pemilih[0], repr(perubahan[pemilih[0]]))
+            nomor = pilihan.get(kunci)
+            if nomor is None:
+                nomor = pilihan[kunci] = len(daftar_pilihan)
+                daftar_pilihan.append(_pilih(monitor, pemilih[0], perubahan[pemilih[0]]))
+            for kolom in KOLOM_PERUBAHAN:
+                if kolom in perubahan:
+                    baris, nomor_pilihan, nilai = catatan[kolom]
+                    baris.append(s)
+                    nomor_pilihan.append(nomor)
+                    nilai.append(perubahan[kolom])
+
+    n = len(monitor.peralatan)
+    panjang_pilihan = np.array([len(p) for p in daftar_pilihan], dtype=np.intp)
+    sel = {}
+    for kolom, (baris, nomor_pilihan, nilai) in catatan.items():
+        if not baris:
+            continue
+        panjang = panjang_pilihan[nomor_pilihan]
+        baris = np.repeat(np.asarray(baris, dtype=np.intp), panjang)
+        peralatan = np.concatenate([daftar_pilihan[i] for i in nomor_pilihan])
+        nilai = np.repeat(_ke_nilai(kolom, nilai), panjang)
+        # Kemunculan terakhir setiap sel: unik atas kunci sel dari belakang
+        kunci, terakhir = np.unique((baris * n + peralatan)[::-1], return_index=True)
+        terakhir = len(baris) - 1 - terakhir
+        sel[kolom] = (kunci, nilai[terakhir])
+    return nama, sel
+
+
+def _biaya_energi(data, kode, kw, jam, jam_mulai):
+    """kWh dan biaya energi sebulan untuk daya, jam per hari, dan jam mulai per sel"""
+    kwh = kw * jam * data['hari']
+    tabel_tarif = data['tabel_tarif']
+    if tabel_tarif.seragam:
+        return kwh, kwh * tabel_tarif.harga_rata[kode]
+    mulai = jam_mulai_efektif(jam_mulai, jam)
+    return kwh, tabel_tarif.energi_jadwal(kode, kw, mulai, jam, data['hari'])
+
+
+def _selisih_chunk(data, kunci_sel, sel):
+    """Selisih kWh dan biaya energi per akun (skenario, golongan) untuk potongan sel"""
+    n = data['n']
+    baris, peralatan = np.divmod(kunci_sel, n)
+    nilai = {}
+    for kolom in KOLOM_PERUBAHAN:
+        nilai[kolom] = data[kolom][peralatan]
+        if kolom in sel:
+            kunci, baru = sel[kolom]
+            # Sel kolom ini yang jatuh di potongan; kunci_sel memuat semuanya
+            kiri, kanan = np.searchsorted(kunci, (kunci_sel[0], kunci_sel[-1] + 1))
+            nilai[kolom][np.searchsorted(kunci_sel, kunci[kiri:kanan])] = baru[kiri:kanan]
+
+    kode = data['kode'][peralatan]
+    kw = nilai['watt'] * nilai['unit'] / 1000
+    kwh, energi = _biaya_energi(data, kode, kw, nilai['jam_per_hari'], nilai['jam_mulai'])
+    akun = baris * data['jumlah_golongan'] + data['kode_golongan'][peralatan]
+    m = data['jumlah_akun']
+    return (np.bincount(akun, weights=kwh - data['kwh_dasar'][peralatan], minlength=m),
+            np.bincount(akun, weights=energi - data['energi_dasar'][peralatan], minlength=m))
+
+
+def evaluasi(monitor, daftar_skenario, hari=30):
+    """kWh dan tagihan bulanan kondisi saat ini dan setiap skenario
+
+    Mengembalikan dict: 'nama' (array objek), 'kwh', 'biaya', 'penghematan_kwh',
+    'penghematan_biaya' (array per skenario), serta 'kwh_saat_ini' dan
+    'biaya_saat_ini' (float, sama dengan hitung_estimasi_biaya).
+    """
+    tabel = monitor.peralatan
+    tabel_tarif = monitor.tabel_tarif()
+    nama, sel = kompilasi(monitor, daftar_skenario)
+
+    golongan, kode_golongan = np.unique(tabel.kolom('golongan').astype(np.intp), return_inverse=True)
+    kode_tarif = tabel_tarif.kode([tabel.kamus_golongan.teks(g) for g in golongan.tolist()])
+    jumlah = len(nama)
+    jumlah_golongan = len(golongan)
+    data = {
+        'n': len(tabel),
+        'watt': tabel.kolom('watt'),
+        'unit': tabel.kolom('unit').astype(np.float64),
+        'jam_per_hari': tabel.kolom('jam_per_hari'),
+        'jam_mulai': tabel.kolom('jam_mulai'),
+        'kode': kode_tarif[kode_golongan],
+        'kode_golongan': kode_golongan,
+        'jumlah_golongan': jumlah_golongan,
+        'jumlah_akun': jumlah * jumlah_golongan,
+        'tabel_tarif': tabel_tarif,
+        'hari': hari,
+    }
+    data['kwh_dasar'], data['energi_dasar'] = _biaya_energi(
+        data, data['kode'], data['watt'] * data['unit'] / 1000, data['jam_per_hari'], data['jam_mulai']
+    )
+
+    # Baris dasar (kondisi saat ini) per golongan, lalu selisih setiap skenario
+    kwh_golongan = np.empty((jumlah + 1, jumlah_golongan))
+    energi_golongan = np.empty((jumlah + 1, jumlah_golongan))
+    kwh_golongan[:] = np.bincount(kode_golongan, weights=data['kwh_dasar'], minlength=jumlah_golongan)
+    energi_golongan[:] = np.bincount(kode_golongan, weights=data['energi_dasar'], minlength=jumlah_golongan)
+    kunci_sel = np.unique(np.concatenate([kunci for kunci, _ in sel.values()] or [np.zeros(0, np.intp)]))
+    for awal in range(0, len(kunci_sel), ELEMEN_PER_CHUNK):
+        kwh, energi = _selisih_chunk(data, kunci_sel[awal:awal + ELEMEN_PER_CHUNK], sel)
+        kwh_golongan[1:] += kwh.reshape(jumlah, jumlah_golongan)
+        energi_golongan[1:] += energi.reshape(jumlah, jumlah_golongan)
+
+    tagihan = tabel_tarif.tagihan(
+        np.tile(kode_tarif, jumlah + 1), kwh_golongan.ravel(), energi_golongan.ravel(),
+        akun=np.arange((jumlah + 1) * jumlah_golongan),
+    )
+    biaya = tagihan['total'].reshape(jumlah + 1, jumlah_golongan).sum(axis=1)
+    kwh = kwh_golongan.sum(axis=1)
+    return {
+        'nama': np.array(nama, dtype=object),
+        'kwh': kwh[1:],
+        'biaya': biaya[1:],
+        'penghematan_kwh': kwh[0] - kwh[1:],
+        'penghematan_biaya': biaya[0] - biaya[1:],
+        'kwh_saat_ini': float(kwh[0]),
+        'biaya_saat_ini': float(biaya[0]),
+    }
+
+
+def peringkat(hasil, batas=None):
+    """Indeks skenario menurut penghematan biaya terbesar (seri: urutan masukan)"""
+    return urutan_teratas(hasil['penghematan_biaya'], menurun=True, batas=batas)
+
+
+def kunci_parameter(daftar_skenario):
+    """Teks JSON kanonis dari daftar skenario untuk kunci cache"""
+    def angka(nilai):
+        if isinstance(nilai, np.generic):
+            return nilai.item()
+        if isinstance(nilai, np.ndarray):
+            return nilai.tolist()
+        raise TypeError(f'Nilai skenario tidak dikenal: {nilai!r}')
+    return json.dumps(daftar_skenario, sort_keys=True, default=angka)
@@ -0,0 +1,297 @@
+"""Snapshot biner ringkas dari state MonitorListrik untuk mulai hangat
+
+Format berkas (versi 1):
+
+    8 byte   MAGIC
+    4 byte   versi format (uint32 little-endian)
+    4 byte   panjang header (uint32 little-endian)
+    header   JSON UTF-8: metadata monitor dan daftar array (dtype, shape, offset)
+    data     isi mentah setiap array, masing-masing rata PERATAAN byte
+
+Format yang sama (dengan MAGIC lain) dipakai berkas biner lain, mis.
+katalog_peralatan. Berkas dibaca dengan mmap: setiap array adalah view baca-saja ke halaman
+berkas tanpa penguraian maupun salinan. Tabel peralatan menjadi basis beku
+dan riwayat bacaan dipakai langsung oleh DeretWaktu, sehingga perubahan sesi
+masuk ke overlay copy-on-write seperti katalog bersama. Berkas ditulis ke
+berkas sementara lalu diganti secara atomik; view lama tetap sah.
+"""
+import functools
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+
+import numpy as np
+
+from .tabel_peralatan import TIPE_KOLOM, KamusString, TabelPeralatan
+
+MAGIC = b'PWSNAP\x00\x00'
+VERSI_FORMAT = 1
+PERATAAN = 64
+EKSTENSI = '.pwsnap'
+INTERVAL_DEFAULT = 60.0  # Detik antar snapshot berkala
+VARIABEL_LINGKUNGAN = 'POWERWATCH_SNAPSHOT'
+PEMISAH_TEKS = '\x00'
+_PREFIKS = struct.Struct('<8sII')
+
+
+def _rata(posisi):
+    return -(-posisi // PERATAAN) * PERATAAN
+
+
+def kodekan_teks(array, nama, daftar):
+    """Menyimpan daftar teks sebagai byte UTF-8 dipisah NUL
+
+    Offset karakter hanya ikut disimpan bila ada teks yang memuat NUL.
+    """
+    gabungan = PEMISAH_TEKS.join(daftar)
+    array[f'{nama}/teks'] = np.frombuffer(gabungan.encode('utf-8'), dtype=np.uint8)
+    if gabungan.count(PEMISAH_TEKS) != max(len(daftar) - 1, 0):
+        panjang = np.fromiter((len(t) for t in daftar), dtype=np.int64, count=len(daftar))
+        offset = np.zeros(len(daftar) + 1, dtype=np.int64)
+        np.cumsum(panjang, out=offset[1:])
+        array[f'{nama}/offset'] = offset
+
+
+def urai_teks(array, nama, jumlah):
+    teks = array[f'{nama}/teks'].tobytes().decode('utf-8')
+    if f'{nama}/offset' in array:
+        batas = array[f'{nama}/offset'].tolist()
+        return [teks[a:b] for a, b in zip(batas[:-1], batas[1:])]
+    return teks.split(PEMISAH_TEKS) if jumlah else []
+
+
+class Snapshot:
+    def __init__(self, meta, array):
+        """State monitor yang dibaca dari berkas snapshot (atribut seperti KatalogBersama)"""
+        self.meta = meta
+        self.tabel = TabelPeralatan.dari_kolom_beku(
+            {nama: array[f'kolom/{nama}'] for nama in TIPE_KOLOM},
+            KamusString.dari_daftar(urai_teks(array, 'nama', meta['jumlah_teks']['nama'])),
+            KamusString.dari_daftar(urai_teks(array, 'golongan', meta['jumlah_teks']['golongan'])),
+        )
+        self.waktu = array['waktu']
+        self.kwh = array['kwh']
+        self.total_kwh = meta['total_kwh']
+        self.kwh_per_golongan = dict(meta['kwh_per_golongan'])
+        self.tarif_listrik = meta['tarif_listrik']
+        self.tarif_terpilih = meta['tarif_terpilih']
+        self.status_rng = meta['status_rng']
+
+
+def tulis_array(path, magic, versi, meta, array):
+    """Menulis metadata JSON dan dict array ke berkas berformat di atas (atomik)"""
+    daftar_array = {}
+    posisi = 0
+    for nama, nilai in array.items():
+        posisi = _rata(posisi)
+        daftar_array[nama] = {'dtype': nilai.dtype.str, 'shape': list(nilai.shape), 'offset': posisi}
+        posisi += nilai.nbytes
+    header = json.dumps({'meta': meta, 'array': daftar_array}).encode('utf-8')
+    awal_data = _rata(_PREFIKS.size + len(header))
+
+    sementara = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(sementara, 'wb') as berkas:
+            berkas.write(_PREFIKS.pack(magic, versi, len(header)))
+            berkas.write(header)
+            for nama, nilai in array.items():
+                berkas.seek(awal_data + daftar_array[nama]['offset'])
+                berkas.write(np.ascontiguousarray(nilai).reshape(-1).view(np.uint8))
+            berkas.truncate(awal_data + posisi)
+        os.replace(sementara, path)
+    except BaseException:
+        if os.path.exists(sementara):
+            os.remove(sementara)
+        raise
+
+
+def baca_array(path, magic, versi_format, jenis='snapshot PowerWatch'):
+    """(meta, dict array) dari berkas yang dibuka dengan mmap; array berupa view baca-saja"""
+    with open(path, 'rb') as berkas:
+        try:
+            peta = mmap.mmap(berkas.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f'{path} bukan {jenis} (berkas kosong)') from None
+    if len(peta) < _PREFIKS.size:
+        raise ValueError(f'{path} bukan {jenis}')
+    magic_berkas, versi, panjang_header = _PREFIKS.unpack_from(peta)
+    if magic_berkas != magic:
+        raise ValueError(f'{path} bukan {jenis}')
+    if versi != versi_format:
+        raise ValueError(f'Versi {jenis} {versi} tidak didukung (diharapkan {versi_format})')
+    try:
+        header = json.loads(peta[_PREFIKS.size:_PREFIKS.size + panjang_header])
+    except ValueError:
+        raise ValueError(f'Header {jenis} {path} rusak') from None
+    awal_data = _rata(_PREFIKS.size + panjang_header)
+
+    data = np.frombuffer(peta, dtype=np.uint8)
+    array = {}
+    for nama, info in header['array'].items():
+        tipe = np.dtype(info['dtype'])
+        awal = awal_data + info['offset']
+        jumlah_byte = tipe.itemsize * int(np.prod(info['shape'], dtype=np.int64))
+        if awal + jumlah_byte > len(data):
+            raise ValueError(f'{jenis.capitalize()} {path} terpotong (array {nama})')
+        array[nama] = data[awal:awal + jumlah_byte].view(tipe).reshape(info['shape'])
+    return header['meta'], array
+
+
+def _salin_state(monitor):
+    """Array dan metadata snapshot, disalin di bawah kunci monitor agar konsisten"""
+    with monitor.kunci:
+        tabel = monitor.peralatan
+        # Salinan: hapus/ubah menggeser kolom di tempat setelah kunci dilepas
+        array = {f'kolom/{nama}': np.array(tabel.kolom(nama)) for nama in TIPE_KOLOM}
+        jumlah_teks = {}
+        for nama, kamus in (('nama', tabel.kamus_nama), ('golongan', tabel.kamus_golongan)):
+            kodekan_teks(array, nama, kamus.daftar())
+            jumlah_teks[nama] = len(kamus)
+        meta = {
+            'dibuat': time.time(),
+            'jumlah_peralatan': len(tabel),
+            'jumlah_teks': jumlah_teks,
+            'total_kwh': monitor._total_kwh,
+            'kwh_per_golongan': dict(monitor._kwh_per_golongan),
+            'tarif_listrik': dict(monitor.tarif_listrik),
+            'tarif_terpilih': monitor.tarif_terpilih,
+            'status_rng': monitor.rng.bit_generator.state,
+        }
+    # Riwayat bacaan hanya bertambah; potret buffer-nya sudah konsisten
+    waktu, kwh, n = monitor.penggunaan_harian._potret()
+    array['waktu'] = waktu[:n]
+    array['kwh'] = kwh[:n]
+    meta['jumlah_bacaan'] = int(n)
+    return meta, array
+
+
+def tulis(monitor, path):
+    """Menulis state monitor (peralatan, riwayat bacaan, tarif) ke berkas snapshot
+
+    Aman dipanggil dari thread lain: state disalin di bawah monitor.kunci,
+    lalu berkas ditulis tanpa menahan kunci.
+    """
+    meta, array = _salin_state(monitor)
+    tulis_array(path, MAGIC, VERSI_FORMAT, meta, array)
+
+
+def baca(path):
+    """Membuka berkas snapshot dengan mmap; semua array berupa view baca-saja"""
+    return Snapshot(*baca_array(path, MAGIC, VERSI_FORMAT))
+
+
+class SnapshotBerkala:
+    def __init__(self, path, interval=INTERVAL_DEFAULT):
+        """Penulis snapshot satu-satunya untuk sebuah berkas di proses ini
+
+        Sesi mendaftarkan monitornya lewat daftarkan(), tetapi hanya monitor
+        utama (yang pertama didaftarkan dan masih hidup) yang ditulis, oleh satu
+        thread latar belakang setiap kali state-nya berubah. Dengan begitu
+        sesi tidak saling menimpa berkas, dan ubahan sesi lain tidak ikut
+        dimuat ulang sebagai state awal. Monitor dipegang lewat weakref; bila
+        sesi monitor utama berakhir, monitor terdaftar berikutnya menggantikannya.
+        """
+        self.path = path
+        self.interval = interval
+        self.galat = None
+        self.jumlah_ditulis = 0
+        self._monitor = []
+        self._kunci = threading.Lock()
+        self._terakhir = None
+        self._berhenti = threading.Event()
+        self._thread = threading.Thread(target=self._jalankan, name='snapshot-berkala', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _kunci_state(monitor):
+        return (id(monitor), monitor.versi, monitor.penggunaan_harian.versi)
+
+    def daftarkan(self, monitor):
+        """Mendaftarkan monitor sebuah sesi; mengembalikan penulis ini"""
+        with self._kunci:
+            if not self._monitor and self._terakhir is None and os.path.exists(self.path):
+                # Monitor utama pertama baru saja dimuat dari berkas ini: belum perlu ditulis
+                self._terakhir = self._kunci_state(monitor)
+            self._monitor.append(weakref.ref(monitor))
+        return self
+
+    def monitor_utama(self):
+        """Monitor terdaftar pertama yang masih hidup, atau None"""
+        with self._kunci:
+            self._monitor = [ref for ref in self._monitor if ref() is not None]
+            return self._monitor[0]() if self._monitor else None
+
+    def _jalankan(self):
+        while not self._berhenti.wait(self.interval):
+            monitor = self.monitor_utama()
+            if monitor is not None:
+                self._snapshot_jika_berubah(monitor)
+            # Jangan menahan monitor selama menunggu putaran berikutnya
+            del monitor
+
+    def _snapshot_jika_berubah(self, monitor):
+        kunci = self._kunci_state(monitor)
+        if kunci == self._terakhir:
+            return
+        try:
+            tulis(monitor, self.path)
+        except Exception as e:
+            self.galat = e
+        else:
+            self._terakhir = kunci
+            self.jumlah_ditulis += 1
+
+    def aktif(self):
+        return self._thread.is_alive()
+
+    def hentikan(self, batas_waktu=5.0):
+        """Menghentikan thread dan menunggu selesai"""
+        self._berhenti.set()
+        self._thread.join(batas_waktu)
+
+
+@functools.lru_cache(maxsize=1)
+def _baca_bersama(path, mtime_ns, ukuran):
+    return baca(path)
+
+
+def baca_dari_env():
+    """Snapshot bersama per proses dari $POWERWATCH_SNAPSHOT, atau None jika tidak ada
+
+    Dibaca ulang hanya bila berkasnya diganti (mis. oleh snapshot berkala).
+    """
+    path = os.environ.get(VARIABEL_LINGKUNGAN)
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    try:
+        status = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _baca_bersama(path, status.st_mtime_ns, status.st_size)
+
+
+_PENULIS = {}
+_KUNCI_PENULIS = threading.Lock()
+
+
+def penulis_berkala(path, interval=INTERVAL_DEFAULT):
+    """Penulis snapshot berkala bersama per proses untuk path (dibuat saat pertama diminta)"""
+    path = os.path.abspath(path)
+    with _KUNCI_PENULIS:
+        penulis = _PENULIS.get(path)
+        if penulis is None or not penulis.aktif():
+            penulis = _PENULIS[path] = SnapshotBerkala(path, interval)
+        return penulis
+
+
+def berkala_dari_env(monitor, interval=INTERVAL_DEFAULT):
+    """Mendaftarkan monitor ke penulis snapshot bersama $POWERWATCH_SNAPSHOT, atau None jika tidak diset"""
+    path = os.environ.get(VARIABEL_LINGKUNGAN)
+    if not path:
+        return None
+    return penulis_berkala(path, interval).daftarkan(monitor)
@@ -0,0 +1,418 @@
+"""Tabel peralatan elektronik berbasis kolom (array NumPy)"""
+import sys
+
+import numpy as np
+
+# Tipe data setiap kolom tabel peralatan
+TIPE_KOLOM = {
+    'nama': np.int32,        # kode nama (lihat KamusString)
+    'golongan': np.int16,    # kode golongan listrik (lihat KamusString)
+    'unit': np.int64,
+    'watt': np.float64,
+    'total_watt': np.float64,
+    'jam_per_hari': np.float64,
+    'jam_mulai': np.float64,  # jam mulai pemakaian harian (0-24); NaN = otomatis
+}
+
+KAPASITAS_AWAL = 64
+JAM_SELESAI_DEFAULT = 22  # tanpa jam_mulai, pemakaian dianggap berakhir pukul 22.00
+
+
+def jam_mulai_efektif(jam_mulai, jam_per_hari):
+    """Jam mulai pemakaian; yang kosong (NaN) diatur agar selesai pukul 22.00"""
+    return np.where(np.isnan(jam_mulai), (JAM_SELESAI_DEFAULT - jam_per_hari) % 24, jam_mulai)
+
+
+class KamusString:
+    def __init__(self, induk=None):
+        """Tabel intern teks -> kode bilangan bulat
+
+        Jika induk diberikan, kode milik induk dipakai bersama dan hanya teks
+        baru yang disimpan di kamus ini (induk tidak boleh bertambah lagi).
+        """
+        self._induk = induk
+        self._offset = len(induk) if induk is not None else 0
+        self._daftar = []
+        self._kode = {}
+        self._cache_array = None
+
+    @classmethod
+    def dari_daftar(cls, daftar_teks):
+        """Kamus dengan kode berurutan sesuai daftar_teks (teks harus unik)
+
+        Dict teks -> kode baru dibangun saat pertama kali dicari.
+        """
+        kamus = cls()
+        kamus._daftar = list(daftar_teks)
+        kamus._kode = None
+        return kamus
+
+    def _indeks_kode(self):
+        """Dict teks -> kode milik kamus ini (dibangun bila belum ada)"""
+        if self._kode is None:
+            self._kode = dict(zip(self._daftar, range(self._offset, len(self))))
+        return self._kode
+
+    def __len__(self):
+        return self._offset + len(self._daftar)
+
+    def kode(self, teks):
+        """Mengembalikan kode untuk teks, menambahkannya jika belum ada"""
+        kode = self.cari(teks)
+        if kode is None:
+            kode = len(self)
+            self._daftar.append(teks)
+            self._indeks_kode()[teks] = kode
+            self._cache_array = None
+        return kode
+
+    def kode_array(self, daftar_teks):
+        """Kode untuk setiap teks dalam array (intern dilakukan per nilai unik)"""
+        unik, kebalikan = np.unique(np.asarray(daftar_teks), return_inverse=True)
+        kode_unik = np.array([self.kode(t) for t in unik.tolist()], dtype=np.int64)
+        return kode_unik[kebalikan]
+
+    def cari(self, teks):
+        """Mengembalikan kode teks atau None jika tidak ada"""
+        if self._induk is not None:
+            kode = self._induk.cari(teks)
+            if kode is not None:
+                return kode
+        return self._indeks_kode().get(teks)
+
+    def teks(self, kode):
+        """Mengembalikan teks untuk sebuah kode"""
+        if kode < self._offset:
+            return self._induk.teks(kode)
+        return self._daftar[kode - self._offset]
+
+    def daftar(self):
+        """Seluruh teks, berurutan sesuai kode"""
+        if self._induk is None:
+            return list(self._daftar)
+        return self._induk.daftar() + self._daftar
+
+    def sebagai_array(self):
+        """Seluruh teks sebagai array objek, diindeks dengan kode"""
+        if self._cache_array is None or len(self._cache_array) != len(self):
+            if self._induk is None:
+                self._cache_array = np.array(self._daftar, dtype=object)
+            else:
+                self._cache_array = np.concatenate([
+                    self._induk.sebagai_array(), np.array(self._daftar, dtype=object)
+                ])
+        return self._cache_array
+
+
+class TabelPeralatan:
+    def __init__(self, kapasitas=KAPASITAS_AWAL):
+        """Inisialisasi tabel peralatan kolumnar"""
+        self._n = 0
+        self._kolom = {
+            nama: np.zeros(kapasitas, dtype=tipe)
+            for nama, tipe in TIPE_KOLOM.items()
+        }
+        self.kamus_nama = KamusString()
+        self.kamus_golongan = KamusString()
+        # Tabel basis bersama (baca-saja) dan jumlah barisnya; baris milik tabel
+        # ini di self._kolom dimulai setelah baris basis
+        self._basis = None
+        self._n_basis = 0
+        self._beku = False
+        self._cache_kolom = {}
+
+    @classmethod
+    def dari_kolom_beku(cls, kolom, kamus_nama, kamus_golongan):
+        """Tabel beku yang langsung memakai array kolom baca-saja (mis. memory-map)"""
+        tabel = cls(kapasitas=0)
+        jumlah = {len(kolom[nama]) for nama in TIPE_KOLOM}
+        if len(jumlah) != 1:
+            raise ValueError('Semua kolom peralatan harus memiliki panjang sama')
+        for nama, tipe in TIPE_KOLOM.items():
+            array = kolom[nama]
+            if array.dtype != tipe:
+                raise ValueError(f'Kolom {nama} harus bertipe {np.dtype(tipe)}')
+            array = array.view()
+            array.flags.writeable = False
+            tabel._kolom[nama] = array
+        tabel._n = jumlah.pop()
+        tabel.kamus_nama = kamus_nama
+        tabel.kamus_golongan = kamus_golongan
+        tabel._beku = True
+        return tabel
+
+    # Basis bersama dengan overlay copy-on-write
+    def bekukan(self):
+        """Membekukan tabel (baca-saja) agar dapat dibagi sebagai basis"""
+        if self._basis is not None:
+            self._materialisasi()
+        for nama, lama in self._kolom.items():
+            baru = lama[:self._n].copy()
+            baru.flags.writeable = False
+            self._kolom[nama] = baru
+        self._beku = True
+        self._cache_kolom.clear()
+        return self
+
+    def turunan(self):
+        """Overlay di atas tabel beku ini yang hanya menyimpan tambahan dan ubahannya"""
+        if not self._beku:
+            raise ValueError('Hanya tabel beku yang dapat dipakai sebagai basis')
+        tabel = TabelPeralatan(kapasitas=0)
+        tabel._basis = self
+        tabel._n_basis = tabel._n = self._n
+        tabel.kamus_nama = KamusString(induk=self.kamus_nama)
+        tabel.kamus_golongan = KamusString(induk=self.kamus_golongan)
+        return tabel
+
+    def _materialisasi(self):
+        """Copy-on-write: menyalin baris basis ke array sendiri lalu melepas basis"""
+        jumlah_sendiri = self._n - self._n_basis
+        kapasitas = max(self._n, KAPASITAS_AWAL)
+        for nama, lama in self._kolom.items():
+            baru = np.zeros(kapasitas, dtype=lama.dtype)
+            baru[:self._n_basis] = self._basis._kolom[nama][:self._n_basis]
+            baru[self._n_basis:self._n] = lama[:jumlah_sendiri]
+            self._kolom[nama] = baru
+        self._basis = None
+        self._n_basis = 0
+
+    def _sebelum_perubahan(self, indeks_basis=None):
+        """Dipanggil sebelum mengubah tabel; indeks_basis: baris yang akan diubah"""
+        if self._beku:
+            raise ValueError('Tabel beku tidak dapat diubah; gunakan turunan()')
+        if indeks_basis is not None and indeks_basis < self._n_basis:
+            self._materialisasi()
+        self._cache_kolom.clear()
+
+    # Akses gaya list of dict (kompatibel dengan halaman lama)
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        for indeks in range(self._n):
+            yield self[indeks]
+
+    def _nilai(self, nama, indeks):
+        """Nilai mentah satu sel (indeks global)"""
+        if indeks < self._n_basis:
+            return self._basis._kolom[nama][indeks]
+        return self._kolom[nama][indeks - self._n_basis]
+
+    def __getitem__(self, indeks):
+        """Mengembalikan satu peralatan sebagai dict"""
+        indeks = self._indeks_valid(indeks)
+        return {
+            'nama': self.kamus_nama.teks(int(self._nilai('nama', indeks))),
+            'unit': int(self._nilai('unit', indeks)),
+            'watt': float(self._nilai('watt', indeks)),
+            'total_watt': float(self._nilai('total_watt', indeks)),
+            'golongan': self.kamus_golongan.teks(int(self._nilai('golongan', indeks))),
+            'jam_per_hari': float(self._nilai('jam_per_hari', indeks)),
+            'jam_mulai': float(self._nilai('jam_mulai', indeks)),
+        }
+
+    def _pastikan_kapasitas(self, jumlah_tambahan):
+        """Memperbesar array (dua kali lipat) bila kapasitas tidak cukup"""
+        jumlah_sendiri = self._n - self._n_basis
+        dibutuhkan = jumlah_sendiri + jumlah_tambahan
+        kapasitas = len(self._kolom['unit'])
+        if dibutuhkan <= kapasitas:
+            return
+        kapasitas_baru = max(dibutuhkan, kapasitas * 2, KAPASITAS_AWAL)
+        for nama, lama in self._kolom.items():
+            baru = np.zeros(kapasitas_baru, dtype=lama.dtype)
+            baru[:jumlah_sendiri] = lama[:jumlah_sendiri]
+            self._kolom[nama] = baru
+
+    def tambah(self, nama, unit, watt, golongan, jam_per_hari, jam_mulai=np.nan):
+        """Menambahkan satu peralatan dan mengembalikan indeksnya"""
+        self._sebelum_perubahan()
+        self._pastikan_kapasitas(1)
+        indeks = self._n - self._n_basis
+        kolom = self._kolom
+        kolom['nama'][indeks] = self.kamus_nama.kode(nama)
+        kolom['golongan'][indeks] = self.kamus_golongan.kode(golongan)
+        kolom['unit'][indeks] = unit
+        kolom['watt'][indeks] = watt
+        kolom['total_watt'][indeks] = watt * unit
+        kolom['jam_per_hari'][indeks] = jam_per_hari
+        kolom['jam_mulai'][indeks] = jam_mulai
+        self._n += 1
+        return self._n - 1
+
+    def tambah_batch(self, nama, unit, watt, golongan, jam_per_hari, jam_mulai=np.nan):
+        """Menambahkan banyak peralatan sekaligus dari array kolom"""
+        self._sebelum_perubahan()
+        jumlah = len(unit)
+        self._pastikan_kapasitas(jumlah)
+        awal = self._n - self._n_basis
+        akhir = awal + jumlah
+        kolom = self._kolom
+        kolom['nama'][awal:akhir] = self.kamus_nama.kode_array(nama)
+        kolom['golongan'][awal:akhir] = self.kamus_golongan.kode_array(golongan)
+        kolom['unit'][awal:akhir] = unit
+        kolom['watt'][awal:akhir] = watt
+        kolom['total_watt'][awal:akhir] = kolom['watt'][awal:akhir] * kolom['unit'][awal:akhir]
+        kolom['jam_per_hari'][awal:akhir] = jam_per_hari
+        kolom['jam_mulai'][awal:akhir] = jam_mulai
+        self._n += jumlah
+        return self._n - jumlah
+
+    def _potong(self, jumlah):
+        """Membuang peralatan setelah indeks ke-jumlah (untuk membatalkan impor)"""
+        self._sebelum_perubahan(jumlah if jumlah < self._n else None)
+        self._n = min(self._n, jumlah)
+
+    def _indeks_valid(self, indeks):
+        if indeks < 0:
+            indeks += self._n
+        if not 0 <= indeks < self._n:
+            raise IndexError('indeks peralatan di luar jangkauan')
+        return indeks
+
+    def hapus(self, indeks):
+        """Menghapus satu peralatan dan mengembalikannya sebagai dict"""
+        indeks = self._indeks_valid(indeks)
+        lama = self[indeks]
+        self._sebelum_perubahan(indeks)
+        indeks -= self._n_basis
+        jumlah_sendiri = self._n - self._n_basis
+        for kolom in self._kolom.values():
+            kolom[indeks:jumlah_sendiri - 1] = kolom[indeks + 1:jumlah_sendiri]
+        self._n -= 1
+        return lama
+
+    def ubah(self, indeks, **perubahan):
+        """Mengubah kolom satu peralatan (nama, unit, watt, golongan, jam_per_hari, jam_mulai)"""
+        indeks = self._indeks_valid(indeks)
+        tidak_dikenal = set(perubahan) - {'nama', 'unit', 'watt', 'golongan', 'jam_per_hari', 'jam_mulai'}
+        if tidak_dikenal:
+            raise KeyError(f"kolom tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+        self._sebelum_perubahan(indeks)
+        indeks -= self._n_basis
+        kolom = self._kolom
+        if 'nama' in perubahan:
+            kolom['nama'][indeks] = self.kamus_nama.kode(perubahan['nama'])
+        if 'golongan' in perubahan:
+            kolom['golongan'][indeks] = self.kamus_golongan.kode(perubahan['golongan'])
+        for nama in ('unit', 'watt', 'jam_per_hari', 'jam_mulai'):
+            if nama in perubahan:
+                kolom[nama][indeks] = perubahan[nama]
+        kolom['total_watt'][indeks] = kolom['watt'][indeks] * kolom['unit'][indeks]
+
+    # Akses kolumnar (vektor)
+    def kolom(self, nama):
+        """Array baca-saja dari satu kolom sepanjang jumlah peralatan
+
+        Tanpa basis (atau tanpa tambahan di atas basis) hasilnya berupa view;
+        gabungan basis + overlay disimpan di cache sampai tabel berubah.
+        """
+        if self._basis is None:
+            view = self._kolom[nama][:self._n]
+        elif self._n == self._n_basis:
+            return self._basis.kolom(nama)
+        else:
+            view = self._cache_kolom.get(nama)
+            if view is None:
+                view = np.concatenate([
+                    self._basis._kolom[nama][:self._n_basis],
+                    self._kolom[nama][:self._n - self._n_basis],
+                ])
+                self._cache_kolom[nama] = view
+        view.flags.writeable = False
+        return view
+
+    def ukuran_memori(self):
+        """Perkiraan byte milik tabel ini sendiri (tanpa basis bersama)"""
+        ukuran = sum(kolom.nbytes for kolom in self._kolom.values())
+        ukuran += sum(kolom.nbytes for kolom in self._cache_kolom.values())
+        for kamus in (self.kamus_nama, self.kamus_golongan):
+            ukuran += sys.getsizeof(kamus._daftar) + sys.getsizeof(kamus._kode)
+            ukuran += sum(sys.getsizeof(teks) for teks in kamus._daftar)
+            if kamus._cache_array is not None:
+                ukuran += kamus._cache_array.nbytes
+        return ukuran
+
+    def nama(self):
+        """Array nama peralatan"""
+        return self.kamus_nama.sebagai_array()[self.kolom('nama')]
+
+    def golongan(self):
+        """Array golongan listrik setiap peralatan"""
+        return self.kamus_golongan.sebagai_array()[self.kolom('golongan')]
+
+    def nama_dalam(self, daftar_nama):
+        """Mask boolean peralatan yang namanya ada di daftar_nama"""
+        cocok = np.zeros(len(self.kamus_nama), dtype=bool)
+        for nama in daftar_nama:
+            kode = self.kamus_nama.cari(nama)
+            if kode is not None:
+                cocok[kode] = True
+        return cocok[self.kolom('nama')]
+
+    def nama_mengandung(self, daftar_kata):
+        """Mask boolean peralatan yang namanya memuat salah satu kata (tanpa membedakan huruf besar)"""
+        kata = [k.casefold() for k in daftar_kata]
+        cocok = np.array(
+            [any(k in nama.casefold() for k in kata) for nama in self.kamus_nama.daftar()],
+            dtype=bool,
+        )
+        return cocok[self.kolom('nama')] if len(cocok) else np.zeros(len(self), dtype=bool)
+
+    def golongan_dalam(self, daftar_golongan):
+        """Mask boolean peralatan yang golongannya ada di daftar_golongan"""
+        cocok = np.zeros(len(self.kamus_golongan), dtype=bool)
+        for golongan in daftar_golongan:
+            kode = self.kamus_golongan.cari(golongan)
+            if kode is not None:
+                cocok[kode] = True
+        return cocok[self.kolom('golongan')]
+
+    def urutan(self, kolom=None, menurun=False):
+        """Indeks peralatan terurut (stabil) menurut satu kolom; None = urutan input"""
+        if kolom is None:
+            indeks = np.arange(self._n)
+            return indeks[::-1] if menurun else indeks
+        if kolom in ('nama', 'golongan'):
+            # Urutkan teks kamus sekali, lalu urutkan baris menurut peringkat kodenya
+            kunci = self.peringkat_teks(kolom)[self.kolom(kolom)]
+        elif kolom == 'jam_mulai':
+            kunci = self.jam_mulai_efektif()
+        elif kolom in TIPE_KOLOM:
+            kunci = self.kolom(kolom)
+        else:
+            raise KeyError(f'kolom tidak dikenal: {kolom}')
+        return np.argsort(-kunci if menurun else kunci, kind='stable')
+
+    def peringkat_teks(self, kolom):
+        """Peringkat alfabetis (tanpa membedakan huruf besar) setiap kode kolom nama/golongan"""
+        kamus = self.kamus_nama if kolom == 'nama' else self.kamus_golongan
+        teks = kamus.daftar()
+        peringkat = np.empty(len(teks), dtype=np.int64)
+        peringkat[sorted(range(len(teks)), key=lambda k: teks[k].casefold())] = np.arange(len(teks))
+        return peringkat
+
+    def baris(self, indeks):
+        """Dict kolom untuk sebagian baris saja (mis. satu halaman tabel)"""
+        indeks = np.asarray(indeks, dtype=np.int64)
+        jam_per_hari = self.kolom('jam_per_hari')[indeks]
+        return {
+            'nama': self.kamus_nama.sebagai_array()[self.kolom('nama')[indeks]],
+            'golongan': self.kamus_golongan.sebagai_array()[self.kolom('golongan')[indeks]],
+            'unit': self.kolom('unit')[indeks],
+            'watt': self.kolom('watt')[indeks],
+            'total_watt': self.kolom('total_watt')[indeks],
+            'jam_per_hari': jam_per_hari,
+            'jam_mulai': jam_mulai_efektif(self.kolom('jam_mulai')[indeks], jam_per_hari),
+        }
+
+    def kwh_per_bulan(self, hari=30):
+        """Konsumsi energi setiap peralatan dalam kWh per bulan"""
+        return (self.kolom('total_watt') / 1000) * self.kolom('jam_per_hari') * hari
+
+    def jam_mulai_efektif(self, jam_per_hari=None):
+        """Jam mulai setiap peralatan (lihat jam_mulai_efektif)"""
+        if jam_per_hari is None:
+            jam_per_hari = self.kolom('jam_per_hari')
+        return jam_mulai_efektif(self.kolom('jam_mulai'), jam_per_hari)
@@ -0,0 +1,431 @@
+"""Tagihan massal: penggunaan dan biaya bulanan ribuan rumah tangga sekaligus
+
+Sumber berupa direktori (satu berkas inventaris per rumah tangga, id = nama
+berkas) atau satu tabel CSV/Parquet dengan kolom tambahan `id_rumah`. Sumber
+dipecah menjadi shard yang dihitung secara vektor di process pool, lalu hasil
+ditulis bertahap ke berkas CSV sesuai urutan sumber. Biaya dihitung lewat
+mesin tarif dengan satu akun per (rumah tangga, golongan), sama seperti
+MonitorListrik.hitung_estimasi_biaya.
+
+    python -m powerwatch.tagihan_massal inventaris/ tagihan.csv --proses 8
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import impor, profil_beban, tarif
+from .monitor import HARI_PER_BULAN, TARIF_DEFAULT, TARIF_LISTRIK
+from .tabel_peralatan import jam_mulai_efektif
+
+KOLOM_ID = 'id_rumah'
+KOLOM_SUMBER = (KOLOM_ID,) + impor.KOLOM_WAJIB + impor.KOLOM_OPSIONAL
+KOLOM_HASIL = (
+    'id_rumah', 'jumlah_peralatan', 'total_kwh', 'estimasi_biaya', 'status',
+)
+EKSTENSI_INVENTARIS = ('.csv', '.parquet', '.pq')
+UKURAN_SHARD = 16 * 1024 * 1024  # byte CSV per shard
+BERKAS_PER_SHARD = 256  # berkas per shard untuk sumber direktori
+SHARD_PER_PROSES = 2  # shard yang boleh berjalan bersamaan per proses (batas memori)
+
+
+def _ke_angka_longgar(nilai):
+    """Konversi ke float64; nilai yang bukan angka menjadi NaN (ditandai tidak valid)"""
+    try:
+        return np.asarray(nilai, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    hasil = np.empty(len(nilai), dtype=np.float64)
+    for i, x in enumerate(nilai):
+        try:
+            hasil[i] = float(x)
+        except (TypeError, ValueError):
+            hasil[i] = np.nan
+    return hasil
+
+
+def hitung_shard(id_rumah, kolom, tarif_listrik=TARIF_LISTRIK):
+    """Agregat per rumah tangga untuk satu shard, dalam urutan kemunculan pertama
+
+    Mengembalikan list baris [id, jumlah_peralatan, kwh, biaya, jumlah_baris_salah,
+    galat, akun]. Baris yang tidak valid tidak ikut dijumlahkan. akun berisi
+    {golongan: [kwh, energi]} hanya untuk rumah tangga pertama dan terakhir,
+    yang tagihannya dihitung ulang bila berlanjut ke shard tetangga.
+    """
+    id_rumah = np.asarray(id_rumah, dtype=object).astype(str)
+    if not len(id_rumah):
+        return []
+    nama_asli = np.asarray(kolom['nama'], dtype=object)
+    nama = nama_asli.astype(str)
+    golongan = np.asarray(kolom['golongan'], dtype=object).astype(str)
+    unit = _ke_angka_longgar(kolom['unit'])
+    watt = _ke_angka_longgar(kolom['watt'])
+    jam = _ke_angka_longgar(kolom['jam_per_hari'])
+    if 'jam_mulai' in kolom:
+        jam_mulai = _ke_angka_longgar(kolom['jam_mulai'])
+    else:
+        jam_mulai = np.full(len(id_rumah), np.nan)
+
+    salah = (jam_mulai < 0) | (jam_mulai >= 24)
+    for mask, _ in impor.pemeriksaan(nama_asli, nama, golongan, unit, watt, jam, tarif_listrik):
+        salah |= mask
+
+    kw = np.where(salah, 0.0, unit * watt / 1000)
+    jam = np.where(salah, 0.0, jam)
+    kwh = kw * jam * HARI_PER_BULAN
+    tabel_tarif = tarif.kompilasi(tarif_listrik, TARIF_DEFAULT)
+    golongan_unik, kode_golongan = np.unique(golongan, return_inverse=True)
+    kode_golongan = kode_golongan.ravel()
+    kode_tarif = tabel_tarif.kode(golongan_unik.tolist())[kode_golongan]
+    kwh_jam = None
+    if not tabel_tarif.seragam:
+        mulai = jam_mulai_efektif(jam_mulai, jam)
+
+        def kwh_jam(a, b):
+            return profil_beban.kwh_per_jam(kw[a:b], mulai[a:b], jam[a:b], HARI_PER_BULAN)
+    energi = tabel_tarif.energi(kode_tarif, kwh, kwh_jam)
+
+    # Kode rumah tangga menurut urutan kemunculan pertama
+    unik, pertama, kebalikan = np.unique(id_rumah, return_index=True, return_inverse=True)
+    urutan = np.argsort(pertama, kind='stable')
+    peringkat = np.empty_like(urutan)
+    peringkat[urutan] = np.arange(len(urutan))
+    kode = peringkat[kebalikan.ravel()]
+    m = len(unik)
+
+    jumlah = np.bincount(kode, minlength=m)
+    total = np.bincount(kode, weights=kwh, minlength=m)
+    n_salah = np.bincount(kode, weights=salah, minlength=m).astype(np.int64)
+
+    # Satu akun per (rumah tangga, golongan); tagihan akun dijumlah per rumah tangga
+    g = len(golongan_unik)
+    akun = kode * g + kode_golongan
+    tagihan = tabel_tarif.tagihan(kode_tarif, kwh, energi, akun)
+    biaya = np.bincount(
+        np.arange(len(tagihan['total'])) // g, weights=tagihan['total'], minlength=m
+    )
+
+    baris = [
+        [i, j, k, b, s, None, None]
+        for i, j, k, b, s in zip(
+            unik[urutan].tolist(), jumlah.tolist(), total.tolist(), biaya.tolist(), n_salah.tolist()
+        )
+    ]
+    jumlah_akun = np.bincount(akun, minlength=m * g).reshape(m, g)
+    kwh_akun = np.bincount(akun, weights=kwh, minlength=m * g).reshape(m, g)
+    energi_akun = np.bincount(akun, weights=energi, minlength=m * g).reshape(m, g)
+    for i in {0, m - 1}:
+        baris[i][6] = {
+            golongan_unik[j]: [kwh_akun[i, j], energi_akun[i, j]]
+            for j in np.flatnonzero(jumlah_akun[i])
+        }
+    return baris
+
+
+def _biaya_akun(akun, tarif_listrik):
+    """Tagihan satu rumah tangga dari {golongan: [kwh, energi]}"""
+    tabel_tarif = tarif.kompilasi(tarif_listrik, TARIF_DEFAULT)
+    golongan = list(akun)
+    kwh = np.array([akun[g][0] for g in golongan])
+    energi = np.array([akun[g][1] for g in golongan])
+    tagihan = tabel_tarif.tagihan(tabel_tarif.kode(golongan), kwh, energi, np.arange(len(golongan)))
+    return float(tagihan['total'].sum())
+
+
+def _shard_direktori(daftar_berkas, tarif_listrik):
+    """Satu shard sumber direktori: setiap berkas adalah satu rumah tangga"""
+    id_rumah = []
+    kolom = {nama: [] for nama in impor.KOLOM_WAJIB + impor.KOLOM_OPSIONAL}
+    galat = {}
+    urutan_id = []
+    for berkas in daftar_berkas:
+        id_ = os.path.splitext(os.path.basename(berkas))[0]
+        urutan_id.append(id_)
+        try:
+            potongan = list(impor.baca_chunk(berkas, pakai_pandas=False))
+        except (OSError, ValueError) as e:
+            galat[id_] = str(e)
+            continue
+        for chunk in potongan:
+            n = len(chunk['nama'])
+            id_rumah.extend([id_] * n)
+            for nama in kolom:
+                kolom[nama].extend(list(chunk[nama]) if nama in chunk else [None] * n)
+
+    hasil = {baris[0]: baris for baris in hitung_shard(id_rumah, kolom, tarif_listrik)}
+    # Rumah tangga tanpa baris atau dengan berkas rusak tetap muncul di keluaran
+    return [
+        hasil.get(id_, [id_, 0, 0.0, 0.0, 0, galat.get(id_), {}])
+        for id_ in urutan_id
+    ]
+
+
+def _shard_csv(path, header, awal, akhir, tarif_listrik):
+    """Satu shard rentang byte [awal, akhir) dari tabel CSV, disejajarkan ke baris"""
+    import pandas as pd
+
+    with open(path, 'rb') as f:
+        # Baris yang terpotong di awal rentang milik shard sebelumnya
+        f.seek(awal - 1)
+        f.readline()
+        posisi = f.tell()
+        if posisi >= akhir:
+            return []
+        data = f.read(akhir - posisi)
+        if not data.endswith(b'\n'):
+            data += f.readline()
+
+    tabel = pd.read_csv(
+        io.BytesIO(data), header=None, names=header,
+        usecols=[n for n in KOLOM_SUMBER if n in header],
+        dtype={KOLOM_ID: str, 'nama': str, 'golongan': str},
+        skip_blank_lines=True,
+    )
+    kolom = {nama: tabel[nama].to_numpy() for nama in tabel.columns if nama != KOLOM_ID}
+    return hitung_shard(tabel[KOLOM_ID].to_numpy(), kolom, tarif_listrik)
+
+
+def _shard_parquet(path, row_group, tarif_listrik):
+    """Satu shard berisi beberapa row group tabel Parquet"""
+    import pyarrow.parquet as pq
+
+    berkas = pq.ParquetFile(path)
+    nama_kolom = [n for n in KOLOM_SUMBER if n in berkas.schema_arrow.names]
+    tabel = berkas.read_row_groups(row_group, columns=nama_kolom)
+    kolom = {
+        nama: tabel.column(nama).to_numpy(zero_copy_only=False)
+        for nama in nama_kolom if nama != KOLOM_ID
+    }
+    return hitung_shard(tabel.column(KOLOM_ID).to_numpy(zero_copy_only=False), kolom, tarif_listrik)
+
+
+def _header_csv(path):
+    """Nama kolom dan offset byte awal data sebuah tabel CSV"""
+    with open(path, 'rb') as f:
+        baris = f.readline()
+    header = next(csv.reader([baris.decode('utf-8-sig')]))
+    header = [h.strip() for h in header]
+    hilang = [n for n in (KOLOM_ID, *impor.KOLOM_WAJIB) if n not in header]
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+    return header, len(baris)
+
+
+def rencana_shard(sumber, ukuran_shard=UKURAN_SHARD, berkas_per_shard=BERKAS_PER_SHARD):
+    """Daftar tugas (fungsi, argumen) untuk sumber direktori atau tabel"""
+    if os.path.isdir(sumber):
+        daftar = sorted(
+            os.path.join(sumber, nama) for nama in os.listdir(sumber)
+            if os.path.splitext(nama)[1].lower() in EKSTENSI_INVENTARIS
+        )
+        return [
+            (_shard_direktori, (daftar[i:i + berkas_per_shard],))
+            for i in range(0, len(daftar), berkas_per_shard)
+        ]
+
+    format = impor._tebak_format(sumber)
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+
+        metadata = pq.ParquetFile(sumber).metadata
+        nama_kolom = set(metadata.schema.names)
+        hilang = [n for n in (KOLOM_ID, *impor.KOLOM_WAJIB) if n not in nama_kolom]
+        if hilang:
+            raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+        # Row group dikelompokkan hingga kira-kira ukuran_shard byte
+        tugas, kelompok, ukuran = [], [], 0
+        for i in range(metadata.num_row_groups):
+            kelompok.append(i)
+            ukuran += metadata.row_group(i).total_byte_size
+            if ukuran >= ukuran_shard:
+                tugas.append((_shard_parquet, (sumber, kelompok)))
+                kelompok, ukuran = [], 0
+        if kelompok:
+            tugas.append((_shard_parquet, (sumber, kelompok)))
+        return tugas
+
+    header, awal_data = _header_csv(sumber)
+    ukuran_berkas = os.path.getsize(sumber)
+    return [
+        (_shard_csv, (sumber, header, awal, min(awal + ukuran_shard, ukuran_berkas)))
+        for awal in range(awal_data, ukuran_berkas, ukuran_shard)
+    ]
+
+
+def _baris_keluaran(baris):
+    """Baris CSV hasil untuk satu rumah tangga"""
+    id_, jumlah, kwh, biaya, n_salah, galat, _ = baris
+    if galat:
+        return [id_, '', '', '', f'galat: {galat}']
+    if n_salah:
+        return [id_, jumlah, '', '', f'{n_salah} baris tidak valid']
+    return [id_, jumlah, round(kwh, 4), round(biaya, 2), 'ok']
+
+
+def _kerjakan(fungsi, argumen, tarif_listrik):
+    """Menghitung satu shard; rumah tangga yang sudah lengkap langsung diformat di pekerja"""
+    baris = fungsi(*argumen, tarif_listrik)
+    # Rumah tangga pertama dan terakhir bisa berlanjut dari/ke shard tetangga
+    tengah = baris[1:-1]
+    teks = io.StringIO()
+    csv.writer(teks).writerows(_baris_keluaran(b) for b in tengah)
+    kwh_valid = [b[2] for b in tengah if not (b[4] or b[5])]
+    return {
+        'tepi': baris[:1] + baris[1:][-1:],
+        'id_tengah': [b[0] for b in tengah],
+        'teks_tengah': teks.getvalue(),
+        'tidak_valid': len(tengah) - len(kwh_valid),
+        'kwh': sum(kwh_valid),
+    }
+
+
+def _jalankan_berurutan(tugas, jumlah_proses, tarif_listrik):
+    """Hasil setiap shard sesuai urutan tugas, dengan jumlah shard berjalan terbatas"""
+    if jumlah_proses == 1:
+        for fungsi, argumen in tugas:
+            yield _kerjakan(fungsi, argumen, tarif_listrik)
+        return
+
+    maks_berjalan = jumlah_proses * SHARD_PER_PROSES
+    with ProcessPoolExecutor(max_workers=jumlah_proses) as pool:
+        berjalan = deque()
+        for fungsi, argumen in tugas:
+            berjalan.append(pool.submit(_kerjakan, fungsi, argumen, tarif_listrik))
+            if len(berjalan) >= maks_berjalan:
+                yield berjalan.popleft().result()
+        while berjalan:
+            yield berjalan.popleft().result()
+
+
+def hitung_tagihan(sumber, keluaran, tarif_listrik=None, jumlah_proses=None,
+                   ukuran_shard=UKURAN_SHARD, laporan=None):
+    """Menghitung tagihan semua rumah tangga di sumber dan menulisnya ke CSV keluaran
+
+    `total_kwh` dan `estimasi_biaya` setara hitung_total_penggunaan dan
+    hitung_estimasi_biaya MonitorListrik per rumah tangga. Pada sumber tabel,
+    baris satu rumah tangga harus berurutan (boleh melewati batas shard).
+    `laporan(selesai, total)` dipanggil setiap shard selesai. Mengembalikan
+    ringkasan dict.
+    """
+    tarif_listrik = dict(tarif_listrik or TARIF_LISTRIK)
+    tarif.kompilasi(tarif_listrik, TARIF_DEFAULT)  # validasi sebelum shard dibagikan
+    jumlah_proses = jumlah_proses or os.cpu_count() or 1
+
+    tugas = rencana_shard(sumber, ukuran_shard)
+    mulai = time.perf_counter()
+    ringkasan = {'rumah_tangga': 0, 'tidak_valid': 0, 'total_kwh': 0.0, 'shard': len(tugas)}
+    sudah_ditulis = set()
+
+    def catat_unik(daftar_id):
+        duplikat = sudah_ditulis.intersection(daftar_id)
+        if duplikat:
+            raise ValueError(
+                f"Baris rumah tangga '{min(duplikat)}' tidak berurutan dalam sumber"
+            )
+        sudah_ditulis.update(daftar_id)
+
+    with open(keluaran, 'w', newline='', encoding='utf-8') as f:
+        penulis = csv.writer(f)
+        penulis.writerow(KOLOM_HASIL)
+
+        def tulis(baris):
+            catat_unik([baris[0]])
+            penulis.writerow(_baris_keluaran(baris))
+            ringkasan['rumah_tangga'] += 1
+            if baris[4] or baris[5]:
+                ringkasan['tidak_valid'] += 1
+            else:
+                ringkasan['total_kwh'] += baris[2]
+
+        # Rumah tangga terakhir sebuah shard bisa berlanjut di shard berikutnya
+        tertunda = None
+        hasil_shard = _jalankan_berurutan(tugas, jumlah_proses, tarif_listrik)
+        for selesai, hasil in enumerate(hasil_shard, 1):
+            tepi = hasil['tepi']
+            if tepi:
+                awal = tepi[0]
+                if tertunda is not None and awal[0] == tertunda[0]:
+                    for i in (1, 2, 4):
+                        tertunda[i] += awal[i]
+                    tertunda[5] = tertunda[5] or awal[5]
+                    # Blok dan biaya minimum tidak aditif: tagihan dihitung ulang
+                    for gol, (kwh, energi) in awal[6].items():
+                        jumlah = tertunda[6].setdefault(gol, [0.0, 0.0])
+                        jumlah[0] += kwh
+                        jumlah[1] += energi
+                    tertunda[3] = _biaya_akun(tertunda[6], tarif_listrik)
+                else:
+                    if tertunda is not None:
+                        tulis(tertunda)
+                    tertunda = awal
+
+            if len(tepi) == 2:
+                # Rumah tangga di tengah shard sudah lengkap dan sudah diformat
+                tulis(tertunda)
+                catat_unik(hasil['id_tengah'])
+                f.write(hasil['teks_tengah'])
+                ringkasan['rumah_tangga'] += len(hasil['id_tengah'])
+                ringkasan['tidak_valid'] += hasil['tidak_valid']
+                ringkasan['total_kwh'] += hasil['kwh']
+                tertunda = tepi[1]
+
+            if laporan is not None:
+                laporan(selesai, len(tugas))
+        if tertunda is not None:
+            tulis(tertunda)
+
+    ringkasan['detik'] = time.perf_counter() - mulai
+    return ringkasan
+
+
+def _laporan_stderr(selesai, total):
+    sys.stderr.write(f'\r[{selesai}/{total}] shard selesai')
+    if selesai == total:
+        sys.stderr.write('\n')
+    sys.stderr.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m powerwatch.tagihan_massal',
+        description='Hitung tagihan bulanan banyak rumah tangga secara paralel.',
+    )
+    parser.add_argument('sumber', help='Direktori berkas inventaris per rumah tangga, '
+                        f'atau tabel CSV/Parquet dengan kolom {KOLOM_ID}')
+    parser.add_argument('keluaran', help='Berkas CSV hasil')
+    parser.add_argument('--tarif', metavar='JSON',
+                        help='Berkas JSON spesifikasi tarif per golongan (lihat powerwatch.tarif)')
+    parser.add_argument('--proses', type=int, default=None,
+                        help='Jumlah proses (default: jumlah CPU)')
+    parser.add_argument('--ukuran-shard', type=float, default=UKURAN_SHARD / 2**20,
+                        help='Ukuran shard tabel dalam MB')
+    args = parser.parse_args(argv)
+
+    try:
+        tarif_listrik = None
+        if args.tarif:
+            with open(args.tarif, encoding='utf-8') as f:
+                tarif_listrik = json.load(f)
+        ringkasan = hitung_tagihan(
+            args.sumber, args.keluaran, tarif_listrik=tarif_listrik, jumlah_proses=args.proses,
+            ukuran_shard=max(1, int(args.ukuran_shard * 2**20)), laporan=_laporan_stderr,
+        )
+    except (OSError, ValueError) as e:
+        print(f'\ntagihan_massal: {e}', file=sys.stderr)
+        return 1
+    print(
+        f"{ringkasan['rumah_tangga']} rumah tangga ({ringkasan['tidak_valid']} tidak valid), "
+        f"{ringkasan['total_kwh']:,.2f} kWh, {ringkasan['detik']:.2f} detik"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Mesin tarif: harga per golongan, blok, waktu pemakaian, biaya minimum, dan pajak
+
+Spesifikasi tarif adalah dict golongan -> harga per kWh (angka), atau dict:
+
+    {'harga': 1444,                       # harga dasar (Rp/kWh)
+     'blok': [(200, 1600), (900, 1800)],  # kWh bulanan di atas batas dihargai ini
+     'waktu': [(17, 22, 2000)],           # jam [mulai, selesai) dengan harga dasar lain
+     'minimum': 50_000,                   # biaya minimum per akun per bulan (Rp)
+     'pajak': 0.03}                       # pajak/PPJ atas subtotal
+
+Harga blok menggantikan harga dasar untuk kWh di atas batasnya; selisihnya
+ditambahkan di atas harga waktu pemakaian. Spesifikasi dikompilasi sekali
+menjadi array (TabelTarif) dan di-cache menurut isinya.
+"""
+import functools
+
+import numpy as np
+
+JAM_PER_HARI = 24
+UKURAN_POTONGAN = 65_536  # baris matriks kWh per jam yang dievaluasi sekaligus
+
+
+def _normalisasi(golongan, spesifikasi):
+    """Spesifikasi satu golongan sebagai tuple hashable yang sudah divalidasi"""
+    try:
+        return _normalisasi_spesifikasi(golongan, spesifikasi)
+    except TypeError as e:
+        raise ValueError(f'Spesifikasi tarif {golongan} tidak valid: {e}') from e
+
+
+def _normalisasi_spesifikasi(golongan, spesifikasi):
+    if not isinstance(spesifikasi, dict):
+        spesifikasi = {'harga': spesifikasi}
+    tidak_dikenal = set(spesifikasi) - {'harga', 'blok', 'waktu', 'minimum', 'pajak'}
+    if tidak_dikenal:
+        raise ValueError(f"Kunci tarif tidak dikenal untuk {golongan}: {', '.join(sorted(tidak_dikenal))}")
+
+    harga = float(spesifikasi.get('harga', 0))
+    if not harga > 0:
+        raise ValueError(f'Harga dasar {golongan} harus > 0')
+
+    blok = spesifikasi.get('blok', ())
+    waktu = spesifikasi.get('waktu', ())
+    if any(len(b) != 2 for b in blok) or any(len(w) != 3 for w in waktu):
+        raise ValueError(
+            f'Tarif {golongan}: blok berupa (batas_kwh, harga), waktu berupa (mulai, selesai, harga)'
+        )
+
+    blok = tuple(sorted((float(batas), float(h)) for batas, h in blok))
+    if any(batas < 0 or h <= 0 for batas, h in blok):
+        raise ValueError(f'Blok tarif {golongan} harus berbatas >= 0 dan berharga > 0')
+
+    waktu = tuple((int(mulai), int(selesai), float(h)) for mulai, selesai, h in waktu)
+    if any(not (0 <= mulai < JAM_PER_HARI and 0 <= selesai <= JAM_PER_HARI) or h <= 0
+           for mulai, selesai, h in waktu):
+        raise ValueError(f'Jendela waktu tarif {golongan} harus di antara jam 0 dan 24')
+
+    minimum = float(spesifikasi.get('minimum', 0))
+    pajak = float(spesifikasi.get('pajak', 0))
+    if minimum < 0 or pajak < 0:
+        raise ValueError(f'Biaya minimum dan pajak {golongan} tidak boleh negatif')
+    return (harga, blok, waktu, minimum, pajak)
+
+
+def kunci_spesifikasi(tarif_listrik):
+    """Kunci hashable untuk dict spesifikasi tarif (juga kunci cache kompilasi)"""
+    if not isinstance(tarif_listrik, dict):
+        raise ValueError('Spesifikasi tarif harus berupa dict golongan -> tarif')
+    return tuple(sorted((g, _normalisasi(g, s)) for g, s in tarif_listrik.items()))
+
+
+class TabelTarif:
+    """Tarif yang sudah dikompilasi menjadi array per golongan
+
+    Baris terakhir setiap array adalah tarif cadangan (harga_default rata)
+    untuk golongan yang tidak ada dalam spesifikasi.
+    """
+
+    def __init__(self, kunci, harga_default):
+        self.golongan = tuple(g for g, _ in kunci)
+        self._indeks = {g: i for i, g in enumerate(self.golongan)}
+        baris = [spesifikasi for _, spesifikasi in kunci] + [(float(harga_default), (), (), 0.0, 0.0)]
+        jumlah_blok = max(1, max(len(s[1]) for s in baris))
+
+        self.harga_jam = np.empty((len(baris), JAM_PER_HARI))
+        self.batas_blok = np.full((len(baris), jumlah_blok), np.inf)
+        self.tambahan_blok = np.zeros((len(baris), jumlah_blok))
+        self.minimum = np.array([s[3] for s in baris])
+        self.pajak = np.array([s[4] for s in baris])
+
+        for i, (harga, blok, waktu, _, _) in enumerate(baris):
+            self.harga_jam[i] = harga
+            for mulai, selesai, h in waktu:
+                if mulai < selesai:
+                    self.harga_jam[i, mulai:selesai] = h
+                else:  # jendela melewati tengah malam
+                    self.harga_jam[i, mulai:] = h
+                    self.harga_jam[i, :selesai] = h
+            # Blok disimpan sebagai tambahan bertingkat di atas harga sebelumnya
+            sebelumnya = harga
+            for j, (batas, h) in enumerate(blok):
+                self.batas_blok[i, j] = batas
+                self.tambahan_blok[i, j] = h - sebelumnya
+                sebelumnya = h
+
+        self.harga_rata = self.harga_jam.mean(axis=1)
+        # Harga kumulatif di awal setiap jam: integral harga dari jam 0 sampai jam h
+        self.harga_kumulatif = np.zeros((len(baris), JAM_PER_HARI + 1))
+        np.cumsum(self.harga_jam, axis=1, out=self.harga_kumulatif[:, 1:])
+        # Tanpa jendela waktu, profil per jam tidak memengaruhi biaya energi
+        self.seragam = bool((self.harga_jam == self.harga_jam[:, :1]).all())
+        for arr in (self.harga_jam, self.batas_blok, self.tambahan_blok,
+                    self.minimum, self.pajak, self.harga_rata, self.harga_kumulatif):
+            arr.flags.writeable = False
+
+    def kode(self, golongan):
+        """Indeks baris tarif untuk setiap nama golongan (cadangan jika tidak dikenal)"""
+        cadangan = len(self.golongan)
+        return np.array([self._indeks.get(g, cadangan) for g in golongan], dtype=np.intp)
+
+    def energi(self, kode, kwh, kwh_jam=None):
+        """Biaya energi per baris (sebelum blok, minimum, dan pajak)
+
+        kwh_jam adalah matriks kWh bulanan (baris x 24 jam), atau fungsi
+        (mulai, selesai) -> potongan matriks tersebut. Tanpa kwh_jam pemakaian
+        dianggap merata sepanjang hari.
+        """
+        kode = np.asarray(kode, dtype=np.intp)
+        kwh = np.asarray(kwh, dtype=np.float64)
+        if kwh_jam is None:
+            return kwh * self.harga_rata[kode]
+
+        ambil = kwh_jam if callable(kwh_jam) else (lambda mulai, selesai: kwh_jam[mulai:selesai])
+        hasil = np.empty(len(kode))
+        for mulai in range(0, len(kode), UKURAN_POTONGAN):
+            selesai = min(mulai + UKURAN_POTONGAN, len(kode))
+            # (baris x 24) @ (24 x golongan), lalu pilih kolom golongan tiap baris
+            semua = ambil(mulai, selesai) @ self.harga_jam.T
+            hasil[mulai:selesai] = np.take_along_axis(
+                semua, kode[mulai:selesai, None], axis=1
+            )[:, 0]
+        return hasil
+
+    def _integral_harga(self, kode, jam):
+        """Integral harga dari jam 0 sampai jam (0 <= jam < 48, melewati tengah malam)"""
+        hari, sisa = np.divmod(jam, JAM_PER_HARI)
+        penuh = np.minimum(sisa.astype(np.intp), JAM_PER_HARI - 1)
+        return (hari * self.harga_kumulatif[kode, JAM_PER_HARI]
+                + self.harga_kumulatif[kode, penuh]
+                + (sisa - penuh) * self.harga_jam[kode, penuh])
+
+    def energi_jadwal(self, kode, kw, jam_mulai, durasi, hari):
+        """Biaya energi pemakaian terjadwal harian [jam_mulai, jam_mulai + durasi)
+
+        Sama dengan energi() dengan kwh_jam dari profil_beban.kwh_per_jam, tetapi
+        dihitung dari integral harga kumulatif tanpa matriks per jam, sehingga
+        argumen boleh berupa matriks (mis. skenario x peralatan) yang saling
+        di-broadcast.
+        """
+        kode = np.asarray(kode, dtype=np.intp)
+        mulai = np.asarray(jam_mulai, dtype=np.float64) % JAM_PER_HARI
+        selesai = mulai + np.clip(durasi, 0, JAM_PER_HARI)
+        integral = self._integral_harga(kode, selesai) - self._integral_harga(kode, mulai)
+        return np.asarray(kw, dtype=np.float64) * hari * integral
+
+    def tagihan(self, kode, kwh, energi, akun=None):
+        """Tagihan per akun: blok, biaya minimum, dan pajak atas jumlah per akun
+
+        akun adalah kode akun (0..m-1) per baris; default satu akun per
+        golongan. Mengembalikan dict array per akun dan kode akun per baris.
+        """
+        kode = np.asarray(kode, dtype=np.intp)
+        if akun is None:
+            akun = kode
+        m = int(akun.max()) + 1 if len(akun) else 0
+
+        kwh_akun = np.bincount(akun, weights=kwh, minlength=m)
+        energi_akun = np.bincount(akun, weights=energi, minlength=m)
+        kode_akun = np.full(m, len(self.golongan), dtype=np.intp)
+        kode_akun[akun] = kode
+
+        lebih = np.maximum(kwh_akun[:, None] - self.batas_blok[kode_akun], 0)
+        blok = (lebih * self.tambahan_blok[kode_akun]).sum(axis=1)
+        subtotal = np.maximum(energi_akun + blok, self.minimum[kode_akun])
+        # Akun tanpa baris tidak dikenai biaya minimum
+        subtotal[np.bincount(akun, minlength=m) == 0] = 0
+        pajak = subtotal * self.pajak[kode_akun]
+        return {
+            'kode': kode_akun,
+            'kwh': kwh_akun,
+            'energi': energi_akun,
+            'blok': blok,
+            'pajak': pajak,
+            'total': subtotal + pajak,
+            'akun': akun,
+        }
+
+    @staticmethod
+    def alokasi(tagihan, bobot):
+        """Membagi total tiap akun ke barisnya menurut porsi bobot (kWh atau energi)"""
+        akun = tagihan['akun']
+        m = len(tagihan['total'])
+        bobot_akun = np.bincount(akun, weights=bobot, minlength=m)[akun]
+        jumlah_baris = np.bincount(akun, minlength=m)[akun]
+        porsi = np.divide(
+            bobot, bobot_akun, out=1.0 / np.maximum(jumlah_baris, 1), where=bobot_akun > 0
+        )
+        return tagihan['total'][akun] * porsi
+
+
+@functools.lru_cache(maxsize=32)
+def _kompilasi(kunci, harga_default):
+    return TabelTarif(kunci, harga_default)
+
+
+def kompilasi(tarif_listrik, harga_default):
+    """TabelTarif untuk dict spesifikasi; hasil kompilasi di-cache menurut isinya"""
+    return _kompilasi(kunci_spesifikasi(tarif_listrik), harga_default)
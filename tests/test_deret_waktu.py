@@ -0,0 +1,75 @@
+"""Deret waktu penggunaan dan downsampling grafik"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch.deret_waktu import DeretWaktu  # noqa: E402
+from powerwatch.downsampling import sampel_indeks  # noqa: E402
+
+AWAL = np.datetime64('2024-01-01T00:00:00')
+
+
+def _deret(n, kapasitas=4):
+    deret = DeretWaktu(kapasitas=kapasitas)
+    waktu = AWAL + np.arange(n) * np.timedelta64(60, 's')
+    kwh = np.sin(np.arange(n) / 50.0) + 1
+    # Lonjakan tunggal yang harus tetap terlihat setelah downsampling
+    kwh[n // 3] = 10.0
+    # Beberapa batch agar buffer tumbuh berkali-kali
+    for mulai in range(0, n, 97):
+        deret.tambah_batch(waktu[mulai:mulai + 97], kwh[mulai:mulai + 97])
+    return deret, waktu, kwh
+
+
+def test_tambah_dan_rentang():
+    deret, waktu, kwh = _deret(1000)
+    assert len(deret) == 1000
+    assert np.array_equal(deret.waktu(), waktu) and np.array_equal(deret.kwh(), kwh)
+    w, k = deret.rentang(waktu[100], waktu[199])
+    assert np.array_equal(w, waktu[100:200]) and np.array_equal(k, kwh[100:200])
+    assert not k.flags.writeable
+    deret.tambah(5.0)
+    assert deret.waktu_terakhir() == waktu[-1] + np.timedelta64(1, 'D')
+
+
+def test_bacaan_mundur_ditolak():
+    deret, waktu, _ = _deret(10)
+    with pytest.raises(ValueError):
+        deret.tambah_batch(waktu[:1], [1.0])
+    with pytest.raises(ValueError):
+        deret.tambah_batch(waktu[[9, 8]] + np.timedelta64(1, 'h'), [1.0, 1.0])
+    assert len(deret) == 10
+
+
+def test_pendengar_menerima_setiap_batch():
+    diterima = []
+    deret = DeretWaktu()
+    deret.daftarkan_pendengar(lambda waktu, kwh: diterima.append(len(kwh)))
+    deret.tambah_batch(AWAL + np.arange(3), [1.0, 2.0, 3.0])
+    deret.tambah(4.0)
+    assert diterima == [3, 1]
+
+
+@pytest.mark.parametrize('metode', ['lttb', 'minmax'])
+def test_sampel_mempertahankan_ujung_dan_lonjakan(metode):
+    deret, waktu, kwh = _deret(20_000)
+    w, k = deret.sampel(jumlah_titik=400, metode=metode)
+    assert len(k) <= 402
+    assert w[0] == waktu[0] and w[-1] == waktu[-1]
+    assert np.all(w[1:] > w[:-1])
+    assert k.max() == 10.0
+    # Hasil di-cache per versi; penambahan bacaan menghasilkan sampel baru
+    assert deret.sampel(jumlah_titik=400, metode=metode)[1] is k
+    deret.tambah(7.0)
+    assert deret.sampel(jumlah_titik=400, metode=metode)[1][-1] == 7.0
+
+
+def test_sampel_deret_pendek_tidak_diubah():
+    assert sampel_indeks(np.arange(5), np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        sampel_indeks(np.arange(5), np.arange(5.0), 3, metode='rata')
@@ -0,0 +1,21 @@
+"""CLI tidak memuat modul halaman (rasio waktu impor: benchmarks/importtime.py)"""
+import os
+import sys
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from benchmarks import importtime  # noqa: E402
+
+
+def _berkas_inventaris(direktori):
+    berkas = direktori / 'inventaris.csv'
+    berkas.write_text('nama,unit,watt,golongan,jam_per_hari\nKulkas,1,150,R-1,24\n')
+    return str(berkas)
+
+
+def test_cli_tidak_memuat_modul_halaman(tmp_path):
+    _, modul = importtime.ukur_impor(['-m', 'powerwatch', _berkas_inventaris(tmp_path)])
+    terlarang = sorted(m for m in modul if m.split('.')[0] in importtime.MODUL_TERLARANG)
+    assert not terlarang
+
@@ -0,0 +1,61 @@
+"""Pipa ingesti meter dan interaksinya dengan MonitorListrik"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik, ingesti  # noqa: E402
+from powerwatch.ingesti import PipaIngesti, SumberSimulator  # noqa: E402
+
+MENIT = np.timedelta64(60, 's')
+
+
+class _SumberDenganPeralatanBaru:
+    """Dua batch per menit; di antaranya sebuah peralatan ditambahkan ke monitor"""
+
+    def __init__(self, monitor, mulai):
+        self.monitor = monitor
+        self.mulai = mulai
+
+    async def __aiter__(self):
+        waktu = self.mulai + MENIT * np.arange(1, 11)
+        yield waktu[:5], np.full(5, 0.01)
+        self.monitor.tambah_peralatan('Kipas', 1, 40, 'R-1', 8)
+        yield waktu[5:], np.full(5, 0.01)
+
+
+def test_tambah_peralatan_selama_ingesti_tidak_membuang_bacaan():
+    monitor = MonitorListrik(seed=0)
+    monitor.tambah_peralatan('Lampu', 1, 10, 'R-1', 6)
+    deret = monitor.penggunaan_harian
+    jumlah_awal = len(deret)
+    pipa = PipaIngesti(deret, _SumberDenganPeralatanBaru(monitor, deret.waktu_terakhir()))
+    asyncio.run(pipa.jalankan())
+    assert pipa.dibuang == 0
+    assert len(deret) == jumlah_awal + 10
+    assert deret.ingesti_aktif == 0
+    # Tanpa ingesti, peralatan baru kembali menambah bacaan contoh
+    monitor.tambah_peralatan('Kipas', 1, 40, 'R-1', 8)
+    assert len(deret) == jumlah_awal + 11
+
+
+def test_hentikan_sebelum_thread_siap(monkeypatch):
+    monitor = MonitorListrik(seed=0)
+    set_event_loop = asyncio.set_event_loop
+
+    def set_event_loop_lambat(loop):
+        # Thread latar belakang belum sempat membuat tugas saat hentikan() dipanggil
+        time.sleep(0.2)
+        set_event_loop(loop)
+
+    monkeypatch.setattr(ingesti.asyncio, 'set_event_loop', set_event_loop_lambat)
+    sumber = SumberSimulator(laju=1_000, ukuran_batch=100, seed=0)
+    latar = PipaIngesti(monitor.penggunaan_harian, sumber).jalankan_di_latar()
+    latar.hentikan(batas_waktu=2.0)
+    assert not latar.aktif()
+    assert monitor.penggunaan_harian.ingesti_aktif == 0
@@ -0,0 +1,35 @@
+"""Indeks grup tetap konsisten setelah peralatan diubah"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik  # noqa: E402
+
+
+def _monitor(cek_konsistensi):
+    monitor = MonitorListrik(cek_konsistensi=cek_konsistensi, seed=0)
+    for i in range(6):
+        monitor.tambah_peralatan(f'Peralatan {i}', 1, 100 + i, 'R-1', 2)
+    for kolom in ('golongan', 'nama'):
+        monitor.indeks_grup(kolom)
+    return monitor
+
+
+@pytest.mark.parametrize('cek_konsistensi', [False, True])
+def test_ubah_dengan_indeks_negatif(cek_konsistensi):
+    monitor = _monitor(cek_konsistensi)
+    n = len(monitor.peralatan)
+    monitor.ubah_peralatan(-1, golongan='R-2')
+    monitor.ubah_peralatan(-2, golongan='R-2', nama='Peralatan 0')
+    for kolom in ('golongan', 'nama'):
+        monitor.indeks_grup(kolom).verifikasi(monitor.peralatan)
+    hasil = monitor.kueri({'golongan': 'R-2'}, kolom=())['indeks']
+    assert np.array_equal(np.sort(hasil), [n - 2, n - 1])
+    hasil = monitor.kueri({'nama': 'Peralatan 0'}, kolom=())['indeks']
+    assert np.array_equal(np.sort(hasil), [0, n - 2])
+    monitor.verifikasi_agregat()
@@ -0,0 +1,111 @@
+"""Agregat berjalan dan tagihan MonitorListrik"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik  # noqa: E402
+from powerwatch.katalog_default import katalog_default  # noqa: E402
+
+TARIF_WAKTU = {'R-1': {'harga': 1444, 'waktu': [(17, 22, 2000)]}, 'R-2': 1699}
+TARIF_MINIMUM = {
+    'R-1': {'harga': 1444, 'minimum': 50_000},
+    'R-2': {'harga': 1699, 'minimum': 50_000},
+}
+
+
+def _monitor(tarif_listrik):
+    monitor = MonitorListrik(cek_konsistensi=True, seed=0)
+    monitor.tarif_listrik = tarif_listrik
+    monitor.tambah_peralatan('Lampu', 2, 10, 'R-1', 6)
+    monitor.tambah_peralatan('Kulkas', 1, 150, 'R-2', 24)
+    return monitor
+
+
+def test_biaya_waktu_pemakaian_setelah_golongan_terakhir_dihapus():
+    monitor = _monitor(TARIF_WAKTU)
+    monitor.hapus_peralatan(1)
+    per_golongan = monitor.hitung_biaya_per_golongan()
+    assert list(per_golongan) == ['R-1']
+    assert monitor.hitung_estimasi_biaya() == pytest.approx(
+        monitor.hitung_biaya_per_peralatan().sum()
+    )
+
+
+@pytest.mark.parametrize('tarif_listrik', [TARIF_MINIMUM, TARIF_WAKTU])
+@pytest.mark.parametrize('kosongkan', ['hapus', 'ubah'])
+def test_golongan_kosong_tidak_dikenai_minimum(tarif_listrik, kosongkan):
+    monitor = _monitor(tarif_listrik)
+    if kosongkan == 'hapus':
+        monitor.hapus_peralatan(1)
+    else:
+        monitor.ubah_peralatan(1, golongan='R-1')
+    assert list(monitor.hitung_kwh_per_golongan()) == ['R-1']
+    assert monitor.hitung_estimasi_biaya() == pytest.approx(
+        monitor.hitung_biaya_per_peralatan().sum()
+    )
+
+
+def _isi(tabel):
+    """Baris tabel sebagai list dict; NaN (jam_mulai otomatis) menjadi None agar dapat dibandingkan"""
+    return [
+        {k: None if isinstance(v, float) and np.isnan(v) else v for k, v in tabel[i].items()}
+        for i in range(len(tabel))
+    ]
+
+
+def _acak_perubahan(monitor, rng, jumlah):
+    """Urutan acak tambah/hapus/ubah/batch atas monitor"""
+    for _ in range(jumlah):
+        aksi = rng.integers(4)
+        golongan = f'R-{rng.integers(1, 4)}'
+        if aksi == 0 or not monitor.peralatan:
+            monitor.tambah_peralatan(f'Peralatan {rng.integers(10)}', int(rng.integers(1, 4)),
+                                     float(rng.uniform(5, 500)), golongan, float(rng.uniform(0, 24)))
+        elif aksi == 1:
+            monitor.hapus_peralatan(int(rng.integers(-len(monitor.peralatan), len(monitor.peralatan))))
+        elif aksi == 2:
+            monitor.ubah_peralatan(int(rng.integers(len(monitor.peralatan))), golongan=golongan,
+                                   jam_per_hari=float(rng.uniform(0, 24)))
+        else:
+            k = int(rng.integers(1, 5))
+            monitor.tambah_peralatan_batch({
+                'nama': [f'Batch {i}' for i in range(k)], 'unit': [1] * k,
+                'watt': rng.uniform(5, 500, k).tolist(), 'golongan': [golongan] * k,
+                'jam_per_hari': rng.uniform(0, 24, k).tolist(),
+            })
+
+
+@pytest.mark.parametrize('dari_katalog', [False, True])
+def test_agregat_berjalan_sama_dengan_hitung_ulang(dari_katalog):
+    katalog = katalog_default()
+    isi_katalog = _isi(katalog.tabel)
+    if dari_katalog:
+        monitor = MonitorListrik.dari_katalog(katalog)
+        monitor.cek_konsistensi = True
+    else:
+        monitor = MonitorListrik(cek_konsistensi=True, seed=0)
+    monitor.indeks_grup('golongan')
+    # cek_konsistensi memverifikasi agregat dan indeks grup setelah setiap perubahan
+    _acak_perubahan(monitor, np.random.default_rng(1), 300)
+    total, kwh_per_golongan = monitor._hitung_agregat_penuh()
+    assert monitor.hitung_total_penggunaan() == pytest.approx(total)
+    assert monitor.hitung_kwh_per_golongan() == pytest.approx(kwh_per_golongan)
+    assert monitor.hitung_estimasi_biaya() == pytest.approx(
+        monitor.hitung_biaya_per_peralatan().sum()
+    )
+    # Overlay copy-on-write tidak mengubah katalog bersama
+    assert _isi(katalog.tabel) == isi_katalog
+
+
+def test_hapus_semua_peralatan_mengosongkan_agregat():
+    monitor = _monitor(TARIF_MINIMUM)
+    monitor.hapus_peralatan(0)
+    monitor.hapus_peralatan(0)
+    assert monitor.hitung_total_penggunaan() == 0
+    assert monitor.hitung_kwh_per_golongan() == {}
+    assert monitor.hitung_estimasi_biaya() == 0
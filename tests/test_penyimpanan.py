@@ -0,0 +1,106 @@
+"""Penyimpanan SQLite + segmen: simpan inkremental dan riwayat bacaan"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik  # noqa: E402
+from powerwatch.penyimpanan import PenyimpananListrik  # noqa: E402
+
+
+def _isi(tabel):
+    """Baris tabel sebagai list dict; NaN (jam_mulai otomatis) menjadi None agar dapat dibandingkan"""
+    return [
+        {k: None if isinstance(v, float) and np.isnan(v) else v for k, v in tabel[i].items()}
+        for i in range(len(tabel))
+    ]
+
+
+def _muat_ulang(direktori):
+    """Monitor dari penyimpanan yang dibuka ulang (koneksi baru)"""
+    penyimpanan = PenyimpananListrik(direktori)
+    return MonitorListrik.dari_penyimpanan(penyimpanan), penyimpanan
+
+
+def test_catatan_perubahan_diputar_ulang_sama_dengan_tabel(tmp_path):
+    rng = np.random.default_rng(7)
+    penyimpanan = PenyimpananListrik(str(tmp_path))
+    monitor = MonitorListrik(seed=0)
+    monitor.tambah_peralatan('Kulkas', 1, 150, 'R-1', 24)
+    monitor.sambungkan_penyimpanan(penyimpanan)
+    monitor.simpan()
+    for putaran in range(40):
+        for _ in range(int(rng.integers(1, 6))):
+            aksi = rng.integers(4)
+            n = len(monitor.peralatan)
+            if aksi == 0 or n == 0:
+                monitor.tambah_peralatan(f'Peralatan {putaran}', 1, float(rng.uniform(5, 300)), 'R-1',
+                                         float(rng.uniform(0, 24)), jam_mulai=float(rng.integers(24)))
+            elif aksi == 1:
+                monitor.hapus_peralatan(int(rng.integers(-n, n)))
+            elif aksi == 2:
+                monitor.ubah_peralatan(int(rng.integers(-n, n)), nama=f'Diubah {putaran}', golongan='R-2')
+            else:
+                monitor.tambah_peralatan_batch([('Batch', 2, 10.0, 'R-3', 3.0)] * int(rng.integers(1, 4)))
+        monitor.simpan()
+        # Tabel di database selalu sama dengan tabel di memori setelah simpan
+        dimuat, lain = _muat_ulang(str(tmp_path))
+        assert _isi(dimuat.peralatan) == _isi(monitor.peralatan)
+        lain.tutup()
+    penyimpanan.tutup()
+
+
+def test_monitor_dari_penyimpanan_melanjutkan_simpan_inkremental(tmp_path):
+    penyimpanan = PenyimpananListrik(str(tmp_path))
+    monitor = MonitorListrik(seed=0)
+    for i in range(5):
+        monitor.tambah_peralatan(f'Peralatan {i}', 1, 10 * (i + 1), 'R-1', 2)
+    monitor.sambungkan_penyimpanan(penyimpanan)
+    monitor.simpan()
+    penyimpanan.tutup()
+
+    dimuat, penyimpanan = _muat_ulang(str(tmp_path))
+    dimuat.hapus_peralatan(1)
+    dimuat.ubah_peralatan(-1, watt=99)
+    dimuat.tambah_peralatan('Baru', 1, 5, 'R-2', 1)
+    dimuat.simpan()
+    harapan = _isi(dimuat.peralatan)
+    penyimpanan.tutup()
+
+    dimuat_lagi, penyimpanan = _muat_ulang(str(tmp_path))
+    assert _isi(dimuat_lagi.peralatan) == harapan
+    penyimpanan.tutup()
+
+
+def test_catatan_tidak_cocok_ditolak(tmp_path):
+    penyimpanan = PenyimpananListrik(str(tmp_path))
+    monitor = MonitorListrik(seed=0)
+    monitor.tambah_peralatan('Kulkas', 1, 150, 'R-1', 24)
+    urutan = penyimpanan.simpan_peralatan(monitor.peralatan)
+    monitor.tambah_peralatan('Kipas', 1, 40, 'R-1', 8)
+    with pytest.raises(RuntimeError):
+        penyimpanan.simpan_perubahan_peralatan(monitor.peralatan, urutan, [])
+    penyimpanan.tutup()
+
+
+def test_riwayat_bacaan_segmen(tmp_path):
+    penyimpanan = PenyimpananListrik(str(tmp_path), ukuran_flush=10)
+    waktu = np.datetime64('2024-01-01T00:00:00') + np.arange(25) * np.timedelta64(1, 'h')
+    kwh = np.arange(25, dtype=np.float64)
+    penyimpanan.tambah_pembacaan(waktu[:12], kwh[:12])
+    penyimpanan.tambah_pembacaan(waktu[12:], kwh[12:])
+    # Bacaan yang lebih lama dari bacaan terakhir dibuang (segmen append-only)
+    penyimpanan.tambah_pembacaan(waktu[:3], kwh[:3])
+    penyimpanan.flush()
+    assert penyimpanan.dibuang == 3
+    assert penyimpanan.jumlah_pembacaan() == 25
+
+    w, k = penyimpanan.muat_pembacaan()
+    assert np.array_equal(w, waktu) and np.array_equal(k, kwh)
+    w, k = penyimpanan.muat_pembacaan(waktu[5], waktu[20])
+    assert np.array_equal(w, waktu[5:21]) and np.array_equal(k, kwh[5:21])
+    penyimpanan.tutup()
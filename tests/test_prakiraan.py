@@ -0,0 +1,31 @@
+"""Prakiraan tagihan Monte Carlo"""
+import os
+import sys
+
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik  # noqa: E402
+
+
+def _monitor(daftar_jam):
+    monitor = MonitorListrik(seed=0)
+    for i, jam in enumerate(daftar_jam):
+        monitor.tambah_peralatan(f'Peralatan {i}', 1, 500, 'R-1', jam)
+    return monitor
+
+
+def test_rata_rata_tidak_bias_untuk_peralatan_mendekati_24_jam():
+    monitor = _monitor([24, 20, 5])
+    prakiraan = monitor.prakiraan_biaya()
+    estimasi = monitor.hitung_estimasi_biaya()
+    assert prakiraan['rata_rata'] == pytest.approx(estimasi, rel=5e-3)
+    assert prakiraan['p10'] < estimasi < prakiraan['p90']
+
+
+def test_peralatan_24_jam_tidak_bervariasi():
+    monitor = _monitor([24, 24])
+    prakiraan = monitor.prakiraan_biaya(jumlah_simulasi=200)
+    assert prakiraan['tagihan'] == pytest.approx(monitor.hitung_estimasi_biaya())
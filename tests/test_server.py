@@ -0,0 +1,47 @@
+"""Server HTTP/JSON lokal"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik  # noqa: E402
+from powerwatch.server import mulai_server  # noqa: E402
+
+
+async def _kirim(permintaan):
+    monitor = MonitorListrik(seed=0)
+    monitor.tambah_peralatan('Lampu', 1, 10, 'R-1', 6)
+    srv, _ = await mulai_server(monitor, port=0)
+    try:
+        port = srv.sockets[0].getsockname()[1]
+        pembaca, penulis = await asyncio.open_connection('127.0.0.1', port)
+        penulis.write(permintaan)
+        await penulis.drain()
+        respons = await asyncio.wait_for(pembaca.read(), 5)
+        penulis.close()
+        return respons
+    finally:
+        srv.close()
+        await srv.wait_closed()
+
+
+@pytest.mark.parametrize('panjang', ['-5', 'abc', '+3', ' 3 3', '1_0'])
+def test_content_length_tidak_valid_ditolak(panjang):
+    respons = asyncio.run(_kirim(
+        f'POST /peralatan HTTP/1.1\r\nContent-Length: {panjang}\r\n\r\n{{}}'.encode()
+    ))
+    kepala, _, body = respons.partition(b'\r\n\r\n')
+    assert kepala.startswith(b'HTTP/1.1 400')
+    assert 'Content-Length' in json.loads(body)['galat']
+
+
+def test_ringkasan():
+    respons = asyncio.run(_kirim(b'GET /ringkasan HTTP/1.1\r\nConnection: close\r\n\r\n'))
+    kepala, _, body = respons.partition(b'\r\n\r\n')
+    assert kepala.startswith(b'HTTP/1.1 200')
+    assert json.loads(body)['jumlah_peralatan'] == 1
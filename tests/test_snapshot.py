@@ -0,0 +1,72 @@
+"""Snapshot biner: tulis, baca, dan penulis berkala"""
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik, snapshot  # noqa: E402
+
+
+def _isi(tabel):
+    """Baris tabel sebagai list dict; NaN (jam_mulai otomatis) menjadi None agar dapat dibandingkan"""
+    return [
+        {k: None if isinstance(v, float) and np.isnan(v) else v for k, v in tabel[i].items()}
+        for i in range(len(tabel))
+    ]
+
+
+def _monitor():
+    monitor = MonitorListrik(seed=3)
+    monitor.tarif_listrik = {'R-1': {'harga': 1444, 'waktu': [(17, 22, 2000)]}, 'R-2': 1699}
+    monitor.tambah_peralatan('Kulkas', 1, 150, 'R-1', 24)
+    monitor.tambah_peralatan('Lampu Teras ☀', 3, 10, 'R-2', 12, jam_mulai=18)
+    monitor.tambah_peralatan('Kipas', 2, 40, 'R-1', 8)
+    monitor.hapus_peralatan(0)
+    return monitor
+
+
+def test_snapshot_pulang_pergi(tmp_path):
+    monitor = _monitor()
+    path = str(tmp_path / f'monitor{snapshot.EKSTENSI}')
+    monitor.simpan_snapshot(path)
+    dimuat = MonitorListrik.dari_snapshot(path)
+
+    assert _isi(dimuat.peralatan) == _isi(monitor.peralatan)
+    assert np.array_equal(dimuat.penggunaan_harian.waktu(), monitor.penggunaan_harian.waktu())
+    assert np.array_equal(dimuat.penggunaan_harian.kwh(), monitor.penggunaan_harian.kwh())
+    assert dimuat.hitung_kwh_per_golongan() == pytest.approx(monitor.hitung_kwh_per_golongan())
+    assert dimuat.hitung_estimasi_biaya() == pytest.approx(monitor.hitung_estimasi_biaya())
+    assert dimuat.tarif_terpilih == monitor.tarif_terpilih
+    # Status rng ikut dipulihkan
+    assert dimuat.rng.random() == monitor.rng.random()
+
+    # Monitor dari snapshot tetap dapat diubah tanpa menyentuh berkasnya
+    dimuat.cek_konsistensi = True
+    dimuat.ubah_peralatan(0, golongan='R-1')
+    dimuat.tambah_peralatan('Rice Cooker', 1, 350, 'R-2', 1)
+    assert len(snapshot.baca(path).tabel) == len(monitor.peralatan)
+
+
+def test_penulis_berkala_bersama(tmp_path, monkeypatch):
+    path = str(tmp_path / f'bersama{snapshot.EKSTENSI}')
+    monkeypatch.setenv(snapshot.VARIABEL_LINGKUNGAN, path)
+    utama, lain = _monitor(), _monitor()
+    penulis = snapshot.berkala_dari_env(utama, interval=0.05)
+    try:
+        assert snapshot.berkala_dari_env(lain, interval=0.05) is penulis
+        assert penulis.monitor_utama() is utama
+        lain.tambah_peralatan('Hanya di sesi lain', 1, 10, 'R-1', 1)
+        utama.tambah_peralatan('Setrika', 1, 300, 'R-1', 1)
+        batas = time.monotonic() + 5
+        while penulis.jumlah_ditulis == 0 and time.monotonic() < batas:
+            time.sleep(0.05)
+        assert penulis.galat is None
+        nama = snapshot.baca(path).tabel.nama().tolist()
+        assert 'Setrika' in nama and 'Hanya di sesi lain' not in nama
+    finally:
+        penulis.hentikan()
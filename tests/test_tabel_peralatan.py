@@ -0,0 +1,81 @@
+"""Tabel peralatan kolumnar dan overlay copy-on-write"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch.tabel_peralatan import TabelPeralatan  # noqa: E402
+
+
+def _baris(nama, unit, watt, golongan, jam_per_hari, jam_mulai=None):
+    return {'nama': nama, 'unit': unit, 'watt': watt, 'total_watt': watt * unit,
+            'golongan': golongan, 'jam_per_hari': jam_per_hari, 'jam_mulai': jam_mulai}
+
+
+def _isi(tabel):
+    return [
+        {k: None if isinstance(v, float) and np.isnan(v) else v for k, v in tabel[i].items()}
+        for i in range(len(tabel))
+    ]
+
+
+def _basis():
+    tabel = TabelPeralatan()
+    tabel.tambah('Kulkas', 1, 150.0, 'R-1', 24.0)
+    tabel.tambah('Lampu', 4, 10.0, 'R-1', 6.0, 18.0)
+    tabel.tambah('AC', 1, 900.0, 'R-2', 8.0)
+    return tabel
+
+
+@pytest.mark.parametrize('overlay', [False, True])
+def test_operasi_sama_dengan_list_dict(overlay):
+    basis = _basis()
+    acuan = _isi(basis)
+    tabel = basis.bekukan().turunan() if overlay else basis
+    rng = np.random.default_rng(0)
+    for langkah in range(200):
+        aksi = rng.integers(4)
+        if aksi == 0 or not acuan:
+            baris = _baris(f'Alat {langkah % 7}', int(rng.integers(1, 5)), float(rng.integers(1, 500)),
+                           f'R-{rng.integers(1, 4)}', float(rng.integers(0, 25)))
+            assert tabel.tambah(**{k: v for k, v in baris.items() if k not in ('total_watt', 'jam_mulai')}) == len(acuan)
+            acuan.append(baris)
+        elif aksi == 1:
+            indeks = int(rng.integers(-len(acuan), len(acuan)))
+            assert tabel.hapus(indeks)['nama'] == acuan.pop(indeks)['nama']
+        elif aksi == 2:
+            indeks = int(rng.integers(-len(acuan), len(acuan)))
+            unit, golongan = int(rng.integers(1, 5)), f'R-{rng.integers(1, 4)}'
+            tabel.ubah(indeks, unit=unit, golongan=golongan)
+            acuan[indeks].update(unit=unit, golongan=golongan,
+                                 total_watt=acuan[indeks]['watt'] * unit)
+        else:
+            k = int(rng.integers(1, 4))
+            tabel.tambah_batch(['Batch'] * k, [2] * k, [5.0] * k, ['R-3'] * k, [1.0] * k)
+            acuan.extend(_baris('Batch', 2, 5.0, 'R-3', 1.0) for _ in range(k))
+        assert _isi(tabel) == acuan
+    assert tabel.kolom('total_watt').tolist() == [b['total_watt'] for b in acuan]
+    assert tabel.golongan().tolist() == [b['golongan'] for b in acuan]
+    if overlay:
+        assert _isi(basis) == _isi(_basis())
+
+
+def test_tabel_beku_tidak_dapat_diubah():
+    tabel = _basis().bekukan()
+    with pytest.raises(ValueError):
+        tabel.tambah('Kipas', 1, 40.0, 'R-1', 8.0)
+    assert not tabel.kolom('watt').flags.writeable
+
+
+def test_indeks_dan_kolom_tidak_valid():
+    tabel = _basis()
+    with pytest.raises(IndexError):
+        tabel.hapus(3)
+    with pytest.raises(IndexError):
+        tabel.ubah(-4, unit=2)
+    with pytest.raises(KeyError):
+        tabel.ubah(0, warna='merah')
@@ -0,0 +1,53 @@
+"""Tagihan massal sama dengan MonitorListrik per rumah tangga"""
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import MonitorListrik, tagihan_massal  # noqa: E402
+
+TARIF = {
+    'R-1': {'harga': 1444, 'blok': [(100, 1600)], 'minimum': 40_000, 'pajak': 0.03},
+    'R-2': {'harga': 1699, 'waktu': [(17, 22, 2100)]},
+}
+
+
+@pytest.mark.parametrize('ukuran_shard', [64 * 1024, 300])
+def test_tagihan_massal_sama_dengan_monitor(tmp_path, ukuran_shard):
+    rng = np.random.default_rng(5)
+    per_rumah = {}
+    sumber = tmp_path / 'inventaris.csv'
+    with open(sumber, 'w', newline='') as f:
+        penulis = csv.writer(f)
+        penulis.writerow(['id_rumah', 'nama', 'unit', 'watt', 'golongan', 'jam_per_hari', 'jam_mulai'])
+        for r in range(12):
+            for i in range(int(rng.integers(1, 8))):
+                baris = (f'Alat {i}', int(rng.integers(1, 4)), round(float(rng.uniform(5, 900)), 1),
+                         f'R-{rng.integers(1, 3)}', round(float(rng.uniform(0.5, 24)), 1),
+                         int(rng.integers(24)))
+                penulis.writerow([f'rumah-{r:02d}', *baris])
+                per_rumah.setdefault(f'rumah-{r:02d}', []).append(baris)
+
+    keluaran = tmp_path / 'tagihan.csv'
+    # ukuran_shard kecil memaksa rumah tangga terbelah di batas shard
+    ringkasan = tagihan_massal.hitung_tagihan(str(sumber), str(keluaran), TARIF, jumlah_proses=1,
+                                              ukuran_shard=ukuran_shard)
+    assert ringkasan['rumah_tangga'] == len(per_rumah)
+    assert (ringkasan['shard'] > 1) == (ukuran_shard < 1024)
+    with open(keluaran, newline='') as f:
+        hasil = {b['id_rumah']: b for b in csv.DictReader(f)}
+    assert list(hasil) == list(per_rumah)
+
+    for id_rumah, daftar in per_rumah.items():
+        monitor = MonitorListrik(seed=0)
+        monitor.tarif_listrik = dict(TARIF)
+        for nama, unit, watt, golongan, jam, jam_mulai in daftar:
+            monitor.tambah_peralatan(nama, unit, watt, golongan, jam, jam_mulai=jam_mulai)
+        assert int(hasil[id_rumah]['jumlah_peralatan']) == len(daftar)
+        assert float(hasil[id_rumah]['total_kwh']) == pytest.approx(monitor.hitung_total_penggunaan())
+        assert float(hasil[id_rumah]['estimasi_biaya']) == pytest.approx(monitor.hitung_estimasi_biaya())
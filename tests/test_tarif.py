@@ -0,0 +1,106 @@
+"""Mesin tarif: blok, waktu pemakaian, biaya minimum, dan pajak"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+from powerwatch import profil_beban, tarif  # noqa: E402
+
+HARGA_DEFAULT = 1500
+
+
+def _tagihan(spesifikasi, kwh, kwh_jam=None, akun=None):
+    tabel_tarif = tarif.kompilasi(spesifikasi, HARGA_DEFAULT)
+    kode = tabel_tarif.kode(['R-1'] * len(kwh))
+    kwh = np.asarray(kwh, dtype=np.float64)
+    energi = tabel_tarif.energi(kode, kwh, kwh_jam)
+    return tabel_tarif.tagihan(kode, kwh, energi, akun=akun)
+
+
+def test_harga_rata():
+    assert _tagihan({'R-1': 1000}, [120])['total'].tolist() == [120_000]
+
+
+def test_blok_bertingkat():
+    spesifikasi = {'R-1': {'harga': 1000, 'blok': [(200, 2000), (100, 1500)]}}
+    hasil = _tagihan(spesifikasi, [250])
+    # 100 kWh x 1000 + 100 kWh x 1500 + 50 kWh x 2000
+    assert hasil['total'][0] == pytest.approx(350_000)
+    assert hasil['blok'][0] == pytest.approx(100_000)
+    # Blok berlaku atas jumlah per akun, bukan per baris
+    assert _tagihan(spesifikasi, [125, 125], akun=np.array([0, 0]))['total'][0] == pytest.approx(350_000)
+
+
+def test_waktu_pemakaian():
+    spesifikasi = {'R-1': {'harga': 1000, 'waktu': [(17, 22, 2000)]}}
+    tabel_tarif = tarif.kompilasi(spesifikasi, HARGA_DEFAULT)
+    assert not tabel_tarif.seragam
+    kwh_jam = np.zeros((2, 24))
+    kwh_jam[0, 18] = 10  # dalam jendela
+    kwh_jam[1, 3] = 10  # di luar jendela
+    energi = tabel_tarif.energi(tabel_tarif.kode(['R-1', 'R-1']), kwh_jam.sum(axis=1), kwh_jam)
+    assert energi.tolist() == [20_000, 10_000]
+    # Tanpa profil per jam, pemakaian dianggap merata sepanjang hari
+    assert tabel_tarif.energi(tabel_tarif.kode(['R-1']), [24])[0] == pytest.approx(19 * 1000 + 5 * 2000)
+
+
+def test_jendela_melewati_tengah_malam():
+    tabel_tarif = tarif.kompilasi({'R-1': {'harga': 1000, 'waktu': [(22, 6, 500)]}}, HARGA_DEFAULT)
+    harga = tabel_tarif.harga_jam[tabel_tarif.kode(['R-1'])[0]]
+    assert harga[[22, 23, 0, 5]].tolist() == [500] * 4
+    assert harga[[6, 21]].tolist() == [1000] * 2
+
+
+def test_energi_jadwal_sama_dengan_profil_per_jam():
+    tabel_tarif = tarif.kompilasi({'R-1': {'harga': 1000, 'waktu': [(17, 22, 2000)]}}, HARGA_DEFAULT)
+    kw = np.array([0.5, 1.2, 0.1])
+    jam_mulai = np.array([16.5, 20.0, 23.0])
+    durasi = np.array([3.0, 6.5, 24.0])
+    kode = tabel_tarif.kode(['R-1'] * 3)
+    acuan = tabel_tarif.energi(kode, kw * durasi * 30,
+                               profil_beban.kwh_per_jam(kw, jam_mulai, durasi, 30))
+    assert tabel_tarif.energi_jadwal(kode, kw, jam_mulai, durasi, 30) == pytest.approx(acuan)
+
+
+def test_minimum_dan_pajak():
+    spesifikasi = {'R-1': {'harga': 1000, 'minimum': 50_000, 'pajak': 0.1}}
+    hasil = _tagihan(spesifikasi, [10, 100], akun=np.array([0, 2]))
+    assert hasil['pajak'].tolist() == pytest.approx([5_000, 0, 10_000])
+    # Akun 1 tanpa baris tidak dikenai biaya minimum
+    assert hasil['total'].tolist() == pytest.approx([55_000, 0, 110_000])
+
+
+def test_alokasi_menjumlah_ke_tagihan_akun():
+    spesifikasi = {'R-1': {'harga': 1000, 'minimum': 50_000, 'pajak': 0.05}}
+    kwh = np.array([5.0, 15.0, 0.0])
+    hasil = _tagihan(spesifikasi, kwh, akun=np.array([0, 0, 1]))
+    per_baris = tarif.TabelTarif.alokasi(hasil, kwh)
+    assert per_baris.sum() == pytest.approx(hasil['total'].sum())
+    assert per_baris[:2].tolist() == pytest.approx([13_125, 39_375])
+
+
+def test_golongan_tidak_dikenal_memakai_harga_default():
+    tabel_tarif = tarif.kompilasi({'R-1': 1000}, HARGA_DEFAULT)
+    kode = tabel_tarif.kode(['B-9'])
+    assert tabel_tarif.energi(kode, [2])[0] == 2 * HARGA_DEFAULT
+
+
+def test_kompilasi_di_cache_menurut_isi():
+    assert tarif.kompilasi({'R-1': 1000, 'R-2': 1200}, 1) is tarif.kompilasi({'R-2': 1200, 'R-1': 1000}, 1)
+
+
+@pytest.mark.parametrize('spesifikasi', [
+    {'R-1': {'harga': 1000, 'diskon': 5}},
+    {'R-1': 0},
+    {'R-1': {'harga': 1000, 'blok': [(100,)]}},
+    {'R-1': {'harga': 1000, 'waktu': [(20, 25, 900)]}},
+    {'R-1': {'harga': 1000, 'pajak': -0.1}},
+    {'R-1': {'harga': 'mahal'}},
+])
+def test_spesifikasi_tidak_valid(spesifikasi):
+    with pytest.raises(ValueError):
+        tarif.kunci_spesifikasi(spesifikasi)